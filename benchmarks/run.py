@@ -0,0 +1,602 @@
+"""Micro-benchmarks for the performance-sensitive library paths.
+
+Each benchmark builds synthetic data, times the current implementation and,
+where one exists, the approach it replaced, and prints the results. Run all
+of them or pick some by name::
+
+    python benchmarks/run.py
+    python benchmarks/run.py section_locator
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import math
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+
+def _linear_section(starts: list[float], dlong: float) -> int:
+    for index in range(len(starts) - 1):
+        if starts[index] <= dlong < starts[index + 1]:
+            return index
+    return len(starts) - 1
+
+
+def bench_section_locator(num_sects: int = 300, queries: int = 200_000) -> None:
+    """DLONG lookups: linear scan, bisect and searchsorted."""
+    from icr2_core.trk.section_locator import SectionLocator
+
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(50_000, 400_000, size=num_sects)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).tolist()
+    track_length = float(lengths.sum())
+    dlongs = rng.uniform(0, track_length, size=queries)
+    scalar_dlongs = dlongs[: queries // 20].tolist()
+    locator = SectionLocator(starts, lengths.tolist(), track_length)
+
+    started = time.perf_counter()
+    expected = [_linear_section(starts, dlong) for dlong in scalar_dlongs]
+    linear = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = [locator.section(dlong) for dlong in scalar_dlongs]
+    bisected = time.perf_counter() - started
+    assert actual == expected
+    started = time.perf_counter()
+    locator.sections(dlongs)
+    vectorised = time.perf_counter() - started
+
+    per_query = len(scalar_dlongs)
+    print(f"{num_sects} sections, {per_query} scalar queries, {queries} array queries")
+    print(f"  linear scan : {linear / per_query * 1e6:8.2f} us/query")
+    print(
+        f"  bisect      : {bisected / per_query * 1e6:8.2f} us/query "
+        f"({linear / bisected:.0f}x)"
+    )
+    print(
+        f"  searchsorted: {vectorised / queries * 1e6:8.3f} us/query "
+        f"({linear / per_query / (vectorised / queries):.0f}x)"
+    )
+
+
+def bench_edit_manager(num_sections: int = 500, cycles: int = 1_000) -> None:
+    """Undo/redo with per-section diffs against deep-copied snapshots."""
+    from sg_viewer.model.edit_commands import ReplaceSectionsCommand
+    from sg_viewer.model.edit_manager import EditManager
+    from sg_viewer.model.sg_model import SectionPreview
+
+    def straight(index: int) -> SectionPreview:
+        start = (float(index), 0.0)
+        end = (float(index + 1), 0.0)
+        return SectionPreview(
+            section_id=index,
+            source_section_id=index,
+            type_name="straight",
+            previous_id=(index - 1) % num_sections,
+            next_id=(index + 1) % num_sections,
+            start=start,
+            end=end,
+            start_dlong=float(index),
+            length=1.0,
+            center=None,
+            sang1=None,
+            sang2=None,
+            eang1=None,
+            eang2=None,
+            radius=None,
+            start_heading=(1.0, 0.0),
+            end_heading=(1.0, 0.0),
+            polyline=[start, end],
+        )
+
+    before = [straight(index) for index in range(num_sections)]
+    after = list(before)
+    after[10] = replace(before[10], length=1.5)
+
+    class _DeepCopyCommand(ReplaceSectionsCommand):
+        # The previous implementation: a deep copy on every undo and redo.
+        def __init__(self, before, after) -> None:
+            super().__init__(before, after)
+            self._before = copy.deepcopy(before)
+            self._after = copy.deepcopy(after)
+
+        def apply(self):
+            return copy.deepcopy(self._after)
+
+        def revert(self):
+            return copy.deepcopy(self._before)
+
+        def apply_to(self, sections):
+            return self.apply()
+
+        def revert_from(self, sections):
+            return self.revert()
+
+        def changed_indices(self):
+            return None
+
+        def compact(self) -> None:
+            pass
+
+    results = {}
+    for label, command_type in (("deepcopy", _DeepCopyCommand), ("diff", ReplaceSectionsCommand)):
+        manager = EditManager()
+        manager.execute(ReplaceSectionsCommand(before, before))
+        manager.execute(command_type(before, after))
+        started = time.perf_counter()
+        for _ in range(cycles):
+            manager.undo()
+            manager.redo()
+        results[label] = time.perf_counter() - started
+
+    print(f"{num_sections} sections, {cycles} undo/redo cycles")
+    for label, elapsed in results.items():
+        print(f"  {label:8s}: {elapsed / cycles * 1e3:8.3f} ms/cycle")
+    print(f"  speed-up: {results['deepcopy'] / results['diff']:.0f}x")
+
+
+def bench_derived_geometry(num_sections: int = 800, edits: int = 50) -> None:
+    """Full rebuild against one-section updates on a circular track."""
+    from sg_viewer.geometry.derived_geometry import DerivedGeometry
+
+    class _Signal:
+        def __init__(self) -> None:
+            self._callbacks: list = []
+
+        def connect(self, func) -> None:
+            self._callbacks.append(func)
+
+        def emit(self, *args) -> None:
+            for func in self._callbacks:
+                func(*args)
+
+    radius = 500_000.0
+    sects = []
+    for index in range(num_sections):
+        a0 = 2 * math.pi * index / num_sections
+        a1 = 2 * math.pi * (index + 1) / num_sections
+        sects.append(
+            SimpleNamespace(
+                type=2 if index % 2 else 1,
+                start_x=radius * math.cos(a0),
+                start_y=radius * math.sin(a0),
+                end_x=radius * math.cos(a1),
+                end_y=radius * math.sin(a1),
+                center_x=0.0,
+                center_y=0.0,
+                radius=radius,
+                sang1=-math.sin(a0),
+                sang2=math.cos(a0),
+                eang1=-math.sin(a1),
+                eang2=math.cos(a1),
+                start_dlong=index * 1000.0,
+                length=1000.0,
+                sec_prev=(index - 1) % num_sections,
+                sec_next=(index + 1) % num_sections,
+            )
+        )
+    document = SimpleNamespace(
+        sg_data=SimpleNamespace(sects=sects),
+        geometry_changed=_Signal(),
+        sections_geometry_changed=_Signal(),
+    )
+    geometry = DerivedGeometry(document)
+
+    started = time.perf_counter()
+    geometry.rebuild_if_needed()
+    full = time.perf_counter() - started
+
+    # An edit away from the bounding box keeps the index grid, so only the
+    # touched segments are re-bucketed.
+    target = num_sections // 8 + 1
+    edited = sects[target]
+    timings = []
+    for step in range(edits):
+        edited.end_x += 10.0 * (step % 3 - 1)
+        edited.radius *= 1.001
+        started = time.perf_counter()
+        document.sections_geometry_changed.emit(target, target + 1)
+        geometry.rebuild_if_needed()
+        timings.append(time.perf_counter() - started)
+
+    print(f"{num_sections} sections, {len(geometry.sampled_centerline)} centreline points")
+    print(f"  full rebuild       : {full * 1e3:7.2f} ms")
+    print(f"  one-section update : {sum(timings) / len(timings) * 1e3:7.2f} ms (avg of {edits})")
+    print(f"  worst update       : {max(timings) * 1e3:7.2f} ms")
+
+
+def _synthetic_track3d(sections: int, faces_per_section: int = 4, vertices_per_face: int = 24) -> str:
+    """.3D-shaped text with TSOs, lists and FACE blocks."""
+    out: list[str] = []
+    for tso in range(sections):
+        out.append(f'__TSO{tso}: DYNAMIC {tso * 10}, {tso * 20}, 0, 0, EXTERN "obj{tso % 40}";')
+    for section in range(sections):
+        out.append(f"ObjectList_L{section}_0: LIST {{ __TSO{section}, __TSO{(section + 1) % sections} }};")
+        out.append(f"DetailList_{section}-0H: LIST {{ __TSO{section}, DetailO_{section}-0 }};")
+    for section in range(sections):
+        for sub in range(faces_per_section):
+            lod = ("HI", "MED", "LO")[sub % 3]
+            out.append(
+                f"// Outputing section from dlong = {section * 1000 + sub} to dlong = {section * 1000 + sub + 1}"
+            )
+            out.append(f"sec{section}_s{sub}_{lod}: FACE")
+            out.append(f"  ObjectList_L{section}_0")
+            out.append(f"  DetailList_{section}-0H")
+            out.append(f'  MIP = "road{sub}.mip"')
+            for vertex in range(vertices_per_face):
+                out.append(f"  [<{section * 100 + vertex}, {sub * 50 + vertex}, {vertex}>], ")
+            out.append(";")
+        out.append(f"sec{section}_l0: LIST {{ sec{section}_s0_HI, DATA {{ {section * 1000}, {section * 1000 + 999} }} }};")
+    out.append("index: LIST { " + ", ".join(f"sec{section}_l0" for section in range(sections)) + " };")
+    return "\n".join(out) + "\n"
+
+
+def bench_track3d_catalog(target_mb: float = 50.0) -> None:
+    """First and cached catalog parse of a synthetic .3D file."""
+    from sg_viewer.io.track3d_catalog import parse_track3d_catalog
+
+    sample = _synthetic_track3d(100)
+    sections = max(1, int(100 * target_mb * 1024 * 1024 / len(sample)))
+    text = _synthetic_track3d(sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "track.3d"
+        path.write_text(text)
+        size_mb = path.stat().st_size / (1024 * 1024)
+
+        started = time.perf_counter()
+        catalog = parse_track3d_catalog(path)
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(3):
+            parse_track3d_catalog(path)
+        cached = (time.perf_counter() - started) / 3
+
+    print(f"{size_mb:.1f} MB, {len(catalog.faces)} faces, {len(catalog.tsos)} TSOs")
+    print(f"  first parse  : {first:7.2f} s")
+    print(f"  cached parse : {cached * 1e3:7.2f} ms")
+
+
+def bench_preview_layer_cache(lines: int = 20_000, pans: int = 30) -> None:
+    """Compare direct drawing with tiled panning for a busy synthetic layer."""
+    from PyQt5 import QtCore, QtGui, QtWidgets
+
+    from sg_viewer.services.preview_layer_cache import PreviewLayerCache
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    rng = random.Random(7)
+    polylines = []
+    for _ in range(lines):
+        x, y = rng.uniform(0, 4000), rng.uniform(0, 3000)
+        polylines.append([(x + 12 * step, y + rng.uniform(-8, 8)) for step in range(8)])
+
+    def draw(painter, transform, _view_transform, widget_height) -> None:
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(QtGui.QPen(QtGui.QColor(200, 200, 90), 1.5))
+        scale, (offset_x, offset_y) = transform
+        for points in polylines:
+            painter.drawPolyline(
+                QtGui.QPolygonF(
+                    [
+                        QtCore.QPointF(offset_x + x * scale, widget_height - offset_y - y * scale)
+                        for x, y in points
+                    ]
+                )
+            )
+
+    width, height = 1600, 1000
+    target = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    def run(cache: PreviewLayerCache | None) -> float:
+        started = time.perf_counter()
+        for step in range(pans):
+            transform = (0.5, (-3.0 * step, 0.0))
+            painter = QtGui.QPainter(target)
+            if cache is None:
+                draw(painter, transform, None, height)
+            else:
+                cache.draw_layer("bench", 1, (), painter, target.rect(), transform, None, height, draw)
+            painter.end()
+        return (time.perf_counter() - started) * 1000.0 / pans
+
+    direct_ms = run(None)
+    tiled_ms = run(PreviewLayerCache(show_timings=False))
+    print(f"{lines} polylines, {width}x{height}, {pans} pan steps")
+    print(f"  direct : {direct_ms:7.2f} ms/paint")
+    print(f"  tiled  : {tiled_ms:7.2f} ms/paint")
+
+
+def bench_spatial_index(num_sections: int = 2000, queries: int = 2000) -> None:
+    """Time snap and pick queries against a full scan on a long synthetic track."""
+    from sg_viewer.geometry.spatial_index import SectionSpatialIndex
+    from sg_viewer.model.sg_model import SectionPreview
+    from sg_viewer.preview.connection_detection import find_unconnected_node_target
+
+    rng = random.Random(11)
+    sections = []
+    x = y = 0.0
+    for index in range(num_sections):
+        angle = index * 2 * math.pi / num_sections
+        end = (x + 3000.0 * math.cos(angle), y + 3000.0 * math.sin(angle))
+        sections.append(
+            SectionPreview(
+                section_id=index,
+                source_section_id=index,
+                type_name="straight",
+                previous_id=index - 1 if index % 50 else -1,
+                next_id=index + 1 if (index + 1) % 50 else -1,
+                start=(x, y),
+                end=end,
+                start_dlong=3000.0 * index,
+                length=3000.0,
+                center=None,
+                sang1=None,
+                sang2=None,
+                eang1=None,
+                eang2=None,
+                radius=None,
+                start_heading=None,
+                end_heading=None,
+                polyline=[(x, y), end],
+            )
+        )
+        x, y = end
+    points = [rng.choice(sections).end for _ in range(queries)]
+
+    def run(index: SectionSpatialIndex | None) -> float:
+        started = time.perf_counter()
+        for point in points:
+            find_unconnected_node_target((0, "start"), point, sections, 200.0, spatial_index=index)
+        return (time.perf_counter() - started) * 1e6 / queries
+
+    index = SectionSpatialIndex()
+    started = time.perf_counter()
+    index.rebuild(sections)
+    build_ms = (time.perf_counter() - started) * 1000.0
+    started = time.perf_counter()
+    for point in points[:200]:
+        index.sections_near(point, 200.0)
+    pick_us = (time.perf_counter() - started) * 1e6 / 200
+    print(f"{num_sections} sections, build {build_ms:.1f} ms")
+    print(f"  snap, full scan : {run(None):8.1f} us/query")
+    print(f"  snap, grid      : {run(index):8.1f} us/query")
+    print(f"  pick candidates : {pick_us:8.1f} us/query")
+
+
+def bench_tsd_projection(num_lines: int = 100_000) -> None:
+    """Generate, serialize, parse and project ``num_lines`` skid marks on an oval."""
+    from sg_viewer.geometry.sg_geometry import update_section_geometry
+    from sg_viewer.model.sg_model import SectionPreview
+    from sg_viewer.services.skid_marks import (
+        SkidMarkGenerationParameters,
+        SkidMarkSectionParameters,
+        generate_skid_mark_columns,
+        generate_skid_mark_lines,
+    )
+    from sg_viewer.services.tsd_io import (
+        TrackSurfaceDetailFile,
+        parse_tsd,
+        parse_tsd_columns,
+        serialize_tsd,
+        serialize_tsd_columns,
+    )
+    from sg_viewer.services.tsd_projection import project_tsd_columns
+
+    straight, radius = 4_000_000.0, 1_500_000.0
+    turn = math.pi * radius
+    layout = [
+        ((0.0, 0.0), (straight, 0.0), None),
+        ((straight, 0.0), (straight, 2 * radius), (straight, radius)),
+        ((straight, 2 * radius), (0.0, 2 * radius), None),
+        ((0.0, 2 * radius), (0.0, 0.0), (0.0, radius)),
+    ]
+    sections = []
+    dlong = 0.0
+    for index, (start, end, center) in enumerate(layout):
+        length = straight if center is None else turn
+        sections.append(
+            update_section_geometry(
+                SectionPreview(
+                    section_id=index,
+                    source_section_id=index,
+                    type_name="straight" if center is None else "curve",
+                    previous_id=(index - 1) % 4,
+                    next_id=(index + 1) % 4,
+                    start=start,
+                    end=end,
+                    start_dlong=dlong,
+                    length=length,
+                    center=center,
+                    sang1=None,
+                    sang2=None,
+                    eang1=None,
+                    eang2=None,
+                    radius=None if center is None else radius,
+                    start_heading=(1.0, 0.0) if index == 0 else None,
+                    end_heading=None,
+                    polyline=[],
+                )
+            )
+        )
+        dlong += length
+    track_length = dlong
+
+    per_section = num_lines // 4
+    parameters = SkidMarkGenerationParameters(
+        colors=(45, 28, 44, 29),
+        sections=tuple(
+            SkidMarkSectionParameters(
+                section_name=f"Turn{index + 1}",
+                start_dlong=int(track_length * index / 4),
+                apex_dlong=int(track_length * (index + 0.5) / 4),
+                end_dlong=int(track_length * (index + 1) / 4),
+                min_length=20_000,
+                max_length=120_000,
+                width_500ths=2200,
+                num_skids=per_section,
+                start_dlat_a=-120_000,
+                start_dlat_b=-60_000,
+                apex_dlat_a=60_000,
+                apex_dlat_b=120_000,
+                end_dlat_a=-120_000,
+                end_dlat_b=-60_000,
+            )
+            for index in range(4)
+        ),
+    )
+
+    def timed(label: str, func):
+        started = time.perf_counter()
+        result = func()
+        print(f"  {label:<26}{(time.perf_counter() - started) * 1000.0:9.1f} ms")
+        return result
+
+    print(f"{num_lines} skid mark lines")
+    timed("generate (lines)", lambda: generate_skid_mark_lines(parameters))
+    columns = timed("generate (columns)", lambda: generate_skid_mark_columns(parameters))
+    text = timed("serialize (columns)", lambda: serialize_tsd_columns(columns))
+    timed("parse (columns)", lambda: parse_tsd_columns(text))
+    lines = timed("to dataclass lines", columns.to_lines)
+    timed("serialize (lines)", lambda: serialize_tsd(TrackSurfaceDetailFile(lines=lines)))
+    timed("parse (lines)", lambda: parse_tsd(text))
+    polylines = timed(
+        "project centre polylines",
+        lambda: project_tsd_columns(columns, sections, 0.002, track_length),
+    )
+    print(f"  {sum(len(points) for points in polylines)} world points")
+
+
+def bench_mips(size: int = 256, repeats: int = 50) -> None:
+    """Decode and encode throughput on a synthetic full MIP chain."""
+    from icr2_core.mip.mips import encode_mip, mip_to_arrays
+
+    rng = np.random.default_rng(0)
+    levels = []
+    width = height = size
+    for _ in range(8):
+        levels.append(rng.integers(0, 256, (height, width), dtype=np.uint8))
+        width, height = int(width/2 + 0.5), int(height/2 + 0.5)
+    fdata = encode_mip(levels, 0)
+    megabytes = len(fdata) * repeats / 1e6
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        mip_to_arrays(fdata)
+    decode = megabytes / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        encode_mip(levels, 0)
+    encode = megabytes / (time.perf_counter() - started)
+    print(f"{size}x{size} mip, {len(fdata)} bytes")
+    print(f"  decode: {decode:8.1f} MB/s")
+    print(f"  encode: {encode:8.1f} MB/s")
+
+
+def bench_quantizer(size: int = 4096) -> None:
+    """Quantize a ``size`` x ``size`` synthetic texture with each engine."""
+    from texture_tools.sunny_optimizer.color_utils import rgb_to_lab
+    from texture_tools.sunny_optimizer.nearest_color import BruteForceNearest
+    from texture_tools.sunny_optimizer.quantizer import Quantizer
+
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, (256, 3), dtype=np.uint8)
+    y, x = np.mgrid[0:size, 0:size]
+    base = np.stack(
+        (x * 255 // size, y * 255 // size, (x + y) * 127 // size), axis=-1
+    )
+    noise = rng.integers(-12, 13, (size, size, 3))
+    image = np.clip(base + noise, 0, 255).astype(np.uint8)
+    colors = np.unique(
+        (image[..., 0].astype(np.uint32) << 16)
+        | (image[..., 1].astype(np.uint32) << 8)
+        | image[..., 2]
+    ).shape[0]
+    print(f"{size}x{size} image, {colors} distinct colours")
+
+    # The search every pixel used to go through: Lab per pixel, all entries.
+    started = time.perf_counter()
+    BruteForceNearest(rgb_to_lab(palette).reshape(256, 3)).nearest(
+        rgb_to_lab(image).reshape(-1, 3)
+    )
+    print(f"  {'per pixel':14s}: {time.perf_counter() - started:7.2f} s")
+    for engine, cache in (("brute", False), ("grid", False), ("grid", True)):
+        quantizer = Quantizer(palette, engine=engine, cache_colors=cache)
+        started = time.perf_counter()
+        quantizer.quantize_image(image)
+        first = time.perf_counter() - started
+        label = f"{engine}{' + cache' if cache else ''}"
+        if cache:
+            started = time.perf_counter()
+            quantizer.quantize_image(image)
+            again = time.perf_counter() - started
+            print(f"  {label:14s}: {first:7.2f} s (repeat {again:.2f} s)")
+        else:
+            print(f"  {label:14s}: {first:7.2f} s")
+
+
+def bench_atlas(count: int = 500, page_size: int = 1024) -> None:
+    """Pack ``count`` synthetic track-sized textures and report fill ratio."""
+    from icr2_core.mip.atlas import TextureAtlas
+
+    rng = np.random.default_rng(0)
+    sizes = [16, 32, 64, 128, 256]
+    textures = {
+        f"tex{index:03d}.mip": rng.integers(
+            0, 256, (rng.choice(sizes[:4]), rng.choice(sizes)), dtype=np.uint8
+        )
+        for index in range(count)
+    }
+    started = time.perf_counter()
+    atlas = TextureAtlas.build(textures, page_size)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{count} textures -> {len(atlas.pages)} page(s) of {page_size}: "
+        f"{elapsed * 1000:.1f} ms, fill {atlas.fill_ratio():.1%}"
+    )
+    name = next(iter(textures))
+    started = time.perf_counter()
+    atlas.update(name, textures[name][::-1].copy())
+    print(f"  single texture update: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+BENCHMARKS = {
+    "section_locator": bench_section_locator,
+    "edit_manager": bench_edit_manager,
+    "derived_geometry": bench_derived_geometry,
+    "track3d_catalog": bench_track3d_catalog,
+    "preview_layer_cache": bench_preview_layer_cache,
+    "spatial_index": bench_spatial_index,
+    "tsd_projection": bench_tsd_projection,
+    "mips": bench_mips,
+    "quantizer": bench_quantizer,
+    "atlas": bench_atlas,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run ICR2 tools micro-benchmarks.")
+    parser.add_argument("names", nargs="*", metavar="name", help=f"One of: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark: {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        print(f"== {name}")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -165,6 +165,20 @@ def list_dat_entries(dat_file_path: str):
         return _read_dat_entries(f, dat_file_path)
 
 
+def iter_dat_entries(dat_file_path: str, suffix: str | None = None):
+    """Yield ``(name, bytes)`` for each entry of a .DAT archive, in order.
+
+    With ``suffix`` (for example ``".mip"``) only entries whose names end
+    with it, ignoring case, are read.
+    """
+    with open(dat_file_path, "rb") as f:
+        for file_name, file_offset, file_length in _read_dat_entries(f, str(dat_file_path)):
+            if suffix is not None and not file_name.lower().endswith(suffix.lower()):
+                continue
+            f.seek(file_offset)
+            yield file_name, f.read(file_length)
+
+
 def extract_file_bytes(dat_file_path: str, target_name: str) -> bytes:
     """
     Extract a specific file from a .DAT archive into memory.
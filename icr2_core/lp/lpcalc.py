@@ -1,22 +1,24 @@
 import math
 
+import numpy as np
+
+from icr2_core.trk.section_locator import section_locator
+
 def get_trk_sect_type(trk, dlong):
     """ Given a DLONG and a TRK object, return 1 for straight and 2 for curve.
     """
-    for i in range(0, trk.numSections - 1):
-        if trk.sects[i].dlong <= dlong < trk.sects[i+1].dlong:
-            return trk.sects[i].type
-    if trk.sects[trk.numSections - 1].dlong <= dlong:
-        return trk.sects[trk.numSections - 1].type
+    sect_id = get_trk_sect_id(trk, dlong)
+    if sect_id is not None:
+        return trk.sects[sect_id].type
 
 def get_trk_sect_id(trk, dlong):
     """ Given a DLONG and a TRK object, return the Section number.
+    Returns None for a DLONG before the first section.
     """
-    for i in range(0, trk.numSections - 1):
-        if trk.sects[i].dlong <= dlong < trk.sects[i+1].dlong:
-            return i
-    if trk.sects[trk.numSections - 1].dlong <= dlong:
-        return trk.numSections - 1
+    locator = section_locator(trk)
+    if dlong < locator.starts[0]:
+        return None
+    return locator.section(dlong)
 
 def get_trk_sect_radius(trk, sect_id):
     """ Calculate radius based on heading and length
@@ -47,3 +49,23 @@ def get_fake_radius3(dlongc, dlong0, r0, dlong1, r1):
     / (math.sin((dlongc - dlong0) / r0)  \
     + math.sin((dlong1 - dlongc) / r1))
     return r
+
+
+def get_fake_radius1_array(g31, c31, f30, c30):
+    """ Array form of get_fake_radius1 for NumPy inputs.
+    """
+    t = np.tan((c31 - f30) / g31)
+    return (g31 * t + f30 - c30) / t
+
+def get_fake_radius2_array(g73, f74, c74, c75):
+    """ Array form of get_fake_radius2 for NumPy inputs.
+    """
+    t = np.tan((f74 - c74) / g73)
+    return (g73 * t + c75 - f74) / t
+
+def get_fake_radius3_array(dlongc, dlong0, r0, dlong1, r1):
+    """ Array form of get_fake_radius3 for NumPy inputs.
+    """
+    s0 = np.sin((dlongc - dlong0) / r0)
+    s1 = np.sin((dlong1 - dlongc) / r1)
+    return (s0 * r0 + s1 * r1) / (s0 + s1)
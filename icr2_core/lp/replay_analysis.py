@@ -0,0 +1,345 @@
+"""Per-lap analytics for every car in an ICR2 replay.
+
+:class:`ReplayAnalyzer` splits each car's replay columns into laps, then
+reports the lap time, overall DLAT envelope and, when a TRK is supplied, the
+minimum speed and DLAT envelope through every corner section. Large replays
+are analysed one car per worker process, and results for a replay file can
+be cached next to it, keyed by the file's content hash.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from icr2_core.lp.rpy import Rpy
+from icr2_core.parallel import worker_count
+from icr2_core.trk.section_locator import SectionLocator
+
+logger = logging.getLogger(__name__)
+
+RPY_FPS = 15.0
+DLONG_UNITS_PER_MILE = 5280 * 12 * 500
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CornerLapMetrics:
+    """Minimum speed and DLAT envelope through one curved TRK section."""
+
+    section: int
+    min_speed_mph: float
+    dlat_min: int
+    dlat_max: int
+
+
+@dataclass(frozen=True)
+class LapMetrics:
+    """Timing and line summary for one lap of one car."""
+
+    car_id: int
+    lap_number: int
+    start_frame: int
+    end_frame: int
+    complete: bool
+    lap_time: float
+    dlat_min: int
+    dlat_max: int
+    corners: tuple[CornerLapMetrics, ...] = ()
+
+    @property
+    def frames(self) -> int:
+        return self.end_frame - self.start_frame
+
+
+def lap_drop_threshold(dlong: np.ndarray) -> int:
+    """Return the DLONG drop that marks a start/finish crossing.
+
+    Half the DLONG range seen in the replay, so that a car backing up after
+    a spin is not mistaken for a new lap.
+    """
+    dlong_range = int(dlong.max() - dlong.min()) if len(dlong) else 0
+    return max(10_000, int(dlong_range * 0.5))
+
+
+def detect_lap_boundaries(dlong: Sequence[int] | np.ndarray) -> np.ndarray:
+    """Return the frames at which a car crosses the start/finish line."""
+    dlong = np.asarray(dlong, dtype=np.int64)
+    if len(dlong) < 2:
+        return np.zeros(0, dtype=np.int64)
+    threshold = lap_drop_threshold(dlong)
+    return np.flatnonzero(dlong[1:] < dlong[:-1] - threshold) + 1
+
+
+def frame_speeds_mph(
+    dlong: np.ndarray,
+    dlat: np.ndarray,
+    boundaries: np.ndarray,
+    track_length: int,
+    fps: float = RPY_FPS,
+) -> np.ndarray:
+    """Return the speed over each frame, measured to the following frame.
+
+    DLONG is unwrapped across start/finish crossings; the final frame
+    repeats the speed of the one before it.
+    """
+    if len(dlong) < 2:
+        return np.zeros(len(dlong))
+    dlong_delta = np.diff(dlong).astype(np.float64)
+    dlong_delta[boundaries - 1] += track_length
+    dlat_delta = np.diff(dlat).astype(np.float64)
+    distance = np.sqrt(dlong_delta**2 + dlat_delta**2)
+    speeds = distance * fps * 3600 / DLONG_UNITS_PER_MILE
+    return np.append(speeds, speeds[-1])
+
+
+def analyze_car_laps(
+    car_id: int,
+    dlong: np.ndarray,
+    dlat: np.ndarray,
+    sect_starts: np.ndarray | None = None,
+    sect_types: np.ndarray | None = None,
+    track_length: int | None = None,
+    fps: float = RPY_FPS,
+) -> list[LapMetrics]:
+    """Split one car's replay columns into laps and measure each lap.
+
+    The segment before the first crossing only counts as a complete lap when
+    the replay starts at the line; the segment after the last crossing is
+    always incomplete. Corner metrics need ``sect_starts``/``sect_types``.
+    """
+    dlong = np.asarray(dlong, dtype=np.int64)
+    dlat = np.asarray(dlat, dtype=np.int64)
+    if len(dlong) == 0:
+        return []
+    boundaries = detect_lap_boundaries(dlong)
+    threshold = lap_drop_threshold(dlong)
+    if track_length is None:
+        track_length = int(dlong.max() - dlong.min())
+    speeds = frame_speeds_mph(dlong, dlat, boundaries, track_length, fps)
+
+    if sect_starts is not None and sect_types is not None and len(sect_starts):
+        sect_ids = SectionLocator(sect_starts).sections(dlong)
+        corner_ids = np.flatnonzero(np.asarray(sect_types) == 2)
+    else:
+        sect_ids = None
+        corner_ids = np.zeros(0, dtype=np.int64)
+
+    edges = [0, *boundaries.tolist(), len(dlong)]
+    laps: list[LapMetrics] = []
+    for lap_index, (start, end) in enumerate(zip(edges[:-1], edges[1:])):
+        if end <= start:
+            continue
+        if lap_index == len(edges) - 2:
+            complete = False
+        elif lap_index == 0:
+            complete = abs(int(dlong[0])) <= threshold
+        else:
+            complete = True
+        lap_dlat = dlat[start:end]
+        corners: tuple[CornerLapMetrics, ...] = ()
+        if sect_ids is not None and len(corner_ids):
+            corners = _corner_metrics(
+                sect_ids[start:end], speeds[start:end], lap_dlat, corner_ids,
+                len(sect_starts),
+            )
+        laps.append(
+            LapMetrics(
+                car_id=int(car_id),
+                lap_number=len(laps) + 1,
+                start_frame=start,
+                end_frame=end,
+                complete=complete,
+                lap_time=(end - start) / fps,
+                dlat_min=int(lap_dlat.min()),
+                dlat_max=int(lap_dlat.max()),
+                corners=corners,
+            )
+        )
+    return laps
+
+
+def _corner_metrics(
+    sect_ids: np.ndarray,
+    speeds: np.ndarray,
+    dlat: np.ndarray,
+    corner_ids: np.ndarray,
+    num_sects: int,
+) -> tuple[CornerLapMetrics, ...]:
+    min_speed = np.full(num_sects, np.inf)
+    dlat_min = np.full(num_sects, np.iinfo(np.int64).max)
+    dlat_max = np.full(num_sects, np.iinfo(np.int64).min)
+    np.minimum.at(min_speed, sect_ids, speeds)
+    np.minimum.at(dlat_min, sect_ids, dlat)
+    np.maximum.at(dlat_max, sect_ids, dlat)
+    return tuple(
+        CornerLapMetrics(
+            section=int(sect),
+            min_speed_mph=float(min_speed[sect]),
+            dlat_min=int(dlat_min[sect]),
+            dlat_max=int(dlat_max[sect]),
+        )
+        for sect in corner_ids
+        if np.isfinite(min_speed[sect])
+    )
+
+
+def _analyze_car_job(args: tuple) -> list[LapMetrics]:
+    return analyze_car_laps(*args)
+
+
+def fastest_laps(results: dict[int, list[LapMetrics]]) -> dict[int, LapMetrics]:
+    """Return the fastest complete lap for every car that has one."""
+    best: dict[int, LapMetrics] = {}
+    for car_id, laps in results.items():
+        complete = [lap for lap in laps if lap.complete]
+        if complete:
+            best[car_id] = min(complete, key=lambda lap: lap.lap_time)
+    return best
+
+
+def replay_cache_path(rpy_path: Path | str) -> Path:
+    """Return the analysis cache file stored alongside ``rpy_path``."""
+    rpy_path = Path(rpy_path)
+    return rpy_path.with_name(rpy_path.name + ".laps.json")
+
+
+def file_digest(path: Path | str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReplayAnalyzer:
+    """Extract every lap of every car in a replay.
+
+    ``trk`` is optional; without it laps carry timing and DLAT envelopes but
+    no corner metrics. ``max_workers`` caps the process pool used for large
+    replays (``1`` forces serial analysis).
+    """
+
+    def __init__(
+        self,
+        trk=None,
+        *,
+        fps: float = RPY_FPS,
+        max_workers: int | None = None,
+    ) -> None:
+        self.fps = fps
+        self.max_workers = max_workers
+        if trk is not None:
+            self._sect_starts = np.array(
+                [sect.start_dlong for sect in trk.sects], dtype=np.float64
+            )
+            self._sect_types = np.array([sect.type for sect in trk.sects])
+            self._track_length = int(trk.trklength)
+        else:
+            self._sect_starts = None
+            self._sect_types = None
+            self._track_length = None
+
+    def analyze(self, rpy: Rpy) -> dict[int, list[LapMetrics]]:
+        """Return the laps of every car in ``rpy``, keyed by car ID."""
+        jobs = [
+            (
+                car_id,
+                np.asarray(car.dlong),
+                np.asarray(car.dlat),
+                self._sect_starts,
+                self._sect_types,
+                self._track_length,
+                self.fps,
+            )
+            for car_id, car in zip(rpy.car_index, rpy.cars)
+        ]
+        total_records = sum(len(job[1]) for job in jobs)
+        workers = worker_count("replay_records", len(jobs), total_records, self.max_workers)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_analyze_car_job, jobs))
+        else:
+            results = [_analyze_car_job(job) for job in jobs]
+        return {job[0]: laps for job, laps in zip(jobs, results)}
+
+    def analyze_file(
+        self, rpy_path: Path | str, *, use_cache: bool = True
+    ) -> dict[int, list[LapMetrics]]:
+        """Analyse a replay file, reusing the cache beside it when current."""
+        rpy_path = Path(rpy_path)
+        digest = file_digest(rpy_path) if use_cache else None
+        if digest is not None:
+            cached = self._read_cache(rpy_path, digest)
+            if cached is not None:
+                return cached
+        with Rpy(str(rpy_path), lazy=True) as rpy:
+            results = self.analyze(rpy)
+        if digest is not None:
+            self._write_cache(rpy_path, digest, results)
+        return results
+
+    def _cache_key(self, digest: str) -> dict:
+        track = None
+        if self._sect_starts is not None:
+            track = [
+                self._track_length,
+                self._sect_starts.tolist(),
+                self._sect_types.tolist(),
+            ]
+        return {"version": CACHE_VERSION, "sha256": digest, "fps": self.fps, "track": track}
+
+    def _read_cache(
+        self, rpy_path: Path, digest: str
+    ) -> dict[int, list[LapMetrics]] | None:
+        cache_path = replay_cache_path(rpy_path)
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("key") != self._cache_key(digest):
+            return None
+        try:
+            return {
+                int(car_id): [
+                    LapMetrics(
+                        **{
+                            **lap,
+                            "corners": tuple(
+                                CornerLapMetrics(**corner) for corner in lap["corners"]
+                            ),
+                        }
+                    )
+                    for lap in laps
+                ]
+                for car_id, laps in payload["cars"].items()
+            }
+        except (KeyError, TypeError):
+            logger.warning("Ignoring malformed replay cache %s", cache_path)
+            return None
+
+    def _write_cache(
+        self,
+        rpy_path: Path,
+        digest: str,
+        results: dict[int, list[LapMetrics]],
+    ) -> None:
+        payload = {
+            "key": self._cache_key(digest),
+            "cars": {
+                str(car_id): [asdict(lap) for lap in laps]
+                for car_id, laps in results.items()
+            },
+        }
+        cache_path = replay_cache_path(rpy_path)
+        try:
+            cache_path.write_text(json.dumps(payload), encoding="utf-8")
+        except OSError as exc:
+            logger.warning("Unable to write replay cache %s: %s", cache_path, exc)
@@ -1,6 +1,76 @@
-from icr2_core.lp.binary import *
+"""Reader for ICR2 replay (.RPY) files.
+
+A replay is a 16-byte header followed by variable-length frames. Each frame
+holds one 13-byte record per car, a block of 14-byte graphics objects, a
+block of 7-byte sound objects and a 5-byte trailer. Only the car records are
+decoded; the frame walk reads just the two object counts per frame and the
+car records are then gathered in bulk through a NumPy structured dtype.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+from time import perf_counter
+
+import numpy as np
+
+from icr2_core.lp.binary import get_int32
+
+logger = logging.getLogger(__name__)
+
+HEADER_SIZE = 16
+CAR_RECORD_SIZE = 13
+GRAPHICS_OBJECT_SIZE = 14
+SOUND_OBJECT_SIZE = 7
+FRAME_TRAILER_SIZE = 5
+
+CAR_RECORD_DTYPE = np.dtype(
+    [
+        ("car_id", "u1"),
+        ("dlong", "u1", (3,)),  # signed 24-bit, multiplied by 256 for DLONG
+        ("dlat", "<i2"),
+        ("orient", "<i2"),
+        ("wheel_orient", "u1"),
+        ("unknown", "V4"),
+    ]
+)
+assert CAR_RECORD_DTYPE.itemsize == CAR_RECORD_SIZE
+
+
+def unpack_int24(raw: np.ndarray) -> np.ndarray:
+    """Return signed values for an ``(n, 3)`` array of little-endian bytes."""
+    raw = raw.astype(np.int32)
+    value = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+    return (value ^ 0x800000) - 0x800000
+
+
+def scan_frame_offsets(data, data_size: int, num_cars: int) -> np.ndarray:
+    """Return the byte offset of every complete frame in ``data``."""
+    car_bytes = num_cars * CAR_RECORD_SIZE
+    limit = min(data_size, len(data))
+    offsets = []
+    offset = HEADER_SIZE
+    while offset < limit:
+        g_offset = offset + car_bytes
+        if g_offset >= len(data):
+            break
+        s_offset = g_offset + data[g_offset] * GRAPHICS_OBJECT_SIZE + 1
+        if s_offset >= len(data):
+            break
+        offsets.append(offset)
+        offset = s_offset + data[s_offset] * SOUND_OBJECT_SIZE + 1 + FRAME_TRAILER_SIZE
+    return np.array(offsets, dtype=np.int64)
+
 
 class Rpy:
+    """Per-car DLONG/DLAT/orientation columns decoded from a replay file.
+
+    ``car_index`` lists the sorted car IDs and ``cars`` holds one
+    :class:`Rpy.Car` per ID in the same order. With ``lazy=True`` the file is
+    memory-mapped and a car's columns are only decoded when first accessed,
+    which keeps multi-hour replays cheap to open; call :meth:`close` (or use
+    the reader as a context manager) to release the mapping.
+    """
 
     class Frame:
         def __init__(self, cars=None, g_objs=None, s_objs=None):
@@ -9,84 +79,152 @@ class Rpy:
             self.s_objs = [] if s_objs is None else s_objs
 
     class Car:
-        def __init__(self):
-            self.car_id = []
-            self.dlong = []
-            self.dlat = []
-            self.orient = []
-            self.wheel_orient = []
-
-    def __init__(self, rpy_file):
-        with open(rpy_file, "rb") as f:
-            bytes = f.read()
+        """Column arrays for one car, in frame order."""
+
+        def __init__(self, car_id, columns=None, loader=None):
+            self.car_id = car_id
+            self._columns = columns
+            self._loader = loader
+
+        def _column(self, name):
+            if self._columns is None:
+                self._columns = self._loader()
+                self._loader = None
+            return self._columns[name]
+
+        @property
+        def dlong(self):
+            return self._column("dlong")
+
+        @property
+        def dlat(self):
+            return self._column("dlat")
+
+        @property
+        def orient(self):
+            return self._column("orient")
+
+        @property
+        def wheel_orient(self):
+            return self._column("wheel_orient")
+
+    def __init__(self, rpy_file, *, lazy=False):
+        started = perf_counter()
+        self.lazy = lazy
+        self._file = None
+        self._mmap = None
+        if lazy:
+            self._file = open(rpy_file, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._file.close()
+                raise
+            data = self._mmap
+        else:
+            with open(rpy_file, "rb") as f:
+                data = f.read()
+        if len(data) < HEADER_SIZE:
+            self.close()
+            raise ValueError(f"Replay file is too short ({len(data)} bytes).")
 
         # Read header
-        self.data_size = get_int32(bytes, 4)
-        self.start_time = get_int32(bytes, 8)
-        self.num_cars = get_int32(bytes, 12)
-
-        f_offset = 16       # data starts here
-        line = 0
-
-        car_id = []
-        dlong = []
-        dlat = []
-        orient = []
-        wheel_orient = []
-        g_objects = []
-        s_objects = []
-
-        while f_offset < self.data_size:
-
-            # Each while loop is a frame
-
-            # Read cars
-            for car in range(0, self.num_cars):
-                offset = f_offset + car * 13
-                car_id.append(get_int8(bytes, offset))
-                dlong.append(get_int24(bytes, offset + 1))    # dlong is multiplied by 256 to get dlong
-                dlat.append(get_int16_s(bytes, offset + 4))
-                orient.append(get_int16_s(bytes, offset + 6))
-                wheel_orient.append(get_int8(bytes, offset + 8))
-
-            # Read graphics objects
-            g_offset = f_offset + self.num_cars * 13
-            num_g_obj = get_int8(bytes, g_offset)
-#            g_objects.append(num_g_obj)
-
-            g_offset_start = g_offset
-            g_offset_end = g_offset + num_g_obj * 14 + 1
-
-            objs = []
-            for i in range(g_offset_start, g_offset_end):
-                objs.append(get_int8(bytes, i))                
-
-            g_objects.append(objs)
-
-            # Sound objects
-            s_offset = g_offset + num_g_obj * 14 + 1
-            s_object = get_int8(bytes, s_offset)
-            s_objects.append(s_object)
-
-            
-
-            flag_offset = s_offset + s_object * 7 + 1
-            record_length = get_int32(bytes, flag_offset + 1)
-
-            f_offset += flag_offset + 5 - f_offset
-
-            # Create Frame object
-            cur_frame = Rpy.Frame()
-
-        # Generate list of unique car IDs and make list of car records
-        car_set = set(car_id)
-        self.car_index = sorted(car_set)
-        self.cars = [self.Car() for i in range(0, len(self.car_index))]
-
-        for i in range(0, len(car_id)):
-            cur_car_id = car_id[i]
-            cur_car_index = self.car_index.index(cur_car_id)
-            self.cars[cur_car_index].dlong.append(dlong[i] * 256)
-            self.cars[cur_car_index].dlat.append(dlat[i] * 256)
-            self.cars[cur_car_index].orient.append(orient[i])
-            self.cars[cur_car_index].wheel_orient.append(wheel_orient[i])
+        self.data_size = get_int32(data, 4)
+        self.start_time = get_int32(data, 8)
+        self.num_cars = get_int32(data, 12)
+        if self.num_cars < 0:
+            self.close()
+            raise ValueError(f"Invalid replay car count {self.num_cars}.")
+
+        self._data = data
+        self.frame_offsets = scan_frame_offsets(data, self.data_size, self.num_cars)
+        self.num_frames = len(self.frame_offsets)
+
+        if lazy:
+            self._build_lazy_cars()
+        else:
+            self._build_cars()
+
+        self.parse_seconds = perf_counter() - started
+        self.bytes_parsed = min(self.data_size, len(data))
+        logger.debug(
+            "Parsed %d replay frames (%d cars) in %.3fs (%.1f MB/s)",
+            self.num_frames,
+            self.num_cars,
+            self.parse_seconds,
+            self.throughput_mb_s,
+        )
+
+    @property
+    def throughput_mb_s(self):
+        """Parse throughput in megabytes of replay data per second."""
+        if self.parse_seconds <= 0:
+            return 0.0
+        return self.bytes_parsed / self.parse_seconds / 1_000_000
+
+    def close(self):
+        """Release the memory map held by a lazy reader."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _car_records(self, record_offsets):
+        """Gather 13-byte car records starting at each byte offset."""
+        buffer = np.frombuffer(self._data, dtype=np.uint8)
+        index = record_offsets[:, None] + np.arange(CAR_RECORD_SIZE)
+        return buffer[index].reshape(-1).view(CAR_RECORD_DTYPE)
+
+    @staticmethod
+    def _columns(records):
+        return {
+            "dlong": unpack_int24(records["dlong"]).astype(np.int64) * 256,
+            "dlat": records["dlat"].astype(np.int64) * 256,
+            "orient": records["orient"].astype(np.int64),
+            "wheel_orient": records["wheel_orient"].astype(np.int64),
+        }
+
+    def _build_cars(self):
+        car_bytes = self.num_cars * CAR_RECORD_SIZE
+        data = self._data
+        joined = b"".join(data[offset:offset + car_bytes] for offset in self.frame_offsets)
+        records = np.frombuffer(joined, dtype=CAR_RECORD_DTYPE)
+        self._data = None
+
+        # Group frame-major records by car ID, keeping frame order per car.
+        ids = records["car_id"]
+        order = np.argsort(ids, kind="stable")
+        unique_ids, counts = np.unique(ids, return_counts=True)
+        columns = self._columns(records[order])
+        bounds = np.cumsum(counts)[:-1]
+        split = {name: np.split(values, bounds) for name, values in columns.items()}
+        self.car_index = [int(car_id) for car_id in unique_ids]
+        self.cars = [
+            self.Car(
+                car_id,
+                columns={name: split[name][index] for name in split},
+            )
+            for index, car_id in enumerate(self.car_index)
+        ]
+
+    def _build_lazy_cars(self):
+        slot_offsets = (
+            self.frame_offsets[:, None]
+            + np.arange(self.num_cars, dtype=np.int64) * CAR_RECORD_SIZE
+        ).reshape(-1)
+        buffer = np.frombuffer(self._data, dtype=np.uint8)
+        ids = buffer[slot_offsets]
+        self.car_index = [int(car_id) for car_id in np.unique(ids)]
+
+        def loader(car_id):
+            return lambda: self._columns(self._car_records(slot_offsets[ids == car_id]))
+
+        self.cars = [self.Car(car_id, loader=loader(car_id)) for car_id in self.car_index]
@@ -0,0 +1,366 @@
+"""Pack a track's MIP textures into a few shared indexed-colour atlases.
+
+Every track texture uses the same sunny.pcx palette, so the full-size MIP
+levels can be copied into larger palette-index pages unchanged and drawn
+with a single texture per page. Placement uses a bottom-left skyline
+packer. Each slot is surrounded by ``padding`` texels copied from the
+opposite edge of the texture, so bilinear filtering of repeating textures
+does not pick up neighbours. The UV table maps every texture name to its
+page and normalised rectangle.
+
+Usage:
+    python -m icr2_core.mip.atlas TRACK.DAT SUNNY.PCX -o atlas/
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Mapping
+
+import numpy as np
+from PIL import Image
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from icr2_core.mip.mips import load_palette, mip_to_arrays
+
+
+class SkylinePacker:
+    """Bottom-left skyline rectangle packer for one ``width`` x ``height`` page."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        # (x, y, width) segments covering the page from left to right.
+        self.skyline: list[list[int]] = [[0, 0, width]]
+
+    def insert(self, width: int, height: int) -> tuple[int, int] | None:
+        """Place a rectangle, returning its top-left corner or ``None`` if full."""
+        best: tuple[int, int, int] | None = None
+        best_index = -1
+        for index in range(len(self.skyline)):
+            y = self._fit(index, width, height)
+            if y is None:
+                continue
+            x = self.skyline[index][0]
+            # Lowest top edge first, then the leftmost spot.
+            candidate = (y + height, x, y)
+            if best is None or candidate < best:
+                best = candidate
+                best_index = index
+        if best is None:
+            return None
+        _top, x, y = best
+        self._add_segment(best_index, x, y + height, width)
+        return x, y
+
+    def _fit(self, index: int, width: int, height: int) -> int | None:
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            _sx, sy, sw = self.skyline[index]
+            y = max(y, sy)
+            if y + height > self.height:
+                return None
+            remaining -= sw
+            index += 1
+        return y
+
+    def _add_segment(self, index: int, x: int, y: int, width: int) -> None:
+        self.skyline.insert(index, [x, y, width])
+        right = x + width
+        # Trim or drop the segments now hidden under the new one.
+        following = index + 1
+        while following < len(self.skyline):
+            segment = self.skyline[following]
+            if segment[0] >= right:
+                break
+            overlap = right - segment[0]
+            if overlap < segment[2]:
+                segment[0] += overlap
+                segment[2] -= overlap
+                break
+            del self.skyline[following]
+        # Merge neighbours of equal height.
+        merged = [self.skyline[0]]
+        for segment in self.skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        self.skyline = merged
+
+
+@dataclass
+class AtlasEntry:
+    name: str
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+    digest: str
+
+    def uv(self, page_width: int, page_height: int) -> tuple[float, float, float, float]:
+        """``(u0, v0, u1, v1)`` of the texture inside its page."""
+        return (
+            self.x / page_width,
+            self.y / page_height,
+            (self.x + self.width) / page_width,
+            (self.y + self.height) / page_height,
+        )
+
+
+def _digest(pixels: np.ndarray) -> str:
+    header = np.asarray(pixels.shape, dtype=np.int32).tobytes()
+    return hashlib.sha1(header + np.ascontiguousarray(pixels).tobytes()).hexdigest()
+
+
+class TextureAtlas:
+    """Set of atlas pages holding palette-index textures.
+
+    Pages are ``page_size`` wide and grow downwards in powers of two up to
+    ``page_size`` as textures are added, so the last page is not mostly
+    empty. ``build`` packs textures tallest first; ``update`` replaces or
+    adds one texture, reusing its slot when it still fits and otherwise
+    packing it into free space, so only the touched pages have to be
+    uploaded again. A page that grows changes the UVs of everything on
+    it, so re-read :meth:`uv_table` after an update.
+
+    Each texture keeps the slot it was packed into even when an update
+    shrinks it, so it can grow back in place. Slots given up by ``update``
+    and ``remove`` go on a free list that is tried, smallest fit first,
+    before the skyline; what a reused slot does not need is split off into
+    two smaller free rectangles. Free rectangles are never merged, so a
+    long editing session can still fragment the pages.
+    """
+
+    def __init__(self, page_size: int = 1024, padding: int = 1) -> None:
+        self.page_size = page_size
+        self.padding = padding
+        self.pages: list[np.ndarray] = []
+        self.entries: dict[str, AtlasEntry] = {}
+        self._packers: list[SkylinePacker] = []
+        # Padded (x, y, width, height) slot of every entry, and the slots
+        # free for reuse on each page.
+        self._slots: dict[str, tuple[int, int, int, int]] = {}
+        self._free: list[list[tuple[int, int, int, int]]] = []
+
+    @classmethod
+    def build(
+        cls,
+        textures: Mapping[str, np.ndarray],
+        page_size: int = 1024,
+        padding: int = 1,
+    ) -> "TextureAtlas":
+        atlas = cls(page_size, padding)
+        order = sorted(
+            textures,
+            key=lambda name: (-textures[name].shape[0], -textures[name].shape[1], name),
+        )
+        for name in order:
+            atlas._place(name, np.asarray(textures[name], dtype=np.uint8))
+        return atlas
+
+    def update(self, name: str, pixels: np.ndarray) -> set[int]:
+        """Replace or add ``name``; returns the indices of pages that changed."""
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        entry = self.entries.get(name)
+        if entry is not None and entry.digest == _digest(pixels):
+            return set()
+        if entry is None:
+            return {self._place(name, pixels).page}
+        slot = self._slots[name]
+        pad = self.padding
+        if pixels.shape[0] + 2 * pad <= slot[3] and pixels.shape[1] + 2 * pad <= slot[2]:
+            self._clear(entry.page, slot)
+            self._blit(entry.page, entry.x, entry.y, pixels)
+            entry.width, entry.height = pixels.shape[1], pixels.shape[0]
+            entry.digest = _digest(pixels)
+            return {entry.page}
+        # Place the new pixels before giving up the old slot, so a texture
+        # that no longer fits anywhere keeps its old entry.
+        del self.entries[name], self._slots[name]
+        try:
+            placed = self._place(name, pixels)
+        except ValueError:
+            self.entries[name], self._slots[name] = entry, slot
+            raise
+        self._release(entry.page, slot)
+        return {entry.page, placed.page}
+
+    def remove(self, name: str) -> set[int]:
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return set()
+        self._release(entry.page, self._slots.pop(name))
+        return {entry.page}
+
+    def fill_ratio(self) -> float:
+        """Share of page texels covered by textures (padding excluded)."""
+        area = sum(page.size for page in self.pages)
+        used = sum(entry.width * entry.height for entry in self.entries.values())
+        return used / area if area else 0.0
+
+    def uv_table(self) -> tuple[list[str], np.ndarray]:
+        """Names in sorted order and a matching ``(n, 5)`` float32 array of
+        ``page, u0, v0, u1, v1`` rows."""
+        names = sorted(self.entries)
+        table = np.zeros((len(names), 5), dtype=np.float32)
+        for row, name in enumerate(names):
+            entry = self.entries[name]
+            page_height, page_width = self.pages[entry.page].shape
+            table[row, 0] = entry.page
+            table[row, 1:] = entry.uv(page_width, page_height)
+        return names, table
+
+    def to_dict(self) -> dict:
+        textures = {}
+        for name in sorted(self.entries):
+            entry = self.entries[name]
+            page_height, page_width = self.pages[entry.page].shape
+            textures[name] = {**asdict(entry), "uv": entry.uv(page_width, page_height)}
+            del textures[name]["name"]
+        return {
+            "page_size": self.page_size,
+            "padding": self.padding,
+            "pages": [list(page.shape[::-1]) for page in self.pages],
+            "textures": textures,
+        }
+
+    def save(self, folder: str | Path, palette, prefix: str = "atlas") -> list[Path]:
+        """Write each page as an indexed PNG plus ``<prefix>.json``."""
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        written = []
+        for index, page in enumerate(self.pages):
+            image = Image.fromarray(page, mode="P")
+            image.putpalette(palette)
+            path = folder / f"{prefix}{index}.png"
+            image.save(path)
+            written.append(path)
+        manifest = folder / f"{prefix}.json"
+        manifest.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        written.append(manifest)
+        return written
+
+    def _place(self, name: str, pixels: np.ndarray) -> AtlasEntry:
+        height, width = pixels.shape
+        pad = self.padding
+        if width + 2 * pad > self.page_size or height + 2 * pad > self.page_size:
+            raise ValueError(f"{name} ({width}x{height}) does not fit in a {self.page_size} page")
+        slot_width, slot_height = width + 2 * pad, height + 2 * pad
+        reused = self._take_free(slot_width, slot_height)
+        if reused is not None:
+            page_index, spot = reused
+        else:
+            for page_index, packer in enumerate(self._packers):
+                spot = packer.insert(slot_width, slot_height)
+                if spot is not None:
+                    break
+            else:
+                page_index = len(self.pages)
+                self._packers.append(SkylinePacker(self.page_size, self.page_size))
+                self._free.append([])
+                self.pages.append(np.zeros((0, self.page_size), dtype=np.uint8))
+                spot = self._packers[page_index].insert(slot_width, slot_height)
+        x, y = spot[0] + pad, spot[1] + pad
+        self._grow(page_index, y + height + pad)
+        entry = AtlasEntry(name, page_index, x, y, width, height, _digest(pixels))
+        self.entries[name] = entry
+        self._slots[name] = (spot[0], spot[1], slot_width, slot_height)
+        self._blit(page_index, x, y, pixels)
+        return entry
+
+    def _take_free(self, width: int, height: int) -> tuple[int, tuple[int, int]] | None:
+        """Claim the smallest free slot that fits, splitting off the rest."""
+        best: tuple[int, int, int] | None = None
+        for page, free in enumerate(self._free):
+            for index, (_x, _y, free_width, free_height) in enumerate(free):
+                if free_width >= width and free_height >= height:
+                    candidate = (free_width * free_height, page, index)
+                    if best is None or candidate < best:
+                        best = candidate
+        if best is None:
+            return None
+        _area, page, index = best
+        x, y, free_width, free_height = self._free[page].pop(index)
+        # Guillotine split: the strip to the right keeps the used height,
+        # the strip below spans the whole free width.
+        if free_width > width:
+            self._free[page].append((x + width, y, free_width - width, height))
+        if free_height > height:
+            self._free[page].append((x, y + height, free_width, free_height - height))
+        return page, (x, y)
+
+    def _release(self, page: int, slot: tuple[int, int, int, int]) -> None:
+        self._clear(page, slot)
+        self._free[page].append(slot)
+
+    def _grow(self, page: int, rows: int) -> None:
+        current = self.pages[page]
+        if rows <= current.shape[0]:
+            return
+        new_height = min(self.page_size, 1 << (rows - 1).bit_length())
+        grown = np.zeros((new_height, self.page_size), dtype=np.uint8)
+        grown[: current.shape[0]] = current
+        self.pages[page] = grown
+
+    def _blit(self, page: int, x: int, y: int, pixels: np.ndarray) -> None:
+        pad = self.padding
+        height, width = pixels.shape
+        padded = np.pad(pixels, pad, mode="wrap") if pad else pixels
+        self.pages[page][y - pad : y + height + pad, x - pad : x + width + pad] = padded
+
+    def _clear(self, page: int, slot: tuple[int, int, int, int]) -> None:
+        x, y, width, height = slot
+        self.pages[page][y : y + height, x : x + width] = 0
+
+
+def textures_from_folder(folder: str | Path) -> dict[str, np.ndarray]:
+    """Full-size level of every ``.mip`` in ``folder``, keyed by file name."""
+    textures = {}
+    for path in sorted(Path(folder).iterdir(), key=lambda p: p.name.lower()):
+        if path.is_file() and path.suffix.lower() == ".mip":
+            textures[path.name] = np.array(mip_to_arrays(path.read_bytes())[0])
+    return textures
+
+
+def textures_from_dat(dat_path: str | Path) -> dict[str, np.ndarray]:
+    """Full-size level of every ``.MIP`` entry in a DAT, read in memory."""
+    from icr2_core.dat.unpackdat import iter_dat_entries
+
+    return {name: np.array(mip_to_arrays(data)[0]) for name, data in iter_dat_entries(dat_path, ".mip")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack MIP textures into indexed atlases.")
+    parser.add_argument("source", type=Path, help="Folder of .mip files or a .dat")
+    parser.add_argument("palette", type=Path, help="Palette file, usually SUNNY.PCX")
+    parser.add_argument("-o", "--out", type=Path, default=Path("atlas"), help="Output folder")
+    parser.add_argument("--page-size", type=int, default=1024)
+    parser.add_argument("--padding", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.source.suffix.lower() == ".dat":
+        textures = textures_from_dat(args.source)
+    else:
+        textures = textures_from_folder(args.source)
+    atlas = TextureAtlas.build(textures, args.page_size, args.padding)
+    atlas.save(args.out, load_palette(str(args.palette)))
+    print(
+        f"Packed {len(textures)} textures into {len(atlas.pages)} page(s), "
+        f"fill {atlas.fill_ratio():.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
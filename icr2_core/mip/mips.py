@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+import hashlib
 from PIL import Image
 import math
 import struct
@@ -45,6 +47,38 @@ def match_closest_color(source_rgb, palette, min_range, max_range):
         distances.append(distance(source_rgb, palette[colorid]))
     return distances.index(min(distances))+min_range
 
+_CARSET_LUTS = {}
+
+
+def carset_color_lut(palette, min_range=32, max_range=177):
+    """ Returns a 256-entry uint8 array mapping each palette index to the
+    index img_to_mip uses for carsets.
+
+    Indices from min_range up to (but not including) max_range - 1 are kept.
+    Every other index, including the last one in the range, goes to its
+    closest color among min_range..max_range - 1, picking the lowest index
+    on ties like match_closest_color. Tables are cached per palette.
+
+    Arguments:
+    palette -- flat RGB palette list (as returned by load_palette)
+    min_range -- first usable carset color
+    max_range -- one past the last usable carset color
+    """
+    rgb = np.zeros(768, dtype=np.int64)
+    rgb[:min(len(palette), 768)] = palette[:768]
+    rgb = rgb.reshape(256, 3)
+    key = (hashlib.sha1(rgb.tobytes()).digest(), min_range, max_range)
+    lut = _CARSET_LUTS.get(key)
+    if lut is None:
+        diff = rgb[:, None, :] - rgb[None, min_range:max_range, :]
+        nearest = np.argmin((diff * diff).sum(axis=2), axis=1) + min_range
+        ids = np.arange(256)
+        keep = (ids >= min_range) & (ids < max_range - 1)
+        lut = np.where(keep, ids, nearest).astype(np.uint8)
+        lut.setflags(write=False)
+        _CARSET_LUTS[key] = lut
+    return lut
+
 def bmp_to_img(bmp_file_path):
     """ Opens a bmp and returns it as a PIL image
     """
@@ -72,42 +106,16 @@ def img_to_mip(im, output_file_path, palette_path, mode, num_images=0, dither=Fa
 
     gamepal = Image.open(palette_path)
     quantized_base = _quantize_to_palette(im.convert(mode="RGB"), gamepal, dither=dither)
-    img_pixels = list(quantized_base.getdata())
+    levels = [np.asarray(quantized_base, dtype=np.uint8)]
 
-    # If this is for a car, create a dictionary of RGB values for each color
-    # in the palette so that the tool can match the colors manually. This is
-    # not needed for tracks because we can use all the colors in sunny.pcx and
-    # we will use PIL to apply the palette.
+    # Cars only use part of the palette, so any other color the quantizer
+    # picked is replaced by the closest color from the carset range. This is
+    # not needed for tracks because we can use all the colors in sunny.pcx.
     if mode == "carset":
-        gamepal_pal = gamepal.getpalette()
-        gamepal_rgb = dict()
-        for color_id in range(0,256):
-            gamepal_rgb.update({color_id:(gamepal_pal[color_id*3],
-                                gamepal_pal[color_id*3+1],
-                                gamepal_pal[color_id*3+2])})
-
-        # Go through each pixel and if outside the valid range, match the
-        # closest color from the valid range in the palette.
-
-        # First do the color matching over the game palette
-        cars_pal = dict()
-        for color_id in range(0,256):
-            if 32 <= color_id < 176:
-                cars_pal.update({color_id: color_id})
-            else:
-                new_color_id = match_closest_color(gamepal_rgb[color_id],
-                    gamepal_rgb, 32, 177)
-                cars_pal.update({color_id: new_color_id})
+        cars_lut = carset_color_lut(gamepal.getpalette())
 
         # Now apply to the car texture
-        adj_pixels_list = []
-        for pixel in img_pixels:
-            new_pixel = cars_pal[pixel]
-            adj_pixels_list.append(new_pixel)
-        img_pixels = [adj_pixels_list]
-
-    else:
-        img_pixels = [img_pixels]
+        levels[0] = cars_lut[levels[0]]
 
     # For both cars and tracks, get the full size of the image and convert it
     # to RGB for scaling later.
@@ -129,117 +137,85 @@ def img_to_mip(im, output_file_path, palette_path, mode, num_images=0, dither=Fa
         elif orig_width <= 512:
             num_images = 9
 
-    # Set up lists with initial values for the original image
-    img_scale1 = [orig_width-1]
-    img_scale2 = [0]
-    buffer_size = [orig_width]
-    img_size = [orig_width*orig_height]
-    scaled_width = [orig_width]
-    scaled_height = [orig_height]
-
     # Scale down the image n times based on specified number of images
-    for img_id in range(1,num_images):
-
-        # Calculate the width and height of resized image, then perform the resize
-        scaled_width.append(int(scaled_width[img_id-1]/2 + 0.5))
-        scaled_height.append(int(scaled_height[img_id-1]/2 + 0.5))
-        im_scaled = im.resize((scaled_width[img_id], scaled_height[img_id]), Image.LANCZOS)
+    scaled_width, scaled_height = orig_width, orig_height
+    for _ in range(1, num_images):
+        scaled_width = int(scaled_width/2 + 0.5)
+        scaled_height = int(scaled_height/2 + 0.5)
+        im_scaled = im.resize((scaled_width, scaled_height), Image.LANCZOS)
         im_scaled = _quantize_to_palette(im_scaled, gamepal, dither=dither)
-
-        # Record the subimage size and the actual subimage as a list
-        img_size.append(scaled_width[img_id] * scaled_height[img_id])
-
-        if mode=="track":
-            img_pixels.append(list(im_scaled.getdata()))
-
-        if mode=="carset":
-            im_scaled_pixels = list(im_scaled.getdata())
-            adj_pixels_list = []
-            for pixel in im_scaled_pixels:
-                new_pixel = cars_pal[pixel]
-                adj_pixels_list.append(new_pixel)
-            img_pixels.append(adj_pixels_list)
-
-        # Calculate the scaling factors that form part of the header
-        cur_scale = scaled_width[img_id]-1
-        img_scale1.append(cur_scale)
-        if cur_scale >= 127:
-            img_scale2.append(0)
-        elif cur_scale >= 63:
-            img_scale2.append(128)
-        elif cur_scale >= 31:
-            img_scale2.append(192)
-        elif cur_scale >= 15:
-            img_scale2.append(224)
-        elif cur_scale >= 7:
-            img_scale2.append(240)
-        elif cur_scale >= 3:
-            img_scale2.append(248)
-        elif cur_scale >= 1:
-            img_scale2.append(252)
-        else:
-            img_scale2.append(255)
-
-        # For purposes of calculating the correct offsets, calculate the size of
-        # the buffer (i.e. duplicate rows before and after a subimage)
-        buffer_size.append(img_scale1[img_id-1]+1 + scaled_width[img_id])
-
-    # Calculate the buffer size after the last image
-    buffer_size.append(img_scale1[num_images - 1] + 1)
+        level = np.asarray(im_scaled, dtype=np.uint8)
+        if mode == "carset":
+            level = cars_lut[level]
+        levels.append(level)
 
     # Calculate the average color
     avg_color = im.resize((1,1), Image.LANCZOS)
     avg_color = _quantize_to_palette(avg_color, gamepal, dither=dither)
-    avg_color = list(avg_color.getdata())[0]
+    avg_color = avg_color.getpixel((0, 0))
+
+    with open(output_file_path, "wb") as output_file:
+        output_file.write(encode_mip(levels, avg_color, num_images))
+
+
+def _scale_code(width_minus_one):
+    """ Second scale byte of a level header for a level this wide """
+    for threshold, code in ((127, 0), (63, 128), (31, 192), (15, 224), (7, 240),
+                            (3, 248), (1, 252)):
+        if width_minus_one >= threshold:
+            return code
+    return 255
 
-    # Calculate header size
-    header_size = 20 + 12 * (num_images)
+
+def encode_mip(levels, avg_color, num_images=None):
+    """ Packs palette-index arrays into the bytes of a .mip file.
+
+    Every level is stored with its first row repeated before it and its last
+    row repeated after it, which is the layout the game expects.
+
+    Arguments:
+    levels -- list of (height, width) uint8 arrays, largest first
+    avg_color -- palette index used for the texture at a distance
+    num_images -- number of levels recorded in the header (defaults to
+        len(levels); only the first num_images levels are written)
+    """
+    if num_images is None:
+        num_images = len(levels)
+    levels = [np.ascontiguousarray(level, dtype=np.uint8) for level in levels]
+    widths = [level.shape[1] for level in levels]
+    heights = [level.shape[0] for level in levels]
+    width_minus_one = [width - 1 for width in widths]
+
+    # Offsets count from the fifth byte of the file, hence the 20 (not 24)
+    # byte fixed header.
+    header_size = 20 + 12 * num_images
+    buffer_size = [widths[0]]
+    buffer_size += [widths[i - 1] + widths[i] for i in range(1, num_images)]
+    buffer_size.append(widths[max(num_images, 1) - 1])
+    img_size = [widths[i] * heights[i] for i in range(max(num_images, 1))]
     file_size = sum(buffer_size) + sum(img_size) + header_size
 
-    # Calculate offsets
-    offsets = [header_size + scaled_width[0]]
+    offsets = [header_size + widths[0]]
     for img_id in range(1, num_images):
-        cur_offset = (offsets[img_id-1] + img_size[img_id-1]
-            + scaled_width[img_id-1] + scaled_width[img_id])
-        offsets.append(cur_offset)
-
-    # Write data
-    with open(output_file_path, "wb") as output_file:
+        offsets.append(offsets[img_id-1] + img_size[img_id-1]
+            + widths[img_id-1] + widths[img_id])
+
+    header = [struct.pack("<6i", file_size, 0, widths[0], heights[0],
+                          num_images, avg_color)]
+    header.append(struct.pack("<i4Bi", width_minus_one[0], 0,
+                              254 if num_images == 8 else 255, 255, 255,
+                              offsets[0]))
+    for img_id in range(1, num_images):
+        header.append(struct.pack("<i4Bi", width_minus_one[img_id],
+                                  _scale_code(width_minus_one[img_id]),
+                                  255, 255, 255, offsets[img_id]))
 
-        # Header
-        output_file.write(int.to_bytes(file_size,4,byteorder="little"))
-        output_file.write(int.to_bytes(0,4,byteorder="little"))
-        output_file.write(int.to_bytes(scaled_width[0],4,byteorder="little"))
-        output_file.write(int.to_bytes(scaled_height[0],4,byteorder="little"))
-        output_file.write(int.to_bytes(num_images,4,byteorder="little"))
-        output_file.write(int.to_bytes(avg_color,4,byteorder="little"))
-
-        # Main image header
-        output_file.write(int.to_bytes(img_scale1[0],4,byteorder="little"))
-        output_file.write(int.to_bytes(img_scale2[0],1,byteorder="little"))
-
-        if num_images == 8:
-            output_file.write(int.to_bytes(254,1,byteorder="little"))
-        else:
-            output_file.write(int.to_bytes(255,1,byteorder="little"))
-        output_file.write(int.to_bytes(255,1,byteorder="little"))
-        output_file.write(int.to_bytes(255,1,byteorder="little"))
-        output_file.write(int.to_bytes(offsets[0],4,byteorder="little"))
-
-        # Subimage headers
-        for img_id in range(1,num_images):
-            output_file.write(int.to_bytes(img_scale1[img_id],4,byteorder="little"))
-            output_file.write(int.to_bytes(img_scale2[img_id],1,byteorder="little"))
-            for _ in range(0,3):
-                output_file.write(int.to_bytes(255,1,byteorder="little"))
-            output_file.write(int.to_bytes(offsets[img_id],4,byteorder="little"))
-
-        # Write each image
-        for img_id in range(0,num_images):
-            output_file.write(bytes(img_pixels[img_id][0:scaled_width[img_id]]))
-            output_file.write(bytes(img_pixels[img_id]))
-            # buffer
-            output_file.write(bytes(img_pixels[img_id][-scaled_width[img_id]::]))
+    out = bytearray(b"".join(header))
+    for level in levels[:num_images]:
+        out += level[0].tobytes()
+        out += level.tobytes()
+        out += level[-1].tobytes()
+    return bytes(out)
 
 def img_to_bmp(im, output_file_path):
     """ Saves a PIL image to .bmp
@@ -264,6 +240,56 @@ def fread(fdata, offset):
 def fread2(fdata, offset):
     return struct.unpack("B",fdata[offset:offset + 1])[0]
 
+
+@dataclass(frozen=True)
+class MipLevel:
+    """ Size and pixel offset (from the fifth byte of the file) of one level """
+    width: int
+    height: int
+    offset: int
+
+
+@dataclass(frozen=True)
+class MipHeader:
+    file_size: int
+    width: int
+    height: int
+    num_images: int
+    color: int
+    levels: tuple
+
+
+def read_mip_header(fdata):
+    """ Parses the header and level table of .mip file contents """
+    file_size, _, width, height, num_images, color = struct.unpack_from("<6i", fdata, 0)
+    first_offset = struct.unpack_from("<i", fdata, 32)[0]
+    levels = [MipLevel(width, height, first_offset)]
+    for img_id in range(0, num_images - 1):
+        # Sub-image sizes halve from the main image rather than coming from
+        # the stored scale words.
+        offset = struct.unpack_from("<i", fdata, 44 + img_id * 12)[0]
+        sub_height = max(int(height / (2 ** (img_id + 1))), 1)
+        sub_width = max(int(width / (2 ** (img_id + 1))), 1)
+        levels.append(MipLevel(sub_width, sub_height, offset))
+    return MipHeader(file_size, width, height, num_images, color, tuple(levels))
+
+
+def mip_to_arrays(fdata):
+    """ Returns each level of .mip file contents as a (height, width) uint8
+    array. The arrays are read-only views into fdata.
+    """
+    header = read_mip_header(fdata)
+    pixels = np.frombuffer(fdata, dtype=np.uint8)
+    arrays = []
+    for level in header.levels:
+        start = 4 + level.offset
+        size = level.width * level.height
+        if start < 0 or start + size > len(pixels):
+            raise ValueError(f"MIP level at offset {level.offset} runs past the end of the file")
+        arrays.append(pixels[start:start + size].reshape(level.height, level.width))
+    return arrays
+
+
 def mip_to_img(mip_file_path, palette):
     """ Loads a .mip file and turns it into a PIL image
 
@@ -273,86 +299,15 @@ def mip_to_img(mip_file_path, palette):
         gamepal.pcx, should be loaded as a PIL image prior to running this
         function)
     """
-
-    # Open the .mip file
     with open(mip_file_path, "rb") as f:
         fdata = f.read()
- 
-        # Read header
-        file_size = fread(fdata, 0)
-
-        # Rest the rest of the file
-        fdata = fdata[4:]
-
-        width = fread(fdata, 4)
-        height = fread(fdata, 8)
-        num_images = fread(fdata, 12)
-        color = fread(fdata, 16)
-        width_minus_one = fread(fdata, 20)
-        unknown1 = fread(fdata, 24)
-        first_offset = fread(fdata, 28)
-
-        print ('Header')
-        print (f'File size = {file_size}')
-        print (f'Width = {width}, Height = {height}')
-        print (f'Number of images = {num_images}')
-        print (f'Color = {color}')
-        print (f'Width minus one = {width_minus_one}')
-        print (f'Unknown = {unknown1}')               # negative width * 2
-        print (f'First offset = {first_offset}')
-
-        # Read subheader for each subimage
-        img_scale_down=[]
-        img_scale_up=[]
-        subimg_offsets=[]
-        for img_id in range(0,num_images-1):
-            offset = 32 + img_id * 12
-            img_scale_down.append(fread(fdata, offset))   # Buffer index
-            img_scale_up.append(fread(fdata, offset + 4))
-            subimg_offsets.append(fread(fdata, offset + 8))
-            print (f'Image ID {img_id}: Offset {subimg_offsets[img_id]}; Scale {img_scale_down[img_id]}, {img_scale_up[img_id]}')
-
-        # Read main image data
-        offset = first_offset
-        img_pixels = []
-        for _ in range(0,height*width):
-            pixel = fread2(fdata, offset)
-            img_pixels.append(pixel)
-            offset += 1
-
-        ims = []
-
-        # Convert to numpy array, then convert to PIL image
-        img_array = np.array(img_pixels, dtype="uint8")
-        img_array = img_array.reshape(height,width)
+
+    ims = []
+    for img_array in mip_to_arrays(fdata):
         im = Image.fromarray(img_array, mode="P")
         im.putpalette(palette)
-
         ims.append(im)
-        # Read subimages
-
-        for img_id in range(0, num_images - 1):
-            img_pixels = []
-            offset = subimg_offsets[img_id] + img_scale_down[img_id] - img_scale_down[img_id]
-            sub_height = int(height / (2 ** (img_id + 1)))
-            sub_width = int(width / (2 ** (img_id + 1)))
-            if sub_height == 0: sub_height = 1
-            if sub_width == 0: sub_width = 1
-
-            print (f'Subimage {img_id} W {sub_width} H {sub_height}')
-            for _ in range(0, sub_height * sub_width):
-                pixel = fread2(fdata, offset)
-                img_pixels.append(pixel)
-                offset += 1
-
-            img_array = np.array(img_pixels, dtype="uint8")
-            img_array = img_array.reshape(sub_height,sub_width)
-            im = Image.fromarray(img_array, mode="P")
-            im.putpalette(palette)
-
-            ims.append(im)
-
-        return ims
+    return ims
 
 # palette = load_palette('sunny.pcx')
 # # img = mip_to_img('page03.mip',palette)
@@ -0,0 +1,267 @@
+"""Shared cache of decoded textures and their thumbnails.
+
+Decoded textures are kept as palette-index arrays in an in-memory LRU keyed
+by the SHA-1 of the file contents and the decoder used, so the same texture
+reached through two paths, or re-opened after switching palettes, is decoded
+once. Thumbnails are written as small PNGs to an optional on-disk store
+keyed by file hash, decoder, palette hash and size, which lets a texture
+list come back quickly on the next run. ``prefetch_folder`` warms both in a background thread.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+from PIL import Image
+
+from icr2_core.mip.mips import load_palette, mip_to_arrays
+
+# Returns (palette indices, opaque mask or None) for raw file contents.
+TextureDecoder = Callable[[bytes], "tuple[np.ndarray, np.ndarray | None]"]
+
+
+def decode_mip_indices(data: bytes) -> tuple[np.ndarray, None]:
+    """Palette indices of the full-size level of a MIP."""
+    return mip_to_arrays(data)[0], None
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    thumbnail_hits: int
+    thumbnail_misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class TextureCache:
+    """Content-addressed cache of decoded textures.
+
+    ``decoders`` maps lower-case file suffixes to a :data:`TextureDecoder`
+    and extends the built-in ``.mip`` support. The LRU holds at most
+    ``max_entries`` textures and ``max_bytes`` of pixel data, and remembers
+    the hashes of up to ``4 * max_entries`` files. Without a
+    ``thumbnail_dir`` thumbnails are only kept in memory.
+    """
+
+    def __init__(
+        self,
+        thumbnail_dir: str | Path | None = None,
+        *,
+        decoders: dict[str, TextureDecoder] | None = None,
+        max_entries: int = 512,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.thumbnail_dir = Path(thumbnail_dir) if thumbnail_dir else None
+        self.decoders: dict[str, TextureDecoder] = {".mip": decode_mip_indices}
+        self.decoders.update(decoders or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._textures: OrderedDict[tuple[str, str], tuple[np.ndarray, np.ndarray | None]] = OrderedDict()
+        self._thumbnails: OrderedDict[tuple[str, str, str, int], Image.Image] = OrderedDict()
+        # resolved path -> (size, mtime_ns, digest), least recently used first.
+        self._digests: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+        self._palettes: dict[str, tuple[str, list[int]]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._thumbnail_hits = 0
+        self._thumbnail_misses = 0
+        self._evictions = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def file_digest(self, path: str | Path) -> str:
+        """SHA-1 of the file contents, re-hashed only when size or mtime change."""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+        with self._lock:
+            cached = self._digests.get(key)
+            if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+                self._digests.move_to_end(key)
+                return cached[2]
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        with self._lock:
+            self._digests[key] = (stat.st_size, stat.st_mtime_ns, digest)
+            self._digests.move_to_end(key)
+            while len(self._digests) > 4 * self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def palette(self, palette_path: str | Path) -> tuple[str, list[int]]:
+        """``(digest, flat RGB palette)`` for a palette file."""
+        digest = self.file_digest(palette_path)
+        with self._lock:
+            cached = self._palettes.get(digest)
+        if cached is None:
+            cached = (digest, load_palette(str(palette_path)))
+            with self._lock:
+                self._palettes[digest] = cached
+        return cached
+
+    def decoded(self, path: str | Path) -> tuple[np.ndarray, np.ndarray | None]:
+        """``(indices, opaque mask or None)`` for a texture; arrays are read-only."""
+        path = Path(path)
+        suffix = path.suffix.lower()
+        decoder = self.decoders.get(suffix)
+        if decoder is None:
+            raise ValueError(f"No texture decoder for {path.suffix or 'files without a suffix'}")
+        key = (self.file_digest(path), suffix)
+        with self._lock:
+            entry = self._textures.get(key)
+            if entry is not None:
+                self._textures.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+
+        indices, mask = decoder(path.read_bytes())
+        indices = np.array(indices, dtype=np.uint8)
+        indices.setflags(write=False)
+        if mask is not None:
+            mask = np.array(mask, dtype=bool)
+            mask.setflags(write=False)
+        entry = (indices, mask)
+        with self._lock:
+            if key not in self._textures:
+                self._textures[key] = entry
+                self._bytes += _entry_bytes(entry)
+                self._evict()
+        return entry
+
+    def image(self, path: str | Path, palette_path: str | Path) -> Image.Image:
+        """Decoded texture as a ``P`` image, or ``RGBA`` if it has transparency."""
+        indices, mask = self.decoded(path)
+        _digest, palette = self.palette(palette_path)
+        image = Image.fromarray(indices, mode="P")
+        image.putpalette(palette)
+        if mask is None:
+            return image
+        image = image.convert("RGBA")
+        image.putalpha(Image.fromarray(mask.astype(np.uint8) * 255, mode="L"))
+        return image
+
+    def thumbnail(self, path: str | Path, palette_path: str | Path, size: int = 64) -> Image.Image:
+        """Texture scaled to fit ``size`` x ``size``, from memory, disk or decoding."""
+        key = (self.file_digest(path), Path(path).suffix.lower(), self.palette(palette_path)[0], int(size))
+        with self._lock:
+            cached = self._thumbnails.get(key)
+            if cached is not None:
+                self._thumbnails.move_to_end(key)
+                self._thumbnail_hits += 1
+                return cached.copy()
+
+        stored = self._thumbnail_path(key)
+        thumb = None
+        if stored is not None and stored.exists():
+            try:
+                with Image.open(stored) as loaded:
+                    thumb = loaded.copy()
+            except OSError:
+                thumb = None
+        with self._lock:
+            if thumb is not None:
+                self._thumbnail_hits += 1
+            else:
+                self._thumbnail_misses += 1
+
+        if thumb is None:
+            thumb = self.image(path, palette_path)
+            thumb.thumbnail((size, size), Image.Resampling.NEAREST)
+            if stored is not None:
+                stored.parent.mkdir(parents=True, exist_ok=True)
+                thumb.save(stored)
+        with self._lock:
+            self._thumbnails[key] = thumb
+            while len(self._thumbnails) > self.max_entries:
+                self._thumbnails.popitem(last=False)
+        return thumb.copy()
+
+    def prefetch_folder(
+        self,
+        folder: str | Path,
+        palette_path: str | Path | None = None,
+        *,
+        thumbnail_size: int | None = None,
+    ) -> Future:
+        """Decode every supported texture in ``folder`` in the background.
+
+        With ``palette_path`` and ``thumbnail_size`` the thumbnails are built
+        too. The returned future resolves to the number of textures loaded;
+        files that fail to decode are skipped.
+        """
+        paths = sorted(
+            (p for p in Path(folder).iterdir() if p.is_file() and p.suffix.lower() in self.decoders),
+            key=lambda p: p.name.lower(),
+        )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="texture-prefetch")
+        return self._executor.submit(self._prefetch, paths, palette_path, thumbnail_size)
+
+    def _prefetch(self, paths: Iterable[Path], palette_path, thumbnail_size: int | None) -> int:
+        loaded = 0
+        for path in paths:
+            try:
+                if palette_path and thumbnail_size:
+                    self.thumbnail(path, palette_path, thumbnail_size)
+                else:
+                    self.decoded(path)
+            except (OSError, ValueError, struct.error):
+                continue
+            loaded += 1
+        return loaded
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                thumbnail_hits=self._thumbnail_hits,
+                thumbnail_misses=self._thumbnail_misses,
+                evictions=self._evictions,
+                entries=len(self._textures),
+                bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop in-memory entries; the on-disk thumbnail store is kept."""
+        with self._lock:
+            self._textures.clear()
+            self._thumbnails.clear()
+            self._digests.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _thumbnail_path(self, key: tuple[str, str, str, int]) -> Path | None:
+        if self.thumbnail_dir is None:
+            return None
+        file_digest, suffix, palette_digest, size = key
+        return self.thumbnail_dir / f"{file_digest}_{suffix.lstrip('.')}_{palette_digest[:12]}_{size}.png"
+
+    def _evict(self) -> None:
+        # Called with the lock held; always keeps the newest entry.
+        while len(self._textures) > 1 and (
+            len(self._textures) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _key, entry = self._textures.popitem(last=False)
+            self._bytes -= _entry_bytes(entry)
+            self._evictions += 1
+
+
+def _entry_bytes(entry: tuple[np.ndarray, np.ndarray | None]) -> int:
+    indices, mask = entry
+    return indices.nbytes + (mask.nbytes if mask is not None else 0)
@@ -0,0 +1,43 @@
+"""Process-pool sizing shared by the batch tools.
+
+Starting worker processes takes a noticeable fraction of a second, so each
+kind of batch work only uses a pool once it is larger than its entry in
+:data:`PARALLEL_THRESHOLDS`, measured in the unit that drives its run time.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+PARALLEL_THRESHOLDS: dict[str, int] = {
+    "replay_records": 400_000,
+    "sg_sections": 200,
+    "track3d_bytes": 16 * 1024 * 1024,
+    "texture_image_bytes": 4 * 1024 * 1024,
+    "texture_conversion_bytes": 1024 * 1024,
+    "tso_objects": 256,
+}
+
+
+def worker_count(kind: str, tasks: int, work: int, max_workers: int | None = None) -> int:
+    """Number of processes for ``tasks`` jobs adding up to ``work`` units.
+
+    Returns 1, meaning run serially, for fewer than two tasks, for
+    ``max_workers=1`` and below the threshold for ``kind``.
+    """
+    if tasks < 2 or max_workers == 1 or work < PARALLEL_THRESHOLDS[kind]:
+        return 1
+    workers = max_workers or os.cpu_count() or 1
+    return max(1, min(workers, tasks))
+
+
+def total_file_size(paths: Iterable[Path]) -> int:
+    """Summed size of ``paths``; files that cannot be stat'ed count as empty."""
+    total = 0
+    for path in paths:
+        try:
+            total += Path(path).stat().st_size
+        except OSError:
+            continue
+    return total
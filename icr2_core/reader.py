@@ -17,9 +17,9 @@ import html
 from icr2_core.icr2_memory import ICR2Memory
 from icr2timing.core.config import Config
 from icr2_core.model import Driver, CarState, RaceState
+from icr2_core.track_library import track_library
 
 import os
-import re
 
 class ReadError(RuntimeError):
     """Raised when a required read is missing or invalid."""
@@ -353,7 +353,7 @@ class MemoryReader:
                 and idx == self._cached_index
             ):
                 try:
-                    return self._cached_tracks[idx][0]  # folder name
+                    return self._cached_tracks[idx]  # folder name
                 except Exception:
                     pass  # rebuild if cache invalid
 
@@ -365,42 +365,21 @@ class MemoryReader:
             if not os.path.isdir(tracks_root):
                 raise ReadError(f"TRACKS folder not found: {tracks_root}")
 
-            # Build alphabetical list from TNAME lines
-            tname_pattern = re.compile(r"^\s*TNAME\s+(.+)$", re.IGNORECASE | re.MULTILINE)
-            track_entries = []
-
-            for sub in os.listdir(tracks_root):
-                sub_path = os.path.join(tracks_root, sub)
-                if not os.path.isdir(sub_path):
-                    continue
-                txt_path = os.path.join(sub_path, f"{sub}.TXT")
-                if not os.path.isfile(txt_path):
-                    continue
-                try:
-                    with open(txt_path, "r", errors="ignore") as f:
-                        txt = f.read()
-                    m = tname_pattern.search(txt)
-                    if not m:
-                        continue
-                    display_name = m.group(1).strip()
-                    track_entries.append((sub, display_name))
-                except Exception:
-                    continue
+            # Folders sorted by TNAME, as in the game's track menu; the
+            # shared library keeps the TNAMEs in its on-disk index.
+            track_folders = track_library(tracks_root).tname_ordered_folders()
 
-            if not track_entries:
+            if not track_folders:
                 raise ReadError("no valid tracks found under TRACKS folder")
 
-            # Sort alphabetically by display name, but we’ll return folder name
-            track_entries.sort(key=lambda x: x[1].lower())
-
-            if not (0 <= idx < len(track_entries)):
+            if not (0 <= idx < len(track_folders)):
                 raise ReadError(f"track index {idx} out of range")
 
             # Cache list and index
-            self._cached_tracks = track_entries
+            self._cached_tracks = track_folders
             self._cached_index = idx
 
-            return track_entries[idx][0]  # folder name
+            return track_folders[idx]
 
         # --- DOS / REND32A fallback ---
         raw = self._mem.read(self._cfg.current_track_addr, 'bytes', count=256)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Sequence
+
+import numpy as np
 
 
 def _xsect_dlats(sg) -> list[float]:
@@ -221,31 +223,107 @@ def sample_sg_elevation_with_dlats(
     if sect_idx < 0 or sect_idx >= len(dlats):
         return []
 
+    section_indices = [
+        index for index, section in enumerate(sections) if float(section.length) > 0
+    ]
+    samples = _sample_sections(
+        sections, section_indices, sect_idx, dlats, min_dlat, max_dlat, resolution
+    )
+    return samples.ravel().tolist()
+
+
+def sample_sg_section_elevations_with_dlats(
+    sg,
+    xsect_idx: int,
+    section_indices: Iterable[int],
+    dlats: list[float],
+    min_dlat: float,
+    max_dlat: float,
+    resolution: int = 256,
+) -> dict[int, list[float]]:
+    """
+    Return ``resolution + 1`` altitude samples for each requested section.
+
+    The samples match the per-section runs of :func:`sample_sg_elevation_with_dlats`,
+    so callers can refresh only the sections an edit touched. Sections that
+    are out of range or have no length are left out.
+    """
+    sections = getattr(sg, "sects", [])
+    if not sections or xsect_idx < 0 or xsect_idx >= len(dlats):
+        return {}
+
+    indices = sorted(
+        index
+        for index in set(section_indices)
+        if 0 <= index < len(sections) and float(sections[index].length) > 0
+    )
+    samples = _sample_sections(
+        sections, indices, xsect_idx, dlats, min_dlat, max_dlat, resolution
+    )
+    return {index: row.tolist() for index, row in zip(indices, samples)}
+
+
+def _sample_sections(
+    sections,
+    section_indices: Sequence[int],
+    xsect_idx: int,
+    dlats: list[float],
+    min_dlat: float,
+    max_dlat: float,
+    resolution: int,
+) -> np.ndarray:
+    # Array form of _sg_altitude_at_with_dlats: the x-section pair and the
+    # blend weight only depend on the DLAT, so they are resolved once and the
+    # cubic is evaluated for every section and step at the same time.
+    samples = max(int(resolution), 1)
+    if not section_indices:
+        return np.empty((0, samples + 1))
+
     dlat_norm = (
         0.0
         if min_dlat == max_dlat
-        else (dlats[sect_idx] - min_dlat) / (max_dlat - min_dlat)
+        else (dlats[xsect_idx] - min_dlat) / (max_dlat - min_dlat)
     )
+    actual_dlat = _denormalize_dlat_with_bounds(dlat_norm, min_dlat, max_dlat)
+    left_xsect, right_xsect = _xsect_pair_for_dlat(dlats, actual_dlat)
 
-    samples = max(int(resolution), 1)
-    altitudes: list[float] = []
-
-    for section_index, section in enumerate(sections):
-        length = float(section.length)
-        if length <= 0:
-            continue
-        for step in range(samples + 1):
-            fraction = step / samples
-            altitudes.append(
-                _sg_altitude_at_with_dlats(
-                    sg,
-                    section_index,
-                    fraction,
-                    dlat_norm,
-                    dlats,
-                    min_dlat,
-                    max_dlat,
-                )
-            )
-
-    return altitudes
+    fractions = np.arange(samples + 1) / samples
+    right_alt = _altitude_curves(sections, section_indices, right_xsect, fractions)
+    if left_xsect == right_xsect:
+        return right_alt
+    dlat_distance = dlats[left_xsect] - dlats[right_xsect]
+    if dlat_distance == 0:
+        return right_alt
+
+    left_alt = _altitude_curves(sections, section_indices, left_xsect, fractions)
+    distance_percent = (actual_dlat - dlats[right_xsect]) / dlat_distance
+    return right_alt + (left_alt - right_alt) * distance_percent
+
+
+def _altitude_curves(
+    sections,
+    section_indices: Sequence[int],
+    xsect_idx: int,
+    fractions: np.ndarray,
+) -> np.ndarray:
+    """Evaluate _altitude_for_xsect for every section in ``section_indices``."""
+    num_sects = len(sections)
+    previous = [sections[(index - 1) % num_sects] for index in section_indices]
+    current = [sections[index] for index in section_indices]
+    begin_alt = np.array([float(sect.alt[xsect_idx]) for sect in previous])
+    end_alt = np.array([float(sect.alt[xsect_idx]) for sect in current])
+    cur_slope = np.array([float(sect.grade[xsect_idx]) for sect in previous]) / 8192.0
+    next_slope = np.array([float(sect.grade[xsect_idx]) for sect in current]) / 8192.0
+    sg_length = np.array([float(sect.length) for sect in current])
+
+    grade1 = (2 * begin_alt / sg_length + cur_slope + next_slope - 2 * end_alt / sg_length) * sg_length
+    grade2 = (3 * end_alt / sg_length - 3 * begin_alt / sg_length - 2 * cur_slope - next_slope) * sg_length
+    grade3 = cur_slope * sg_length
+
+    t = np.clip(fractions, 0.0, 1.0)
+    return (
+        grade1[:, None] * t ** 3
+        + grade2[:, None] * t ** 2
+        + grade3[:, None] * t
+        + begin_alt[:, None]
+    )
@@ -20,11 +20,17 @@ from __future__ import annotations
 import argparse
 import logging
 import struct
+import sys
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
+import numpy as np
 from PIL import Image
 
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
 
 # -----------------------------------------------------------------------------
 # Logging
@@ -74,88 +80,158 @@ def read_pcx_256_palette(pcx_path: Path) -> List[int]:
     return list(data[-768:])
 
 
-def decode_stp_partial(
-    stp_path: Path,
-    logger: logging.Logger,
-) -> tuple[int, int, bytearray, int]:
-    """
-    Returns:
-        width, height,
-        decoded pixel buffer (partial),
-        stop_offset (file offset where decoding failed or ended)
+@dataclass(frozen=True)
+class DecodedSTP:
+    """Result of decoding one STP image.
+
+    ``pixels`` is always the full ``(height, width)`` buffer; pixels past
+    ``decoded`` were never reached and hold the fill colour.
     """
-    buf = stp_path.read_bytes()
-    width, height = struct.unpack_from("<HH", buf, 0)
 
-    total = width * height
-    out = bytearray()
-    offset = 8
+    width: int
+    height: int
+    pixels: np.ndarray
+    decoded: int
+    stop_offset: int
+    error: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self.error is None
+
 
-    logger.debug("Decoding %s (%dx%d)", stp_path.name, width, height)
+def _scan_controls(buf: bytes, total: int):
+    """Walk the control stream once, recording where each run starts.
+
+    Only the control offsets are collected here; run lengths and kinds are
+    derived from them in bulk. Returns ``(controls, decoded, stop_offset,
+    failure)`` where ``failure`` is ``None`` or ``(control_offset,
+    control_byte, reason)``.
+    """
+    controls: list[int] = []
+    size = len(buf)
+    decoded = 0
+    offset = 8
+    ctrl_offset = offset
+    a = 0
 
     try:
-        while len(out) < total:
-            if offset >= len(buf):
+        while decoded < total:
+            if offset >= size:
                 raise STPDecodeError("Unexpected EOF")
 
             ctrl_offset = offset
             a = buf[offset]
-            offset += 1
 
             # ---------------- Literal ----------------
             if a <= 64:
-                run_len = a
-                if run_len == 0:
+                if a == 0:
                     raise STPDecodeError("Literal run length 0")
-
-                if offset + run_len > len(buf):
+                if offset + 1 + a > size:
                     raise STPDecodeError("EOF in literal run")
+                controls.append(offset)
+                offset += 1 + a
+                decoded += a
+                continue
+
+            # ---------------- Repeat a - 64 / a - 128 ----------------
+            if a == 128:
+                raise STPDecodeError("Repeat length <= 0 (a-128)")
+            if offset + 1 >= size:
+                raise STPDecodeError("EOF reading repeat color")
+            controls.append(offset)
+            offset += 2
+            decoded += a - 64 if a < 128 else a - 128
+
+    except STPDecodeError as e:
+        return controls, decoded, ctrl_offset, (ctrl_offset, a, str(e))
 
-                out.extend(buf[offset : offset + run_len])
-                offset += run_len
+    return controls, decoded, offset, None
 
-            # ---------------- Repeat a - 64 ----------------
-            elif a < 128:
-                run_len = a - 64
-                if run_len <= 0:
-                    raise STPDecodeError("Repeat length <= 0 (a-64)")
 
-                if offset >= len(buf):
-                    raise STPDecodeError("EOF reading repeat color")
+def decode_stp_bytes(
+    buf: bytes,
+    logger: logging.Logger | None = None,
+    name: str = "<stp>",
+    fill_color: int = 0xFF,
+) -> DecodedSTP:
+    """Decode an in-memory STP, keeping whatever decoded before an error."""
+    logger = logger or logging.getLogger(LOGGER_NAME)
+    width, height = struct.unpack_from("<HH", buf, 0)
+    total = width * height
 
-                color = buf[offset]
-                offset += 1
-                out.extend([color] * run_len)
+    logger.debug("Decoding %s (%dx%d)", name, width, height)
+
+    controls, decoded, stop_offset, failure = _scan_controls(buf, total)
+
+    pixels = np.full((height, width), fill_color, dtype=np.uint8)
+    if controls:
+        data = np.frombuffer(buf, dtype=np.uint8)
+        starts = np.asarray(controls, dtype=np.int64)
+        codes = data[starts].astype(np.int64)
+        literal = codes <= 64
+        lengths = np.where(literal, codes, np.where(codes < 128, codes - 64, codes - 128))
+        # Every run reads from the byte after its control: literal runs step
+        # through their bytes, fill runs repeat that one byte.
+        run_starts = np.cumsum(lengths) - lengths
+        used = min(decoded, total)
+        run_of_pixel = np.repeat(np.arange(len(starts)), lengths)[:used]
+        within = np.arange(used, dtype=np.int64) - run_starts[run_of_pixel]
+        gather = starts[run_of_pixel] + 1 + within * literal[run_of_pixel]
+        pixels.reshape(-1)[:used] = data[gather]
+
+    if failure is None:
+        return DecodedSTP(width, height, pixels, decoded, stop_offset)
+
+    ctrl_offset, a, reason = failure
+    logger.error(
+        "DECODE STOPPED at file offset 0x%08X\n"
+        "  control byte = 0x%02X (%d)\n"
+        "  decoded px   = %d / %d\n"
+        "  reason       = %s",
+        ctrl_offset,
+        a,
+        a,
+        decoded,
+        total,
+        reason,
+    )
+    return DecodedSTP(width, height, pixels, decoded, stop_offset, reason)
 
-            # ---------------- Repeat a - 128 ----------------
-            else:
-                run_len = a - 128
-                if run_len <= 0:
-                    raise STPDecodeError("Repeat length <= 0 (a-128)")
 
-                if offset >= len(buf):
-                    raise STPDecodeError("EOF reading repeat color")
+def decode_stp_partial(
+    stp_path: Path,
+    logger: logging.Logger,
+) -> tuple[int, int, bytearray, int]:
+    """
+    Returns:
+        width, height,
+        decoded pixel buffer (partial),
+        stop_offset (file offset where decoding failed or ended)
+    """
+    result = decode_stp_bytes(stp_path.read_bytes(), logger, stp_path.name)
+    decoded = min(result.decoded, result.width * result.height)
+    pixels = bytearray(result.pixels.reshape(-1)[:decoded].tobytes())
+    return result.width, result.height, pixels, result.stop_offset
 
-                color = buf[offset]
-                offset += 1
-                out.extend([color] * run_len)
 
-    except STPDecodeError as e:
-        logger.error(
-            "DECODE STOPPED at file offset 0x%08X\n"
-            "  control byte = 0x%02X (%d)\n"
-            "  decoded px   = %d / %d\n"
-            "  reason       = %s",
-            ctrl_offset,
-            a,
-            a,
-            len(out),
-            total,
-            str(e),
-        )
-        return width, height, out, ctrl_offset
+def decode_dat_stps(
+    dat_path: Path,
+    logger: logging.Logger | None = None,
+) -> dict[str, DecodedSTP]:
+    """Decode every ``.STP`` entry of a DAT in memory, keyed by entry name."""
+    from icr2_core.dat.unpackdat import iter_dat_entries
+
+    return {
+        name: decode_stp_bytes(data, logger, name)
+        for name, data in iter_dat_entries(dat_path, ".stp")
+    }
 
-    return width, height, out, offset
+
+def stp_to_image(result: DecodedSTP, palette: List[int]) -> Image.Image:
+    img = Image.fromarray(result.pixels, "P")
+    img.putpalette(palette)
+    return img
 
 
 def write_partial_png(
@@ -191,15 +267,25 @@ def write_partial_png(
 
 def main() -> None:
     ap = argparse.ArgumentParser("STP → PNG (partial output on error)")
-    ap.add_argument("stp", type=Path)
+    ap.add_argument("stp", type=Path, help="STP file, or a DAT to convert every STP inside it")
     ap.add_argument("pcx", type=Path)
-    ap.add_argument("-o", "--out", type=Path)
+    ap.add_argument("-o", "--out", type=Path, help="Output PNG, or output folder for a DAT")
     ap.add_argument("--log", type=Path)
     ap.add_argument("-v", "--verbose", action="store_true")
 
     args = ap.parse_args()
     logger = setup_logger(args.log, args.verbose)
 
+    if args.stp.suffix.lower() == ".dat":
+        out_dir = args.out if args.out else args.stp.with_suffix("")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        palette = read_pcx_256_palette(args.pcx)
+        for name, result in decode_dat_stps(args.stp, logger).items():
+            out_path = out_dir / Path(name).with_suffix(".png").name
+            stp_to_image(result, palette).save(out_path)
+            logger.info("Wrote %sPNG: %s", "" if result.complete else "partial ", out_path)
+        return
+
     out_path = args.out if args.out else args.stp.with_suffix(".png")
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
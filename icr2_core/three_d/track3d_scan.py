@@ -0,0 +1,253 @@
+"""Streaming statistics for text ``.3D`` files.
+
+:func:`scan_track3d` memory-maps a ``.3D`` file and walks it in fixed-size
+chunks with compiled byte patterns. It collects the vertex bounding box,
+vertex/polygon/object counts, referenced MIP names and the number of labels
+of each statement type without decoding the file or holding more than one
+chunk of it. :func:`scan_tracks_library` runs the scanner over every ``.3D``
+file below an ICR2 ``TRACKS`` folder, one file per worker process, and
+:func:`write_inventory_csv` stores the result as a CSV inventory::
+
+    python -m icr2_core.three_d.track3d_scan C:/ICR2/TRACKS -o inventory.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import mmap
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, TextIO
+
+import numpy as np
+
+from icr2_core.parallel import total_file_size, worker_count
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 8 * 1024 * 1024
+TRACK3D_SUFFIX = ".3d"
+
+# One group per vertex keeps findall() cheap; the coordinates are split by
+# numpy afterwards.
+_NUMBER = rb"-?\d+(?:\.\d+)?"
+_VERTEX_RE = re.compile(
+    rb"\[<\s*(" + _NUMBER + rb"\s*,\s*" + _NUMBER + rb"\s*,\s*" + _NUMBER + rb")\s*>\]"
+)
+_MIP_RE = re.compile(rb'MIP\s*=\s*"([^"\r\n]+)"')
+# Anchored on a newline rather than ``^`` with MULTILINE, which is several
+# times slower; chunks always start at a line start and get one prepended.
+_LABEL_RE = re.compile(rb"\n[ \t]*[A-Za-z_][\w\-]*[ \t]*:[ \t]*([A-Z]+)\b")
+
+POLYGON_TYPES = ("POLY", "FACE")
+OBJECT_TYPE = "DYNAMIC"
+
+INVENTORY_COLUMNS = (
+    "path",
+    "size",
+    "vertices",
+    "polygons",
+    "objects",
+    "labels",
+    "min_x",
+    "max_x",
+    "min_y",
+    "max_y",
+    "min_z",
+    "max_z",
+    "mip_count",
+    "mips",
+)
+
+
+@dataclass
+class Track3DStats:
+    """Counts and extents gathered from one ``.3D`` file."""
+
+    path: str
+    size: int = 0
+    vertices: int = 0
+    min_x: float | None = None
+    max_x: float | None = None
+    min_y: float | None = None
+    max_y: float | None = None
+    min_z: float | None = None
+    max_z: float | None = None
+    mips: tuple[str, ...] = ()
+    label_types: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def labels(self) -> int:
+        return sum(self.label_types.values())
+
+    @property
+    def polygons(self) -> int:
+        return sum(self.label_types.get(kind, 0) for kind in POLYGON_TYPES)
+
+    @property
+    def objects(self) -> int:
+        return self.label_types.get(OBJECT_TYPE, 0)
+
+    def inventory_row(self) -> dict[str, object]:
+        return {
+            "path": self.path,
+            "size": self.size,
+            "vertices": self.vertices,
+            "polygons": self.polygons,
+            "objects": self.objects,
+            "labels": self.labels,
+            "min_x": self.min_x,
+            "max_x": self.max_x,
+            "min_y": self.min_y,
+            "max_y": self.max_y,
+            "min_z": self.min_z,
+            "max_z": self.max_z,
+            "mip_count": len(self.mips),
+            "mips": ";".join(self.mips),
+        }
+
+
+def iter_statement_chunks(data: bytes | mmap.mmap, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield ``data`` in pieces of roughly ``chunk_size`` bytes.
+
+    Every piece except the last ends on the line that closes a ``;``
+    statement, so vertices, MIP assignments and labels are never split.
+    """
+    size = len(data)
+    start = 0
+    while start < size:
+        stop = min(start + chunk_size, size)
+        while stop < size:
+            semicolon = data.rfind(b";", start, stop)
+            newline = data.find(b"\n", semicolon, stop) if semicolon >= 0 else -1
+            if newline >= 0:
+                stop = newline + 1
+                break
+            # A single statement longer than the chunk; widen the window.
+            stop = min(stop + chunk_size, size)
+        yield data[start:stop]
+        start = stop
+
+
+def scan_track3d_bytes(data: bytes | mmap.mmap, path: str = "", chunk_size: int = CHUNK_SIZE) -> Track3DStats:
+    """Scan ``.3D`` source held in ``data`` (bytes or a memory map)."""
+    stats = Track3DStats(path=path, size=len(data))
+    lows: list[np.ndarray] = []
+    highs: list[np.ndarray] = []
+    mips: dict[str, None] = {}
+    label_types: Counter[bytes] = Counter()
+    for chunk in iter_statement_chunks(data, chunk_size):
+        vertices = _VERTEX_RE.findall(chunk)
+        if vertices:
+            coords = np.fromstring(b",".join(vertices), dtype=np.float64, sep=",").reshape(-1, 3)
+            lows.append(coords.min(axis=0))
+            highs.append(coords.max(axis=0))
+            stats.vertices += len(vertices)
+        for name in _MIP_RE.findall(chunk):
+            mips.setdefault(name.decode("utf-8", "replace"), None)
+        label_types.update(_LABEL_RE.findall(b"\n" + chunk))
+    if lows:
+        low = np.min(lows, axis=0)
+        high = np.max(highs, axis=0)
+        stats.min_x, stats.min_y, stats.min_z = (float(value) for value in low)
+        stats.max_x, stats.max_y, stats.max_z = (float(value) for value in high)
+    stats.mips = tuple(mips)
+    stats.label_types = {kind.decode("ascii"): count for kind, count in sorted(label_types.items())}
+    return stats
+
+
+def scan_track3d(path: str | Path, chunk_size: int = CHUNK_SIZE) -> Track3DStats:
+    """Scan a ``.3D`` file through a read-only memory map."""
+    path = Path(path)
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return Track3DStats(path=str(path))
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scan_track3d_bytes(data, str(path), chunk_size)
+
+
+def find_track3d_files(root: str | Path) -> list[Path]:
+    """Return every ``.3D`` file below ``root``, folder by folder in name order."""
+    found: list[Path] = []
+    for folder, dirnames, filenames in os.walk(root):
+        dirnames.sort(key=str.lower)
+        for name in sorted(filenames, key=str.lower):
+            if name.lower().endswith(TRACK3D_SUFFIX):
+                found.append(Path(folder) / name)
+    return found
+
+
+def _scan_job(path: Path) -> Track3DStats | None:
+    try:
+        return scan_track3d(path)
+    except OSError as exc:
+        logger.warning("Could not scan %s: %s", path, exc)
+        return None
+
+
+def scan_track3d_files(paths: Iterable[str | Path], *, max_workers: int | None = None) -> list[Track3DStats]:
+    """Scan several ``.3D`` files, in worker processes when worthwhile.
+
+    Files that cannot be read are logged and left out. ``max_workers=1``
+    forces a serial scan.
+    """
+    paths = [Path(path) for path in paths]
+    workers = worker_count("track3d_bytes", len(paths), total_file_size(paths), max_workers)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_job, paths))
+    else:
+        results = [_scan_job(path) for path in paths]
+    return [stats for stats in results if stats is not None]
+
+
+def scan_tracks_library(tracks_root: str | Path, *, max_workers: int | None = None) -> list[Track3DStats]:
+    """Scan every ``.3D`` file below an ICR2 ``TRACKS`` folder."""
+    return scan_track3d_files(find_track3d_files(tracks_root), max_workers=max_workers)
+
+
+def _write_inventory(handle: TextIO, stats: Iterable[Track3DStats]) -> None:
+    writer = csv.DictWriter(handle, fieldnames=INVENTORY_COLUMNS)
+    writer.writeheader()
+    for item in stats:
+        writer.writerow(item.inventory_row())
+
+
+def write_inventory_csv(stats: Iterable[Track3DStats], path: str | Path) -> None:
+    """Write one CSV row per scanned file."""
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        _write_inventory(handle, stats)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Write a CSV inventory of the .3D files in a TRACKS folder (or of single files)."
+    )
+    parser.add_argument("inputs", nargs="+", help="TRACKS folder(s) or .3D file(s) to scan")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    paths: list[Path] = []
+    for item in args.inputs:
+        item_path = Path(item)
+        paths.extend(find_track3d_files(item_path) if item_path.is_dir() else [item_path])
+    stats = scan_track3d_files(paths, max_workers=args.jobs)
+    if args.output:
+        write_inventory_csv(stats, args.output)
+    else:
+        _write_inventory(sys.stdout, stats)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
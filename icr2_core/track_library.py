@@ -0,0 +1,319 @@
+"""Persistent index of the track folders under an ICR2 ``TRACKS`` directory.
+
+Listing the library only needs the folder names and their modification
+times. Per-track metadata (TNAME from the ``.TXT`` plus the size and mtime
+of the TXT/DAT/TRK files) is read lazily the first time a track is looked
+up, then stored in a JSON index so later sessions and other tools skip the
+file reads. :meth:`TrackLibrary.refresh` re-stats folders and the known
+TXT/DAT/TRK files and only invalidates tracks whose sizes or mtimes changed.
+
+:func:`track_library` hands out one shared instance per ``TRACKS`` folder
+so icr2timing and the track viewer reuse the same index in a process.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = ".icr2tools_tracks.json"
+INDEX_VERSION = 1
+TRACK_FILE_SUFFIXES = (".txt", ".dat", ".trk")
+
+_TNAME_PATTERN = re.compile(r"^\s*TNAME\s+(.+)$", re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class TrackFileInfo:
+    name: str
+    size: int
+    mtime: float
+
+
+@dataclass(frozen=True)
+class TrackMetadata:
+    """Lazily read details for one track folder."""
+
+    tname: str | None
+    files: tuple[TrackFileInfo, ...] = ()
+
+    def _with_suffix(self, suffix: str) -> tuple[TrackFileInfo, ...]:
+        return tuple(info for info in self.files if info.name.lower().endswith(suffix))
+
+    @property
+    def txt(self) -> TrackFileInfo | None:
+        matches = self._with_suffix(".txt")
+        return matches[0] if matches else None
+
+    @property
+    def dat_files(self) -> tuple[TrackFileInfo, ...]:
+        return self._with_suffix(".dat")
+
+    @property
+    def trk_files(self) -> tuple[TrackFileInfo, ...]:
+        return self._with_suffix(".trk")
+
+    @property
+    def has_dat(self) -> bool:
+        return bool(self.dat_files)
+
+    @property
+    def has_trk(self) -> bool:
+        return bool(self.trk_files)
+
+
+@dataclass
+class TrackEntry:
+    folder: str
+    folder_mtime: float
+    metadata: TrackMetadata | None = field(default=None, repr=False)
+
+
+def read_tname(txt_path: Path) -> str | None:
+    """Return the TNAME value from a track ``.TXT`` file, if present."""
+    try:
+        with open(txt_path, "r", errors="ignore") as handle:
+            match = _TNAME_PATTERN.search(handle.read())
+    except OSError:
+        return None
+    return match.group(1).strip() if match else None
+
+
+class TrackLibrary:
+    """Index of the track folders under one ``TRACKS`` directory.
+
+    Lookups by folder name, TNAME or TNAME-sorted position are dictionary
+    or list indexing. Call :meth:`refresh` to pick up changes on disk.
+    """
+
+    def __init__(
+        self,
+        tracks_root: Path | str,
+        index_path: Path | str | None = None,
+        *,
+        persist: bool = True,
+    ) -> None:
+        self.tracks_root = Path(tracks_root)
+        self.index_path = (
+            Path(index_path) if index_path is not None else self.tracks_root / INDEX_FILE_NAME
+        )
+        self.persist = persist
+        self._entries: dict[str, TrackEntry] = {}
+        self._folders: list[str] = []
+        self._by_lower_name: dict[str, str] = {}
+        self._tname_order: list[str] | None = None
+        self._by_tname: dict[str, str] | None = None
+        self._dirty = False
+        if persist:
+            self._load_index()
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Listing and lookups
+    # ------------------------------------------------------------------
+    @property
+    def folders(self) -> list[str]:
+        """Folder names sorted case-insensitively."""
+        return list(self._folders)
+
+    def folder_paths(self) -> list[Path]:
+        return [self.tracks_root / folder for folder in self._folders]
+
+    def __len__(self) -> int:
+        return len(self._folders)
+
+    def __contains__(self, folder: str) -> bool:
+        return folder.lower() in self._by_lower_name
+
+    def metadata(self, folder: str) -> TrackMetadata | None:
+        """Return (reading on first use) the metadata for ``folder``."""
+        name = self._by_lower_name.get(folder.lower())
+        if name is None:
+            return None
+        entry = self._entries[name]
+        if entry.metadata is None:
+            entry.metadata = self._read_metadata(name)
+            self._dirty = True
+        return entry.metadata
+
+    def tname(self, folder: str) -> str | None:
+        metadata = self.metadata(folder)
+        return metadata.tname if metadata is not None else None
+
+    def folder_for_tname(self, tname: str) -> str | None:
+        """Return the folder whose TNAME matches ``tname`` (case-insensitive)."""
+        self._ensure_tname_order()
+        return self._by_tname.get(tname.strip().lower())
+
+    def tname_ordered_folders(self) -> list[str]:
+        """Folders with a TNAME, sorted by TNAME as the WINDY track menu is."""
+        self._ensure_tname_order()
+        return list(self._tname_order)
+
+    def folder_at_tname_index(self, index: int) -> str | None:
+        self._ensure_tname_order()
+        if 0 <= index < len(self._tname_order):
+            return self._tname_order[index]
+        return None
+
+    # ------------------------------------------------------------------
+    # Refresh and persistence
+    # ------------------------------------------------------------------
+    def refresh(self) -> bool:
+        """Re-scan folder mtimes; return ``True`` when the library changed."""
+        try:
+            scanned = {
+                entry.name: entry.stat().st_mtime
+                for entry in os.scandir(self.tracks_root)
+                if entry.is_dir()
+            }
+        except OSError:
+            scanned = {}
+
+        changed = set(scanned) != set(self._entries)
+        entries: dict[str, TrackEntry] = {}
+        for name, mtime in scanned.items():
+            entry = self._entries.get(name)
+            if entry is None or entry.folder_mtime != mtime or self._files_changed(entry):
+                entry = TrackEntry(folder=name, folder_mtime=mtime)
+                changed = True
+            entries[name] = entry
+        self._entries = entries
+        if changed or len(self._folders) != len(entries):
+            self._folders = sorted(entries, key=str.lower)
+            self._by_lower_name = {name.lower(): name for name in self._folders}
+        if changed:
+            self._tname_order = None
+            self._by_tname = None
+            self._dirty = True
+        self.save()
+        return changed
+
+    def save(self) -> None:
+        """Write the index if anything changed since it was last saved."""
+        if not self.persist or not self._dirty:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "tracks": {
+                entry.folder: {
+                    "folder_mtime": entry.folder_mtime,
+                    "metadata": None
+                    if entry.metadata is None
+                    else {
+                        "tname": entry.metadata.tname,
+                        "files": [
+                            [info.name, info.size, info.mtime]
+                            for info in entry.metadata.files
+                        ],
+                    },
+                }
+                for entry in self._entries.values()
+            },
+        }
+        try:
+            self.index_path.write_text(json.dumps(payload), encoding="utf-8")
+        except OSError as exc:
+            log.debug("Unable to write track index %s: %s", self.index_path, exc)
+        self._dirty = False
+
+    def _load_index(self) -> None:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        try:
+            for folder, data in payload["tracks"].items():
+                metadata = data.get("metadata")
+                self._entries[folder] = TrackEntry(
+                    folder=folder,
+                    folder_mtime=float(data["folder_mtime"]),
+                    metadata=None
+                    if metadata is None
+                    else TrackMetadata(
+                        tname=metadata["tname"],
+                        files=tuple(
+                            TrackFileInfo(str(name), int(size), float(mtime))
+                            for name, size, mtime in metadata["files"]
+                        ),
+                    ),
+                )
+        except (KeyError, TypeError, ValueError):
+            log.warning("Ignoring malformed track index %s", self.index_path)
+            self._entries = {}
+
+    def _files_changed(self, entry: TrackEntry) -> bool:
+        # Editing a file does not touch its folder's mtime, so the recorded
+        # TXT, DAT and TRK files are re-checked explicitly.
+        if entry.metadata is None:
+            return False
+        folder_path = self.tracks_root / entry.folder
+        for info in entry.metadata.files:
+            try:
+                stat = (folder_path / info.name).stat()
+            except OSError:
+                return True
+            if stat.st_mtime != info.mtime or stat.st_size != info.size:
+                return True
+        return False
+
+    def _read_metadata(self, folder: str) -> TrackMetadata:
+        folder_path = self.tracks_root / folder
+        own_txt = f"{folder}.txt".lower()
+        files: list[TrackFileInfo] = []
+        try:
+            for item in os.scandir(folder_path):
+                suffix = os.path.splitext(item.name)[1].lower()
+                if suffix not in TRACK_FILE_SUFFIXES or not item.is_file():
+                    continue
+                if suffix == ".txt" and item.name.lower() != own_txt:
+                    continue
+                stat = item.stat()
+                files.append(TrackFileInfo(item.name, stat.st_size, stat.st_mtime))
+        except OSError:
+            return TrackMetadata(tname=None)
+        files.sort(key=lambda info: info.name.lower())
+        metadata = TrackMetadata(tname=None, files=tuple(files))
+        if metadata.txt is None:
+            return metadata
+        return TrackMetadata(
+            tname=read_tname(folder_path / metadata.txt.name), files=metadata.files
+        )
+
+    def _ensure_tname_order(self) -> None:
+        if self._tname_order is not None:
+            return
+        named = [(folder, self.tname(folder)) for folder in self._folders]
+        named = [(folder, tname) for folder, tname in named if tname]
+        named.sort(key=lambda item: item[1].lower())
+        self._tname_order = [folder for folder, _ in named]
+        self._by_tname = {}
+        for folder, tname in named:
+            self._by_tname.setdefault(tname.lower(), folder)
+        self.save()
+
+
+_LIBRARIES: dict[Path, TrackLibrary] = {}
+
+
+def track_library(tracks_root: Path | str) -> TrackLibrary:
+    """Return the shared :class:`TrackLibrary` for ``tracks_root``.
+
+    A cached library is refreshed before it is returned, which only costs a
+    directory scan when nothing changed.
+    """
+    root = Path(tracks_root).resolve()
+    library = _LIBRARIES.get(root)
+    if library is None:
+        library = TrackLibrary(root)
+        _LIBRARIES[root] = library
+    else:
+        library.refresh()
+    return library
@@ -0,0 +1,113 @@
+"""Binary-search DLONG to section lookup for TRK and SG section lists.
+
+The historical helpers scanned every section until ``start <= dlong < next``
+matched, which is O(sections) per query and sits inside per-point loops.
+:class:`SectionLocator` answers the same question with :mod:`bisect` for
+scalars and ``np.searchsorted`` for arrays, keeping the scan's conventions:
+a DLONG before the first section or past the last start maps to the last
+section. Pass ``wrap=True`` to reduce DLONGs modulo the track length first.
+
+``python benchmarks/run.py section_locator`` compares it with the linear
+scan on a 300-section track.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Sequence
+
+import numpy as np
+
+
+class SectionLocator:
+    """Locate the section containing a DLONG by binary search."""
+
+    def __init__(
+        self,
+        starts: Sequence[float],
+        lengths: Sequence[float] | None = None,
+        track_length: float | None = None,
+    ) -> None:
+        if not len(starts):
+            raise ValueError("SectionLocator needs at least one section.")
+        self.starts = [float(start) for start in starts]
+        self.lengths = None if lengths is None else [float(length) for length in lengths]
+        self.track_length = None if track_length is None else float(track_length)
+        self._starts_array = np.asarray(self.starts, dtype=np.float64)
+        self._last = len(self.starts) - 1
+
+    @classmethod
+    def from_sections(cls, sections: Sequence, track_length: float | None = None) -> "SectionLocator":
+        """Build from TRK or SG sections (``start_dlong``/``length``).
+
+        Older TRK readers name the start ``dlong``; that is accepted too.
+        """
+        starts = []
+        lengths = []
+        for section in sections:
+            start = getattr(section, "start_dlong", None)
+            if start is None:
+                start = section.dlong
+            starts.append(start)
+            lengths.append(getattr(section, "length", None))
+        if any(length is None for length in lengths):
+            lengths = None
+        return cls(starts, lengths, track_length)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _wrap(self, dlong):
+        if not self.track_length:
+            raise ValueError("Wrapping needs a track length.")
+        return dlong % self.track_length
+
+    def section(self, dlong: float, *, wrap: bool = False) -> int:
+        """Return the section index containing ``dlong``."""
+        if wrap:
+            dlong = self._wrap(dlong)
+        index = bisect_right(self.starts, dlong) - 1
+        return self._last if index < 0 else index
+
+    def sections(self, dlongs, *, wrap: bool = False) -> np.ndarray:
+        """Vectorised :meth:`section` for an array of DLONGs."""
+        dlongs = np.asarray(dlongs)
+        if wrap:
+            dlongs = self._wrap(dlongs)
+        index = np.searchsorted(self._starts_array, dlongs, side="right") - 1
+        index[index < 0] = self._last
+        return index
+
+    def locate(self, dlong: float, *, wrap: bool = False) -> tuple[int, float]:
+        """Return ``(section, fraction)`` where fraction is along the section.
+
+        The fraction is not clamped, matching ``trk_utils.dlong2sect``.
+        """
+        if self.lengths is None:
+            raise ValueError("Section lengths are required to locate a DLONG.")
+        if wrap:
+            dlong = self._wrap(dlong)
+        sect = self.section(dlong)
+        return sect, (dlong - self.starts[sect]) / self.lengths[sect]
+
+
+def section_locator(trk) -> SectionLocator:
+    """Return a locator for ``trk``'s sections, cached on the TRK object.
+
+    The cache is keyed on the section list identity, its length and the
+    track length. TRK sections are not edited in place after loading; code
+    that rebuilds a track produces a new section list.
+    """
+    sects = trk.sects
+    track_length = getattr(trk, "trklength", None)
+    if track_length is None:
+        track_length = getattr(trk, "trackLength", None)
+    key = (id(sects), len(sects), track_length)
+    cached = getattr(trk, "_section_locator", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    locator = SectionLocator.from_sections(sects, track_length)
+    try:
+        trk._section_locator = (key, locator)
+    except AttributeError:
+        pass
+    return locator
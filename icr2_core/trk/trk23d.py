@@ -2,6 +2,8 @@ import math
 import trk_classes
 import csv2obj
 
+from icr2_core.trk.section_locator import section_locator
+
 def distance_3d(coord1, coord2):
     x1, y1, z1 = coord1
     x2, y2, z2 = coord2
@@ -37,15 +39,7 @@ def get_cline_pos(trk):
 
 def dlong2sect(trk, dlong):
     """Given a DLONG, return the section number and fraction of the section"""
-    for sect in range(0, trk.num_sects):
-
-        if sect < trk.num_sects - 1:
-            if trk.sects[sect].start_dlong <= dlong < trk.sects[sect+1].start_dlong:
-                subsect = (dlong - trk.sects[sect].start_dlong)/trk.sects[sect].length
-                return sect, subsect
-        else:
-            subsect = (dlong - trk.sects[sect].start_dlong)/trk.sects[sect].length
-            return sect, subsect
+    return section_locator(trk).locate(dlong)
 
 def heading2rad(heading):
     return (heading / 2**31) * math.pi
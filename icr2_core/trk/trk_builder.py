@@ -0,0 +1,399 @@
+"""Columnar SG to TRK conversion.
+
+:func:`build_trk_array` produces the same int32 words as
+``TRKFile.from_sgfile`` followed by ``trk_exporter.write_trk``, but fills
+preallocated arrays for the header, x-section data, ground fsects and section
+records instead of building per-section lists and objects. The result is
+written with a single ``tofile``.
+
+``python -m icr2_core.trk.trk_builder track.sg --watch`` re-exports the TRK
+every time the SG file is saved.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+
+from icr2_core.trk.sg_classes import SGFile
+
+logger = logging.getLogger(__name__)
+
+TRK_FILE_TYPE = 1414676811
+TRK_VERSION = 1
+TRK_MAX_XSECTS = 10
+TRK_UNUSED = -858993460
+SECTION_HEADER_WORDS = 13
+BOUNDARY_WORDS = 5
+# Matches the default of utils.approx_curve_length, which sets section lengths.
+CURVE_LENGTH_SEGMENTS = 10000
+# Sections per batch when measuring centreline lengths (keeps temporaries small).
+CURVE_LENGTH_BATCH = 64
+# Measured centreline lengths are kept per curve, so re-exports after an edit
+# only measure the sections whose profile changed.
+CURVE_LENGTH_CACHE_SIZE = 65536
+
+_curve_length_cache: OrderedDict[tuple[float, ...], float] = OrderedDict()
+
+_GROUND_TYPES = np.array([6, 14, 22, 30, 38, 46, 54], dtype=np.int64)
+_FENCE_TYPES = (2, 6, 10, 14)
+_WALL_TYPE = 7
+
+
+def _cubic_terms(
+    begin_alt: np.ndarray,
+    end_alt: np.ndarray,
+    cur_slope: np.ndarray,
+    next_slope: np.ndarray,
+    sg_length: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    grade1 = np.rint((2 * begin_alt / sg_length + cur_slope + next_slope - 2 * end_alt / sg_length) * sg_length)
+    grade2 = np.rint((3 * end_alt / sg_length - 3 * begin_alt / sg_length - 2 * cur_slope - next_slope) * sg_length)
+    grade3 = np.rint(cur_slope * sg_length)
+    return grade1, grade2, grade3
+
+
+def _measure_curve_lengths(
+    grade1: np.ndarray,
+    grade2: np.ndarray,
+    grade3: np.ndarray,
+    alt: np.ndarray,
+    sg_length: np.ndarray,
+) -> np.ndarray:
+    """Row-wise utils.approx_curve_length, evaluated in batches of sections."""
+    lengths = np.empty(len(sg_length))
+    steps = np.arange(CURVE_LENGTH_SEGMENTS + 1, dtype=np.float64)
+    for start in range(0, len(sg_length), CURVE_LENGTH_BATCH):
+        rows = slice(start, start + CURVE_LENGTH_BATCH)
+        scale = sg_length[rows, None]
+        x_values = steps * (scale / CURVE_LENGTH_SEGMENTS)
+        x_values += 0.0
+        x_values[:, -1] = scale[:, 0]
+        x_scaled = x_values / scale
+        y_values = (
+            grade1[rows, None] * x_scaled**3
+            + grade2[rows, None] * x_scaled**2
+            + grade3[rows, None] * x_scaled
+            + alt[rows, None]
+        )
+        delta_x = np.diff(x_values, axis=1)
+        delta_y = np.diff(y_values, axis=1)
+        lengths[rows] = np.sum(np.sqrt(delta_x**2 + delta_y**2), axis=1)
+    return lengths
+
+
+def _curve_lengths(
+    grade1: np.ndarray,
+    grade2: np.ndarray,
+    grade3: np.ndarray,
+    alt: np.ndarray,
+    sg_length: np.ndarray,
+) -> np.ndarray:
+    keys = list(zip(grade1.tolist(), grade2.tolist(), grade3.tolist(), alt.tolist(), sg_length.tolist()))
+    lengths = np.empty(len(keys))
+    missing = []
+    for row, key in enumerate(keys):
+        cached = _curve_length_cache.get(key)
+        if cached is None:
+            missing.append(row)
+        else:
+            lengths[row] = cached
+            _curve_length_cache.move_to_end(key)
+    if missing:
+        rows = np.array(missing)
+        measured = _measure_curve_lengths(grade1[rows], grade2[rows], grade3[rows], alt[rows], sg_length[rows])
+        lengths[rows] = measured
+        for row, length in zip(missing, measured.tolist()):
+            _curve_length_cache[keys[row]] = length
+        while len(_curve_length_cache) > CURVE_LENGTH_CACHE_SIZE:
+            _curve_length_cache.popitem(last=False)
+    return lengths
+
+
+def _centerline_xsects(dlats: Sequence[int]) -> tuple[int, int]:
+    pair = None
+    for xsect in range(len(dlats)):
+        if dlats[xsect] < 0:
+            if xsect + 1 >= len(dlats):
+                pair = None
+                break
+            if dlats[xsect + 1] >= 0:
+                pair = (xsect, xsect + 1)
+    if pair is None:
+        raise ValueError("SG x-sections do not straddle the centreline (DLAT 0)")
+    return pair
+
+
+def build_trk_array(sgfile: SGFile) -> np.ndarray:
+    """Return the TRK file for ``sgfile`` as one int32 array."""
+    num_sects = int(sgfile.num_sects)
+    num_xsects = int(sgfile.num_xsects)
+    if num_sects <= 0:
+        raise ValueError("SG file has no sections")
+    if not 0 < num_xsects <= TRK_MAX_XSECTS:
+        raise ValueError(f"TRK files hold 1 to {TRK_MAX_XSECTS} x-sections, SG has {num_xsects}")
+    sects = sgfile.sects[:num_sects]
+    dlats = [sgfile.xsect_dlats[xsect] for xsect in range(num_xsects)]
+
+    types = np.array([sect.type for sect in sects], dtype=np.int64)
+    if not np.isin(types, (1, 2)).all():
+        raise ValueError("SG sections must be straights (1) or curves (2)")
+    straight = types == 1
+    sg_length = np.array([sect.length for sect in sects], dtype=np.float64)
+    start_x = np.array([sect.start_x for sect in sects], dtype=np.float64)
+    start_y = np.array([sect.start_y for sect in sects], dtype=np.float64)
+    center_x = np.array([sect.center_x for sect in sects], dtype=np.int64)
+    center_y = np.array([sect.center_y for sect in sects], dtype=np.int64)
+    radius = np.array([sect.radius for sect in sects], dtype=np.int64)
+    alt = np.array([sect.alt[:num_xsects] for sect in sects], dtype=np.int64).reshape(num_sects, num_xsects)
+    grade = np.array([sect.grade[:num_xsects] for sect in sects], dtype=np.int64).reshape(num_sects, num_xsects)
+    prev = np.roll(np.arange(num_sects), 1)
+
+    # Headings use math.* per section so they round exactly like from_sgfile.
+    headings = np.empty(num_sects, dtype=np.int64)
+    headings_rad = np.empty(num_sects)
+    for index, sect in enumerate(sects):
+        if sect.type == 1:
+            d_x = sect.end_x - sect.start_x
+            d_y = sect.end_y - sect.start_y
+            heading_rad = math.atan2(d_y, d_x)
+            heading = heading_rad / math.pi * 2**31
+            if heading == 2**31:
+                heading = -(2**31)
+        else:
+            start_angle = math.atan2(sect.start_y - sect.center_y, sect.start_x - sect.center_x)
+            end_angle = math.atan2(sect.end_y - sect.center_y, sect.end_x - sect.center_x)
+            diff = (end_angle - start_angle) % (2 * math.pi)
+            clockwise = diff != 0 and diff > math.pi
+            heading_rad = start_angle - math.pi / 2 if clockwise else start_angle + math.pi / 2
+            heading = heading_rad / math.pi * 2**31
+        headings_rad[index] = heading_rad
+        headings[index] = round(heading)
+
+    # X-section records: cubic terms, start altitude and position per xsect.
+    begin_alt = alt[prev]
+    grade1, grade2, grade3 = _cubic_terms(
+        begin_alt, alt, grade[prev] / 8192, grade / 8192, sg_length[:, None]
+    )
+    dlat_row = np.array(dlats, dtype=np.int64)
+    pos_angle = headings_rad + math.pi / 2
+    cos_angle = np.array([math.cos(angle) for angle in pos_angle])
+    sin_angle = np.array([math.sin(angle) for angle in pos_angle])
+    straight_col = straight[:, None]
+    pos1 = np.where(
+        straight_col,
+        np.rint(start_x[:, None] + dlat_row * cos_angle[:, None]),
+        radius[:, None] - dlat_row,
+    )
+    pos2 = np.where(straight_col, np.rint(start_y[:, None] + dlat_row * sin_angle[:, None]), TRK_UNUSED)
+    xsect_data = np.stack(
+        [grade1, grade2, grade3, begin_alt, grade1 * 3, grade2 * 2, pos1, pos2], axis=-1
+    ).astype(np.int64)
+
+    # Centreline lengths give each section's TRK length and start DLONG.
+    rxsect, lxsect = _centerline_xsects(dlats)
+    cline_pct = -dlats[rxsect] / (dlats[lxsect] - dlats[rxsect])
+    cline_alt = alt[:, rxsect] + cline_pct * (alt[:, lxsect] - alt[:, rxsect])
+    cline_grade = grade[:, rxsect] + cline_pct * (grade[:, lxsect] - grade[:, rxsect])
+    cline1, cline2, cline3 = _cubic_terms(
+        cline_alt[prev], cline_alt, cline_grade[prev] / 8192, cline_grade / 8192, sg_length
+    )
+    adj_length = np.rint(_curve_lengths(cline1, cline2, cline3, cline_alt, sg_length)).astype(np.int64)
+    start_dlong = np.concatenate(([0], np.cumsum(adj_length[:-1])))
+
+    # Runs of straights share the heading of the first straight in the run.
+    run_start = np.ones(num_sects, dtype=bool)
+    run_start[1:] = ~(straight[1:] & straight[:-1])
+    headings = headings[np.maximum.accumulate(np.where(run_start, np.arange(num_sects), 0))]
+
+    heading_rad = headings / (2**31) * math.pi
+    heading_sin = -np.array([math.sin(value) for value in heading_rad])
+    heading_cos = np.array([math.cos(value) for value in heading_rad])
+    ang3_straight = 2**30 * heading_sin
+    ang4_straight = heading_cos * 2**30
+    ang5_straight = 2**30 - 2 * (2**30 - sg_length / adj_length * 2**30)
+    ang2_straight = -ang3_straight - (-ang3_straight + heading_sin * ang5_straight) / 2
+    ang1_straight = ang4_straight - (ang4_straight - (heading_cos * ang5_straight)) / 2
+    ang3_curve = (np.roll(headings, -1) - headings) / 2
+    ang3_curve = np.where(ang3_curve < -(2**30), 2**31 + ang3_curve, ang3_curve)
+    ang3_curve = np.where(ang3_curve > 2**30, ang3_curve - 2**31, ang3_curve)
+    angles = np.where(
+        straight[:, None],
+        np.stack([ang1_straight, ang2_straight, ang3_straight, ang4_straight, ang5_straight], axis=-1),
+        np.stack(
+            [center_x, center_y, ang3_curve, np.full(num_sects, TRK_UNUSED), np.full(num_sects, TRK_UNUSED)],
+            axis=-1,
+        ),
+    )
+
+    # Ground fsects and boundaries, in section order.
+    ground_counts = np.array([sect.num_ground_fsects for sect in sects], dtype=np.int64)
+    bound_counts = np.array([sect.num_boundaries for sect in sects], dtype=np.int64)
+    ground = np.array(
+        [
+            (fstart, fend, ftype)
+            for sect in sects
+            for ftype, fstart, fend in zip(sect.ground_ftype, sect.ground_fstart, sect.ground_fend)
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    ground[:, 2] = _GROUND_TYPES[ground[:, 2]]
+    bounds = np.array(
+        [
+            (ftype1, ftype2, fstart, fend)
+            for sect in sects
+            for ftype1, ftype2, fstart, fend in zip(
+                sect.bound_ftype1, sect.bound_ftype2, sect.bound_fstart, sect.bound_fend
+            )
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    ground_counter = np.concatenate(([0], np.cumsum(ground_counts[:-1])))
+
+    # Section records: 13 header words plus 5 words per boundary.
+    record_words = SECTION_HEADER_WORDS + BOUNDARY_WORDS * bound_counts
+    sect_offsets = np.concatenate(([0], np.cumsum(record_words[:-1])))
+    sects_words = int(record_words.sum())
+    records = np.empty(sects_words, dtype=np.int64)
+    header_columns = (
+        types,
+        start_dlong,
+        adj_length,
+        headings,
+        *np.rint(angles).astype(np.int64).T,
+        np.arange(num_sects) * num_xsects,
+        ground_counts,
+        ground_counter,
+        bound_counts,
+    )
+    for column, values in enumerate(header_columns):
+        records[sect_offsets + column] = values
+    bound_sect = np.repeat(np.arange(num_sects), bound_counts)
+    bound_rank = np.arange(len(bounds)) - np.repeat(np.cumsum(bound_counts) - bound_counts, bound_counts)
+    bound_base = sect_offsets[bound_sect] + SECTION_HEADER_WORDS + BOUNDARY_WORDS * bound_rank
+    wall = (bounds[:, 0] == _WALL_TYPE).astype(np.int64)
+    fence = np.isin(bounds[:, 1], _FENCE_TYPES).astype(np.int64)
+    records[bound_base] = wall * 4 + fence * 2
+    records[bound_base + 1] = bounds[:, 2]
+    records[bound_base + 2] = bounds[:, 3]
+    records[bound_base + 3] = TRK_UNUSED
+    records[bound_base + 4] = TRK_UNUSED
+
+    header = (
+        TRK_FILE_TYPE,
+        TRK_VERSION,
+        int(adj_length.sum()),
+        num_xsects,
+        num_sects,
+        ground.size * 4,
+        sects_words * 4,
+    )
+    parts = (
+        (header, len(header)),
+        (dlats, TRK_MAX_XSECTS),
+        (sect_offsets * 4, num_sects),
+        (xsect_data.ravel(), xsect_data.size),
+        (ground.ravel(), ground.size),
+        (records, sects_words),
+    )
+    output = np.zeros(sum(size for _values, size in parts), dtype=np.int32)
+    position = 0
+    for values, size in parts:
+        values = np.asarray(values, dtype=np.int64)
+        output[position : position + len(values)] = values.astype(np.int32)
+        position += size
+    return output
+
+
+def write_sgfile_as_trk(sgfile: SGFile, trk_path: str | Path) -> None:
+    """Write ``sgfile`` as a binary TRK file."""
+    build_trk_array(sgfile).tofile(str(trk_path))
+
+
+def convert_sg_to_trk(sg_path: str | Path, trk_path: str | Path) -> None:
+    """Read an SG file and write the matching TRK file."""
+    write_sgfile_as_trk(SGFile.from_sg(str(sg_path)), trk_path)
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch_sg(
+    sg_path: str | Path,
+    trk_path: str | Path,
+    *,
+    interval: float = 0.5,
+    max_polls: int | None = None,
+    on_export: Callable[[Path, float], None] | None = None,
+) -> None:
+    """Re-export ``trk_path`` whenever ``sg_path`` changes on disk.
+
+    The SG file is polled every ``interval`` seconds. A file caught half
+    written fails to load and is retried on the next poll. ``max_polls``
+    bounds the loop (``None`` watches until interrupted).
+    """
+    sg_path = Path(sg_path)
+    trk_path = Path(trk_path)
+    exported = None
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        if polls:
+            time.sleep(interval)
+        polls += 1
+        signature = _file_signature(sg_path)
+        if signature is None or signature == exported:
+            continue
+        started = time.perf_counter()
+        try:
+            convert_sg_to_trk(sg_path, trk_path)
+        except (OSError, ValueError) as exc:
+            logger.warning("TRK export of %s failed: %s", sg_path, exc)
+            continue
+        exported = signature
+        elapsed = time.perf_counter() - started
+        logger.info("Exported %s in %.0f ms", trk_path, elapsed * 1000)
+        if on_export is not None:
+            on_export(trk_path, elapsed)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convert an SG file to a TRK file.")
+    parser.add_argument("sg_file", help="Input .sg file")
+    parser.add_argument("-o", "--output", help="Output .trk file (default: next to the SG file)")
+    parser.add_argument("--watch", action="store_true", help="Re-export every time the SG file is saved")
+    parser.add_argument("--interval", type=float, default=0.5, help="Watch poll interval in seconds")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    sg_path = Path(args.sg_file)
+    trk_path = Path(args.output) if args.output else sg_path.with_suffix(".trk")
+    if not args.watch:
+        convert_sg_to_trk(sg_path, trk_path)
+        return 0
+
+    def report(path: Path, elapsed: float) -> None:
+        print(f"{time.strftime('%H:%M:%S')} wrote {path} ({elapsed * 1000:.0f} ms)", flush=True)
+
+    print(f"Watching {sg_path} (Ctrl+C to stop)", flush=True)
+    try:
+        watch_sg(sg_path, trk_path, interval=args.interval, on_export=report)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -83,8 +83,7 @@ def write_trk(trk, filename):
     header = np.array(trk.header).astype(np.int32)
     xsect_dlats = np.array(trk.xsect_dlats).astype(np.int32)
     sect_offsets = np.array(trk.sect_offsets).astype(np.int32)
-    sect_offsets = (sect_offsets * 4).tolist()
-    sect_offsets = sect_offsets[:-1]
+    sect_offsets = sect_offsets[:-1] * 4
     xsect_data = np.array(trk.xsect_data).astype(np.int32).flatten()
     ground_data = np.array(trk.ground_data).astype(np.int32).flatten()
 
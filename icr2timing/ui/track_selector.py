@@ -1,6 +1,7 @@
 import os
 from PyQt5 import QtWidgets, QtCore
 from icr2timing.core.config import Config
+from icr2_core.track_library import track_library
 
 
 class TrackSelector(QtWidgets.QWidget):
@@ -49,11 +50,7 @@ class TrackSelector(QtWidgets.QWidget):
             self.combo.addItem("(No TRACKS folder found)")
             return
 
-        track_names = [
-            name for name in os.listdir(tracks_dir)
-            if os.path.isdir(os.path.join(tracks_dir, name))
-        ]
-        track_names.sort(key=str.lower)
+        track_names = track_library(tracks_dir).folders
 
         if not track_names:
             self.combo.addItem("(No tracks found)")
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import logging
+import math
+
 from sg_viewer.geometry.centerline_utils import compute_start_finish_mapping_from_centerline
 from sg_viewer.geometry.sg_geometry import (
     build_section_polyline,
@@ -7,13 +10,77 @@ from sg_viewer.geometry.sg_geometry import (
     rebuild_centerline_from_sections,
 )
 from sg_viewer.model.sg_document import SGDocument
-from sg_viewer.model.sg_model import SectionPreview
+from sg_viewer.model.sg_model import Point, SectionPreview
+from track_viewer.geometry import build_centerline_index, update_centerline_index
+
+logger = logging.getLogger(__name__)
+
+_SIGNATURE_FIELDS = (
+    "type",
+    "start_x",
+    "start_y",
+    "end_x",
+    "end_y",
+    "center_x",
+    "center_y",
+    "radius",
+    "sang1",
+    "sang2",
+    "eang1",
+    "eang2",
+    "start_dlong",
+    "length",
+    "sec_prev",
+    "sec_next",
+)
+
+
+def _section_signature(sg_sect) -> tuple:
+    return tuple(getattr(sg_sect, name, None) for name in _SIGNATURE_FIELDS)
+
+
+def _point_offsets(sections: list[SectionPreview]) -> list[int]:
+    """Return where each section's points start in the flattened centreline.
+
+    Mirrors the joining rule of ``rebuild_centerline_from_sections``: a
+    polyline whose first point repeats the previous last point skips it.
+    """
+    offsets = [0]
+    count = 0
+    last: Point | None = None
+    for sect in sections:
+        polyline = sect.polyline
+        if polyline:
+            count += len(polyline) - 1 if last is not None and last == polyline[0] else len(polyline)
+            last = polyline[-1]
+        offsets.append(count)
+    return offsets
 
 
 class DerivedGeometry:
-    def __init__(self, sg_document: SGDocument) -> None:
+    """Preview sections and sampled centreline derived from the SG document.
+
+    Whole-document changes (``geometry_changed``) compare a per-section
+    signature of the SG fields to find what moved; ranged changes
+    (``sections_geometry_changed``) only compare that range. Changed sections
+    are rebuilt and their samples spliced into the centreline, shifting the
+    downstream DLONGs and re-bucketing only the moved centreline segments.
+    Larger or structural changes fall back to a full rebuild, and with
+    ``verify_incremental`` every incremental update is checked against one.
+
+    The centreline grid keeps the origin and cell size it was laid out with
+    while the track's extent stays within ``GRID_RELAYOUT_FACTOR`` of it, so
+    an edit that moves the bounding box does not re-bucket every segment.
+    """
+
+    # Above this fraction of changed sections a full rebuild is cheaper.
+    INCREMENTAL_MAX_FRACTION = 0.5
+    GRID_RELAYOUT_FACTOR = 2.0
+
+    def __init__(self, sg_document: SGDocument, *, verify_incremental: bool = False) -> None:
         self._document = sg_document
         self.dirty = True
+        self.verify_incremental = verify_incremental
         self.sections: list[SectionPreview] = []
         self.section_endpoints: list[tuple[tuple[float, float], tuple[float, float]]] = []
         self.sampled_centerline: list[tuple[float, float]] = []
@@ -22,11 +89,30 @@ class DerivedGeometry:
         self.centerline_index: object | None = None
         self.track_length: float = 0.0
         self.start_finish_mapping: tuple[tuple[float, float], tuple[float, float], tuple[float, float]] | None = None
+        self.last_rebuild_incremental = False
+
+        self._signatures: list[tuple] = []
+        self._offsets: list[int] | None = None
+        self._dirty_range: tuple[int, int] | None = None
 
         self._document.geometry_changed.connect(self.mark_dirty)
+        sections_changed = getattr(self._document, "sections_geometry_changed", None)
+        if sections_changed is not None:
+            sections_changed.connect(self.mark_sections_dirty)
 
     def mark_dirty(self) -> None:
         self.dirty = True
+        self._dirty_range = None
+
+    def mark_sections_dirty(self, start: int, stop: int) -> None:
+        """Mark sections ``start`` to ``stop - 1`` as changed."""
+        if self.dirty and self._dirty_range is None:
+            return
+        if self._dirty_range is not None:
+            start = min(start, self._dirty_range[0])
+            stop = max(stop, self._dirty_range[1])
+        self.dirty = True
+        self._dirty_range = (start, stop)
 
     def rebuild_if_needed(self) -> None:
         if not self.dirty:
@@ -42,17 +128,34 @@ class DerivedGeometry:
             self.centerline_index = None
             self.track_length = 0.0
             self.start_finish_mapping = None
+            self._signatures = []
+            self._offsets = None
             self._assert_section_id_invariant()
+            self._dirty_range = None
             self.dirty = False
             return
 
+        self.last_rebuild_incremental = self._rebuild_incremental(sg_data)
+        if not self.last_rebuild_incremental:
+            self._rebuild_full(sg_data)
+
+        self._assert_section_id_invariant()
+        self._dirty_range = None
+        self.dirty = False
+
+    # ------------------------------------------------------------------
+    # Full rebuild
+    # ------------------------------------------------------------------
+    def _rebuild_full(self, sg_data) -> None:
         self.sections = self._build_sections(sg_data)
+        self._signatures = [_section_signature(sect) for sect in sg_data.sects]
         (
             self.sampled_centerline,
             self.sampled_dlongs,
             self.sampled_bounds,
             self.centerline_index,
         ) = rebuild_centerline_from_sections(self.sections)
+        self._offsets = _point_offsets(self.sections) if self.sampled_centerline else None
 
         if self.sampled_dlongs:
             self.track_length = float(self.sampled_dlongs[-1])
@@ -64,81 +167,266 @@ class DerivedGeometry:
             self.sampled_centerline
         )
 
-        self._assert_section_id_invariant()
-        self.dirty = False
-
     def _build_sections(self, sgfile) -> list[SectionPreview]:
-        sections: list[SectionPreview] = []
+        sections = [
+            self._build_section(idx, sg_sect) for idx, sg_sect in enumerate(sgfile.sects)
+        ]
 
-        for idx, sg_sect in enumerate(sgfile.sects):
-            start_dlong = float(sg_sect.start_dlong)
-            length = float(sg_sect.length)
+        for i, sect in enumerate(sections):
+            object.__setattr__(sect, "section_id", i)
 
-            start = (float(sg_sect.start_x), float(sg_sect.start_y))
-            end = (
-                float(getattr(sg_sect, "end_x", start[0])),
-                float(getattr(sg_sect, "end_y", start[1])),
-            )
+        assert all(
+            i == sect.section_id
+            for i, sect in enumerate(sections)
+        ), "SectionPreview.section_id must equal list index"
+
+        return sections
+
+    def _build_section(self, idx: int, sg_sect) -> SectionPreview:
+        start_dlong = float(sg_sect.start_dlong)
+        length = float(sg_sect.length)
+
+        start = (float(sg_sect.start_x), float(sg_sect.start_y))
+        end = (
+            float(getattr(sg_sect, "end_x", start[0])),
+            float(getattr(sg_sect, "end_y", start[1])),
+        )
+
+        center = None
+        radius = None
+        sang1 = sang2 = eang1 = eang2 = None
+        if getattr(sg_sect, "type", None) == 2:
+            center = (float(sg_sect.center_x), float(sg_sect.center_y))
+            radius = float(sg_sect.radius)
+            sang1 = float(sg_sect.sang1)
+            sang2 = float(sg_sect.sang2)
+            eang1 = float(sg_sect.eang1)
+            eang2 = float(sg_sect.eang2)
+
+        type_name = "curve" if getattr(sg_sect, "type", None) == 2 else "straight"
+
+        polyline = build_section_polyline(
+            type_name,
+            start,
+            end,
+            center,
+            radius,
+            (sang1, sang2) if sang1 is not None and sang2 is not None else None,
+            (eang1, eang2) if eang1 is not None and eang2 is not None else None,
+        )
+
+        start_heading, end_heading = derive_heading_vectors(
+            polyline, sang1, sang2, eang1, eang2
+        )
+
+        return SectionPreview(
+            section_id=idx,
+            source_section_id=idx,
+            type_name=type_name,
+            previous_id=int(getattr(sg_sect, "sec_prev", idx - 1)),
+            next_id=int(getattr(sg_sect, "sec_next", idx + 1)),
+            start=start,
+            end=end,
+            start_dlong=start_dlong,
+            length=length,
+            center=center,
+            sang1=sang1,
+            sang2=sang2,
+            eang1=eang1,
+            eang2=eang2,
+            radius=radius,
+            start_heading=start_heading,
+            end_heading=end_heading,
+            polyline=polyline,
+        )
 
-            center = None
-            radius = None
-            sang1 = sang2 = eang1 = eang2 = None
-            if getattr(sg_sect, "type", None) == 2:
-                center = (float(sg_sect.center_x), float(sg_sect.center_y))
-                radius = float(sg_sect.radius)
-                sang1 = float(sg_sect.sang1)
-                sang2 = float(sg_sect.sang2)
-                eang1 = float(sg_sect.eang1)
-                eang2 = float(sg_sect.eang2)
-
-            type_name = "curve" if getattr(sg_sect, "type", None) == 2 else "straight"
-
-            polyline = build_section_polyline(
-                type_name,
-                start,
-                end,
-                center,
-                radius,
-                (sang1, sang2) if sang1 is not None and sang2 is not None else None,
-                (eang1, eang2) if eang1 is not None and eang2 is not None else None,
+    # ------------------------------------------------------------------
+    # Incremental rebuild
+    # ------------------------------------------------------------------
+    def _rebuild_incremental(self, sg_data) -> bool:
+        sg_sects = sg_data.sects
+        total = len(sg_sects)
+        if (
+            self._offsets is None
+            or len(self.sections) != total
+            or len(self._signatures) != total
+        ):
+            return False
+
+        if self._dirty_range is None:
+            candidates = range(total)
+        else:
+            candidates = range(max(0, self._dirty_range[0]), min(total, self._dirty_range[1]))
+        changed: list[int] = []
+        signatures: dict[int, tuple] = {}
+        for index in candidates:
+            signature = _section_signature(sg_sects[index])
+            if signature != self._signatures[index]:
+                changed.append(index)
+                signatures[index] = signature
+        if len(changed) > total * self.INCREMENTAL_MAX_FRACTION:
+            return False
+
+        sections = list(self.sections)
+        moved: list[int] = []
+        for index in changed:
+            section = self._build_section(index, sg_sects[index])
+            if section.polyline != sections[index].polyline:
+                moved.append(index)
+            sections[index] = section
+
+        if moved and not self._patch_centerline(sections, moved[0], moved[-1] + 1):
+            return False
+
+        for index in changed:
+            self._signatures[index] = signatures[index]
+        self.sections = sections
+        if changed:
+            self.section_endpoints = list(self.section_endpoints)
+            for index in changed:
+                self.section_endpoints[index] = (sections[index].start, sections[index].end)
+        if moved:
+            self.track_length = float(self.sampled_dlongs[-1])
+            self.start_finish_mapping = compute_start_finish_mapping_from_centerline(
+                self.sampled_centerline
             )
 
-            start_heading, end_heading = derive_heading_vectors(
-                polyline, sang1, sang2, eang1, eang2
+        if self.verify_incremental and not self._matches_full_rebuild(sg_data):
+            logger.warning("Incremental geometry rebuild diverged; using a full rebuild.")
+            return False
+        return True
+
+    def _patch_centerline(self, sections: list[SectionPreview], first: int, stop: int) -> bool:
+        """Splice the samples of ``sections[first:stop]`` into the centreline."""
+        offsets = self._offsets
+        points = self.sampled_centerline
+        dlongs = self.sampled_dlongs
+        total = len(sections)
+
+        # The section after the range may gain or lose its joined first point.
+        end = min(stop + 1, total)
+        while end < total and not sections[end - 1].polyline:
+            end += 1
+        lo = offsets[first]
+        hi = offsets[end]
+
+        last: Point | None = points[lo - 1] if lo > 0 else None
+        new_points: list[Point] = []
+        counts: list[int] = []
+        for index in range(first, end):
+            polyline = sections[index].polyline
+            if not polyline:
+                counts.append(0)
+                continue
+            contribution = polyline[1:] if last is not None and last == polyline[0] else polyline
+            new_points.extend(contribution)
+            counts.append(len(contribution))
+            last = polyline[-1]
+
+        count_delta = len(new_points) - (hi - lo)
+        new_total = len(points) + count_delta
+        if new_total < 2:
+            return False
+
+        old_slice = points[lo:hi]
+        patched_points = points[:lo] + new_points + points[hi:]
+
+        patched_dlongs = dlongs[:lo]
+        distance = patched_dlongs[-1] if patched_dlongs else 0.0
+        previous = patched_points[lo - 1] if lo > 0 else None
+        for point in new_points:
+            if previous is not None:
+                distance += math.hypot(point[0] - previous[0], point[1] - previous[1])
+            patched_dlongs.append(distance)
+            previous = point
+        tail_start = lo + len(new_points)
+        if tail_start < new_total:
+            point = patched_points[tail_start]
+            head = (
+                distance + math.hypot(point[0] - previous[0], point[1] - previous[1])
+                if previous is not None
+                else 0.0
             )
+            shift = head - dlongs[hi]
+            patched_dlongs.extend(value + shift for value in dlongs[hi:])
 
-            sections.append(
-                SectionPreview(
-                    section_id=idx,
-                    source_section_id=idx,
-                    type_name=type_name,
-                    previous_id=int(getattr(sg_sect, "sec_prev", idx - 1)),
-                    next_id=int(getattr(sg_sect, "sec_next", idx + 1)),
-                    start=start,
-                    end=end,
-                    start_dlong=start_dlong,
-                    length=length,
-                    center=center,
-                    sang1=sang1,
-                    sang2=sang2,
-                    eang1=eang1,
-                    eang2=eang2,
-                    radius=radius,
-                    start_heading=start_heading,
-                    end_heading=end_heading,
-                    polyline=polyline,
-                )
+        bounds = self._patched_bounds(patched_points, old_slice, new_points)
+
+        index = None
+        if self._grid_fits(bounds):
+            index = update_centerline_index(
+                self.centerline_index, patched_points, lo, hi, lo + len(new_points)
             )
+        if index is None:
+            index = build_centerline_index(patched_points, bounds)
 
-        for i, sect in enumerate(sections):
-            object.__setattr__(sect, "section_id", i)
+        patched_offsets = offsets[: first + 1]
+        for count in counts:
+            patched_offsets.append(patched_offsets[-1] + count)
+        patched_offsets.extend(offset + count_delta for offset in offsets[end + 1 :])
 
-        assert all(
-            i == sect.section_id
-            for i, sect in enumerate(sections)
-        ), "SectionPreview.section_id must equal list index"
+        self.sampled_centerline = patched_points
+        self.sampled_dlongs = patched_dlongs
+        self.sampled_bounds = bounds
+        self.centerline_index = index
+        self._offsets = patched_offsets
+        return True
 
-        return sections
+    def _grid_fits(self, bounds: tuple[float, float, float, float]) -> bool:
+        layout = self.centerline_index.bounds if self.centerline_index is not None else None
+        if layout is None:
+            return False
+        old_span = max(layout[1] - layout[0], layout[3] - layout[2])
+        new_span = max(bounds[1] - bounds[0], bounds[3] - bounds[2])
+        if old_span <= 0 or new_span <= 0:
+            return False
+        return 1.0 / self.GRID_RELAYOUT_FACTOR <= new_span / old_span <= self.GRID_RELAYOUT_FACTOR
+
+    def _patched_bounds(
+        self,
+        points: list[Point],
+        removed: list[Point],
+        added: list[Point],
+    ) -> tuple[float, float, float, float]:
+        bounds = self.sampled_bounds
+        if bounds is not None:
+            min_x, max_x, min_y, max_y = bounds
+            if not any(
+                x in (min_x, max_x) or y in (min_y, max_y) for x, y in removed
+            ):
+                for x, y in added:
+                    min_x = min(min_x, x)
+                    max_x = max(max_x, x)
+                    min_y = min(min_y, y)
+                    max_y = max(max_y, y)
+                return (min_x, max_x, min_y, max_y)
+        return (
+            min(p[0] for p in points),
+            max(p[0] for p in points),
+            min(p[1] for p in points),
+            max(p[1] for p in points),
+        )
+
+    def _matches_full_rebuild(self, sg_data) -> bool:
+        sections = self._build_sections(sg_data)
+        points, dlongs, bounds, index = rebuild_centerline_from_sections(sections)
+        if self.centerline_index is not None and self.centerline_index.bounds != bounds:
+            # Compare against a grid with the same layout as the patched one.
+            index = build_centerline_index(points, self.centerline_index.bounds)
+        return (
+            sections == self.sections
+            and points == self.sampled_centerline
+            and bounds == self.sampled_bounds
+            and len(dlongs) == len(self.sampled_dlongs)
+            and all(
+                math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+                for a, b in zip(dlongs, self.sampled_dlongs)
+            )
+            and index is not None
+            and self.centerline_index is not None
+            and index.segments == self.centerline_index.segments
+            and index.grid == self.centerline_index.grid
+        )
 
     def _assert_section_id_invariant(self) -> None:
         for i, sect in enumerate(self.sections):
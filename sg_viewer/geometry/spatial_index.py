@@ -0,0 +1,166 @@
+"""Uniform-grid index of SG section endpoints and section extents.
+
+Snapping a dragged node and picking a node or section under the cursor used
+to test every section on each mouse move. :class:`SectionSpatialIndex`
+buckets endpoints and polyline bounding boxes into square cells about one
+typical section long, so a query only looks at the few cells around the
+cursor. The preview section manager keeps one index in step with its active
+section list and re-buckets only the sections that changed.
+
+Queries return candidates in section order (``start`` before ``end``); the
+callers still measure the exact distances, so results match a full scan.
+"""
+from __future__ import annotations
+
+import math
+from statistics import median
+from typing import Iterable, Sequence, Tuple
+
+from sg_viewer.model.sg_model import SectionPreview
+
+Point = Tuple[float, float]
+Cell = Tuple[int, int]
+NodeKey = Tuple[int, str]
+BBox = Tuple[float, float, float, float]
+
+_ENDTYPES = ("start", "end")
+
+
+def _node_order(key: NodeKey) -> tuple[int, int]:
+    return key[0], _ENDTYPES.index(key[1])
+
+
+def _section_bbox(section: SectionPreview) -> BBox:
+    points = section.polyline if len(section.polyline) >= 2 else (section.start, section.end)
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class SectionSpatialIndex:
+    """Grid of section endpoints and bounding boxes for snap and pick queries."""
+
+    def __init__(self) -> None:
+        self.sections: Sequence[SectionPreview] | None = None
+        self.cell_size = 1.0
+        self._node_points: dict[NodeKey, Point] = {}
+        self._node_grid: dict[Cell, set[NodeKey]] = {}
+        self._section_boxes: list[BBox] = []
+        self._section_grid: dict[Cell, set[int]] = {}
+
+    def covers(self, sections: Sequence[SectionPreview]) -> bool:
+        """Whether the index reflects exactly this section list."""
+        return self.sections is sections and len(self._section_boxes) == len(sections)
+
+    def rebuild(self, sections: Sequence[SectionPreview]) -> None:
+        self.sections = sections
+        self._node_points = {}
+        self._node_grid = {}
+        self._section_boxes = []
+        self._section_grid = {}
+        boxes = [_section_bbox(section) for section in sections]
+        extents = [max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes]
+        self.cell_size = max(median(extents), 1.0) if extents else 1.0
+        for index, section in enumerate(sections):
+            self._section_boxes.append(boxes[index])
+            self._add_section(index, section, boxes[index])
+
+    def update(self, sections: Sequence[SectionPreview], indices: Iterable[int]) -> None:
+        """Follow ``sections``, re-bucketing the given indices if they moved.
+
+        Sections outside ``indices`` must be unchanged since the last update.
+        A change in section count rebuilds the whole index.
+        """
+        if len(sections) != len(self._section_boxes):
+            self.rebuild(sections)
+            return
+        self.sections = sections
+        for index in set(indices):
+            if not 0 <= index < len(sections):
+                continue
+            section = sections[index]
+            box = _section_bbox(section)
+            if (
+                box == self._section_boxes[index]
+                and self._node_points.get((index, "start")) == section.start
+                and self._node_points.get((index, "end")) == section.end
+            ):
+                continue
+            self._remove_section(index)
+            self._section_boxes[index] = box
+            self._add_section(index, section, box)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def nodes_near(self, point: Point, radius: float) -> list[NodeKey]:
+        """Endpoints whose cell lies within ``radius`` of ``point``."""
+        cells = self._cells_for_box(
+            (point[0] - radius, point[1] - radius, point[0] + radius, point[1] + radius)
+        )
+        if cells is None:
+            return sorted(self._node_points, key=_node_order)
+        found: set[NodeKey] = set()
+        for cell in cells:
+            found.update(self._node_grid.get(cell, ()))
+        return sorted(found, key=_node_order)
+
+    def sections_near(self, point: Point, radius: float) -> list[int]:
+        """Sections whose bounding box may come within ``radius`` of ``point``."""
+        cells = self._cells_for_box(
+            (point[0] - radius, point[1] - radius, point[0] + radius, point[1] + radius)
+        )
+        if cells is None:
+            return list(range(len(self._section_boxes)))
+        found: set[int] = set()
+        for cell in cells:
+            found.update(self._section_grid.get(cell, ()))
+        return sorted(found)
+
+    # ------------------------------------------------------------------
+    # Buckets
+    # ------------------------------------------------------------------
+    def _cell(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cells_for_box(self, box: BBox) -> list[Cell] | None:
+        """Cells overlapping ``box``; ``None`` when a full scan is cheaper."""
+        if not all(math.isfinite(value) for value in box):
+            return None
+        gx0, gy0 = self._cell(box[0], box[1])
+        gx1, gy1 = self._cell(box[2], box[3])
+        if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) > max(len(self._section_boxes), 1):
+            return None
+        return [(gx, gy) for gx in range(gx0, gx1 + 1) for gy in range(gy0, gy1 + 1)]
+
+    def _box_cells(self, box: BBox) -> list[Cell]:
+        gx0, gy0 = self._cell(box[0], box[1])
+        gx1, gy1 = self._cell(box[2], box[3])
+        return [(gx, gy) for gx in range(gx0, gx1 + 1) for gy in range(gy0, gy1 + 1)]
+
+    def _add_section(self, index: int, section: SectionPreview, box: BBox) -> None:
+        for endtype, point in (("start", section.start), ("end", section.end)):
+            key = (index, endtype)
+            self._node_points[key] = point
+            self._node_grid.setdefault(self._cell(*point), set()).add(key)
+        for cell in self._box_cells(box):
+            self._section_grid.setdefault(cell, set()).add(index)
+
+    def _remove_section(self, index: int) -> None:
+        for endtype in _ENDTYPES:
+            key = (index, endtype)
+            point = self._node_points.pop(key, None)
+            if point is None:
+                continue
+            cell = self._cell(*point)
+            members = self._node_grid.get(cell)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._node_grid[cell]
+        for cell in self._box_cells(self._section_boxes[index]):
+            members = self._section_grid.get(cell)
+            if members is not None:
+                members.discard(index)
+                if not members:
+                    del self._section_grid[cell]
@@ -11,6 +11,7 @@ from sg_viewer.geometry.connect_curve_to_straight import (
 )
 from sg_viewer.geometry.dlong import set_start_finish
 from sg_viewer.geometry.picking import project_point_to_segment
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.geometry_core import curve_tangent, directed_angle, heading, is_perfectly_straight_chain, points_close
 from sg_viewer.geometry.sg_geometry import assert_section_geometry_consistent, update_section_geometry
 from sg_viewer.geometry.topology import is_closed_loop
@@ -248,12 +249,13 @@ class PreviewGeometryDomainService:
     def can_start_shared_node_drag(self, node: tuple[int, EndType], sections: list[SectionPreview]) -> bool:
         return self._shared_straight_pair(node, sections) is not None or self._shared_curve_pair(node, sections) is not None
 
-    def find_connection_target(self, dragged_key: tuple[int, EndType], dragged_pos: Point, sections: list[SectionPreview], snap_radius: float) -> tuple[int, EndType] | None:
+    def find_connection_target(self, dragged_key: tuple[int, EndType], dragged_pos: Point, sections: list[SectionPreview], snap_radius: float, spatial_index: SectionSpatialIndex | None = None) -> tuple[int, EndType] | None:
         return find_unconnected_node_target(
             dragged_key=dragged_key,
             dragged_pos=dragged_pos,
             sections=sections,
             snap_radius=snap_radius,
+            spatial_index=spatial_index,
         )
     def validate_sections(self, sections: list[SectionPreview]) -> None:
         if __debug__:
@@ -3,13 +3,24 @@
 The parser builds an organizational map of generated track .3D source:
 DYNAMIC TSO definitions, ObjectList definitions, FACE blocks, section LOD
 lists, index entries, and per-section summary data.
+
+Parsing is not streamed: the whole file is decoded and kept in memory with
+its lines, and spans carry character offsets into that text because the edit
+plans in :mod:`sg_viewer.io.track3d_edit_plan` splice it by offset. The first
+parse of a large file is therefore proportional to its size (several seconds
+for the 56 MB file in ``benchmarks/run.py track3d_catalog``); repeat parses of
+an unchanged file come from :func:`track3d_index`'s cache.
 """
 
 from __future__ import annotations
 
 import collections
 import re
+import string
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import accumulate
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +32,20 @@ DETAIL_RE = re.compile(r"^(DetailList_(\d+)-(\d+)([HML]?)):\s*LIST\s*\{(.*?)\}\s
 FACE_RE = re.compile(r"^(sec(?P<section>\d+)_s(?P<sub>\d+)_(?P<lod>HI|MED|LO)):\s+FACE\b")
 SEC_LIST_RE = re.compile(r"^(sec(\d+)_l(\d+)):\s*LIST\s*\{(.*?)\}\s*;", re.S)
 DLONG_RE = re.compile(r"Outputing section from dlong\s*=\s*(\d+)\s*to dlong\s*=\s*(\d+)")
+_SECTION_LIST_LABEL_RE = re.compile(r"^sec\d+_l\d+$")
+# Face block references. The leading word boundary is checked in
+# ``_word_refs`` because a pattern starting with ``\b`` loses the regex
+# engine's literal-prefix search and is several times slower on large blocks.
+_OBJECT_REF_RE = re.compile(r"ObjectList_[LR]\d+_\d+\b")
+_DETAIL_REF_RE = re.compile(r"DetailList_\d+-\d+[HML]?\b")
+_TOPO_REF_RE = re.compile(r"TOPO_sec\d+_s\d+_[LR]_(?:HI|MED|LO)\b")
+_MATERIAL_RE = re.compile(r'MIP\s*=\s*"([^"]+)"|__([A-Za-z0-9_]+)__\.c')
+_LABEL_START_CHARS = frozenset(string.ascii_letters + "_")
+# Whole-text searches for the lines worth matching against LABEL_RE and
+# DLONG_RE; see ``_label_candidates``.
+_LABEL_LINE_RE = re.compile(r"\n[A-Za-z_]")
+_DLONG_TEXT_RE = re.compile(r"Outputing section from dlong")
+_OTHER_LINE_BREAKS = ("\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
 
 
 @dataclass(frozen=True)
@@ -173,195 +198,365 @@ def label_positions(lines: list[str]) -> list[tuple[int, str, str]]:
     return out
 
 
-def parse_track3d_catalog(path: str | Path) -> Track3DCatalog:
-    """Parse a text .3D file into a typed catalog of track entities."""
-    path = Path(path)
-    text = path.read_text(errors="replace")
-    lines = text.splitlines()
-    offsets = line_offsets(text)
-    labels = label_positions(lines)
-
-    tsos: dict[str, Track3DTsoDefinition] = {}
-    for i, label, _rest in labels:
-        stmt, start, end = capture_statement(lines, i)
-        m = TSO_RE.match(stmt.strip())
-        if not m:
-            continue
-        nums = [int(x.strip()) for x in m.group(2).replace("\n", " ").split(",")]
-        tsos[m.group(1)] = Track3DTsoDefinition(
-            line=i + 1,
-            span=source_span(lines, offsets, start, end),
-            x=nums[0],
-            y=nums[1],
-            z=nums[2],
-            rot=nums[3],
-            extern=m.group(3),
-            params=nums,
-        )
+def _label_candidates(text: str, lines: list[str], starts: list[int]) -> list[int]:
+    """Indexes of the lines that start with a character a label can start with.
 
-    object_lists: dict[str, Track3DObjectListDefinition] = {}
-    for i, label, _rest in labels:
-        if not label.startswith("ObjectList_"):
-            continue
-        stmt, start, end = capture_statement(lines, i)
-        m = OBJ_RE.match(stmt.strip())
-        if not m:
+    When every line ends in ``\\n`` or ``\\r\\n`` the lines are found with one
+    search of ``text``; any other line break ``str.splitlines`` honours falls
+    back to checking each line.
+    """
+    if text.count("\r") != text.count("\r\n") or any(
+        char in text for char in _OTHER_LINE_BREAKS
+    ):
+        return [i for i, line in enumerate(lines) if line[:1] in _LABEL_START_CHARS]
+    candidates = [0] if text[:1] in _LABEL_START_CHARS else []
+    candidates.extend(bisect_left(starts, found.start() + 1) for found in _LABEL_LINE_RE.finditer(text))
+    return candidates
+
+
+def _word_refs(pattern: re.Pattern[str], block: str) -> list[str]:
+    """Sorted unique matches of ``pattern`` that start on a word boundary."""
+    refs: set[str] = set()
+    for match in pattern.finditer(block):
+        start = match.start()
+        if start > 0 and (block[start - 1].isalnum() or block[start - 1] == "_"):
             continue
-        items = [x.strip() for x in m.group(5).replace("\n", " ").split(",") if x.strip()]
-        object_lists[label] = Track3DObjectListDefinition(
-            line=i + 1,
-            span=source_span(lines, offsets, start, end),
-            side=m.group(2),
-            section=int(m.group(3)),
-            subsection=int(m.group(4)),
-            items=items,
-            externs=[tsos.get(item).extern if item in tsos else None for item in items],
-        )
+        refs.add(match.group(0))
+    return sorted(refs)
 
-    detail_lists: dict[str, Track3DDetailListDefinition] = {}
-    for i, label, _rest in labels:
-        if not label.startswith("DetailList_"):
-            continue
-        stmt, start, end = capture_statement(lines, i)
-        m = DETAIL_RE.match(stmt.strip())
-        if not m:
-            continue
-        items = [x.strip() for x in m.group(5).replace("\n", " ").split(",") if x.strip()]
-        detail_lists[label] = Track3DDetailListDefinition(
-            line=i + 1,
-            span=source_span(lines, offsets, start, end),
-            section=int(m.group(2)),
-            subsection=int(m.group(3)),
-            lod_suffix=m.group(4),
-            items=items,
-            externs=[tsos.get(item).extern if item in tsos else None for item in items],
-        )
 
-    face_positions: list[tuple[int, str, int, int, str, tuple[int, int] | None]] = []
-    for i, line in enumerate(lines):
-        m = FACE_RE.match(line)
-        if not m:
-            continue
-        dlong = None
-        for k in range(max(0, i - 5), i):
-            dm = DLONG_RE.search(lines[k])
+_INDEX_CACHE_SIZE = 4
+_INDEX_CACHE: "collections.OrderedDict[Path, tuple[tuple[int, int], Track3DIndex]]" = (
+    collections.OrderedDict()
+)
+
+
+class Track3DIndex:
+    """Label index over a text .3D file.
+
+    Building the index records every label with its line and character offset, the
+    FACE labels with their preceding DLONG comment, and the label lines in
+    sorted order so the end of a block is a bisect away. Typed definitions
+    (TSOs, lists, faces, ...) are only parsed when first accessed, and
+    :meth:`catalog` assembles them into a :class:`Track3DCatalog`. Label
+    and DLONG lines are found by searching the whole text rather than by
+    matching every line, most of which are FACE vertex data.
+
+    Use :func:`track3d_index` to share one index per file; indexes and the
+    catalogs they return are cached and must be treated as read-only.
+    """
+
+    def __init__(self, text: str, source: str = "") -> None:
+        self.source = source
+        self.lines = text.splitlines()
+        starts = list(accumulate(map(len, text.splitlines(keepends=True)), initial=0))
+        # The last start is the end of the text, not a line.
+        self.offsets: list[int] = starts[:-1] or [0]
+        # (line index, label, rest of line) for every label, in file order.
+        self.labels: list[tuple[int, str, str]] = []
+        self.label_lines: list[int] = []
+        self._face_positions: list[
+            tuple[int, str, int, int, str, tuple[int, int] | None]
+        ] = []
+
+        dlong_lines: list[int] = []
+        dlongs: list[tuple[int, int]] = []
+        for found in _DLONG_TEXT_RE.finditer(text):
+            i = bisect_right(starts, found.start()) - 1
+            if dlong_lines and dlong_lines[-1] == i:
+                continue
+            dm = DLONG_RE.search(self.lines[i])
             if dm:
-                dlong = (int(dm.group(1)), int(dm.group(2)))
-        face_positions.append((i, m.group(1), int(m.group("section")), int(m.group("sub")), m.group("lod"), dlong))
-
-    faces: list[Track3DFaceBlock] = []
-    label_indices = [pos for pos, _label, _rest in labels]
-    for idx, (i, label, section, subsection, lod, dlong) in enumerate(face_positions):
-        next_labels = [pos for pos in label_indices if pos > i]
-        end = next_labels[0] if next_labels else len(lines)
-        block = "\n".join(lines[i:end])
-        object_refs = sorted(set(re.findall(r"\bObjectList_[LR]\d+_\d+\b", block)))
-        detail_refs = sorted(set(re.findall(r"\bDetailList_\d+-\d+[HML]?\b", block)))
-        topo_refs = sorted(set(re.findall(r"\bTOPO_sec\d+_s\d+_[LR]_(?:HI|MED|LO)\b", block)))
-        mats = []
-        for mip_name, texture_name in re.findall(r'MIP\s*=\s*"([^"]+)"|__([A-Za-z0-9_]+)__\.c', block):
-            mats.append(mip_name or texture_name)
-        faces.append(Track3DFaceBlock(
-            label=label,
-            line=i + 1,
-            span=source_span(lines, offsets, i, end - 1),
-            section=section,
-            subsection=subsection,
-            lod=lod,
-            dlong_start=dlong[0] if dlong else None,
-            dlong_end=dlong[1] if dlong else None,
-            object_lists=object_refs,
-            detail_lists=detail_refs,
-            topo_lists=topo_refs,
-            materials=sorted(set(mats)),
-        ))
-
-    section_lists: dict[str, Track3DSectionList] = {}
-    for i, label, _rest in labels:
-        if not re.match(r"^sec\d+_l\d+$", label):
-            continue
-        stmt, start, end = capture_statement(lines, i)
-        m = SEC_LIST_RE.match(stmt.strip())
-        if not m:
-            continue
-        body = m.group(4)
-        data = re.search(r"DATA\s*\{([^}]*)\}", body, re.S)
-        dlongs = [int(x) for x in re.findall(r"\d+", data.group(1))] if data else []
-        front = re.sub(r"DATA\s*\{.*?\}", "", body, flags=re.S)
-        entries = [x.strip() for x in front.split(",") if x.strip()]
-        section_lists[label] = Track3DSectionList(
-            line=i + 1,
-            span=source_span(lines, offsets, start, end),
-            section=int(m.group(2)),
-            layout=int(m.group(3)),
-            entries=entries,
-            dlongs=dlongs,
+                dlong_lines.append(i)
+                dlongs.append((int(dm.group(1)), int(dm.group(2))))
+
+        for i in _label_candidates(text, self.lines, starts):
+            line = self.lines[i]
+            m = LABEL_RE.match(line)
+            if not m:
+                continue
+            self.labels.append((i, m.group(1), m.group(2)))
+            self.label_lines.append(i)
+            fm = FACE_RE.match(line) if line.startswith("sec") else None
+            if fm:
+                # Only a DLONG comment in the five lines above counts.
+                before = bisect_left(dlong_lines, i) - 1
+                dlong = dlongs[before] if before >= 0 and dlong_lines[before] >= i - 5 else None
+                self._face_positions.append(
+                    (
+                        i,
+                        fm.group(1),
+                        int(fm.group("section")),
+                        int(fm.group("sub")),
+                        fm.group("lod"),
+                        dlong,
+                    )
+                )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "Track3DIndex":
+        path = Path(path)
+        return cls(path.read_text(errors="replace"), source=path.name)
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+    def next_label_line(self, line_index: int) -> int:
+        """Return the line of the first label after ``line_index`` (or EOF)."""
+        position = bisect_right(self.label_lines, line_index)
+        if position < len(self.label_lines):
+            return self.label_lines[position]
+        return len(self.lines)
+
+    def statement(self, line_index: int) -> tuple[str, int, int]:
+        """Like :func:`capture_statement`, using the indexed label lines."""
+        stop = self.next_label_line(line_index)
+        for j in range(line_index, stop):
+            if ";" in self.lines[j]:
+                return "\n".join(self.lines[line_index : j + 1]), line_index, j
+        return "\n".join(self.lines[line_index:stop]), line_index, stop - 1
+
+    def span(self, start_idx: int, end_idx: int) -> Track3DSourceSpan:
+        return source_span(self.lines, self.offsets, start_idx, end_idx)
+
+    # ------------------------------------------------------------------
+    # Lazily parsed definitions
+    # ------------------------------------------------------------------
+    @cached_property
+    def tsos(self) -> dict[str, Track3DTsoDefinition]:
+        tsos: dict[str, Track3DTsoDefinition] = {}
+        for i, label, _rest in self.labels:
+            if not label.startswith("__TSO"):
+                continue
+            stmt, start, end = self.statement(i)
+            m = TSO_RE.match(stmt.strip())
+            if not m:
+                continue
+            nums = [int(x.strip()) for x in m.group(2).replace("\n", " ").split(",")]
+            tsos[m.group(1)] = Track3DTsoDefinition(
+                line=i + 1,
+                span=self.span(start, end),
+                x=nums[0],
+                y=nums[1],
+                z=nums[2],
+                rot=nums[3],
+                extern=m.group(3),
+                params=nums,
+            )
+        return tsos
+
+    def _externs(self, items: list[str]) -> list[str | None]:
+        tsos = self.tsos
+        return [tsos[item].extern if item in tsos else None for item in items]
+
+    @cached_property
+    def object_lists(self) -> dict[str, Track3DObjectListDefinition]:
+        object_lists: dict[str, Track3DObjectListDefinition] = {}
+        for i, label, _rest in self.labels:
+            if not label.startswith("ObjectList_"):
+                continue
+            stmt, start, end = self.statement(i)
+            m = OBJ_RE.match(stmt.strip())
+            if not m:
+                continue
+            items = [x.strip() for x in m.group(5).replace("\n", " ").split(",") if x.strip()]
+            object_lists[label] = Track3DObjectListDefinition(
+                line=i + 1,
+                span=self.span(start, end),
+                side=m.group(2),
+                section=int(m.group(3)),
+                subsection=int(m.group(4)),
+                items=items,
+                externs=self._externs(items),
+            )
+        return object_lists
+
+    @cached_property
+    def detail_lists(self) -> dict[str, Track3DDetailListDefinition]:
+        detail_lists: dict[str, Track3DDetailListDefinition] = {}
+        for i, label, _rest in self.labels:
+            if not label.startswith("DetailList_"):
+                continue
+            stmt, start, end = self.statement(i)
+            m = DETAIL_RE.match(stmt.strip())
+            if not m:
+                continue
+            items = [x.strip() for x in m.group(5).replace("\n", " ").split(",") if x.strip()]
+            detail_lists[label] = Track3DDetailListDefinition(
+                line=i + 1,
+                span=self.span(start, end),
+                section=int(m.group(2)),
+                subsection=int(m.group(3)),
+                lod_suffix=m.group(4),
+                items=items,
+                externs=self._externs(items),
+            )
+        return detail_lists
+
+    @cached_property
+    def faces(self) -> list[Track3DFaceBlock]:
+        faces: list[Track3DFaceBlock] = []
+        for i, label, section, subsection, lod, dlong in self._face_positions:
+            end = self.next_label_line(i)
+            block = "\n".join(self.lines[i:end])
+            # Most blocks are vertex data; skip the scans that cannot match.
+            object_refs = _word_refs(_OBJECT_REF_RE, block) if "ObjectList_" in block else []
+            detail_refs = _word_refs(_DETAIL_REF_RE, block) if "DetailList_" in block else []
+            topo_refs = _word_refs(_TOPO_REF_RE, block) if "TOPO_sec" in block else []
+            mats = [mip_name or texture_name for mip_name, texture_name in _MATERIAL_RE.findall(block)]
+            faces.append(Track3DFaceBlock(
+                label=label,
+                line=i + 1,
+                span=Track3DSourceSpan(
+                    start_line=i + 1,
+                    end_line=end,
+                    start_offset=self.offsets[i],
+                    end_offset=self.offsets[end - 1] + len(self.lines[end - 1]),
+                    text=block,
+                ),
+                section=section,
+                subsection=subsection,
+                lod=lod,
+                dlong_start=dlong[0] if dlong else None,
+                dlong_end=dlong[1] if dlong else None,
+                object_lists=object_refs,
+                detail_lists=detail_refs,
+                topo_lists=topo_refs,
+                materials=sorted(set(mats)),
+            ))
+        return faces
+
+    @cached_property
+    def section_lists(self) -> dict[str, Track3DSectionList]:
+        section_lists: dict[str, Track3DSectionList] = {}
+        for i, label, _rest in self.labels:
+            if not _SECTION_LIST_LABEL_RE.match(label):
+                continue
+            stmt, start, end = self.statement(i)
+            m = SEC_LIST_RE.match(stmt.strip())
+            if not m:
+                continue
+            body = m.group(4)
+            data = re.search(r"DATA\s*\{([^}]*)\}", body, re.S)
+            dlongs = [int(x) for x in re.findall(r"\d+", data.group(1))] if data else []
+            front = re.sub(r"DATA\s*\{.*?\}", "", body, flags=re.S)
+            entries = [x.strip() for x in front.split(",") if x.strip()]
+            section_lists[label] = Track3DSectionList(
+                line=i + 1,
+                span=self.span(start, end),
+                section=int(m.group(2)),
+                layout=int(m.group(3)),
+                entries=entries,
+                dlongs=dlongs,
+            )
+        return section_lists
+
+    @cached_property
+    def index_entries(self) -> tuple[list[str], Track3DSourceSpan | None]:
+        for i, label, _rest in self.labels:
+            if label != "index":
+                continue
+            stmt, start, end = self.statement(i)
+            body = re.search(r"\{(.*?)\}", stmt, re.S)
+            entries: list[str] = []
+            if body:
+                entries = [x.strip() for x in body.group(1).replace("\n", " ").split(",") if x.strip()]
+            return entries, self.span(start, end)
+        return [], None
+
+    def section_summary(self) -> list[Track3DSectionSummary]:
+        by_section: dict[int, Any] = collections.defaultdict(
+            lambda: {
+                "subsections": set(),
+                "lod_counts": collections.Counter(),
+                "dlong_ranges": set(),
+                "object_lists": set(),
+                "detail_lists": set(),
+                "section_lists": set(),
+            }
         )
 
-    index_entries: list[str] = []
-    index_span: Track3DSourceSpan | None = None
-    for i, label, _rest in labels:
-        if label != "index":
-            continue
-        stmt, start, end = capture_statement(lines, i)
-        index_span = source_span(lines, offsets, start, end)
-        body = re.search(r"\{(.*?)\}", stmt, re.S)
-        if body:
-            index_entries = [x.strip() for x in body.group(1).replace("\n", " ").split(",") if x.strip()]
-        break
-
-    by_section: dict[int, Any] = collections.defaultdict(
-        lambda: {
-            "subsections": set(),
-            "lod_counts": collections.Counter(),
-            "dlong_ranges": set(),
-            "object_lists": set(),
-            "detail_lists": set(),
-            "section_lists": set(),
-        }
-    )
-
-    for face in faces:
-        bucket = by_section[face.section]
-        bucket["subsections"].add(face.subsection)
-        bucket["lod_counts"][face.lod] += 1
-        if face.dlong_start is not None and face.dlong_end is not None:
-            bucket["dlong_ranges"].add((face.dlong_start, face.dlong_end))
-        bucket["object_lists"].update(face.object_lists)
-        bucket["detail_lists"].update(face.detail_lists)
-
-    for label, sec_list in section_lists.items():
-        by_section[sec_list.section]["section_lists"].add(label)
-
-    section_summary = [
-        Track3DSectionSummary(
-            section=section,
-            subsections=sorted(bucket["subsections"]),
-            lod_counts=dict(bucket["lod_counts"]),
-            dlong_ranges=sorted(bucket["dlong_ranges"]),
-            object_lists=sorted(bucket["object_lists"]),
-            detail_lists=sorted(bucket["detail_lists"]),
-            section_lists=sorted(bucket["section_lists"]),
+        for face in self.faces:
+            bucket = by_section[face.section]
+            bucket["subsections"].add(face.subsection)
+            bucket["lod_counts"][face.lod] += 1
+            if face.dlong_start is not None and face.dlong_end is not None:
+                bucket["dlong_ranges"].add((face.dlong_start, face.dlong_end))
+            bucket["object_lists"].update(face.object_lists)
+            bucket["detail_lists"].update(face.detail_lists)
+
+        for label, sec_list in self.section_lists.items():
+            by_section[sec_list.section]["section_lists"].add(label)
+
+        return [
+            Track3DSectionSummary(
+                section=section,
+                subsections=sorted(bucket["subsections"]),
+                lod_counts=dict(bucket["lod_counts"]),
+                dlong_ranges=sorted(bucket["dlong_ranges"]),
+                object_lists=sorted(bucket["object_lists"]),
+                detail_lists=sorted(bucket["detail_lists"]),
+                section_lists=sorted(bucket["section_lists"]),
+            )
+            for section, bucket in sorted(by_section.items())
+        ]
+
+    @cached_property
+    def catalog(self) -> Track3DCatalog:
+        """Every definition in the file as a :class:`Track3DCatalog`."""
+        index_entries, index_span = self.index_entries
+        return Track3DCatalog(
+            source=self.source,
+            counts={
+                "tsos": len(self.tsos),
+                "object_lists": len(self.object_lists),
+                "detail_lists": len(self.detail_lists),
+                "faces": len(self.faces),
+                "section_lists": len(self.section_lists),
+                "index_entries": len(index_entries),
+            },
+            tsos=self.tsos,
+            object_lists=self.object_lists,
+            detail_lists=self.detail_lists,
+            faces=self.faces,
+            section_lists=self.section_lists,
+            index=index_entries,
+            index_span=index_span,
+            section_summary=self.section_summary(),
         )
-        for section, bucket in sorted(by_section.items())
-    ]
-
-    return Track3DCatalog(
-        source=path.name,
-        counts={
-            "tsos": len(tsos),
-            "object_lists": len(object_lists),
-            "detail_lists": len(detail_lists),
-            "faces": len(faces),
-            "section_lists": len(section_lists),
-            "index_entries": len(index_entries),
-        },
-        tsos=tsos,
-        object_lists=object_lists,
-        detail_lists=detail_lists,
-        faces=faces,
-        section_lists=section_lists,
-        index=index_entries,
-        index_span=index_span,
-        section_summary=section_summary,
-    )
+
+
+def track3d_index(path: str | Path) -> Track3DIndex:
+    """Return the shared :class:`Track3DIndex` for ``path``.
+
+    Indexes are cached by resolved path, modification time and size, so a
+    file is only read again after it changes on disk.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _INDEX_CACHE.get(resolved)
+    if cached is not None and cached[0] == stamp:
+        _INDEX_CACHE.move_to_end(resolved)
+        return cached[1]
+    index = Track3DIndex(resolved.read_text(errors="replace"), source=Path(path).name)
+    _INDEX_CACHE[resolved] = (stamp, index)
+    _INDEX_CACHE.move_to_end(resolved)
+    while len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+        _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def invalidate_track3d_index(path: str | Path) -> None:
+    """Drop the cached index for ``path`` after writing to it."""
+    _INDEX_CACHE.pop(Path(path).resolve(), None)
+
+
+def parse_track3d_catalog(path: str | Path) -> Track3DCatalog:
+    """Parse a text .3D file into a typed catalog of track entities."""
+    return track3d_index(path).catalog
+
+
+def parse_track3d_catalog_text(text: str, source: str = "") -> Track3DCatalog:
+    """Parse .3D source text that is not (or not yet) saved to a file."""
+    return Track3DIndex(text, source=source).catalog
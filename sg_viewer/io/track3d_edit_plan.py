@@ -128,6 +128,9 @@ class Track3DEditPlan:
         backup_path = self.create_backup(timestamp=timestamp)
         with self.original_path.open("w", encoding="utf-8", newline="") as handle:
             handle.write(edited_text)
+        from sg_viewer.io.track3d_catalog import invalidate_track3d_index
+
+        invalidate_track3d_index(self.original_path)
         return backup_path
 
 
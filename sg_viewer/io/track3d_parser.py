@@ -1,12 +1,13 @@
-import re
 import shutil
 from datetime import datetime
 from dataclasses import dataclass
 from pathlib import Path
 
+from icr2_core.three_d.track3d_scan import scan_track3d
 from sg_viewer.io.track3d_catalog import (
     Track3DDetailListDefinition,
     Track3DObjectListDefinition,
+    invalidate_track3d_index,
     parse_track3d_catalog,
 )
 
@@ -62,26 +63,16 @@ class Track3DSectionDlongList:
     dlongs: tuple[int, ...]
 
 
-_TRACK3D_VERTEX_RE = re.compile(
-    r"\[<\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*>\]"
-)
-
-
 def calculate_track3d_xy_bounding_box(path: str | Path) -> Track3DBoundingBox:
     """Return the X/Y bounding box for vertex definitions in a text .3D file."""
-    text = Path(path).read_text(encoding="utf-8", errors="replace")
-    xs: list[float] = []
-    ys: list[float] = []
-    for match in _TRACK3D_VERTEX_RE.finditer(text):
-        xs.append(float(match.group(1)))
-        ys.append(float(match.group(2)))
-    if not xs or not ys:
+    stats = scan_track3d(path)
+    if not stats.vertices:
         raise ValueError("No vertex coordinates were found in the selected .3D file.")
     return Track3DBoundingBox(
-        min_x=min(xs),
-        min_y=min(ys),
-        max_x=max(xs),
-        max_y=max(ys),
+        min_x=stats.min_x,
+        min_y=stats.min_y,
+        max_x=stats.max_x,
+        max_y=stats.max_y,
     )
 
 
@@ -314,6 +305,7 @@ def save_object_lists_to_track3d(
         )
 
     track3d_path.write_text(updated_text, encoding="utf-8")
+    invalidate_track3d_index(track3d_path)
 
     return backup_path
 
@@ -368,4 +360,5 @@ def save_detail_lists_to_track3d(
         )
 
     track3d_path.write_text(updated_text, encoding="utf-8")
+    invalidate_track3d_index(track3d_path)
     return backup_path
@@ -3,12 +3,93 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import copy
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Hashable, NamedTuple, Sequence
 
 if TYPE_CHECKING:
     from sg_viewer.model.sg_model import SectionPreview
 
+# Rough footprint of one section record kept alive by history, used to cap
+# undo memory; polyline points dominate for curves.
+SECTION_BASE_BYTES = 640
+POLYLINE_POINT_BYTES = 120
+
+
+class SectionSplice(NamedTuple):
+    """Replace ``old`` with ``new`` starting at list position ``index``."""
+
+    index: int
+    old: tuple["SectionPreview", ...]
+    new: tuple["SectionPreview", ...]
+
+
+def diff_sections(
+    before: Sequence["SectionPreview"],
+    after: Sequence["SectionPreview"],
+) -> tuple[SectionSplice, ...]:
+    """Return the splices that turn ``before`` into ``after``.
+
+    Sections are immutable, so unchanged entries are detected by identity and
+    shared between history states rather than copied. Equal-length lists
+    produce one splice per run of changed indices; otherwise the common
+    prefix and suffix are trimmed into a single splice.
+    """
+
+    if len(before) == len(after):
+        splices: list[SectionSplice] = []
+        run_start: int | None = None
+        for index, (old, new) in enumerate(zip(before, after)):
+            if old is not new:
+                if run_start is None:
+                    run_start = index
+            elif run_start is not None:
+                splices.append(
+                    SectionSplice(run_start, tuple(before[run_start:index]), tuple(after[run_start:index]))
+                )
+                run_start = None
+        if run_start is not None:
+            splices.append(
+                SectionSplice(run_start, tuple(before[run_start:]), tuple(after[run_start:]))
+            )
+        return tuple(splices)
+
+    prefix = 0
+    limit = min(len(before), len(after))
+    while prefix < limit and before[prefix] is after[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and before[len(before) - 1 - suffix] is after[len(after) - 1 - suffix]
+    ):
+        suffix += 1
+    return (
+        SectionSplice(
+            prefix,
+            tuple(before[prefix : len(before) - suffix]),
+            tuple(after[prefix : len(after) - suffix]),
+        ),
+    )
+
+
+def patch_sections(
+    sections: Sequence["SectionPreview"],
+    splices: Sequence[SectionSplice],
+    *,
+    reverse: bool = False,
+) -> list["SectionPreview"]:
+    """Apply ``splices`` to ``sections`` (or undo them when ``reverse``)."""
+
+    result = list(sections)
+    for splice in splices:
+        current, replacement = (splice.new, splice.old) if reverse else (splice.old, splice.new)
+        result[splice.index : splice.index + len(current)] = replacement
+    return result
+
+
+def _section_bytes(section: "SectionPreview") -> int:
+    polyline = getattr(section, "polyline", None) or ()
+    return SECTION_BASE_BYTES + POLYLINE_POINT_BYTES * len(polyline)
+
 
 class EditCommand(ABC):
     """Base class for reversible preview edit commands."""
@@ -21,22 +102,124 @@ class EditCommand(ABC):
     def revert(self) -> list["SectionPreview"]:
         """Revert the command and return the prior section list."""
 
+    def apply_to(self, sections: Sequence["SectionPreview"]) -> list["SectionPreview"]:
+        """Reapply the command on top of ``sections`` (the state it was undone to)."""
+        return self.apply()
+
+    def revert_from(self, sections: Sequence["SectionPreview"]) -> list["SectionPreview"]:
+        """Undo the command given ``sections``, the state it produced."""
+        return self.revert()
+
+    def changed_indices(self) -> list[int] | None:
+        """Indices touched by a length-preserving edit, or ``None`` if unknown."""
+        return None
+
+    def is_based_on(self, sections: Sequence["SectionPreview"]) -> bool:
+        """Return ``True`` when the command was built on top of ``sections``."""
+        return False
+
+    def merge(
+        self,
+        other: "EditCommand",
+        before: Sequence["SectionPreview"],
+        after: Sequence["SectionPreview"],
+    ) -> bool:
+        """Fold ``other``, which took ``before`` to ``after``, into this command."""
+        return False
+
+    def memory_cost(self) -> int:
+        """Approximate bytes kept alive by this command in the history."""
+        return 0
+
+    def compact(self) -> None:
+        """Drop anything only needed for the first :meth:`apply`."""
+
 
 class ReplaceSectionsCommand(EditCommand):
-    """Replace the complete section collection with a new version."""
+    """Replace the section collection, stored as per-section splices.
+
+    The full ``before``/``after`` lists are only held until the edit manager
+    records the command (:meth:`compact`); history then keeps the changed
+    sections and replays them with :meth:`apply_to`/:meth:`revert_from`.
+    Commands sharing a non-``None`` ``merge_key`` may be coalesced.
+    """
 
     def __init__(
         self,
         before: list["SectionPreview"],
         after: list["SectionPreview"],
+        *,
+        merge_key: Hashable | None = None,
     ) -> None:
-        self._before = copy.deepcopy(before)
-        self._after = copy.deepcopy(after)
+        self.merge_key = merge_key
+        self._splices = diff_sections(before, after)
+        self._same_length = len(before) == len(after)
+        self._before: tuple["SectionPreview", ...] | None = tuple(before)
+        self._after: tuple["SectionPreview", ...] | None = tuple(after)
+
+    @property
+    def splices(self) -> tuple[SectionSplice, ...]:
+        return self._splices
 
     def apply(self) -> list["SectionPreview"]:
         """Return the replacement section list for command execution."""
-        return copy.deepcopy(self._after)
+        if self._after is None:
+            raise RuntimeError("Compacted command; use apply_to() with the current sections.")
+        return list(self._after)
 
     def revert(self) -> list["SectionPreview"]:
         """Return the original section list for undo."""
-        return copy.deepcopy(self._before)
+        if self._before is None:
+            raise RuntimeError("Compacted command; use revert_from() with the current sections.")
+        return list(self._before)
+
+    def apply_to(self, sections: Sequence["SectionPreview"]) -> list["SectionPreview"]:
+        return patch_sections(sections, self._splices)
+
+    def revert_from(self, sections: Sequence["SectionPreview"]) -> list["SectionPreview"]:
+        return patch_sections(sections, self._splices, reverse=True)
+
+    def changed_indices(self) -> list[int] | None:
+        if not self._same_length:
+            return None
+        return [
+            splice.index + offset
+            for splice in self._splices
+            for offset in range(len(splice.new))
+        ]
+
+    def is_based_on(self, sections: Sequence["SectionPreview"]) -> bool:
+        before = self._before
+        return (
+            before is not None
+            and len(before) == len(sections)
+            and all(a is b for a, b in zip(before, sections))
+        )
+
+    def merge(
+        self,
+        other: EditCommand,
+        before: Sequence["SectionPreview"],
+        after: Sequence["SectionPreview"],
+    ) -> bool:
+        if (
+            not isinstance(other, ReplaceSectionsCommand)
+            or self.merge_key is None
+            or other.merge_key != self.merge_key
+        ):
+            return False
+        original = self.revert_from(before)
+        self._splices = diff_sections(original, after)
+        self._same_length = len(original) == len(after)
+        return True
+
+    def memory_cost(self) -> int:
+        return sum(
+            _section_bytes(section)
+            for splice in self._splices
+            for section in (*splice.old, *splice.new)
+        )
+
+    def compact(self) -> None:
+        self._before = None
+        self._after = None
@@ -2,32 +2,77 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Callable, Sequence
 
 from sg_viewer.model.edit_commands import EditCommand
-from sg_viewer.model.invariants import InvariantError, validate_sections
+from sg_viewer.model.invariants import (
+    InvariantError,
+    validate_sections,
+    validate_sections_near,
+)
 
 if TYPE_CHECKING:
     from sg_viewer.model.sg_model import SectionPreview
 
+DEFAULT_HISTORY_BYTES = 64 * 1024 * 1024
+DEFAULT_COALESCE_SECONDS = 1.0
+
 
 class EditManager:
-    """Execute reversible edit commands and manage undo/redo stacks."""
+    """Execute reversible edit commands and manage undo/redo stacks.
+
+    The manager remembers the section list it last produced. Commands that
+    report their changed indices against that list are validated only around
+    those indices, and history replays them as diffs on top of it. Commands
+    with matching merge keys executed within ``coalesce_seconds`` of each
+    other share one history entry. History is trimmed oldest-first once the
+    commands' estimated footprint exceeds ``max_history_bytes``.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        max_history_bytes: int = DEFAULT_HISTORY_BYTES,
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._undo_stack: list[EditCommand] = []
         self._redo_stack: list[EditCommand] = []
+        self._sections: tuple["SectionPreview", ...] | None = None
+        self._history_bytes = 0
+        self._last_execute_time: float | None = None
+        self.max_history_bytes = max_history_bytes
+        self.coalesce_seconds = coalesce_seconds
+        self._clock = clock
+
+    @property
+    def history_bytes(self) -> int:
+        """Estimated memory held by the undo and redo stacks."""
+        return self._history_bytes
 
     def execute(self, command: EditCommand) -> list["SectionPreview"]:
         """Execute a command, validate invariants, and record undo history."""
         result = command.apply()
+        previous = self._sections
+        if previous is not None and not command.is_based_on(previous):
+            previous = None
         try:
-            validate_sections(result)
+            self._validate(command, result, previous)
         except InvariantError:
             command.revert()
             raise
-        self._undo_stack.append(command)
+        command.compact()
+
+        now = self._clock()
+        if not self._coalesce(command, previous, result, now):
+            self._undo_stack.append(command)
+            self._history_bytes += command.memory_cost()
+        self._last_execute_time = now
+        self._history_bytes -= sum(item.memory_cost() for item in self._redo_stack)
         self._redo_stack.clear()
+        self._sections = tuple(result)
+        self._trim_history()
         return result
 
     def undo(self) -> list["SectionPreview"] | None:
@@ -35,8 +80,10 @@ class EditManager:
         if not self._undo_stack:
             return None
         command = self._undo_stack.pop()
-        result = command.revert()
+        result = command.revert_from(self._sections) if self._sections is not None else command.revert()
         self._redo_stack.append(command)
+        self._sections = tuple(result)
+        self._last_execute_time = None
         return result
 
     def redo(self) -> list["SectionPreview"] | None:
@@ -44,6 +91,49 @@ class EditManager:
         if not self._redo_stack:
             return None
         command = self._redo_stack.pop()
-        result = command.apply()
+        result = command.apply_to(self._sections) if self._sections is not None else command.apply()
         self._undo_stack.append(command)
+        self._sections = tuple(result)
+        self._last_execute_time = None
         return result
+
+    def _validate(
+        self,
+        command: EditCommand,
+        result: Sequence["SectionPreview"],
+        previous: Sequence["SectionPreview"] | None,
+    ) -> None:
+        # ``previous`` is only given when the command was built on the list
+        # this manager last validated; anything else gets a full check.
+        indices = command.changed_indices()
+        if indices is None or previous is None or len(previous) != len(result):
+            validate_sections(result)
+            return
+        validate_sections_near(result, indices, previous)
+
+    def _coalesce(
+        self,
+        command: EditCommand,
+        previous: Sequence["SectionPreview"] | None,
+        result: Sequence["SectionPreview"],
+        now: float,
+    ) -> bool:
+        if (
+            previous is None
+            or not self._undo_stack
+            or self._redo_stack
+            or self._last_execute_time is None
+            or now - self._last_execute_time > self.coalesce_seconds
+        ):
+            return False
+        top = self._undo_stack[-1]
+        cost_before = top.memory_cost()
+        if not top.merge(command, previous, result):
+            return False
+        self._history_bytes += top.memory_cost() - cost_before
+        return True
+
+    def _trim_history(self) -> None:
+        # Keep the newest entry even if it alone exceeds the budget.
+        while self._history_bytes > self.max_history_bytes and len(self._undo_stack) > 1:
+            self._history_bytes -= self._undo_stack.pop(0).memory_cost()
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from math import isfinite
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 if TYPE_CHECKING:
     from sg_viewer.model.sg_model import SectionPreview
@@ -52,13 +52,20 @@ def assert_consistent_topology(sections: Sequence["SectionPreview"]) -> None:
     if total == 0:
         return
 
-    valid_ids = {-1, *range(total)}
-    for section in sections:
-        if section.previous_id not in valid_ids:
+    _assert_links(sections, sections)
+
+
+def _assert_links(
+    sections: Sequence["SectionPreview"],
+    checked: Iterable["SectionPreview"],
+) -> None:
+    total = len(sections)
+    for section in checked:
+        if not _is_valid_link(section.previous_id, total):
             raise InvariantError(
                 f"Section {section.section_id} has invalid previous_id {section.previous_id}."
             )
-        if section.next_id not in valid_ids:
+        if not _is_valid_link(section.next_id, total):
             raise InvariantError(
                 f"Section {section.section_id} has invalid next_id {section.next_id}."
             )
@@ -82,6 +89,10 @@ def assert_consistent_topology(sections: Sequence["SectionPreview"]) -> None:
                 )
 
 
+def _is_valid_link(link: int, total: int) -> bool:
+    return link in range(-1, total)
+
+
 def assert_geometry_valid(sections: Sequence["SectionPreview"]) -> None:
     """Assert section geometry values are finite and internally coherent.
 
@@ -121,3 +132,42 @@ def validate_sections(sections: Sequence["SectionPreview"]) -> None:
     assert_consistent_topology(sections)
     assert_geometry_valid(sections)
 
+
+def validate_sections_near(
+    sections: Sequence["SectionPreview"],
+    indices: Iterable[int],
+    previous: Sequence["SectionPreview"] | None = None,
+) -> None:
+    """Run the core invariants for ``indices`` and their linked neighbours.
+
+    Only valid for a length-preserving edit of a list that already passed
+    :func:`validate_sections`. ``previous`` is that list; the sections the
+    edited entries used to link to are re-checked too, so a dangling link
+    left behind by the edit is still caught.
+    """
+
+    total = len(sections)
+    touched = [index for index in indices if 0 <= index < total]
+    neighbourhood: set[int] = set(touched)
+    for index in touched:
+        sources = [sections[index]]
+        if previous is not None and index < len(previous):
+            sources.append(previous[index])
+        for section in sources:
+            for link in (section.previous_id, section.next_id):
+                if link != -1 and _is_valid_link(link, total):
+                    neighbourhood.add(link)
+
+    for index in sorted(neighbourhood):
+        section_id = int(sections[index].section_id)
+        if section_id != index:
+            if section_id < 0 or section_id >= total:
+                raise InvariantError(
+                    f"section_id {section_id} is out of bounds for {total} sections."
+                )
+            raise InvariantError(
+                f"section_id/index mismatch at index {index}: section_id={section_id}."
+            )
+    nearby = [sections[index] for index in sorted(neighbourhood)]
+    _assert_links(sections, nearby)
+    assert_geometry_valid([sections[index] for index in touched])
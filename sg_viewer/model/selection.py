@@ -9,6 +9,7 @@ from PyQt5 import QtCore
 
 from track_viewer.geometry import CenterlineIndex, project_point_to_centerline
 
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.model.dlong_mapping import dlong_to_section_position
 from sg_viewer.model.sg_model import SectionPreview
 
@@ -66,6 +67,11 @@ class SelectionManager(QtCore.QObject):
         self._selected_section_points: list[Point] = []
         self._selected_curve_index: int | None = None
         self._section_ranges: list[tuple[float, float]] = []
+        self._spatial_index: SectionSpatialIndex | None = None
+
+    def set_spatial_index(self, spatial_index: SectionSpatialIndex | None) -> None:
+        """Use ``spatial_index`` to narrow picking while it covers the sections."""
+        self._spatial_index = spatial_index
 
     @property
     def selected_section_index(self) -> int | None:
@@ -214,8 +220,19 @@ class SelectionManager(QtCore.QObject):
         if not self._sections:
             return None
 
+        scale, _ = transform
+        candidates: range | list[int] = range(len(self._sections))
+        if (
+            scale > 0
+            and self._spatial_index is not None
+            and self._spatial_index.covers(self._sections)
+        ):
+            # Anything farther than the 10px pick radius is rejected anyway.
+            candidates = self._spatial_index.sections_near(track_point, 10.0 / scale)
         polylines: list[tuple[int, list[Point]]] = [
-            (idx, sect.polyline) for idx, sect in enumerate(self._sections) if len(sect.polyline) >= 2
+            (idx, self._sections[idx].polyline)
+            for idx in candidates
+            if len(self._sections[idx].polyline) >= 2
         ]
 
         if polylines:
@@ -228,7 +245,6 @@ class SelectionManager(QtCore.QObject):
                     best_distance = distance
                     best_index = idx
 
-            scale, _ = transform
             screen_distance = best_distance * max(scale, 0.0)
             logger.debug(
                 "Selection._find_section_by_dlong nearest polyline idx=%s distance=%.3fpx (scale=%.3f)",
@@ -240,6 +256,9 @@ class SelectionManager(QtCore.QObject):
                 return best_index
             return None
 
+        if isinstance(candidates, list) and any(len(sect.polyline) >= 2 for sect in self._sections):
+            return None
+
         if not self._centerline_index or not self._sampled_dlongs or not self._track_length:
             return None
 
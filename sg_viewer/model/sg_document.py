@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 class SGDocument(QtCore.QObject):
     section_changed = QtCore.pyqtSignal(int)
     geometry_changed = QtCore.pyqtSignal()
+    # Sections [start, stop) changed in place; the section list itself did not.
+    sections_geometry_changed = QtCore.pyqtSignal(int, int)
     elevation_changed = QtCore.pyqtSignal(int)
     elevations_bulk_changed = QtCore.pyqtSignal()
     metadata_changed = QtCore.pyqtSignal()
@@ -424,7 +426,7 @@ class SGDocument(QtCore.QObject):
         if __debug__:
             self.validate()
 
-        self.geometry_changed.emit()
+        self.sections_geometry_changed.emit(start_index, len(self._sg_data.sects))
 
     def add_fsection(self, section_id: int, index: int, fsect: FSection) -> None:
         if self._sg_data is None:
@@ -433,7 +435,7 @@ class SGDocument(QtCore.QObject):
         insert_fsection(self._sg_data, section_id, index, fsect)
 
         self.section_changed.emit(section_id)
-        self.geometry_changed.emit()
+        self.sections_geometry_changed.emit(section_id, section_id + 1)
 
     def edit_fsection(self, section_id: int, index: int, **fields: object) -> None:
         if self._sg_data is None:
@@ -442,7 +444,7 @@ class SGDocument(QtCore.QObject):
         update_fsection(self._sg_data, section_id, index, **fields)
 
         self.section_changed.emit(section_id)
-        self.geometry_changed.emit()
+        self.sections_geometry_changed.emit(section_id, section_id + 1)
 
     def remove_fsection(self, section_id: int, index: int) -> None:
         if self._sg_data is None:
@@ -451,7 +453,7 @@ class SGDocument(QtCore.QObject):
         delete_fsection(self._sg_data, section_id, index)
 
         self.section_changed.emit(section_id)
-        self.geometry_changed.emit()
+        self.sections_geometry_changed.emit(section_id, section_id + 1)
 
     def replace_fsections(self, section_id: int, fsects: list[FSection]) -> None:
         if self._sg_data is None:
@@ -460,7 +462,7 @@ class SGDocument(QtCore.QObject):
         replace_fsections(self._sg_data, section_id, fsects)
 
         self.section_changed.emit(section_id)
-        self.geometry_changed.emit()
+        self.sections_geometry_changed.emit(section_id, section_id + 1)
 
     def validate(self) -> None:
         sg_data = self._sg_data
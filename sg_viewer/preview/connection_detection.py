@@ -1,6 +1,7 @@
 from typing import Optional, Tuple
 
 from sg_viewer.geometry.picking import find_connection_target
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.preview.selection import build_node_positions
 from sg_viewer.model.preview_state_utils import is_disconnected_endpoint
 
@@ -12,9 +13,21 @@ def find_unconnected_node_target(
     dragged_pos: Point,
     sections,
     snap_radius: float,
+    spatial_index: SectionSpatialIndex | None = None,
 ) -> Optional[tuple[int, str]]:
 
-    node_positions = build_node_positions(sections)
+    if spatial_index is not None and spatial_index.covers(sections):
+        # Only endpoints in the grid cells around the cursor can be in range.
+        if not 0 <= dragged_key[0] < len(sections):
+            return None
+        candidate_keys = spatial_index.nodes_near(dragged_pos, snap_radius)
+        node_positions = {
+            key: sections[key[0]].start if key[1] == "start" else sections[key[0]].end
+            for key in candidate_keys
+        }
+        node_positions.setdefault(dragged_key, dragged_pos)
+    else:
+        node_positions = build_node_positions(sections)
 
     nodes = []
     dragged_node = None
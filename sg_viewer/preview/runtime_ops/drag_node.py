@@ -52,6 +52,7 @@ class _RuntimeCoreDragNodeMixin:
                 transform,
                 self._widget_height(),
                 self._node_radius_px,
+                self._section_manager.spatial_index,
             )
 
         return CreationEventContext(
@@ -60,6 +60,9 @@ class _RuntimeCoreBaseMixin:
 
         self._document.section_changed.connect(self._on_section_changed)
         self._document.geometry_changed.connect(self._on_geometry_changed)
+        self._document.sections_geometry_changed.connect(
+            self._on_sections_geometry_changed
+        )
         self._document.elevation_changed.connect(self._on_elevation_changed)
         self._document.elevations_bulk_changed.connect(self._on_elevations_bulk_changed)
 
@@ -125,6 +128,7 @@ class _RuntimeCoreBaseMixin:
         self._last_elevation_recalc_message: str | None = None
 
         self._selection = selection.SelectionManager()
+        self._selection.set_spatial_index(self._section_manager.spatial_index)
         self._selection.selectionChanged.connect(self._on_selection_changed)
 
         self._creation_controller = CreationController()
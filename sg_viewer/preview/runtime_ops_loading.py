@@ -55,6 +55,10 @@ class _RuntimeLoadingMixin:
         self._bump_sg_version()
         self._refresh_from_document(mark_unsaved=not self._suppress_document_dirty)
 
+    def _on_sections_geometry_changed(self, start: int, stop: int) -> None:
+        _ = start, stop
+        self._on_geometry_changed()
+
     def _on_elevation_changed(self, section_id: int) -> None:
         sg_data = self._document.sg_data
         if sg_data is None:
@@ -7,9 +7,9 @@ from types import SimpleNamespace
 
 from icr2_core.trk.sg_classes import SGFile
 from icr2_core.sg_elevation import (
-    _sg_altitude_at_with_dlats,
     sample_sg_elevation,
     sample_sg_elevation_with_dlats,
+    sample_sg_section_elevations_with_dlats,
 )
 from sg_viewer.preview.edit_session import apply_preview_to_sgfile
 from sg_viewer.preview.sg_overlay_builder import build_sg_preview_model
@@ -216,34 +216,29 @@ class _RuntimePersistenceMixin:
         altitudes: list[float],
         section_offsets: list[tuple[int, int] | None],
         section_indices: set[int],
-        dlat_norm: float,
+        xsect_index: int,
         dlats: list[float],
         min_dlat: float,
         max_dlat: float,
         samples_per_section: int,
     ) -> None:
-        sections = list(sgfile.sects)
-        for section_index in section_indices:
-            if section_index < 0 or section_index >= len(sections):
+        refreshed = sample_sg_section_elevations_with_dlats(
+            sgfile,
+            xsect_index,
+            section_indices,
+            dlats,
+            min_dlat,
+            max_dlat,
+            resolution=samples_per_section,
+        )
+        for section_index, samples in refreshed.items():
+            if section_index >= len(section_offsets):
                 continue
             offset_info = section_offsets[section_index]
             if offset_info is None:
                 continue
             start_index, count = offset_info
-            sg_length = float(sections[section_index].length)
-            if sg_length <= 0:
-                continue
-            for step in range(count):
-                fraction = step / samples_per_section
-                altitudes[start_index + step] = _sg_altitude_at_with_dlats(
-                    sgfile,
-                    section_index,
-                    fraction,
-                    dlat_norm,
-                    dlats,
-                    min_dlat,
-                    max_dlat,
-                )
+            altitudes[start_index : start_index + count] = samples[:count]
 
     def save_sg(self, path: Path) -> None:
         """Write the current SG (and any edits) to ``path``."""
@@ -327,11 +322,6 @@ class _RuntimePersistenceMixin:
             dlongs, section_ranges, section_offsets = cached
         min_dlat = min(dlats)
         max_dlat = max(dlats)
-        dlat_norm = (
-            0.0
-            if min_dlat == max_dlat
-            else (dlats[xsect_index] - min_dlat) / (max_dlat - min_dlat)
-        )
         alt_cache_key = (samples_per_section, self._sg_version, xsect_index)
         sg_altitudes = self._elevation_profile_alt_cache.get(alt_cache_key)
         dirty_sections = self._elevation_profile_dirty.setdefault(alt_cache_key, set())
@@ -352,7 +342,7 @@ class _RuntimePersistenceMixin:
                 sg_altitudes,
                 section_offsets,
                 dirty_sections,
-                dlat_norm,
+                xsect_index,
                 dlats,
                 min_dlat,
                 max_dlat,
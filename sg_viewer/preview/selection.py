@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Tuple
 
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.model.preview_state_utils import is_disconnected_endpoint
 from sg_viewer.model.sg_model import SectionPreview
 from sg_viewer.preview.geometry import heading_for_endpoint
@@ -27,12 +28,14 @@ def find_unconnected_node_hit(
     transform: Transform | None,
     widget_height: float,
     radius_px: float,
+    spatial_index: SectionSpatialIndex | None = None,
 ) -> tuple[int, str, Point, tuple[float, float] | None] | None:
     """Return unconnected node hit details for a screen position.
 
     ``pos`` is a screen-space ``(x, y)`` tuple. ``transform`` maps world
     coordinates to screen via ``(scale, (ox, oy))``. The result is ``None`` when
-    no disconnected endpoint is within ``radius_px`` pixels.
+    no disconnected endpoint is within ``radius_px`` pixels. When
+    ``spatial_index`` covers ``sections`` only nearby endpoints are tested.
     """
 
     if transform is None:
@@ -42,19 +45,25 @@ def find_unconnected_node_hit(
     ox, oy = offsets
     r2 = radius_px * radius_px
 
-    for i, section in enumerate(sections):
-        for endtype in ("start", "end"):
-            if not is_disconnected_endpoint(sections, section, endtype):
-                continue
+    if scale > 0 and spatial_index is not None and spatial_index.covers(sections):
+        world_pos = ((pos[0] - ox) / scale, (widget_height - pos[1] - oy) / scale)
+        candidates = spatial_index.nodes_near(world_pos, radius_px / scale)
+    else:
+        candidates = [(i, endtype) for i in range(len(sections)) for endtype in ("start", "end")]
 
-            world_point = section.start if endtype == "start" else section.end
-            px = ox + world_point[0] * scale
-            py_world = oy + world_point[1] * scale
-            py = widget_height - py_world
+    for i, endtype in candidates:
+        section = sections[i]
+        if not is_disconnected_endpoint(sections, section, endtype):
+            continue
 
-            dx = px - pos[0]
-            dy = py - pos[1]
-            if dx * dx + dy * dy <= r2:
-                return i, endtype, world_point, heading_for_endpoint(section, endtype)
+        world_point = section.start if endtype == "start" else section.end
+        px = ox + world_point[0] * scale
+        py_world = oy + world_point[1] * scale
+        py = widget_height - py_world
+
+        dx = px - pos[0]
+        dy = py - pos[1]
+        if dx * dx + dy * dy <= r2:
+            return i, endtype, world_point, heading_for_endpoint(section, endtype)
 
     return None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import Callable, Hashable
 
 from icr2_core.trk.utils import approx_curve_length
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.geometry.topology import is_closed_loop, loop_length
 from sg_viewer.model.edit_commands import ReplaceSectionsCommand
 from sg_viewer.model.edit_manager import EditManager
@@ -57,8 +58,9 @@ class ViewerRuntimeApi:
         before: list[SectionPreview],
         after: list[SectionPreview],
         changed_indices: list[int] | None = None,
+        merge_key: Hashable | None = None,
     ) -> RuntimeUpdatePayload:
-        command = ReplaceSectionsCommand(before=before, after=after)
+        command = ReplaceSectionsCommand(before=before, after=after, merge_key=merge_key)
         updated = self._edit_manager.execute(command)
         return RuntimeUpdatePayload(
             updated_sections=updated,
@@ -204,12 +206,14 @@ class ViewerRuntimeApi:
         dragged_pos: tuple[float, float],
         sections: list[SectionPreview],
         snap_radius: float,
+        spatial_index: SectionSpatialIndex | None = None,
     ) -> tuple[int, str] | None:
         return self._geometry_service.find_connection_target(
             dragged_key=dragged_key,
             dragged_pos=dragged_pos,
             sections=sections,
             snap_radius=snap_radius,
+            spatial_index=spatial_index,
         )
 
     def recalculate_elevations_intent(
@@ -43,11 +43,10 @@ def _load_sg_class():
     return SGFile
 
 
-def _load_trk_export_dependencies():
-    from icr2_core.trk.trk_classes import TRKFile
-    from icr2_core.trk.trk_exporter import write_trk
+def _load_trk_converter():
+    from icr2_core.trk.trk_builder import convert_sg_to_trk
 
-    return TRKFile, write_trk
+    return convert_sg_to_trk
 
 
 def export_sg_to_csv(*, sg_path: Path) -> ExportResult:
@@ -64,9 +63,8 @@ def export_sg_to_csv(*, sg_path: Path) -> ExportResult:
 
 def export_sg_to_trk(*, sg_path: Path, trk_path: Path) -> ExportResult:
     try:
-        trk_class, write_trk = _load_trk_export_dependencies()
-        trk_file = trk_class.from_sg(str(sg_path))
-        write_trk(trk_file, str(trk_path))
+        convert_sg_to_trk = _load_trk_converter()
+        convert_sg_to_trk(sg_path, trk_path)
     except Exception as exc:
         return ExportResult(success=False, message=f"SG saved but TRK export failed:\n{exc}")
 
@@ -0,0 +1,247 @@
+"""Tile cache for the static layers of the SG preview.
+
+The background image, the SG track surface, the MRK wall notches and the TSD
+lines only change when the document, the view settings or the zoom level
+change, yet :func:`~sg_viewer.services.preview_painter.paint_preview` used to
+redraw them on every paint. :class:`PreviewLayerCache` rasterises each of
+those layers into ``TILE_SIZE`` tiles anchored to the world at the current
+zoom, so panning composites images and only renders the tiles that scroll
+into view. Selection, drag and creation overlays are still drawn live.
+
+Each layer is identified by a content key (plus objects compared by
+identity, such as the preview model) and is dropped as soon as that key
+changes. Tiles are only built once a layer's key and zoom level are the same
+on two consecutive paints; while the user is zooming or dragging geometry
+the layer is drawn directly, as before.
+
+Set ``SG_VIEWER_PAINT_TIMINGS=1`` to show a per-layer paint-time readout.
+"""
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, Tuple
+
+from PyQt5 import QtCore, QtGui
+
+from sg_viewer.preview.transform import ViewTransform
+
+Transform = Tuple[float, Tuple[float, float]]
+LayerDraw = Callable[[QtGui.QPainter, Transform, ViewTransform, int], None]
+
+TILE_SIZE = 256
+# Lower bound for the tile LRU; it grows to twice the tiles one paint needs.
+MIN_CACHED_TILES = 256
+
+
+@dataclass
+class LayerPaintStats:
+    """How one layer was produced during the last paint."""
+
+    name: str
+    mode: str
+    ms: float
+    tiles_built: int = 0
+    tiles_reused: int = 0
+
+    def describe(self) -> str:
+        text = f"{self.name} {self.ms:.1f} ms {self.mode}"
+        if self.tiles_built:
+            text += f" +{self.tiles_built}"
+        return text
+
+
+@dataclass
+class _LayerState:
+    key: Hashable
+    sources: tuple[object, ...]
+    zoom_key: Hashable | None = None
+    tiled_zoom_keys: set = field(default_factory=set)
+
+
+class PreviewLayerCache:
+    """Zoom-bucketed tile cache for the static SG preview layers."""
+
+    def __init__(self, *, show_timings: bool | None = None) -> None:
+        self._tiles: OrderedDict[tuple, QtGui.QImage] = OrderedDict()
+        self._layers: dict[str, _LayerState] = {}
+        self._tiles_in_use = 0
+        self._paint_started: float | None = None
+        self.last_paint: dict[str, LayerPaintStats] = {}
+        self.last_total_ms = 0.0
+        if show_timings is None:
+            show_timings = os.getenv("SG_VIEWER_PAINT_TIMINGS", "") not in ("", "0")
+        self.show_timings = show_timings
+
+    def clear(self) -> None:
+        self._tiles.clear()
+        self._layers.clear()
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles)
+
+    # ------------------------------------------------------------------
+    # Paint bookkeeping
+    # ------------------------------------------------------------------
+    def begin_paint(self) -> None:
+        self._paint_started = time.perf_counter()
+        self._tiles_in_use = 0
+        self.last_paint = {}
+
+    def end_paint(self) -> None:
+        if self._paint_started is None:
+            return
+        self.last_total_ms = (time.perf_counter() - self._paint_started) * 1000.0
+        self._paint_started = None
+
+    def timings_text(self) -> str:
+        """One-line readout of the last paint, layer by layer."""
+        layer_ms = sum(stats.ms for stats in self.last_paint.values())
+        parts = [stats.describe() for stats in self.last_paint.values()]
+        parts.append(f"live {max(0.0, self.last_total_ms - layer_ms):.1f} ms")
+        parts.append(f"total {self.last_total_ms:.1f} ms")
+        return " | ".join(parts)
+
+    # ------------------------------------------------------------------
+    # Layers
+    # ------------------------------------------------------------------
+    def draw_layer(
+        self,
+        name: str,
+        key: Hashable,
+        sources: tuple[object, ...],
+        painter: QtGui.QPainter,
+        rect: QtCore.QRect,
+        transform: Transform,
+        view_transform: ViewTransform,
+        widget_height: int,
+        draw: LayerDraw,
+        *,
+        opaque: bool = False,
+    ) -> None:
+        """Draw one static layer, from tiles when its content is stable.
+
+        ``draw`` renders the layer with the given painter, transform, SG view
+        transform and widget height. ``key`` must change whenever the layer's
+        appearance does; ``sources`` are additional inputs compared by
+        identity. Opaque layers are rendered onto an uninitialised tile.
+        """
+        started = time.perf_counter()
+        scale, (offset_x, offset_y) = transform
+        screen_y0 = widget_height - offset_y
+        base_x = math.floor(offset_x)
+        base_y = math.floor(screen_y0)
+        frac = (round(offset_x - base_x, 6), round(screen_y0 - base_y, 6))
+        zoom_key = (scale, frac)
+
+        state = self._layers.get(name)
+        if state is None or state.key != key or not _same_objects(state.sources, sources):
+            self._drop_layer(name)
+            state = _LayerState(key=key, sources=sources)
+            self._layers[name] = state
+        stable = state.zoom_key == zoom_key or zoom_key in state.tiled_zoom_keys
+        state.zoom_key = zoom_key
+        if not stable or scale <= 0:
+            draw(painter, transform, view_transform, widget_height)
+            self._record(name, "direct", started)
+            return
+
+        first_col = math.floor((rect.left() - base_x) / TILE_SIZE)
+        last_col = math.floor((rect.right() - base_x) / TILE_SIZE)
+        first_row = math.floor((rect.top() - base_y) / TILE_SIZE)
+        last_row = math.floor((rect.bottom() - base_y) / TILE_SIZE)
+        wanted = [
+            (col, row)
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        ]
+        missing = [tile for tile in wanted if (name, zoom_key, *tile) not in self._tiles]
+        if missing:
+            self._render_tiles(name, zoom_key, missing, scale, frac, draw, opaque)
+        state.tiled_zoom_keys.add(zoom_key)
+
+        painter.save()
+        painter.setOpacity(1.0)
+        for col, row in wanted:
+            tile_key = (name, zoom_key, col, row)
+            image = self._tiles[tile_key]
+            self._tiles.move_to_end(tile_key)
+            painter.drawImage(QtCore.QPoint(base_x + col * TILE_SIZE, base_y + row * TILE_SIZE), image)
+        painter.restore()
+
+        self._tiles_in_use += len(wanted)
+        self._evict()
+        mode = "tiles" if not missing else "built"
+        self._record(name, mode, started, len(missing), len(wanted) - len(missing))
+
+    def _render_tiles(
+        self,
+        name: str,
+        zoom_key: Hashable,
+        tiles: list[tuple[int, int]],
+        scale: float,
+        frac: tuple[float, float],
+        draw: LayerDraw,
+        opaque: bool,
+    ) -> None:
+        # Render the bounding block of the missing tiles in one pass, then
+        # slice it, so primitives crossing tile edges are drawn identically.
+        col0 = min(col for col, _row in tiles)
+        col1 = max(col for col, _row in tiles)
+        row0 = min(row for _col, row in tiles)
+        row1 = max(row for _col, row in tiles)
+        width = (col1 - col0 + 1) * TILE_SIZE
+        height = (row1 - row0 + 1) * TILE_SIZE
+        block = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        if not opaque:
+            block.fill(QtCore.Qt.transparent)
+        origin_x = frac[0] - col0 * TILE_SIZE
+        origin_y = frac[1] - row0 * TILE_SIZE
+        block_transform: Transform = (scale, (origin_x, height - origin_y))
+        block_view = ViewTransform(scale=scale, offset=(origin_x, origin_y))
+        block_painter = QtGui.QPainter(block)
+        try:
+            draw(block_painter, block_transform, block_view, height)
+        finally:
+            block_painter.end()
+        for col, row in tiles:
+            self._tiles[(name, zoom_key, col, row)] = block.copy(
+                (col - col0) * TILE_SIZE, (row - row0) * TILE_SIZE, TILE_SIZE, TILE_SIZE
+            )
+
+    def _drop_layer(self, name: str) -> None:
+        self._layers.pop(name, None)
+        for tile_key in [tile_key for tile_key in self._tiles if tile_key[0] == name]:
+            del self._tiles[tile_key]
+
+    def _evict(self) -> None:
+        limit = max(MIN_CACHED_TILES, 2 * self._tiles_in_use)
+        while len(self._tiles) > limit:
+            tile_key, _image = self._tiles.popitem(last=False)
+            state = self._layers.get(tile_key[0])
+            if state is not None:
+                state.tiled_zoom_keys.discard(tile_key[1])
+
+    def _record(
+        self,
+        name: str,
+        mode: str,
+        started: float,
+        built: int = 0,
+        reused: int = 0,
+    ) -> None:
+        self.last_paint[name] = LayerPaintStats(
+            name=name,
+            mode=mode,
+            ms=(time.perf_counter() - started) * 1000.0,
+            tiles_built=built,
+            tiles_reused=reused,
+        )
+
+
+def _same_objects(left: tuple[object, ...], right: tuple[object, ...]) -> bool:
+    return len(left) == len(right) and all(a is b for a, b in zip(left, right))
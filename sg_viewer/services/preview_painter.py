@@ -4,6 +4,8 @@ import math
 from dataclasses import dataclass, field
 from typing import Iterable, Tuple
 
+import numpy as np
+
 from sg_viewer.services.tsd_io import TrackSurfaceDetailLine
 
 from PyQt5 import QtCore, QtGui
@@ -20,7 +22,9 @@ from sg_viewer.model.preview_state import SgPreviewModel, SgPreviewViewState
 from sg_viewer.preview.render_state import split_nodes_by_status
 from sg_viewer.preview.transform import ViewTransform
 from sg_viewer.services import sg_rendering
+from sg_viewer.services.preview_layer_cache import PreviewLayerCache
 from sg_viewer.services.trackside_objects import normalize_rotation_point
+from sg_viewer.services.tsd_projection import TrackProjector, angle_delta, is_ccw_turn
 
 Point = Tuple[float, float]
 Transform = tuple[float, tuple[float, float]]
@@ -33,9 +37,6 @@ _SHOW_FSECT_OUTLINES = False
 _MRK_DEFAULT_WALL_HEIGHT = 21000.0
 _MRK_DEFAULT_ARMCO_HEIGHT = 18000.0
 _MRK_NOTCH_HALF_LENGTH_PX = 4.0
-ICR2_UNITS_PER_FOOT = 500.0 * 12.0
-MIN_TSD_SAMPLE_STEP = ICR2_UNITS_PER_FOOT
-TARGET_TSD_PIXELS_PER_SAMPLE = 6.0
 
 
 @dataclass
@@ -194,14 +195,22 @@ class TsdGeometryCache:
     section_geometry_version: int | None = None
     tsd_lines_version: int | None = None
     sampling_bucket: int | None = None
-    world_points_by_key: dict[tuple[object, ...], tuple[Point, ...]] = field(
+    projector: TrackProjector | None = None
+    world_points_by_key: dict[tuple[object, ...], np.ndarray] = field(
+        default_factory=dict
+    )
+    edge_points_by_key: dict[tuple[object, ...], tuple[np.ndarray, np.ndarray]] = field(
         default_factory=dict
     )
     bbox_by_key: dict[tuple[object, ...], BBox | None] = field(default_factory=dict)
+    sampled_bbox_by_key: dict[tuple[object, ...], BBox] = field(default_factory=dict)
 
     def clear(self) -> None:
+        self.projector = None
         self.world_points_by_key.clear()
+        self.edge_points_by_key.clear()
         self.bbox_by_key.clear()
+        self.sampled_bbox_by_key.clear()
 
 
 _GLOBAL_TSD_GEOMETRY_CACHE = TsdGeometryCache()
@@ -216,21 +225,70 @@ def paint_preview(
     sg_preview_state: SgPreviewState | None,
     transform: Transform | None,
     widget_height: int,
+    *,
+    layer_cache: PreviewLayerCache | None = None,
 ) -> None:
-    """Draw the preview and any active creation overlays."""
+    """Draw the preview and any active creation overlays.
 
-    _draw_background(
+    With a ``layer_cache`` the background, SG surface, MRK and TSD layers are
+    composited from cached tiles; everything else is drawn live.
+    """
+    if layer_cache is not None and transform is not None:
+        layer_cache.begin_paint()
+        _paint_preview_layers(
+            painter,
+            base_state,
+            creation_state,
+            node_state,
+            drag_heading_state,
+            sg_preview_state,
+            transform,
+            widget_height,
+            layer_cache,
+        )
+        layer_cache.end_paint()
+        if layer_cache.show_timings:
+            _draw_paint_timings(painter, base_state.rect, layer_cache.timings_text())
+        return
+    _paint_preview_layers(
         painter,
-        base_state.rect,
-        base_state.background_color,
-        base_state.background_image,
-        base_state.background_brightness,
-        base_state.background_scale_500ths_per_px,
-        base_state.background_origin,
+        base_state,
+        creation_state,
+        node_state,
+        drag_heading_state,
+        sg_preview_state,
         transform,
         widget_height,
+        None,
     )
 
+
+def _paint_preview_layers(
+    painter: QtGui.QPainter,
+    base_state: BasePreviewState,
+    creation_state: CreationOverlayState,
+    node_state: NodeOverlayState | None,
+    drag_heading_state: DragHeadingState | None,
+    sg_preview_state: SgPreviewState | None,
+    transform: Transform | None,
+    widget_height: int,
+    layer_cache: PreviewLayerCache | None,
+) -> None:
+    if layer_cache is not None and base_state.background_image is not None:
+        _draw_cached_background(painter, base_state, transform, widget_height, layer_cache)
+    else:
+        _draw_background(
+            painter,
+            base_state.rect,
+            base_state.background_color,
+            base_state.background_image,
+            base_state.background_brightness,
+            base_state.background_scale_500ths_per_px,
+            base_state.background_origin,
+            transform,
+            widget_height,
+        )
+
     if transform is None:
         _draw_placeholder(painter, base_state.rect, "Unable to fit view")
         return
@@ -245,7 +303,23 @@ def paint_preview(
             painter, base_state.rect, base_state.show_axes, transform, widget_height
         )
 
-        if sg_preview_state and sg_preview_state.enabled:
+        if (
+            layer_cache is not None
+            and sg_preview_state
+            and sg_preview_state.enabled
+            and sg_preview_state.model is not None
+            and sg_preview_state.transform is not None
+        ):
+            _draw_cached_sg_layers(
+                painter,
+                sg_preview_state,
+                track_opacity,
+                base_state.rect,
+                transform,
+                widget_height,
+                layer_cache,
+            )
+        elif sg_preview_state and sg_preview_state.enabled:
             render_sg_preview(
                 painter,
                 sg_preview_state.model,
@@ -351,7 +425,23 @@ def paint_preview(
                 widget_height,
                 base_state.fsections_by_section,
             )
-        if sg_preview_state and sg_preview_state.show_tsd_lines:
+        if (
+            layer_cache is not None
+            and sg_preview_state
+            and sg_preview_state.show_tsd_lines
+            and sg_preview_state.tsd_lines
+        ):
+            _draw_cached_tsd_layer(
+                painter,
+                sg_preview_state,
+                base_state.sections,
+                track_opacity,
+                base_state.rect,
+                transform,
+                widget_height,
+                layer_cache,
+            )
+        elif sg_preview_state and sg_preview_state.show_tsd_lines:
             _draw_tsd_lines(
                 painter,
                 sg_preview_state.tsd_lines,
@@ -650,33 +740,244 @@ def render_sg_preview(
     if model is None or transform is None:
         return
 
+    _render_sg_track_layer(painter, model, transform, view_state)
+    if view_state.show_boundaries and show_mrk_notches:
+        _render_sg_mrk_layer(
+            painter,
+            model,
+            transform,
+            selected_mrk_wall=selected_mrk_wall,
+            selected_mrk_wall_range=selected_mrk_wall_range,
+            highlighted_mrk_walls=highlighted_mrk_walls,
+            mrk_wall_height_500ths=mrk_wall_height_500ths,
+            mrk_armco_height_500ths=mrk_armco_height_500ths,
+            mrk_length_multiplier=mrk_length_multiplier,
+        )
+    if _SHOW_FSECT_OUTLINES:
+        painter.save()
+        painter.setRenderHint(type(painter).Antialiasing, True)
+        _draw_fsect_outlines(painter, model, transform)
+        painter.restore()
+
+
+def _render_sg_track_layer(
+    painter, model: SgPreviewModel, transform: ViewTransform, view_state: SgPreviewViewState
+) -> None:
     painter.save()
     painter.setRenderHint(type(painter).Antialiasing, True)
-
     if view_state.show_surfaces:
         _draw_surfaces(painter, model, transform)
-
     if view_state.show_boundaries:
         _draw_boundaries(painter, model, transform)
-        if show_mrk_notches:
-            _draw_mrk_notches(
-                painter,
-                model,
-                transform,
-                selected_wall=selected_mrk_wall,
-                selected_wall_range=selected_mrk_wall_range,
-                highlighted_walls=highlighted_mrk_walls,
-                wall_height_500ths=mrk_wall_height_500ths,
-                armco_height_500ths=mrk_armco_height_500ths,
-                length_multiplier=mrk_length_multiplier,
-            )
+    painter.restore()
 
-    if _SHOW_FSECT_OUTLINES:
-        _draw_fsect_outlines(painter, model, transform)
 
+def _render_sg_mrk_layer(
+    painter,
+    model: SgPreviewModel,
+    transform: ViewTransform,
+    *,
+    selected_mrk_wall: tuple[int, int, int] | None,
+    selected_mrk_wall_range: tuple[int, int, int, int, int] | None,
+    highlighted_mrk_walls: tuple[tuple[int, int, int, int, str], ...],
+    mrk_wall_height_500ths: float,
+    mrk_armco_height_500ths: float,
+    mrk_length_multiplier: float,
+) -> None:
+    painter.save()
+    painter.setRenderHint(type(painter).Antialiasing, True)
+    _draw_mrk_notches(
+        painter,
+        model,
+        transform,
+        selected_wall=selected_mrk_wall,
+        selected_wall_range=selected_mrk_wall_range,
+        highlighted_walls=highlighted_mrk_walls,
+        wall_height_500ths=mrk_wall_height_500ths,
+        armco_height_500ths=mrk_armco_height_500ths,
+        length_multiplier=mrk_length_multiplier,
+    )
     painter.restore()
 
 
+def _draw_cached_background(
+    painter: QtGui.QPainter,
+    base_state: BasePreviewState,
+    transform: Transform | None,
+    widget_height: int,
+    layer_cache: PreviewLayerCache,
+) -> None:
+    if transform is None or not base_state.background_scale_500ths_per_px:
+        painter.fillRect(base_state.rect, base_state.background_color)
+        return
+    image = base_state.background_image
+
+    def draw(layer_painter, layer_transform, _view_transform, layer_height) -> None:
+        _draw_background(
+            layer_painter,
+            layer_painter.viewport(),
+            base_state.background_color,
+            image,
+            base_state.background_brightness,
+            base_state.background_scale_500ths_per_px,
+            base_state.background_origin,
+            layer_transform,
+            layer_height,
+        )
+
+    key = (
+        base_state.background_color.rgba(),
+        image.cacheKey(),
+        float(base_state.background_brightness),
+        float(base_state.background_scale_500ths_per_px),
+        tuple(base_state.background_origin or (0.0, 0.0)),
+    )
+    layer_cache.draw_layer(
+        "background",
+        key,
+        (),
+        painter,
+        base_state.rect,
+        transform,
+        _sg_view_transform(transform, widget_height),
+        widget_height,
+        draw,
+        opaque=True,
+    )
+
+
+def _fsection_color_key() -> tuple[tuple[int, int], ...]:
+    """The fsect colours as a tile key; the colour pickers rewrite them in place."""
+    colors = sorted((surface, color.rgba()) for surface, color in sg_rendering.SURFACE_COLORS.items())
+    colors.append((-1, sg_rendering.WALL_COLOR.rgba()))
+    colors.append((-2, sg_rendering.ARMCO_COLOR.rgba()))
+    return tuple(colors)
+
+
+def _draw_cached_sg_layers(
+    painter: QtGui.QPainter,
+    state: SgPreviewState,
+    opacity: float,
+    rect: QtCore.QRect,
+    transform: Transform,
+    widget_height: int,
+    layer_cache: PreviewLayerCache,
+) -> None:
+    model = state.model
+    view_state = state.view_state
+
+    def draw_track(layer_painter, _transform, view_transform, _height) -> None:
+        layer_painter.save()
+        layer_painter.setOpacity(opacity)
+        _render_sg_track_layer(layer_painter, model, view_transform, view_state)
+        layer_painter.restore()
+
+    if view_state.show_surfaces or view_state.show_boundaries:
+        layer_cache.draw_layer(
+            "track",
+            (view_state.show_surfaces, view_state.show_boundaries, opacity, _fsection_color_key()),
+            (model,),
+            painter,
+            rect,
+            transform,
+            state.transform,
+            widget_height,
+            draw_track,
+        )
+
+    if not (view_state.show_boundaries and state.show_mrk_notches):
+        return
+
+    def draw_mrk(layer_painter, _transform, view_transform, _height) -> None:
+        layer_painter.save()
+        layer_painter.setOpacity(opacity)
+        _render_sg_mrk_layer(
+            layer_painter,
+            model,
+            view_transform,
+            selected_mrk_wall=state.selected_mrk_wall,
+            selected_mrk_wall_range=state.selected_mrk_wall_range,
+            highlighted_mrk_walls=state.highlighted_mrk_walls,
+            mrk_wall_height_500ths=state.mrk_wall_height_500ths,
+            mrk_armco_height_500ths=state.mrk_armco_height_500ths,
+            mrk_length_multiplier=state.mrk_length_multiplier,
+        )
+        layer_painter.restore()
+
+    layer_cache.draw_layer(
+        "mrk",
+        (
+            state.selected_mrk_wall,
+            state.selected_mrk_wall_range,
+            state.highlighted_mrk_walls,
+            state.mrk_wall_height_500ths,
+            state.mrk_armco_height_500ths,
+            state.mrk_length_multiplier,
+            opacity,
+        ),
+        (model,),
+        painter,
+        rect,
+        transform,
+        state.transform,
+        widget_height,
+        draw_mrk,
+    )
+
+
+def _draw_cached_tsd_layer(
+    painter: QtGui.QPainter,
+    state: SgPreviewState,
+    sections: Iterable[SectionPreview],
+    opacity: float,
+    rect: QtCore.QRect,
+    transform: Transform,
+    widget_height: int,
+    layer_cache: PreviewLayerCache,
+) -> None:
+    def draw(layer_painter, layer_transform, _view_transform, layer_height) -> None:
+        layer_painter.save()
+        layer_painter.setOpacity(opacity)
+        _draw_tsd_lines(
+            layer_painter,
+            state.tsd_lines,
+            state.tsd_palette,
+            sections,
+            layer_transform,
+            layer_height,
+            selected_section_only=state.show_tsd_selected_section_only,
+            selected_section_index=state.selected_section_index,
+            section_geometry_version=state.section_geometry_version,
+            tsd_lines_version=state.tsd_lines_version,
+        )
+        layer_painter.restore()
+
+    key = (
+        state.tsd_lines_version,
+        state.section_geometry_version,
+        tuple(color.rgba() for color in state.tsd_palette),
+        state.show_tsd_selected_section_only,
+        state.selected_section_index if state.show_tsd_selected_section_only else None,
+        opacity,
+    )
+    layer_cache.draw_layer(
+        "tsd",
+        key,
+        (state.tsd_lines, sections),
+        painter,
+        rect,
+        transform,
+        _sg_view_transform(transform, widget_height),
+        widget_height,
+        draw,
+    )
+
+
+def _sg_view_transform(transform: Transform, widget_height: int) -> ViewTransform:
+    scale, offsets = transform
+    return ViewTransform(scale=scale, offset=(offsets[0], widget_height - offsets[1]))
+
+
 def _draw_surfaces(painter, model: SgPreviewModel, transform: ViewTransform) -> None:
     for fsect in model.fsects:
         for surface in fsect.surfaces:
@@ -1500,6 +1801,9 @@ def _draw_tsd_lines(
         cache.section_geometry_version = section_geometry_version
         cache.tsd_lines_version = tsd_lines_version
         cache.sampling_bucket = sampling_bucket
+    if cache.projector is None:
+        cache.projector = TrackProjector(section_list, track_length, section_lookup)
+    projector = cache.projector
 
     selected_range: tuple[float, float] | None = None
     if selected_section_only:
@@ -1520,28 +1824,11 @@ def _draw_tsd_lines(
         painter.viewport(), transform, widget_height
     )
 
+    # First pass: cull against the cached coarse boxes and collect the
+    # segments still missing sampled geometry, so they are projected together.
+    visible: list[tuple[TrackSurfaceDetailLine, float, tuple[object, ...]]] = []
+    missing: list[tuple[TrackSurfaceDetailLine, tuple[float, float, float, float], tuple[object, ...]]] = []
     for line in tsd_lines:
-        color_index = max(0, min(255, int(line.color_index)))
-        if tsd_palette:
-            color = QtGui.QColor(tsd_palette[color_index % len(tsd_palette)])
-        else:
-            color = QtGui.QColor(color_index, color_index, color_index)
-        width_px = _tsd_width_to_pixels(line.width_500ths, transform[0])
-
-        is_dashed = line.command == "Detail_Dash"
-        if is_dashed:
-            pen = QtGui.QPen(color)
-            pen.setWidthF(width_px)
-            pen.setStyle(QtCore.Qt.DashLine)
-            pen.setDashPattern([8.0, 8.0])
-            pen.setCapStyle(QtCore.Qt.FlatCap)
-            pen.setJoinStyle(QtCore.Qt.RoundJoin)
-            painter.setPen(pen)
-            painter.setBrush(QtCore.Qt.NoBrush)
-        else:
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.setBrush(QtGui.QBrush(color))
-
         if selected_range is not None and not _tsd_line_overlaps_section_range(
             line,
             selected_range,
@@ -1550,6 +1837,8 @@ def _draw_tsd_lines(
         ):
             continue
 
+        width_px = _tsd_width_to_pixels(line.width_500ths, transform[0])
+        cull_margin_world = width_px / max(transform[0], 1e-9)
         for segment in split_wrapped_segment(
             x1=float(line.start_dlong),
             y1=float(line.start_dlat),
@@ -1572,7 +1861,6 @@ def _draw_tsd_lines(
                 float(segment[2]),
                 float(segment[3]),
             )
-            cull_margin_world = width_px / max(transform[0], 1e-9)
             estimated_bbox = cache.bbox_by_key.get(segment_cache_key)
             if segment_cache_key not in cache.bbox_by_key:
                 estimated_bbox = _estimate_tsd_segment_world_bbox(
@@ -1583,6 +1871,7 @@ def _draw_tsd_lines(
                     sections=section_list,
                     track_length=track_length,
                     section_lookup=section_lookup,
+                    projector=projector,
                 )
                 cache.bbox_by_key[segment_cache_key] = estimated_bbox
             if estimated_bbox is not None and not _bbox_intersects(
@@ -1604,72 +1893,124 @@ def _draw_tsd_lines(
                 sampling_bucket,
                 *segment_cache_key[-4:],
             )
-            world_points = cache.world_points_by_key.get(cache_key)
-            if world_points is None:
-                sampled_points = _sample_tsd_detail_segment(
-                    start_dlong=segment[0],
-                    start_dlat=segment[1],
-                    end_dlong=segment[2],
-                    end_dlat=segment[3],
-                    sections=section_list,
-                    pixels_per_world_unit=transform[0],
-                    track_length=track_length,
-                    section_lookup=section_lookup,
-                )
-                world_points = tuple(sampled_points)
-                cache.world_points_by_key[cache_key] = world_points
-            if len(world_points) < 2:
-                continue
-            sampled_bbox = _bbox_from_points(world_points)
-            if sampled_bbox is not None and not _bbox_intersects(
-                sampled_bbox,
-                viewport_bbox,
-                margin=cull_margin_world,
-            ):
-                continue
-            mapped_points = [
-                sg_rendering.map_point(point[0], point[1], transform, widget_height)
-                for point in world_points
-            ]
+            if cache_key not in cache.world_points_by_key:
+                missing.append((line, segment, cache_key))
+            visible.append((line, cull_margin_world, cache_key))
+
+    if missing:
+        _sample_tsd_segments_into_cache(cache, missing, projector, transform[0])
+
+    current_style: tuple[str, int, float] | None = None
+    for line, cull_margin_world, cache_key in visible:
+        world_points = cache.world_points_by_key[cache_key]
+        if len(world_points) < 2:
+            continue
+        if not _bbox_intersects(
+            cache.sampled_bbox_by_key[cache_key],
+            viewport_bbox,
+            margin=cull_margin_world,
+        ):
+            continue
+
+        is_dashed = line.command == "Detail_Dash"
+        style = (str(line.command), int(line.color_index), float(line.width_500ths))
+        if style != current_style:
+            current_style = style
+            color_index = max(0, min(255, int(line.color_index)))
+            if tsd_palette:
+                color = QtGui.QColor(tsd_palette[color_index % len(tsd_palette)])
+            else:
+                color = QtGui.QColor(color_index, color_index, color_index)
             if is_dashed:
-                painter.drawPolyline(QtGui.QPolygonF(mapped_points))
-                continue
+                pen = QtGui.QPen(color)
+                pen.setWidthF(_tsd_width_to_pixels(line.width_500ths, transform[0]))
+                pen.setStyle(QtCore.Qt.DashLine)
+                pen.setDashPattern([8.0, 8.0])
+                pen.setCapStyle(QtCore.Qt.FlatCap)
+                pen.setJoinStyle(QtCore.Qt.RoundJoin)
+                painter.setPen(pen)
+                painter.setBrush(QtCore.Qt.NoBrush)
+            else:
+                painter.setPen(QtCore.Qt.NoPen)
+                painter.setBrush(QtGui.QBrush(color))
 
-            half_width_world = float(line.width_500ths) * 0.5
-            positive_edge = _sample_tsd_detail_segment(
-                start_dlong=segment[0],
-                start_dlat=float(segment[1]) + half_width_world,
-                end_dlong=segment[2],
-                end_dlat=float(segment[3]) + half_width_world,
-                sections=section_list,
-                pixels_per_world_unit=transform[0],
-                track_length=track_length,
-                section_lookup=section_lookup,
+        if is_dashed:
+            painter.drawPolyline(_map_world_points(world_points, transform, widget_height))
+            continue
+
+        positive_edge, negative_edge = cache.edge_points_by_key[cache_key]
+        if len(positive_edge) < 2 or len(negative_edge) < 2:
+            continue
+        painter.drawPolygon(
+            _map_world_points(
+                np.concatenate((positive_edge, negative_edge[::-1])),
+                transform,
+                widget_height,
             )
-            negative_edge = _sample_tsd_detail_segment(
-                start_dlong=segment[0],
-                start_dlat=float(segment[1]) - half_width_world,
-                end_dlong=segment[2],
-                end_dlat=float(segment[3]) - half_width_world,
-                sections=section_list,
-                pixels_per_world_unit=transform[0],
-                track_length=track_length,
-                section_lookup=section_lookup,
+        )
+
+    painter.restore()
+
+
+def _sample_tsd_segments_into_cache(
+    cache: TsdGeometryCache,
+    missing: list[tuple[TrackSurfaceDetailLine, tuple[float, float, float, float], tuple[object, ...]]],
+    projector: TrackProjector,
+    pixels_per_world_unit: float,
+) -> None:
+    """Sample centre lines (and solid-line edges) for ``missing`` in bulk."""
+    segments = np.array([segment for _line, segment, _key in missing], dtype=float)
+    centre_lines = projector.sample_segments(
+        segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3], pixels_per_world_unit
+    )
+    for (_line, _segment, cache_key), points in zip(missing, centre_lines):
+        cache.world_points_by_key[cache_key] = points
+        if len(points):
+            low = points.min(axis=0)
+            high = points.max(axis=0)
+            cache.sampled_bbox_by_key[cache_key] = (
+                float(low[0]),
+                float(low[1]),
+                float(high[0]),
+                float(high[1]),
             )
-            if len(positive_edge) < 2 or len(negative_edge) < 2:
-                continue
 
-            polygon_points = [
-                sg_rendering.map_point(point[0], point[1], transform, widget_height)
-                for point in positive_edge
-            ]
-            polygon_points.extend(
-                sg_rendering.map_point(point[0], point[1], transform, widget_height)
-                for point in reversed(negative_edge)
+    solid = [
+        index
+        for index, (line, _segment, _key) in enumerate(missing)
+        if line.command != "Detail_Dash"
+    ]
+    if not solid:
+        return
+    solid_segments = segments[solid]
+    half_width = np.array(
+        [float(missing[index][0].width_500ths) * 0.5 for index in solid]
+    )
+    edges = []
+    for sign in (1.0, -1.0):
+        edges.append(
+            projector.sample_segments(
+                solid_segments[:, 0],
+                solid_segments[:, 1] + sign * half_width,
+                solid_segments[:, 2],
+                solid_segments[:, 3] + sign * half_width,
+                pixels_per_world_unit,
             )
-            painter.drawPolygon(QtGui.QPolygonF(polygon_points))
+        )
+    for index, positive, negative in zip(solid, *edges):
+        cache.edge_points_by_key[missing[index][2]] = (positive, negative)
 
-    painter.restore()
+
+def _map_world_points(
+    points: np.ndarray, transform: Transform, widget_height: int
+) -> QtGui.QPolygonF:
+    """Map an ``(n, 2)`` world array to screen, as ``sg_rendering.map_point``."""
+    scale, offsets = transform
+    xs = offsets[0] + points[:, 0] * scale
+    ys = widget_height - (offsets[1] + points[:, 1] * scale)
+    return QtGui.QPolygonF(
+        [QtCore.QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+    )
 
 
 def _tsd_line_overlaps_section_range(
@@ -1720,17 +2061,6 @@ def _world_bbox_for_painter_rect(
     )
 
 
-def _bbox_from_points(points: Iterable[Point]) -> BBox | None:
-    xs: list[float] = []
-    ys: list[float] = []
-    for x, y in points:
-        xs.append(float(x))
-        ys.append(float(y))
-    if not xs:
-        return None
-    return (min(xs), min(ys), max(xs), max(ys))
-
-
 def _bbox_intersects(a: BBox, b: BBox, *, margin: float = 0.0) -> bool:
     return not (
         a[2] < b[0] - margin
@@ -1748,36 +2078,14 @@ def _estimate_tsd_segment_world_bbox(
     sections: list[SectionPreview],
     track_length: float,
     section_lookup: DlongSectionLookup | None = None,
+    projector: TrackProjector | None = None,
 ) -> BBox | None:
     if track_length <= 0:
         return None
 
-    normalized_start = float(start_dlong) % track_length
-    normalized_end = float(end_dlong) % track_length
-    span = (normalized_end - normalized_start) % track_length
-    if math.isclose(span, 0.0):
-        return None
-
-    checkpoint_count = max(
-        4, min(32, int(math.ceil(span / (50.0 * MIN_TSD_SAMPLE_STEP))))
-    )
-    sampled_points: list[Point] = []
-    for index in range(checkpoint_count + 1):
-        fraction = index / checkpoint_count
-        along = span * fraction
-        dlong = (normalized_start + along) % track_length
-        dlat = float(start_dlat) + (float(end_dlat) - float(start_dlat)) * fraction
-        point = _point_on_track_at_dlong(
-            sections,
-            dlong,
-            dlat,
-            track_length,
-            section_lookup=section_lookup,
-        )
-        if point is not None:
-            sampled_points.append(point)
-
-    return _bbox_from_points(sampled_points)
+    if projector is None:
+        projector = TrackProjector(sections, track_length, section_lookup)
+    return projector.segment_bboxes(start_dlong, start_dlat, end_dlong, end_dlat)[0]
 
 
 def _tsd_width_to_pixels(width_500ths: int, pixels_per_world_unit: float) -> float:
@@ -1825,37 +2133,17 @@ def _sample_tsd_detail_segment(
     pixels_per_world_unit: float,
     track_length: float,
     section_lookup: DlongSectionLookup | None = None,
+    projector: TrackProjector | None = None,
 ) -> list[Point]:
     if track_length <= 0:
         return []
 
-    normalized_start = float(start_dlong) % track_length
-    normalized_end = float(end_dlong) % track_length
-    span = (normalized_end - normalized_start) % track_length
-    if math.isclose(span, 0.0):
-        return []
-
-    adaptive_step = TARGET_TSD_PIXELS_PER_SAMPLE / max(pixels_per_world_unit, 1e-9)
-    increment = max(MIN_TSD_SAMPLE_STEP, adaptive_step)
-    step_count = max(1, int(math.ceil(span / increment)))
-
-    points: list[Point] = []
-    for step in range(step_count + 1):
-        along = min(span, step * increment)
-        fraction = along / span if span > 0 else 0.0
-        dlong = (normalized_start + along) % track_length
-        dlat = float(start_dlat) + (float(end_dlat) - float(start_dlat)) * fraction
-        point = _point_on_track_at_dlong(
-            sections,
-            dlong,
-            dlat,
-            track_length,
-            section_lookup=section_lookup,
-        )
-        if point is not None:
-            points.append(point)
-
-    return points
+    if projector is None:
+        projector = TrackProjector(sections, track_length, section_lookup)
+    (points,) = projector.sample_segments(
+        start_dlong, start_dlat, end_dlong, end_dlat, pixels_per_world_unit
+    )
+    return [(x, y) for x, y in points.tolist()]
 
 
 def _track_length_from_sections(sections: list[SectionPreview]) -> float:
@@ -1931,8 +2219,8 @@ def _point_on_section(section: SectionPreview, fraction: float, dlat: float) ->
 
     start_angle = math.atan2(start_vec[1], start_vec[0])
     end_angle = math.atan2(end_vec[1], end_vec[0])
-    ccw = _is_ccw_turn(start_vec, end_vec, section.start_heading)
-    delta = _angle_delta(start_angle, end_angle, ccw)
+    ccw = is_ccw_turn(start_vec, end_vec, section.start_heading)
+    delta = angle_delta(start_angle, end_angle, ccw)
     angle = start_angle + delta * fraction
 
     sign = -1.0 if ccw else 1.0
@@ -1943,31 +2231,6 @@ def _point_on_section(section: SectionPreview, fraction: float, dlat: float) ->
     )
 
 
-def _is_ccw_turn(
-    start_vec: Point,
-    end_vec: Point,
-    heading: tuple[float, float] | None,
-) -> bool:
-    if heading is not None:
-        cross = start_vec[0] * heading[1] - start_vec[1] * heading[0]
-        if not math.isclose(cross, 0.0, abs_tol=1e-12):
-            return cross > 0
-
-    cross = start_vec[0] * end_vec[1] - start_vec[1] * end_vec[0]
-    return cross > 0
-
-
-def _angle_delta(start_angle: float, end_angle: float, ccw: bool) -> float:
-    delta = end_angle - start_angle
-    if ccw:
-        while delta <= 0:
-            delta += math.tau
-    else:
-        while delta >= 0:
-            delta -= math.tau
-    return delta
-
-
 def _draw_xsect_dlat_line(
     painter: QtGui.QPainter,
     sections: Iterable[SectionPreview],
@@ -2269,6 +2532,19 @@ def _draw_status_overlay(
     sg_rendering.draw_status_message(painter, rect, message)
 
 
+def _draw_paint_timings(
+    painter: QtGui.QPainter, rect: QtCore.QRect, text: str
+) -> None:
+    painter.save()
+    metrics = painter.fontMetrics()
+    box = metrics.boundingRect(text).adjusted(-6, -4, 6, 4)
+    box.moveBottomLeft(QtCore.QPoint(rect.left() + 8, rect.bottom() - 8))
+    painter.fillRect(box, QtGui.QColor(0, 0, 0, 170))
+    painter.setPen(QtGui.QColor("white"))
+    painter.drawText(box, QtCore.Qt.AlignCenter, text)
+    painter.restore()
+
+
 def _draw_query_track_overlay(
     painter: QtGui.QPainter,
     rect: QtCore.QRect,
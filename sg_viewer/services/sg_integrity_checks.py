@@ -3,10 +3,12 @@ from __future__ import annotations
 import importlib.util
 import math
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable
 
+from icr2_core.parallel import worker_count
 from sg_viewer.geometry.topology import is_closed_loop
 from sg_viewer.model.preview_fsection import PreviewFSection
 from sg_viewer.model.selection import heading_delta
@@ -28,6 +30,8 @@ MIN_CENTERLINE_SEPARATION_FT = 80.0
 PERP_SAMPLE_STEP_FT = 10.0
 UNIT_LABELS = {"feet": "ft", "meter": "m", "inch": "in", "500ths": "500ths"}
 UNIT_DECIMALS = {"feet": 2, "meter": 3, "inch": 1, "500ths": 0}
+_CHUNKS_PER_WORKER = 4
+_SERIAL_CHUNK_SECTIONS = 16
 
 
 def _ft_to_world(feet: float) -> float:
@@ -342,9 +346,18 @@ def build_integrity_report(
     fsects_by_section: list[list[PreviewFSection]],
     measurement_unit: str = "feet",
     on_progress: ProgressCallback | None = None,
+    *,
+    cache: IntegrityCache | None = None,
+    max_workers: int | None = None,
 ) -> IntegrityReport:
-    total_steps = _estimate_progress_steps(sections)
-    progress = _ProgressTracker(total=total_steps, callback=on_progress)
+    """Run every integrity check and merge the findings into one report.
+
+    Checks run per section. With a ``cache`` from a previous run, only the
+    sections whose content hash, or the hash of a section they depend on,
+    changed are re-checked. Large workloads are split into section chunks
+    and run in a process pool; ``max_workers=1`` keeps everything in-process.
+    """
+    progress = _ProgressTracker(total=1, callback=on_progress)
     progress.update(message="Preparing integrity checks")
 
     lines: list[str] = []
@@ -356,17 +369,43 @@ def build_integrity_report(
         progress.complete(message="Integrity checks complete")
         return IntegrityReport(text="\n".join(lines))
 
-    lines.extend(_topology_report(sections, progress))
+    if cache is None:
+        cache = IntegrityCache()
+    cache._begin(measurement_unit, len(sections))
+
+    results: dict[tuple[str, int], _Findings] = {}
+    pending: list[tuple[_CheckTask, tuple]] = []
+    for task, key in _plan_section_checks(sections, fsects_by_section):
+        cached = cache._lookup(task.check, task.index, key)
+        if cached is None:
+            pending.append((task, key))
+        else:
+            results[(task.check, task.index)] = cached
+
+    jobs = _build_check_jobs(
+        sections,
+        fsects_by_section,
+        measurement_unit,
+        [task for task, _ in pending],
+        _section_workers(len({task.index for task, _ in pending}), max_workers),
+    )
+    progress.total = 1 + sum(job.weight for job in jobs)
+    for job, findings in _run_check_jobs(jobs, max_workers, progress, len(sections)):
+        for task, result in zip(job.tasks, findings):
+            results[(task.check, task.index)] = result
+    for task, key in pending:
+        cache._store(task.check, task.index, key, results[(task.check, task.index)])
+
+    lines.extend(_topology_report(sections, results))
     lines.append("")
-    lines.extend(_heading_and_boundary_report(sections, fsects_by_section, measurement_unit, progress))
+    lines.extend(_heading_and_boundary_report(sections, results))
     lines.append("")
-    lines.extend(_curve_limits_report(sections, measurement_unit, progress))
+    lines.extend(_curve_limits_report(sections, measurement_unit, results))
     lines.append("")
     centerline_lines, boundary_violation_points, spacing_violation_points = _centerline_clearance_report(
         sections,
-        fsects_by_section,
         measurement_unit,
-        progress,
+        results,
     )
     lines.extend(centerline_lines)
     progress.complete(message="Integrity checks complete")
@@ -378,24 +417,401 @@ def build_integrity_report(
     )
 
 
-def _topology_report(sections: list[SectionPreview], progress: "_ProgressTracker") -> list[str]:
+# ----------------------------------------------------------------------
+# Per-section checks, caching and process pool
+# ----------------------------------------------------------------------
+_CHECK_TOPOLOGY = "topology"
+_CHECK_JOINS = "joins"
+_CHECK_CURVES = "curves"
+_CHECK_SPACING = "spacing"
+_CHECK_OWNERSHIP = "ownership"
+_SECTION_CHECKS = (_CHECK_TOPOLOGY, _CHECK_JOINS, _CHECK_CURVES, _CHECK_SPACING, _CHECK_OWNERSHIP)
+
+
+@dataclass(frozen=True)
+class _Findings:
+    """Report lines found for one section by one check, per report list."""
+
+    groups: tuple[tuple[str, ...], ...]
+    points: tuple[Point, ...] = ()
+
+
+@dataclass(frozen=True)
+class _CheckTask:
+    check: str
+    index: int
+    # Sections the result depends on besides ``index`` itself.
+    context: tuple[int, ...]
+    weight: int = 1
+
+
+@dataclass(frozen=True)
+class _CheckJob:
+    sections: list[SectionPreview | None]
+    fsects_by_section: list[list[PreviewFSection]]
+    measurement_unit: str
+    tasks: tuple[_CheckTask, ...]
+    weight: int
+
+
+class IntegrityCache:
+    """Per-section findings kept between :func:`build_integrity_report` runs.
+
+    Each result is stored with the content hashes of its section and of the
+    sections it depends on (the next section for join checks, nearby
+    sections for clearance and boundary ownership), so a re-run after an
+    edit only re-checks results whose inputs changed. ``checked`` and
+    ``reused`` count the results of the latest run.
+    """
+
+    def __init__(self) -> None:
+        self._measurement_unit: str | None = None
+        self._entries: dict[tuple[str, int], tuple[tuple, _Findings]] = {}
+        self.checked = 0
+        self.reused = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _begin(self, measurement_unit: str, section_count: int) -> None:
+        if measurement_unit != self._measurement_unit:
+            self._entries.clear()
+            self._measurement_unit = measurement_unit
+        for stale in [key for key in self._entries if key[1] >= section_count]:
+            del self._entries[stale]
+        self.checked = 0
+        self.reused = 0
+
+    def _lookup(self, check: str, index: int, key: tuple) -> _Findings | None:
+        entry = self._entries.get((check, index))
+        if entry is None or entry[0] != key:
+            return None
+        self.reused += 1
+        return entry[1]
+
+    def _store(self, check: str, index: int, key: tuple, findings: _Findings) -> None:
+        self._entries[(check, index)] = (key, findings)
+        self.checked += 1
+
+
+def _section_hash(section: SectionPreview, fsects: list[PreviewFSection]) -> int:
+    def _pair(value) -> tuple | None:
+        return None if value is None else tuple(value)
+
+    return hash(
+        (
+            getattr(section, "type_name", None),
+            section.previous_id,
+            section.next_id,
+            _pair(section.start),
+            _pair(section.end),
+            getattr(section, "start_dlong", None),
+            getattr(section, "length", None),
+            _pair(getattr(section, "center", None)),
+            getattr(section, "radius", None),
+            getattr(section, "sang1", None),
+            getattr(section, "sang2", None),
+            getattr(section, "eang1", None),
+            getattr(section, "eang2", None),
+            _pair(getattr(section, "start_heading", None)),
+            _pair(getattr(section, "end_heading", None)),
+            tuple(tuple(point) for point in _section_polyline_for_checks(section)),
+            tuple((float(fsect.start_dlat), float(fsect.end_dlat)) for fsect in fsects),
+        )
+    )
+
+
+def _plan_section_checks(
+    sections: list[SectionPreview],
+    fsects_by_section: list[list[PreviewFSection]],
+) -> list[tuple[_CheckTask, tuple]]:
+    """Return every check task with its cache key, ordered by section."""
+    count = len(sections)
+    hashes = [
+        _section_hash(section, _safe_get_fsects(fsects_by_section, index))
+        for index, section in enumerate(sections)
+    ]
+    polylines = [_section_polyline_for_checks(section) for section in sections]
+    bounds = [_polyline_bounds(polyline) for polyline in polylines]
+    probe_half_len_world = _ft_to_world(MIN_CENTERLINE_SEPARATION_FT)
+    sample_step_world = _ft_to_world(PERP_SAMPLE_STEP_FT)
+
+    spacing_context = _nearby_sections(bounds, [probe_half_len_world] * count)
+    if np is not None:
+        # A boundary point lies within its own max |DLAT| of the centreline,
+        # so only a rival within twice that distance can be closer to it.
+        ownership_context = _nearby_sections(
+            bounds,
+            [
+                2.0 * _max_abs_dlat(_safe_get_fsects(fsects_by_section, index)) + 1.0
+                for index in range(count)
+            ],
+        )
+    else:
+        # The fallback takes the nearest rival of all sections.
+        ownership_context = [
+            tuple(other for other in range(count) if other != index) for index in range(count)
+        ]
+
+    planned: list[tuple[_CheckTask, tuple]] = []
+    for index in range(count):
+        contexts = {
+            _CHECK_TOPOLOGY: (),
+            _CHECK_JOINS: ((index + 1) % count,),
+            _CHECK_CURVES: (),
+            _CHECK_SPACING: spacing_context[index],
+            _CHECK_OWNERSHIP: ownership_context[index],
+        }
+        for check in _SECTION_CHECKS:
+            context = contexts[check]
+            weight = 1
+            if check == _CHECK_SPACING:
+                weight += _count_polyline_samples(polylines[index], sample_step_world)
+            key = (count, hashes[index], tuple(hashes[other] for other in context))
+            planned.append((_CheckTask(check, index, context, weight), key))
+    return planned
+
+
+def _polyline_bounds(polyline: list[Point]) -> tuple[float, float, float, float] | None:
+    if len(polyline) < 2:
+        return None
+    xs = [float(point[0]) for point in polyline]
+    ys = [float(point[1]) for point in polyline]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _max_abs_dlat(fsects: list[PreviewFSection]) -> float:
+    return max(
+        (abs(float(value)) for fsect in fsects for value in (fsect.start_dlat, fsect.end_dlat)),
+        default=0.0,
+    )
+
+
+def _nearby_sections(
+    bounds: list[tuple[float, float, float, float] | None],
+    margins: list[float],
+) -> list[tuple[int, ...]]:
+    """Return, per section, the other sections within its margin (by bbox)."""
+    present = [index for index, bbox in enumerate(bounds) if bbox is not None]
+    nearby: list[tuple[int, ...]] = [() for _ in bounds]
+    if not present:
+        return nearby
+
+    if np is not None:
+        indices = np.asarray(present)
+        boxes = np.asarray([bounds[index] for index in present], dtype=float)
+        for index in present:
+            min_x, min_y, max_x, max_y = bounds[index]
+            margin = margins[index]
+            mask = (
+                (boxes[:, 0] <= max_x + margin)
+                & (boxes[:, 2] >= min_x - margin)
+                & (boxes[:, 1] <= max_y + margin)
+                & (boxes[:, 3] >= min_y - margin)
+            )
+            nearby[index] = tuple(int(other) for other in indices[mask] if other != index)
+        return nearby
+
+    for index in present:
+        min_x, min_y, max_x, max_y = bounds[index]
+        margin = margins[index]
+        nearby[index] = tuple(
+            other
+            for other in present
+            if other != index
+            and bounds[other][0] <= max_x + margin
+            and bounds[other][2] >= min_x - margin
+            and bounds[other][1] <= max_y + margin
+            and bounds[other][3] >= min_y - margin
+        )
+    return nearby
+
+
+def _section_workers(sections: int, max_workers: int | None) -> int:
+    return worker_count("sg_sections", sections, sections, max_workers)
+
+
+def _build_check_jobs(
+    sections: list[SectionPreview],
+    fsects_by_section: list[list[PreviewFSection]],
+    measurement_unit: str,
+    tasks: list[_CheckTask],
+    workers: int,
+) -> list[_CheckJob]:
+    """Split ``tasks`` into chunks of neighbouring sections.
+
+    Each job carries only the sections (and fsects) its tasks read; the
+    rest of the list is ``None`` so indices keep their meaning.
+    """
+    if not tasks:
+        return []
+    by_section: dict[int, list[_CheckTask]] = {}
+    for task in tasks:
+        by_section.setdefault(task.index, []).append(task)
+    section_indices = sorted(by_section)
+    if workers > 1:
+        chunk_size = math.ceil(len(section_indices) / (workers * _CHUNKS_PER_WORKER))
+    else:
+        chunk_size = _SERIAL_CHUNK_SECTIONS
+    chunk_size = max(1, chunk_size)
+
+    jobs: list[_CheckJob] = []
+    for start in range(0, len(section_indices), chunk_size):
+        chunk_tasks = tuple(
+            task
+            for index in section_indices[start : start + chunk_size]
+            for task in by_section[index]
+        )
+        needed = {task.index for task in chunk_tasks}
+        for task in chunk_tasks:
+            needed.update(task.context)
+        jobs.append(
+            _CheckJob(
+                sections=[
+                    section if index in needed else None
+                    for index, section in enumerate(sections)
+                ],
+                fsects_by_section=[
+                    _safe_get_fsects(fsects_by_section, index) if index in needed else []
+                    for index in range(len(sections))
+                ],
+                measurement_unit=measurement_unit,
+                tasks=chunk_tasks,
+                weight=sum(task.weight for task in chunk_tasks),
+            )
+        )
+    return jobs
+
+
+def _run_check_jobs(
+    jobs: list[_CheckJob],
+    max_workers: int | None,
+    progress: "_ProgressTracker",
+    section_count: int,
+):
+    """Yield ``(job, findings)`` as jobs finish, in a process pool if worthwhile."""
+
+    def _message(job: _CheckJob) -> str:
+        first = job.tasks[0].index + 1
+        last = job.tasks[-1].index + 1
+        return f"Integrity checks: sections {first}-{last}/{section_count}"
+
+    section_total = len({task.index for job in jobs for task in job.tasks})
+    workers = min(_section_workers(section_total, max_workers), len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            findings = _run_check_job(job)
+            progress.step(job.weight, message=_message(job))
+            yield job, findings
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(_run_check_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            findings = future.result()
+            progress.step(job.weight, message=_message(job))
+            yield job, findings
+    except BaseException:
+        # Also reached when the progress callback cancels the run.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+
+def _run_check_job(job: _CheckJob) -> list[_Findings]:
+    """Run one chunk of check tasks; executed in worker processes."""
+    sections = job.sections
+    fsects_by_section = job.fsects_by_section
+    unit = job.measurement_unit
+    sample_step_world = _ft_to_world(PERP_SAMPLE_STEP_FT)
+    probe_half_len_world = _ft_to_world(MIN_CENTERLINE_SEPARATION_FT)
+
+    all_segments: list[tuple[int, Point, Point]] | None = None
+    segment_index: _SegmentSpatialIndex | None = None
+    prepared_polyline_cache: dict[int, _PreparedPolyline] | None = None
+    section_spatial_index: _SectionSegmentSpatialIndex | None = None
+
+    results: list[_Findings] = []
+    for task in job.tasks:
+        index = task.index
+        if task.check == _CHECK_TOPOLOGY:
+            results.append(_topology_findings(index, sections))
+        elif task.check == _CHECK_JOINS:
+            results.append(_join_findings(index, sections, fsects_by_section, unit))
+        elif task.check == _CHECK_CURVES:
+            results.append(_curve_findings(index, sections, unit))
+        elif task.check == _CHECK_SPACING:
+            if all_segments is None:
+                all_segments = _collect_segments(sections)
+                segment_index = _build_segment_spatial_index(all_segments, probe_half_len_world)
+            results.append(
+                _spacing_findings(
+                    index,
+                    sections,
+                    fsects_by_section,
+                    all_segments,
+                    segment_index,
+                    sample_step_world,
+                    unit,
+                )
+            )
+        elif np is not None:
+            if prepared_polyline_cache is None:
+                prepared_polyline_cache = _build_prepared_polyline_cache(sections)
+            results.append(
+                _ownership_findings_numpy(
+                    index,
+                    sections,
+                    fsects_by_section,
+                    prepared_polyline_cache,
+                    task.context,
+                    sample_step_world,
+                    unit,
+                )
+            )
+        else:
+            if section_spatial_index is None:
+                section_spatial_index = _build_section_segment_spatial_index(
+                    sections, sample_step_world
+                )
+            results.append(
+                _ownership_findings_fallback(
+                    index,
+                    sections,
+                    fsects_by_section,
+                    section_spatial_index,
+                    sample_step_world,
+                    unit,
+                )
+            )
+    return results
+
+
+def _merged_lines(
+    results: dict[tuple[str, int], _Findings], check: str, count: int, group: int = 0
+) -> list[str]:
+    return [line for index in range(count) for line in results[(check, index)].groups[group]]
+
+
+def _merged_points(
+    results: dict[tuple[str, int], _Findings], check: str, count: int
+) -> list[Point]:
+    return [point for index in range(count) for point in results[(check, index)].points]
+
+
+# ----------------------------------------------------------------------
+# Report sections
+# ----------------------------------------------------------------------
+def _topology_report(
+    sections: list[SectionPreview], results: dict[tuple[str, int], _Findings]
+) -> list[str]:
     n = len(sections)
     closed = is_closed_loop(sections)
     lines = ["Topology", "-" * 72, f"Sections: {n}", f"Closed loop: {'YES' if closed else 'NO'}"]
 
-    unconnected: list[str] = []
-    for index, section in enumerate(sections):
-        progress.step(message=f"Topology checks: section {index + 1}/{n}")
-        invalid_prev = section.previous_id < 0 or section.previous_id >= n
-        invalid_next = section.next_id < 0 or section.next_id >= n
-        if invalid_prev or invalid_next:
-            reasons: list[str] = []
-            if invalid_prev:
-                reasons.append(f"previous_id={section.previous_id}")
-            if invalid_next:
-                reasons.append(f"next_id={section.next_id}")
-            unconnected.append(f"  - section {index}: {', '.join(reasons)}")
-
+    unconnected = _merged_lines(results, _CHECK_TOPOLOGY, n)
     if unconnected:
         lines.append(f"Unconnected sections: {len(unconnected)}")
         lines.extend(unconnected)
@@ -405,60 +821,27 @@ def _topology_report(sections: list[SectionPreview], progress: "_ProgressTracker
     return lines
 
 
+def _topology_findings(index: int, sections: list[SectionPreview | None]) -> _Findings:
+    n = len(sections)
+    section = sections[index]
+    invalid_prev = section.previous_id < 0 or section.previous_id >= n
+    invalid_next = section.next_id < 0 or section.next_id >= n
+    if not (invalid_prev or invalid_next):
+        return _Findings(groups=((),))
+    reasons: list[str] = []
+    if invalid_prev:
+        reasons.append(f"previous_id={section.previous_id}")
+    if invalid_next:
+        reasons.append(f"next_id={section.next_id}")
+    return _Findings(groups=((f"  - section {index}: {', '.join(reasons)}",),))
+
+
 def _heading_and_boundary_report(
-    sections: list[SectionPreview],
-    fsects_by_section: list[list[PreviewFSection]],
-    measurement_unit: str,
-    progress: "_ProgressTracker",
+    sections: list[SectionPreview], results: dict[tuple[str, int], _Findings]
 ) -> list[str]:
     lines = ["Join heading and boundary gap checks", "-" * 72]
-    mismatch_lines: list[str] = []
-    computed_endpoint_gap_lines: list[str] = []
-    total = len(sections)
-
-    for index, section in enumerate(sections):
-        progress.step(message=f"Join heading checks: section {index + 1}/{total}")
-        next_index = index + 1
-        if next_index >= total:
-            next_index = 0
-        next_section = sections[next_index]
-
-        mismatch = heading_delta(section.end_heading, next_section.start_heading)
-        if mismatch is None or abs(mismatch) < 0.01:
-            pass
-        else:
-            center_gap = _distance(section.end, next_section.start)
-            left_gap, right_gap = _boundary_gaps(
-                section,
-                next_section,
-                _safe_get_fsects(fsects_by_section, index),
-                _safe_get_fsects(fsects_by_section, next_index),
-            )
-            mismatch_lines.append(
-                (
-                    f"  - {index} -> {next_index}: heading Δ={mismatch:.3f}°, "
-                    f"centerline gap={_format_world_distance(center_gap, measurement_unit)}, "
-                    f"left boundary gap={_format_world_distance(left_gap, measurement_unit)}, "
-                    f"right boundary gap={_format_world_distance(right_gap, measurement_unit)}"
-                )
-            )
-
-        computed_end = _computed_section_end_xy(section)
-        if computed_end is None:
-            continue
-        computed_gap = _distance(computed_end, next_section.start)
-        if computed_gap <= 1.0:
-            continue
-        computed_endpoint_gap_lines.append(
-            (
-                f"  - {index} -> {next_index}: computed end "
-                f"({_format_world_distance(computed_end[0], measurement_unit)}, "
-                f"{_format_world_distance(computed_end[1], measurement_unit)}) vs next start "
-                f"({_format_world_distance(next_section.start[0], measurement_unit)}, "
-                f"{_format_world_distance(next_section.start[1], measurement_unit)}), "
-                f"gap={_format_world_distance(computed_gap, measurement_unit)}"
-            )
-        )
+    mismatch_lines = _merged_lines(results, _CHECK_JOINS, len(sections), 0)
+    computed_endpoint_gap_lines = _merged_lines(results, _CHECK_JOINS, len(sections), 1)
 
     if mismatch_lines:
         lines.append(f"Heading mismatches: {len(mismatch_lines)}")
@@ -475,6 +858,56 @@ def _heading_and_boundary_report(
     return lines
 
 
+def _join_findings(
+    index: int,
+    sections: list[SectionPreview | None],
+    fsects_by_section: list[list[PreviewFSection]],
+    measurement_unit: str,
+) -> _Findings:
+    section = sections[index]
+    next_index = index + 1
+    if next_index >= len(sections):
+        next_index = 0
+    next_section = sections[next_index]
+    mismatch_lines: tuple[str, ...] = ()
+    gap_lines: tuple[str, ...] = ()
+
+    mismatch = heading_delta(section.end_heading, next_section.start_heading)
+    if mismatch is not None and abs(mismatch) >= 0.01:
+        center_gap = _distance(section.end, next_section.start)
+        left_gap, right_gap = _boundary_gaps(
+            section,
+            next_section,
+            _safe_get_fsects(fsects_by_section, index),
+            _safe_get_fsects(fsects_by_section, next_index),
+        )
+        mismatch_lines = (
+            (
+                f"  - {index} -> {next_index}: heading Δ={mismatch:.3f}°, "
+                f"centerline gap={_format_world_distance(center_gap, measurement_unit)}, "
+                f"left boundary gap={_format_world_distance(left_gap, measurement_unit)}, "
+                f"right boundary gap={_format_world_distance(right_gap, measurement_unit)}"
+            ),
+        )
+
+    computed_end = _computed_section_end_xy(section)
+    if computed_end is not None:
+        computed_gap = _distance(computed_end, next_section.start)
+        if computed_gap > 1.0:
+            gap_lines = (
+                (
+                    f"  - {index} -> {next_index}: computed end "
+                    f"({_format_world_distance(computed_end[0], measurement_unit)}, "
+                    f"{_format_world_distance(computed_end[1], measurement_unit)}) vs next start "
+                    f"({_format_world_distance(next_section.start[0], measurement_unit)}, "
+                    f"{_format_world_distance(next_section.start[1], measurement_unit)}), "
+                    f"gap={_format_world_distance(computed_gap, measurement_unit)}"
+                ),
+            )
+
+    return _Findings(groups=(mismatch_lines, gap_lines))
+
+
 def _computed_section_end_xy(section: SectionPreview) -> Point | None:
     start_x = float(section.start[0])
     start_y = float(section.start[1])
@@ -505,29 +938,15 @@ def _computed_section_end_xy(section: SectionPreview) -> Point | None:
     return (start_x + heading[0] * length, start_y + heading[1] * length)
 
 
+
 def _curve_limits_report(
-    sections: list[SectionPreview], measurement_unit: str, progress: "_ProgressTracker"
+    sections: list[SectionPreview],
+    measurement_unit: str,
+    results: dict[tuple[str, int], _Findings],
 ) -> list[str]:
     lines = ["Curve limits", "-" * 72]
-    long_arc: list[str] = []
-    tight_radius: list[str] = []
-    min_radius_world = _ft_to_world(MIN_RADIUS_FT)
-
-    for index, section in enumerate(sections):
-        progress.step(message=f"Curve limit checks: section {index + 1}/{len(sections)}")
-        if section.type_name != "curve":
-            continue
-
-        radius_abs = _effective_curve_radius(section)
-        if radius_abs > 0:
-            arc_degrees = math.degrees(float(section.length) / radius_abs)
-            if arc_degrees > MAX_ARC_DEGREES:
-                long_arc.append(f"  - section {index}: arc={arc_degrees:.2f}°")
-
-        if radius_abs < min_radius_world:
-            tight_radius.append(
-                f"  - section {index}: radius={_format_world_distance(radius_abs, measurement_unit)}"
-            )
+    long_arc = _merged_lines(results, _CHECK_CURVES, len(sections), 0)
+    tight_radius = _merged_lines(results, _CHECK_CURVES, len(sections), 1)
 
     if long_arc:
         lines.append(f"Curves with arc > {MAX_ARC_DEGREES:.0f}°: {len(long_arc)}")
@@ -549,92 +968,39 @@ def _curve_limits_report(
     return lines
 
 
+def _curve_findings(
+    index: int, sections: list[SectionPreview | None], measurement_unit: str
+) -> _Findings:
+    section = sections[index]
+    if section.type_name != "curve":
+        return _Findings(groups=((), ()))
+
+    long_arc: tuple[str, ...] = ()
+    tight_radius: tuple[str, ...] = ()
+    radius_abs = _effective_curve_radius(section)
+    if radius_abs > 0:
+        arc_degrees = math.degrees(float(section.length) / radius_abs)
+        if arc_degrees > MAX_ARC_DEGREES:
+            long_arc = (f"  - section {index}: arc={arc_degrees:.2f}°",)
+
+    if radius_abs < _ft_to_world(MIN_RADIUS_FT):
+        tight_radius = (
+            f"  - section {index}: radius={_format_world_distance(radius_abs, measurement_unit)}",
+        )
+    return _Findings(groups=(long_arc, tight_radius))
+
+
 def _centerline_clearance_report(
     sections: list[SectionPreview],
-    fsects_by_section: list[list[PreviewFSection]],
     measurement_unit: str,
-    progress: "_ProgressTracker",
+    results: dict[tuple[str, int], _Findings],
 ) -> tuple[list[str], list[Point], list[Point]]:
     lines = ["Centerline clearance and boundary ownership", "-" * 72]
     sample_step_world = _ft_to_world(PERP_SAMPLE_STEP_FT)
-    probe_half_len_world = _ft_to_world(MIN_CENTERLINE_SEPARATION_FT)
-
-    all_segments: list[tuple[int, Point, Point]] = []
-    for section_index, section in enumerate(sections):
-        progress.step(
-            message=f"Centerline setup: section {section_index + 1}/{len(sections)}"
-        )
-        for seg_start, seg_end in _polyline_segments(_section_polyline_for_checks(section)):
-            all_segments.append((section_index, seg_start, seg_end))
-
-    segment_index = _build_segment_spatial_index(
-        all_segments,
-        search_radius=probe_half_len_world,
-    )
-
-    sample_counts = _centerline_sample_counts(sections, sample_step_world)
-    total_samples = sum(sample_counts)
-    processed_samples = 0
-    findings: list[str] = []
-    spacing_violation_points: list[Point] = []
-    for section_index, section in enumerate(sections):
-        for sample_point, tangent, along_distance, ratio in _sample_polyline_with_distance(
-            _section_polyline_for_checks(section),
-            sample_step_world,
-        ):
-            processed_samples += 1
-            if total_samples > 0:
-                progress.step(
-                    message=(
-                        "Centerline spacing checks: "
-                        f"section {section_index + 1}/{len(sections)} sample "
-                        f"{processed_samples}/{total_samples}"
-                    )
-                )
-            normal = _left_normal(tangent)
-            if normal is None:
-                continue
-
-            hit = _find_probe_proximity(
-                section_index,
-                sample_point,
-                normal,
-                probe_half_len_world,
-                all_segments,
-                segment_index,
-                sections,
-            )
-            if hit is None:
-                continue
-            hit_section_index, measured_clearance, conflict_point = hit
-            findings.append(
-                (
-                    f"  - section {section_index} at DLONG {_format_world_distance(section.start_dlong + along_distance, measurement_unit)} "
-                    f"near ({_format_world_distance(sample_point[0], measurement_unit)}, "
-                    f"{_format_world_distance(sample_point[1], measurement_unit)}) intersects section {hit_section_index} "
-                    f"within ±{_format_world_distance(probe_half_len_world, measurement_unit)} "
-                    f"(measured clearance {_format_world_distance(measured_clearance, measurement_unit)})"
-                )
-            )
-
-            section_fsects = fsects_by_section[section_index] if section_index < len(fsects_by_section) else []
-            left_dlat, right_dlat = _boundary_offsets_at_ratio(section_fsects, ratio)
-            side_dlat = left_dlat
-            conflict_vector = (
-                float(conflict_point[0] - sample_point[0]),
-                float(conflict_point[1] - sample_point[1]),
-            )
-            if (conflict_vector[0] * normal[0] + conflict_vector[1] * normal[1]) < 0.0:
-                side_dlat = right_dlat
-
-            spacing_violation_points.append(
-                (
-                    float(sample_point[0] + normal[0] * side_dlat),
-                    float(sample_point[1] + normal[1] * side_dlat),
-                )
-            )
-            break
+    count = len(sections)
 
+    findings = _merged_lines(results, _CHECK_SPACING, count)
+    spacing_violation_points = _merged_points(results, _CHECK_SPACING, count)
     if findings:
         lines.append(
             f"Sections with < {_format_world_distance(_ft_to_world(MIN_CENTERLINE_SEPARATION_FT), measurement_unit)} perpendicular spacing: {len(findings)}"
@@ -649,14 +1015,8 @@ def _centerline_clearance_report(
             )
         )
 
-    boundary_lines, violation_points = _boundary_centerline_ownership_report(
-        sections,
-        fsects_by_section,
-        sample_step_world,
-        measurement_unit,
-        progress,
-    )
-    lines.extend(boundary_lines)
+    lines.extend(_ownership_lines(_merged_lines(results, _CHECK_OWNERSHIP, count)))
+    violation_points = _merged_points(results, _CHECK_OWNERSHIP, count)
 
     lines.append(
         f"Sampling step: {_format_world_distance(sample_step_world, measurement_unit)} along each centerline section."
@@ -664,6 +1024,99 @@ def _centerline_clearance_report(
     return lines, violation_points, spacing_violation_points
 
 
+def _collect_segments(sections: list[SectionPreview | None]) -> list[tuple[int, Point, Point]]:
+    all_segments: list[tuple[int, Point, Point]] = []
+    for section_index, section in enumerate(sections):
+        if section is None:
+            continue
+        for seg_start, seg_end in _polyline_segments(_section_polyline_for_checks(section)):
+            all_segments.append((section_index, seg_start, seg_end))
+    return all_segments
+
+
+def _spacing_findings(
+    section_index: int,
+    sections: list[SectionPreview | None],
+    fsects_by_section: list[list[PreviewFSection]],
+    all_segments: list[tuple[int, Point, Point]],
+    segment_index: "_SegmentSpatialIndex | None",
+    sample_step_world: float,
+    measurement_unit: str,
+) -> _Findings:
+    section = sections[section_index]
+    probe_half_len_world = _ft_to_world(MIN_CENTERLINE_SEPARATION_FT)
+    for sample_point, tangent, along_distance, ratio in _sample_polyline_with_distance(
+        _section_polyline_for_checks(section),
+        sample_step_world,
+    ):
+        normal = _left_normal(tangent)
+        if normal is None:
+            continue
+
+        hit = _find_probe_proximity(
+            section_index,
+            sample_point,
+            normal,
+            probe_half_len_world,
+            all_segments,
+            segment_index,
+            sections,
+        )
+        if hit is None:
+            continue
+        hit_section_index, measured_clearance, conflict_point = hit
+        finding = (
+            f"  - section {section_index} at DLONG {_format_world_distance(section.start_dlong + along_distance, measurement_unit)} "
+            f"near ({_format_world_distance(sample_point[0], measurement_unit)}, "
+            f"{_format_world_distance(sample_point[1], measurement_unit)}) intersects section {hit_section_index} "
+            f"within ±{_format_world_distance(probe_half_len_world, measurement_unit)} "
+            f"(measured clearance {_format_world_distance(measured_clearance, measurement_unit)})"
+        )
+
+        section_fsects = _safe_get_fsects(fsects_by_section, section_index)
+        left_dlat, right_dlat = _boundary_offsets_at_ratio(section_fsects, ratio)
+        side_dlat = left_dlat
+        conflict_vector = (
+            float(conflict_point[0] - sample_point[0]),
+            float(conflict_point[1] - sample_point[1]),
+        )
+        if (conflict_vector[0] * normal[0] + conflict_vector[1] * normal[1]) < 0.0:
+            side_dlat = right_dlat
+
+        point = (
+            float(sample_point[0] + normal[0] * side_dlat),
+            float(sample_point[1] + normal[1] * side_dlat),
+        )
+        return _Findings(groups=((finding,),), points=(point,))
+    return _Findings(groups=((),))
+
+
+def _ownership_lines(findings: list[str]) -> list[str]:
+    if not findings:
+        return ["Boundary points closer to a different centerline: none"]
+    return [f"Boundary points closer to a different centerline: {len(findings)}", *findings]
+
+
+def _ownership_finding_text(
+    section_index: int,
+    side: str,
+    boundary_point: Point,
+    dlong: float,
+    rival_index: int,
+    rival_distance: float,
+    own_distance: float,
+    measurement_unit: str,
+) -> str:
+    return (
+        f"  - section {section_index} {side} boundary near "
+        f"({_format_world_distance(boundary_point[0], measurement_unit)}, {_format_world_distance(boundary_point[1], measurement_unit)}) "
+        f"at DLONG {_format_world_distance(dlong, measurement_unit)} "
+        f"is closer to section {rival_index} centerline "
+        f"({_format_world_distance(rival_distance, measurement_unit)}) than its own "
+        f"({_format_world_distance(own_distance, measurement_unit)})"
+    )
+
+
 def _boundary_centerline_ownership_report(
     sections: list[SectionPreview],
     fsects_by_section: list[list[PreviewFSection]],
@@ -695,119 +1148,135 @@ def _boundary_centerline_ownership_report_numpy(
     measurement_unit: str,
     progress: "_ProgressTracker",
 ) -> tuple[list[str], list[Point]]:
-    lines: list[str] = []
+    prepared_polyline_cache = _build_prepared_polyline_cache(sections)
+    rivals = tuple(range(len(sections)))
     findings: list[str] = []
     violation_points: list[Point] = []
-    prepared_polyline_cache = _build_prepared_polyline_cache(sections)
-
-    for section_index, section in enumerate(sections):
+    for section_index in range(len(sections)):
         progress.step(
             message=f"Boundary ownership checks: section {section_index + 1}/{len(sections)}"
         )
-        samples = _sample_polyline_with_distance(_section_polyline_for_checks(section), sample_step_world)
-        if not samples:
-            continue
+        result = _ownership_findings_numpy(
+            section_index,
+            sections,
+            fsects_by_section,
+            prepared_polyline_cache,
+            rivals,
+            sample_step_world,
+            measurement_unit,
+        )
+        findings.extend(result.groups[0])
+        violation_points.extend(result.points)
+    return _ownership_lines(findings), violation_points
 
-        own_prepared_polyline = prepared_polyline_cache.get(section_index)
-        if own_prepared_polyline is None:
-            continue
 
-        sample_points = np.asarray([sample[0] for sample in samples], dtype=float)
-        tangents = np.asarray([sample[1] for sample in samples], dtype=float)
-        along = np.asarray([sample[2] for sample in samples], dtype=float)
-        total = float(samples[-1][3])
+def _ownership_findings_numpy(
+    section_index: int,
+    sections: list[SectionPreview | None],
+    fsects_by_section: list[list[PreviewFSection]],
+    prepared_polyline_cache: dict[int, "_PreparedPolyline"],
+    rival_candidates: tuple[int, ...],
+    sample_step_world: float,
+    measurement_unit: str,
+) -> _Findings:
+    """Check one section's boundaries, trying ``rival_candidates`` in order."""
+    no_findings = _Findings(groups=((),))
+    section = sections[section_index]
+    samples = _sample_polyline_with_distance(_section_polyline_for_checks(section), sample_step_world)
+    if not samples:
+        return no_findings
+
+    own_prepared_polyline = prepared_polyline_cache.get(section_index)
+    if own_prepared_polyline is None:
+        return no_findings
+
+    sample_points = np.asarray([sample[0] for sample in samples], dtype=float)
+    tangents = np.asarray([sample[1] for sample in samples], dtype=float)
+    along = np.asarray([sample[2] for sample in samples], dtype=float)
+    total = float(samples[-1][3])
+
+    tangent_norm = np.hypot(tangents[:, 0], tangents[:, 1])
+    valid = tangent_norm > 1e-9
+    if not np.any(valid):
+        return no_findings
+
+    normals = np.zeros_like(tangents)
+    normals[:, 0] = -tangents[:, 1]
+    normals[:, 1] = tangents[:, 0]
+    normals[valid] /= tangent_norm[valid][:, None]
+
+    ratio = np.zeros_like(along)
+    if total > 0:
+        ratio = np.clip(along / total, 0.0, 1.0)
+
+    left_dlat, right_dlat = _boundary_offsets_at_ratio_numpy(
+        _safe_get_fsects(fsects_by_section, section_index),
+        ratio,
+    )
+    left_points = sample_points + normals * left_dlat[:, None]
+    right_points = sample_points + normals * right_dlat[:, None]
 
-        tangent_norm = np.hypot(tangents[:, 0], tangents[:, 1])
-        valid = tangent_norm > 1e-9
-        if not np.any(valid):
+    for side, points in (("left", left_points), ("right", right_points)):
+        side_points = points[valid]
+        if side_points.size == 0:
             continue
 
-        normals = np.zeros_like(tangents)
-        normals[:, 0] = -tangents[:, 1]
-        normals[:, 1] = tangents[:, 0]
-        normals[valid] /= tangent_norm[valid][:, None]
-
-        ratio = np.zeros_like(along)
-        if total > 0:
-            ratio = np.clip(along / total, 0.0, 1.0)
-
-        left_dlat, right_dlat = _boundary_offsets_at_ratio_numpy(
-            _safe_get_fsects(fsects_by_section, section_index),
-            ratio,
+        own_distances = _points_to_polyline_distance_numpy(
+            side_points,
+            own_prepared_polyline,
         )
-        left_points = sample_points + normals * left_dlat[:, None]
-        right_points = sample_points + normals * right_dlat[:, None]
+        unresolved = np.ones(side_points.shape[0], dtype=bool)
+        rival_indices = np.full(side_points.shape[0], -1, dtype=int)
+        rival_distances = np.full(side_points.shape[0], math.inf, dtype=float)
 
-        for side, points in (("left", left_points), ("right", right_points)):
-            side_points = points[valid]
-            if side_points.size == 0:
+        for rival_index in rival_candidates:
+            if rival_index == section_index:
                 continue
+            if _is_adjacent_section(section_index, rival_index, sections):
+                continue
+            if not np.any(unresolved):
+                break
 
-            own_distances = _points_to_polyline_distance_numpy(
-                side_points,
-                own_prepared_polyline,
-            )
-            unresolved = np.ones(side_points.shape[0], dtype=bool)
-            rival_indices = np.full(side_points.shape[0], -1, dtype=int)
-            rival_distances = np.full(side_points.shape[0], math.inf, dtype=float)
-
-            for rival_index, _ in enumerate(sections):
-                if rival_index == section_index:
-                    continue
-                if _is_adjacent_section(section_index, rival_index, sections):
-                    continue
-                if not np.any(unresolved):
-                    break
-
-                rival_prepared_polyline = prepared_polyline_cache.get(rival_index)
-                if rival_prepared_polyline is None:
-                    continue
-
-                unresolved_indices = np.flatnonzero(unresolved)
-                rival_distances_candidate = _points_to_polyline_distance_numpy(
-                    side_points[unresolved_indices],
-                    rival_prepared_polyline,
-                )
-                can_flip = rival_distances_candidate + 1e-6 < own_distances[unresolved_indices]
-                if not np.any(can_flip):
-                    continue
-
-                flipped_indices = unresolved_indices[can_flip]
-                rival_indices[flipped_indices] = rival_index
-                rival_distances[flipped_indices] = rival_distances_candidate[can_flip]
-                unresolved[flipped_indices] = False
-
-            flipped = np.flatnonzero(rival_indices >= 0)
-            if flipped.size == 0:
+            rival_prepared_polyline = prepared_polyline_cache.get(rival_index)
+            if rival_prepared_polyline is None:
                 continue
 
-            first = int(flipped[0])
-            boundary_point = side_points[first]
-            findings.append(
-                (
-                    f"  - section {section_index} {side} boundary near "
-                    f"({_format_world_distance(boundary_point[0], measurement_unit)}, {_format_world_distance(boundary_point[1], measurement_unit)}) "
-                    f"at DLONG {_format_world_distance(section.start_dlong + along[first], measurement_unit)} "
-                    f"is closer to section {int(rival_indices[first])} centerline "
-                    f"({_format_world_distance(rival_distances[first], measurement_unit)}) than its own "
-                    f"({_format_world_distance(own_distances[first], measurement_unit)})"
-                )
+            unresolved_indices = np.flatnonzero(unresolved)
+            rival_distances_candidate = _points_to_polyline_distance_numpy(
+                side_points[unresolved_indices],
+                rival_prepared_polyline,
             )
-            violation_points.append((float(boundary_point[0]), float(boundary_point[1])))
-            break
+            can_flip = rival_distances_candidate + 1e-6 < own_distances[unresolved_indices]
+            if not np.any(can_flip):
+                continue
+
+            flipped_indices = unresolved_indices[can_flip]
+            rival_indices[flipped_indices] = rival_index
+            rival_distances[flipped_indices] = rival_distances_candidate[can_flip]
+            unresolved[flipped_indices] = False
 
-        if findings and findings[-1].startswith(f"  - section {section_index} "):
+        flipped = np.flatnonzero(rival_indices >= 0)
+        if flipped.size == 0:
             continue
 
-    if findings:
-        lines.append(
-            f"Boundary points closer to a different centerline: {len(findings)}"
+        first = int(flipped[0])
+        boundary_point = side_points[first]
+        finding = _ownership_finding_text(
+            section_index,
+            side,
+            boundary_point,
+            section.start_dlong + along[first],
+            int(rival_indices[first]),
+            rival_distances[first],
+            own_distances[first],
+            measurement_unit,
+        )
+        return _Findings(
+            groups=((finding,),),
+            points=((float(boundary_point[0]), float(boundary_point[1])),),
         )
-        lines.extend(findings)
-    else:
-        lines.append("Boundary points closer to a different centerline: none")
 
-    return lines, violation_points
+    return no_findings
 
 
 def _boundary_centerline_ownership_report_fallback(
@@ -817,87 +1286,82 @@ def _boundary_centerline_ownership_report_fallback(
     measurement_unit: str,
     progress: "_ProgressTracker",
 ) -> tuple[list[str], list[Point]]:
-    lines: list[str] = []
+    spatial_index = _build_section_segment_spatial_index(sections, sample_step_world)
     findings: list[str] = []
     violation_points: list[Point] = []
-    spatial_index = _build_section_segment_spatial_index(sections, sample_step_world)
-
-    for section_index, section in enumerate(sections):
+    for section_index in range(len(sections)):
         progress.step(
             message=f"Boundary ownership checks: section {section_index + 1}/{len(sections)}"
         )
-        samples = _sample_polyline_with_distance(_section_polyline_for_checks(section), sample_step_world)
-        if not samples:
-            continue
-
-        section_fsects = _safe_get_fsects(fsects_by_section, section_index)
-        for sample_point, tangent, along_distance, total_distance in samples:
-            normal = _left_normal(tangent)
-            if normal is None:
-                continue
-
-            ratio = 0.0 if total_distance <= 0 else min(max(along_distance / total_distance, 0.0), 1.0)
-            left_dlat, right_dlat = _boundary_offsets_at_ratio(section_fsects, ratio)
-            for side, dlat in (("left", left_dlat), ("right", right_dlat)):
-                boundary_point = (
-                    sample_point[0] + normal[0] * dlat,
-                    sample_point[1] + normal[1] * dlat,
-                )
-                own_dist = _point_to_polyline_distance(
-                    boundary_point,
-                    _section_polyline_for_checks(section),
-                )
-                rival_index, rival_dist = _nearest_section_distance(
-                    boundary_point,
-                    sections,
-                    exclude_index=section_index,
-                    spatial_index=spatial_index,
-                )
-                if rival_index is None or rival_dist is None:
-                    continue
-                if _is_adjacent_section(section_index, rival_index, sections):
-                    continue
-                if rival_dist + 1e-6 >= own_dist:
-                    continue
-
-                findings.append(
-                    (
-                        f"  - section {section_index} {side} boundary near "
-                        f"({_format_world_distance(boundary_point[0], measurement_unit)}, {_format_world_distance(boundary_point[1], measurement_unit)}) "
-                        f"at DLONG {_format_world_distance(section.start_dlong + along_distance, measurement_unit)} "
-                        f"is closer to section {rival_index} centerline "
-                        f"({_format_world_distance(rival_dist, measurement_unit)}) than its own "
-                        f"({_format_world_distance(own_dist, measurement_unit)})"
-                    )
-                )
-                violation_points.append((float(boundary_point[0]), float(boundary_point[1])))
-                break
-
-            if findings and findings[-1].startswith(f"  - section {section_index} "):
-                break
-
-    if findings:
-        lines.append(
-            f"Boundary points closer to a different centerline: {len(findings)}"
+        result = _ownership_findings_fallback(
+            section_index,
+            sections,
+            fsects_by_section,
+            spatial_index,
+            sample_step_world,
+            measurement_unit,
         )
-        lines.extend(findings)
-    else:
-        lines.append("Boundary points closer to a different centerline: none")
-
-    return lines, violation_points
+        findings.extend(result.groups[0])
+        violation_points.extend(result.points)
+    return _ownership_lines(findings), violation_points
 
 
-def _estimate_progress_steps(sections: list[SectionPreview]) -> int:
-    if not sections:
-        return 1
+def _ownership_findings_fallback(
+    section_index: int,
+    sections: list[SectionPreview | None],
+    fsects_by_section: list[list[PreviewFSection]],
+    spatial_index: "_SectionSegmentSpatialIndex | None",
+    sample_step_world: float,
+    measurement_unit: str,
+) -> _Findings:
+    section = sections[section_index]
+    samples = _sample_polyline_with_distance(_section_polyline_for_checks(section), sample_step_world)
+    section_fsects = _safe_get_fsects(fsects_by_section, section_index)
+    for sample_point, tangent, along_distance, total_distance in samples:
+        normal = _left_normal(tangent)
+        if normal is None:
+            continue
 
-    sample_step_world = _ft_to_world(PERP_SAMPLE_STEP_FT)
-    centerline_samples = sum(_count_polyline_samples(_section_polyline_for_checks(section), sample_step_world) for section in sections)
-    return 1 + (4 * len(sections)) + centerline_samples
+        ratio = 0.0 if total_distance <= 0 else min(max(along_distance / total_distance, 0.0), 1.0)
+        left_dlat, right_dlat = _boundary_offsets_at_ratio(section_fsects, ratio)
+        for side, dlat in (("left", left_dlat), ("right", right_dlat)):
+            boundary_point = (
+                sample_point[0] + normal[0] * dlat,
+                sample_point[1] + normal[1] * dlat,
+            )
+            own_dist = _point_to_polyline_distance(
+                boundary_point,
+                _section_polyline_for_checks(section),
+            )
+            rival_index, rival_dist = _nearest_section_distance(
+                boundary_point,
+                sections,
+                exclude_index=section_index,
+                spatial_index=spatial_index,
+            )
+            if rival_index is None or rival_dist is None:
+                continue
+            if _is_adjacent_section(section_index, rival_index, sections):
+                continue
+            if rival_dist + 1e-6 >= own_dist:
+                continue
 
+            finding = _ownership_finding_text(
+                section_index,
+                side,
+                boundary_point,
+                section.start_dlong + along_distance,
+                rival_index,
+                rival_dist,
+                own_dist,
+                measurement_unit,
+            )
+            return _Findings(
+                groups=((finding,),),
+                points=((float(boundary_point[0]), float(boundary_point[1])),),
+            )
 
-def _centerline_sample_counts(sections: list[SectionPreview], step: float) -> list[int]:
-    return [_count_polyline_samples(_section_polyline_for_checks(section), step) for section in sections]
+    return _Findings(groups=((),))
 
 
 def _count_polyline_samples(polyline: list[Point], step: float) -> int:
@@ -1126,7 +1590,7 @@ def _nearest_section_distance(
             return nearest_index, nearest_distance
 
     for index, section in enumerate(sections):
-        if index == exclude_index:
+        if index == exclude_index or section is None:
             continue
         prepared_polyline = None
         if prepared_polyline_cache is not None:
@@ -1173,6 +1637,8 @@ def _build_section_segment_spatial_index(
 ) -> _SectionSegmentSpatialIndex | None:
     indexed_segments: list[_IndexedSectionSegment] = []
     for section_index, section in enumerate(sections):
+        if section is None:
+            continue
         for seg_start, seg_end in _polyline_segments(_section_polyline_for_checks(section)):
             min_x = min(seg_start[0], seg_end[0])
             max_x = max(seg_start[0], seg_end[0])
@@ -1228,6 +1694,8 @@ def _build_prepared_polyline_cache(
 
     prepared: dict[int, _PreparedPolyline] = {}
     for index, section in enumerate(sections):
+        if section is None:
+            continue
         polyline = _section_polyline_for_checks(section)
         if len(polyline) < 2:
             continue
@@ -1415,6 +1883,9 @@ class _SegmentSpatialIndex:
                 continue
             overlapping.append(segment_index)
 
+        # Ascending order makes the first probe hit independent of which
+        # sections were indexed alongside the query.
+        overlapping.sort()
         return overlapping
 
 
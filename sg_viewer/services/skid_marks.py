@@ -3,7 +3,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 import random
 
-from sg_viewer.services.tsd_io import TrackSurfaceDetailLine
+import numpy as np
+
+from sg_viewer.services.tsd_io import (
+    TSD_COMMANDS,
+    TrackSurfaceDetailColumns,
+    TrackSurfaceDetailLine,
+)
 
 DEFAULT_SKID_COLORS: tuple[int, ...] = (45, 28, 44, 29)
 
@@ -142,6 +148,84 @@ def generate_skid_mark_lines(
     return tuple(lines)
 
 
+def generate_skid_mark_columns(
+    parameters: SkidMarkGenerationParameters,
+    *,
+    rng: np.random.Generator | None = None,
+) -> TrackSurfaceDetailColumns:
+    """Vectorized :func:`generate_skid_mark_lines` drawing from a numpy generator.
+
+    Each section's skids are drawn as whole arrays with the same distributions
+    as the per-line generator, so dense marks over a full track stay cheap.
+    """
+    generator = rng or np.random.default_rng()
+    colors = np.asarray(parameters.colors or DEFAULT_SKID_COLORS, dtype=np.int64)
+    values: list[np.ndarray] = []
+    for section in parameters.sections:
+        if section.num_skids <= 0:
+            continue
+        min_length = min(section.min_length, section.max_length)
+        max_length = max(section.min_length, section.max_length)
+        length = generator.integers(
+            min_length, max(min_length + 1, max_length), size=section.num_skids
+        )
+        start_upper = section.end_dlong - length
+        keep = start_upper > section.start_dlong
+        length = length[keep]
+        start_skid = generator.integers(section.start_dlong, start_upper[keep])
+        end_skid = start_skid + length
+
+        start_low, start_high = _interpolate_dlat_ranges(section, start_skid)
+        end_low, end_high = _interpolate_dlat_ranges(section, end_skid)
+        flat = start_high <= start_low
+        span = np.where(flat, 1, start_high - start_low)
+        dlat = np.where(flat, start_low, start_low + generator.integers(0, span))
+        ratio = np.where(flat, 0.5, (dlat - start_low) / span)
+        dlat2 = np.trunc(end_low + (end_high - end_low) * ratio).astype(np.int64)
+        values.append(
+            np.column_stack(
+                (
+                    generator.choice(colors, size=len(start_skid)),
+                    np.full(len(start_skid), max(1, int(section.width_500ths))),
+                    start_skid,
+                    dlat,
+                    end_skid,
+                    dlat2,
+                )
+            )
+        )
+    stacked = np.concatenate(values) if values else np.empty((0, 6), dtype=np.int64)
+    command = np.full(len(stacked), TSD_COMMANDS.index("Detail"), dtype=np.uint8)
+    return TrackSurfaceDetailColumns.from_values(command, stacked)
+
+
+def _interpolate_dlat_ranges(
+    section: SkidMarkSectionParameters, dlong: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Array form of :func:`_interpolate_dlat_range`."""
+    start_min = min(section.start_dlat_a, section.start_dlat_b)
+    start_max = max(section.start_dlat_a, section.start_dlat_b)
+    apex_min = min(section.apex_dlat_a, section.apex_dlat_b)
+    apex_max = max(section.apex_dlat_a, section.apex_dlat_b)
+    end_min = min(section.end_dlat_a, section.end_dlat_b)
+    end_max = max(section.end_dlat_a, section.end_dlat_b)
+    entry_length = section.apex_dlong - section.start_dlong
+    exit_length = section.end_dlong - section.apex_dlong
+
+    entry = (dlong <= section.apex_dlong) & (entry_length != 0)
+    entry_position = (dlong - section.start_dlong) / (entry_length or 1)
+    if exit_length == 0:
+        exit_low = np.full(dlong.shape, float(apex_min))
+        exit_high = np.full(dlong.shape, float(apex_max))
+    else:
+        exit_position = (dlong - section.apex_dlong) / exit_length
+        exit_low = apex_min + (end_min - apex_min) * exit_position
+        exit_high = apex_max + (end_max - apex_max) * exit_position
+    low = np.where(entry, start_min + (apex_min - start_min) * entry_position, exit_low)
+    high = np.where(entry, start_max + (apex_max - start_max) * entry_position, exit_high)
+    return np.trunc(low).astype(np.int64), np.trunc(high).astype(np.int64)
+
+
 def _interpolate_dlat_range(
     section: SkidMarkSectionParameters,
     *,
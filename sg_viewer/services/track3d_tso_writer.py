@@ -1,9 +1,6 @@
 from __future__ import annotations
 
-from pathlib import Path
-from tempfile import NamedTemporaryFile
-
-from sg_viewer.io.track3d_catalog import Track3DCatalog, parse_track3d_catalog
+from sg_viewer.io.track3d_catalog import Track3DCatalog, parse_track3d_catalog_text
 from sg_viewer.services.trackside_objects import TracksideObject, normalize_trackside_filename
 
 
@@ -40,13 +37,7 @@ def replace_tso_dynamic_section_in_3d_text(
     catalog: Track3DCatalog | None = None,
 ) -> tuple[str, int, int]:
     if catalog is None:
-        with NamedTemporaryFile("w", suffix=".3d", encoding="utf-8", delete=False) as temp_file:
-            temp_file.write(text)
-            temp_path = Path(temp_file.name)
-        try:
-            catalog = parse_track3d_catalog(temp_path)
-        finally:
-            temp_path.unlink(missing_ok=True)
+        catalog = parse_track3d_catalog_text(text)
     if not catalog.tsos:
         return text, 0, 0
 
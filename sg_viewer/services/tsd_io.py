@@ -1,6 +1,15 @@
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+TSD_COMMANDS: tuple[str, ...] = ("Detail", "Detail_Dash")
+_TSD_COMMAND_CODES = {name.lower(): code for code, name in enumerate(TSD_COMMANDS)}
+_TSD_FIELDS = ("color_index", "width_500ths", "start_dlong", "start_dlat", "end_dlong", "end_dlat")
+_INT64 = np.iinfo(np.int64)
 
 
 @dataclass(frozen=True)
@@ -28,6 +37,50 @@ class TrackSurfaceDetailFile:
     lines: tuple[TrackSurfaceDetailLine, ...]
 
 
+@dataclass(frozen=True)
+class TrackSurfaceDetailColumns:
+    """TSD lines stored column-wise for bulk generation, I/O and projection.
+
+    ``command`` holds indexes into :data:`TSD_COMMANDS`; the other columns are
+    ``int64`` arrays matching the :class:`TrackSurfaceDetailLine` fields.
+    """
+
+    command: np.ndarray
+    color_index: np.ndarray
+    width_500ths: np.ndarray
+    start_dlong: np.ndarray
+    start_dlat: np.ndarray
+    end_dlong: np.ndarray
+    end_dlat: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.command)
+
+    @classmethod
+    def from_values(cls, command: np.ndarray, values: np.ndarray) -> TrackSurfaceDetailColumns:
+        """Build from command codes and an ``(n, 6)`` array in TSD field order."""
+        values = np.asarray(values, dtype=np.int64).reshape(-1, len(_TSD_FIELDS))
+        return cls(np.asarray(command, dtype=np.uint8), *(values[:, index] for index in range(len(_TSD_FIELDS))))
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[TrackSurfaceDetailLine]) -> TrackSurfaceDetailColumns:
+        lines = tuple(lines)
+        command = [_TSD_COMMAND_CODES[normalize_tsd_command(line.command).lower()] for line in lines]
+        values = [[getattr(line, name) for name in _TSD_FIELDS] for line in lines]
+        return cls.from_values(command, np.array(values, dtype=np.int64).reshape(-1, len(_TSD_FIELDS)))
+
+    def values(self) -> np.ndarray:
+        """Return the numeric columns as an ``(n, 6)`` array in TSD field order."""
+        return np.column_stack([getattr(self, name) for name in _TSD_FIELDS]).reshape(-1, len(_TSD_FIELDS))
+
+    def to_lines(self) -> tuple[TrackSurfaceDetailLine, ...]:
+        commands = [TSD_COMMANDS[code] for code in self.command.tolist()]
+        return tuple(
+            TrackSurfaceDetailLine(*row, command=command)
+            for command, row in zip(commands, self.values().tolist())
+        )
+
+
 def serialize_tsd(detail_file: TrackSurfaceDetailFile) -> str:
     rows = [
         (
@@ -39,7 +92,67 @@ def serialize_tsd(detail_file: TrackSurfaceDetailFile) -> str:
     return "\n".join(rows) + ("\n" if rows else "")
 
 
+def serialize_tsd_columns(columns: TrackSurfaceDetailColumns) -> str:
+    """Serialize columnar lines; the output matches :func:`serialize_tsd`."""
+    commands = [TSD_COMMANDS[code] for code in columns.command.tolist()]
+    fields = [getattr(columns, name).tolist() for name in _TSD_FIELDS]
+    rows = [
+        f"{command}: {color} {width} {start_dlong} {start_dlat} {end_dlong} {end_dlat}"
+        for command, color, width, start_dlong, start_dlat, end_dlong, end_dlat in zip(
+            commands, *fields
+        )
+    ]
+    return "\n".join(rows) + ("\n" if rows else "")
+
+
+def parse_tsd_columns(content: str) -> TrackSurfaceDetailColumns:
+    """Parse TSD text straight into columns.
+
+    Anything the bulk path cannot read (non-decimal integers, bad lines) goes
+    through the per-line parser, which raises the line-numbered errors.
+    """
+    commands: list[int] = []
+    payloads: list[str] = []
+    for raw_line in content.splitlines():
+        stripped = raw_line.strip()
+        if not stripped or stripped.startswith("%"):
+            continue
+        prefix, sep, payload = stripped.partition(":")
+        code = _TSD_COMMAND_CODES.get(prefix.strip().lower())
+        if code is None or sep != ":":
+            if sep == ":" and prefix.strip().lower() == "detail_tex":
+                continue
+            return _parse_tsd_columns_per_line(content)
+        if len(payload.split()) != len(_TSD_FIELDS):
+            return _parse_tsd_columns_per_line(content)
+        commands.append(code)
+        payloads.append(payload)
+    if not payloads:
+        return TrackSurfaceDetailColumns.from_values(commands, np.empty(0, dtype=np.int64))
+    with warnings.catch_warnings():
+        # numpy only warns when the text holds something other than integers.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(" ".join(payloads), dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            return _parse_tsd_columns_per_line(content)
+    if values.size != len(payloads) * len(_TSD_FIELDS):
+        return _parse_tsd_columns_per_line(content)
+    # fromstring saturates out-of-range values instead of failing.
+    if values.max() == _INT64.max or values.min() == _INT64.min:
+        return _parse_tsd_columns_per_line(content)
+    return TrackSurfaceDetailColumns.from_values(commands, values)
+
+
+def _parse_tsd_columns_per_line(content: str) -> TrackSurfaceDetailColumns:
+    return TrackSurfaceDetailColumns.from_lines(_parse_tsd_lines(content))
+
+
 def parse_tsd(content: str) -> TrackSurfaceDetailFile:
+    return TrackSurfaceDetailFile(lines=parse_tsd_columns(content).to_lines())
+
+
+def _parse_tsd_lines(content: str) -> tuple[TrackSurfaceDetailLine, ...]:
     lines: list[TrackSurfaceDetailLine] = []
     for line_number, raw_line in enumerate(content.splitlines(), start=1):
         stripped = raw_line.strip()
@@ -70,5 +183,7 @@ def parse_tsd(content: str) -> TrackSurfaceDetailFile:
             values = [int(value) for value in parts]
         except ValueError as exc:
             raise ValueError(f"Line {line_number}: all fields must be integers.") from exc
+        if not all(_INT64.min <= value <= _INT64.max for value in values):
+            raise ValueError(f"Line {line_number}: fields must fit in a 64-bit integer.")
         lines.append(TrackSurfaceDetailLine(*values, command=command))
-    return TrackSurfaceDetailFile(lines=tuple(lines))
+    return tuple(lines)
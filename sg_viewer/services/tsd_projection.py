@@ -0,0 +1,298 @@
+"""Bulk projection of TSD dlong/dlat coordinates onto SG preview sections.
+
+The preview painter used to place every TSD sample with a Python call per
+point. :class:`TrackProjector` precomputes the per-section constants once and
+maps whole arrays of ``(dlong, dlat)`` pairs to world coordinates, and
+:meth:`TrackProjector.sample_segments` samples many TSD segments in a single
+pass. The arithmetic mirrors ``preview_painter._point_on_track_at_dlong`` and
+``_sample_tsd_detail_segment`` step for step.
+"""
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from sg_viewer.model.dlong_mapping import DlongSectionLookup, build_dlong_section_lookup
+from sg_viewer.services.tsd_io import TrackSurfaceDetailColumns
+
+Point = tuple[float, float]
+BBox = tuple[float, float, float, float]
+
+ICR2_UNITS_PER_FOOT = 500.0 * 12.0
+MIN_TSD_SAMPLE_STEP = ICR2_UNITS_PER_FOOT
+TARGET_TSD_PIXELS_PER_SAMPLE = 6.0
+
+
+def is_ccw_turn(
+    start_vec: Point,
+    end_vec: Point,
+    heading: tuple[float, float] | None,
+) -> bool:
+    """Whether an arc from ``start_vec`` to ``end_vec`` about its centre turns left."""
+    if heading is not None:
+        cross = start_vec[0] * heading[1] - start_vec[1] * heading[0]
+        if not math.isclose(cross, 0.0, abs_tol=1e-12):
+            return cross > 0
+
+    cross = start_vec[0] * end_vec[1] - start_vec[1] * end_vec[0]
+    return cross > 0
+
+
+def angle_delta(start_angle: float, end_angle: float, ccw: bool) -> float:
+    """Signed sweep from ``start_angle`` to ``end_angle`` in the turn direction."""
+    delta = end_angle - start_angle
+    if ccw:
+        while delta <= 0:
+            delta += math.tau
+    else:
+        while delta >= 0:
+            delta -= math.tau
+    return delta
+
+
+def _isclose(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise ``math.isclose`` with its default tolerances."""
+    return (a == b) | (np.abs(a - b) <= 1e-9 * np.maximum(np.abs(a), np.abs(b)))
+
+
+class TrackProjector:
+    """Maps arrays of ``(dlong, dlat)`` to world points along ``sections``."""
+
+    def __init__(
+        self,
+        sections: Sequence,
+        track_length: float,
+        section_lookup: DlongSectionLookup | None = None,
+    ) -> None:
+        self.track_length = float(track_length)
+        self.section_count = len(sections)
+        self.empty = not sections or self.track_length <= 0
+        if self.empty:
+            return
+
+        lookup = section_lookup or build_dlong_section_lookup(sections, self.track_length)
+        self._starts = np.array([interval.start for interval in lookup.intervals], dtype=float)
+        self._ends = np.array([interval.end for interval in lookup.intervals], dtype=float)
+        self._interval_sections = np.array(
+            [interval.section_index for interval in lookup.intervals], dtype=np.int64
+        )
+        self._wrapping = tuple(lookup.wrapping_interval_indexes)
+
+        count = len(sections)
+        self._is_curve = np.zeros(count, dtype=bool)
+        self._sx = np.zeros(count)
+        self._sy = np.zeros(count)
+        self._dx = np.zeros(count)
+        self._dy = np.zeros(count)
+        self._nx = np.zeros(count)
+        self._ny = np.zeros(count)
+        self._has_normal = np.zeros(count, dtype=bool)
+        self._cx = np.zeros(count)
+        self._cy = np.zeros(count)
+        self._start_angle = np.zeros(count)
+        self._delta = np.zeros(count)
+        self._base_radius = np.zeros(count)
+        self._sign = np.ones(count)
+        for index, section in enumerate(sections):
+            sx, sy = section.start
+            ex, ey = section.end
+            self._sx[index] = sx
+            self._sy[index] = sy
+            center = section.center
+            if center is None:
+                dx = ex - sx
+                dy = ey - sy
+                length = math.hypot(dx, dy)
+                self._dx[index] = dx
+                self._dy[index] = dy
+                if length > 0:
+                    self._has_normal[index] = True
+                    self._nx[index] = -dy / length
+                    self._ny[index] = dx / length
+                continue
+
+            center_x, center_y = center
+            start_vec = (sx - center_x, sy - center_y)
+            end_vec = (ex - center_x, ey - center_y)
+            self._is_curve[index] = True
+            self._cx[index] = center_x
+            self._cy[index] = center_y
+            self._base_radius[index] = math.hypot(start_vec[0], start_vec[1])
+            if self._base_radius[index] <= 0:
+                continue
+            start_angle = math.atan2(start_vec[1], start_vec[0])
+            end_angle = math.atan2(end_vec[1], end_vec[0])
+            ccw = is_ccw_turn(start_vec, end_vec, section.start_heading)
+            self._start_angle[index] = start_angle
+            self._delta[index] = angle_delta(start_angle, end_angle, ccw)
+            self._sign[index] = -1.0 if ccw else 1.0
+
+    def locate(self, dlong: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Section indexes and clamped fractions, as ``dlong_to_section_position``."""
+        length = self.track_length
+        wrapped = np.mod(np.asarray(dlong, dtype=float), length)
+        count = len(self._starts)
+        if count == 0:
+            return np.full(wrapped.shape, self.section_count - 1), np.ones(wrapped.shape)
+        nearest = np.searchsorted(self._starts, wrapped, side="right") - 1
+        candidates = [nearest - 1, nearest, nearest + 1]
+        candidates.extend(np.full_like(nearest, index) for index in self._wrapping)
+
+        best_section = np.full(wrapped.shape, np.iinfo(np.int64).max)
+        best_interval = np.zeros(wrapped.shape, dtype=np.int64)
+        for candidate in candidates:
+            valid = (candidate >= 0) & (candidate < count)
+            interval = np.clip(candidate, 0, max(count - 1, 0))
+            start = self._starts[interval]
+            end = self._ends[interval]
+            wrapped_end = end - length
+            inside = np.where(
+                end <= length,
+                ((start <= wrapped) & (wrapped < end)) | _isclose(wrapped, end),
+                (wrapped >= start) | (wrapped < wrapped_end) | _isclose(wrapped, wrapped_end),
+            )
+            section = self._interval_sections[interval]
+            better = valid & inside & (end > start) & (section < best_section)
+            best_section = np.where(better, section, best_section)
+            best_interval = np.where(better, interval, best_interval)
+
+        found = best_section != np.iinfo(np.int64).max
+        start = self._starts[best_interval]
+        end = self._ends[best_interval]
+        span = end - start
+        safe_span = np.where(span > 0, span, 1.0)
+        fraction = np.where(
+            (end > length) & (wrapped < start),
+            (wrapped + length - start) / safe_span,
+            (wrapped - start) / safe_span,
+        )
+        fraction = np.where(found, np.clip(fraction, 0.0, 1.0), 1.0)
+        sections = np.where(found, best_section, self.section_count - 1)
+        return sections, fraction
+
+    def project(self, dlong: np.ndarray, dlat: np.ndarray) -> np.ndarray:
+        """World points as an ``(n, 2)`` array; empty when there is no track."""
+        dlong = np.asarray(dlong, dtype=float)
+        if self.empty:
+            return np.empty((0, 2))
+        dlat = np.broadcast_to(np.asarray(dlat, dtype=float), dlong.shape)
+        index, fraction = self.locate(dlong)
+
+        sx = self._sx[index]
+        sy = self._sy[index]
+        line_x = sx + self._dx[index] * fraction
+        line_y = sy + self._dy[index] * fraction
+        has_normal = self._has_normal[index]
+        line_x = np.where(has_normal, line_x + self._nx[index] * dlat, line_x)
+        line_y = np.where(has_normal, line_y + self._ny[index] * dlat, line_y)
+
+        angle = self._start_angle[index] + self._delta[index] * fraction
+        radius = np.maximum(0.0, self._base_radius[index] + self._sign[index] * dlat)
+        arc_x = self._cx[index] + np.cos(angle) * radius
+        arc_y = self._cy[index] + np.sin(angle) * radius
+        degenerate = self._base_radius[index] <= 0
+        arc_x = np.where(degenerate, sx, arc_x)
+        arc_y = np.where(degenerate, sy, arc_y)
+
+        is_curve = self._is_curve[index]
+        return np.column_stack((np.where(is_curve, arc_x, line_x), np.where(is_curve, arc_y, line_y)))
+
+    def sample_segments(
+        self,
+        start_dlong: np.ndarray,
+        start_dlat: np.ndarray,
+        end_dlong: np.ndarray,
+        end_dlat: np.ndarray,
+        pixels_per_world_unit: float,
+    ) -> list[np.ndarray]:
+        """Sample each segment at the painter's adaptive step in one pass."""
+        increment = max(
+            MIN_TSD_SAMPLE_STEP,
+            TARGET_TSD_PIXELS_PER_SAMPLE / max(pixels_per_world_unit, 1e-9),
+        )
+
+        def counts(span: np.ndarray) -> np.ndarray:
+            return np.maximum(1, np.ceil(span / increment)).astype(np.int64) + 1
+
+        def along(span: np.ndarray, step: np.ndarray, _count: np.ndarray):
+            distance = np.minimum(span, step * increment)
+            return distance, distance / np.where(span > 0, span, 1.0)
+
+        return self._sample(start_dlong, start_dlat, end_dlong, end_dlat, counts, along)
+
+    def segment_bboxes(
+        self,
+        start_dlong: np.ndarray,
+        start_dlat: np.ndarray,
+        end_dlong: np.ndarray,
+        end_dlat: np.ndarray,
+    ) -> list[BBox | None]:
+        """Coarse world bounding boxes from 4-32 checkpoints per segment."""
+
+        def counts(span: np.ndarray) -> np.ndarray:
+            checkpoints = np.ceil(span / (50.0 * MIN_TSD_SAMPLE_STEP))
+            return np.maximum(4, np.minimum(32, checkpoints)).astype(np.int64) + 1
+
+        def along(span: np.ndarray, step: np.ndarray, count: np.ndarray):
+            fraction = step / (count - 1)
+            return span * fraction, fraction
+
+        boxes: list[BBox | None] = []
+        for points in self._sample(start_dlong, start_dlat, end_dlong, end_dlat, counts, along):
+            if len(points) == 0:
+                boxes.append(None)
+                continue
+            low = points.min(axis=0)
+            high = points.max(axis=0)
+            boxes.append((float(low[0]), float(low[1]), float(high[0]), float(high[1])))
+        return boxes
+
+    def _sample(self, start_dlong, start_dlat, end_dlong, end_dlat, counts, along) -> list[np.ndarray]:
+        start_dlong = np.atleast_1d(np.asarray(start_dlong, dtype=float))
+        if self.empty:
+            return [np.empty((0, 2)) for _ in range(len(start_dlong))]
+        start_dlat = np.broadcast_to(np.asarray(start_dlat, dtype=float), start_dlong.shape)
+        end_dlat = np.broadcast_to(np.asarray(end_dlat, dtype=float), start_dlong.shape)
+        length = self.track_length
+        normalized_start = np.mod(start_dlong, length)
+        normalized_end = np.mod(np.asarray(end_dlong, dtype=float), length)
+        span = np.mod(normalized_end - normalized_start, length)
+
+        sample_counts = np.where(span == 0.0, 0, counts(span))
+        offsets = np.concatenate(([0], np.cumsum(sample_counts)))
+        segment = np.repeat(np.arange(len(span)), sample_counts)
+        step = (np.arange(offsets[-1]) - offsets[:-1][segment]).astype(float)
+        seg_span = span[segment]
+        distance, fraction = along(seg_span, step, sample_counts[segment])
+        dlong = np.mod(normalized_start[segment] + distance, length)
+        dlat = start_dlat[segment] + (end_dlat[segment] - start_dlat[segment]) * fraction
+        points = self.project(dlong, dlat)
+        return np.split(points, offsets[1:-1])
+
+
+def project_tsd_columns(
+    columns: TrackSurfaceDetailColumns,
+    sections: Sequence,
+    pixels_per_world_unit: float,
+    track_length: float | None = None,
+) -> list[np.ndarray]:
+    """World-space centre polylines for every line in ``columns``.
+
+    Lines are sampled from start to end dlong (wrapping once past the track
+    end) at the same density the preview painter uses.
+    """
+    if track_length is None:
+        track_length = max(
+            (float(section.start_dlong) + float(section.length) for section in sections),
+            default=0.0,
+        )
+    projector = TrackProjector(sections, track_length)
+    return projector.sample_segments(
+        columns.start_dlong,
+        columns.start_dlat,
+        columns.end_dlong,
+        columns.end_dlat,
+        pixels_per_world_unit,
+    )
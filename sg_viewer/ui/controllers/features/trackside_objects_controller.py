@@ -8,7 +8,12 @@ from time import perf_counter
 
 from PyQt5 import QtCore, QtWidgets
 
-from sg_viewer.io.track3d_catalog import Track3DCatalog, parse_track3d_catalog
+from sg_viewer.io.track3d_catalog import (
+    Track3DCatalog,
+    invalidate_track3d_index,
+    parse_track3d_catalog,
+    parse_track3d_catalog_text,
+)
 from sg_viewer.io.track3d_parser import Track3DDetailList, Track3DObjectList
 from sg_viewer.model.dlong_mapping import dlong_to_section_position
 from sg_viewer.services.track3d_tso_writer import (
@@ -1572,19 +1577,9 @@ class TracksideObjectsController:
 
     def _parse_trackside_objects_from_3d_text(self, text: str) -> list[TracksideObject]:
         """Compatibility adapter for tests; UI workflows parse the selected file directly."""
-        from tempfile import NamedTemporaryFile
-
-        with NamedTemporaryFile(
-            "w", suffix=".3d", encoding="utf-8", delete=False
-        ) as temp_file:
-            temp_file.write(text)
-            temp_path = Path(temp_file.name)
-        try:
-            return self._trackside_objects_from_track3d_catalog(
-                parse_track3d_catalog(temp_path)
-            )
-        finally:
-            temp_path.unlink(missing_ok=True)
+        return self._trackside_objects_from_track3d_catalog(
+            parse_track3d_catalog_text(text)
+        )
 
     def _on_tso_import_from_3d_requested(self) -> None:
         proceed = QtWidgets.QMessageBox.warning(
@@ -2063,6 +2058,7 @@ class TracksideObjectsController:
             return
         try:
             path.write_text(updated_text, encoding="utf-8")
+            invalidate_track3d_index(path)
         except OSError as exc:
             QtWidgets.QMessageBox.critical(
                 self._window,
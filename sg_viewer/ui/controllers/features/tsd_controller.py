@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import math
-import random
 from dataclasses import dataclass, replace
 from pathlib import Path
 from time import perf_counter
@@ -11,7 +10,7 @@ from PyQt5 import QtCore, QtWidgets
 from sg_viewer.model.sg_model import Point, SectionPreview
 from sg_viewer.services.skid_marks import (
     SkidMarkGenerationParameters,
-    generate_skid_mark_lines,
+    generate_skid_mark_columns,
     parse_colors_csv,
     parse_skid_sections_csv,
 )
@@ -816,10 +815,7 @@ class TsdController:
             except ValueError as exc:
                 QtWidgets.QMessageBox.warning(dialog, "Skid Marks", str(exc))
                 return
-            self._generated_skid_mark_lines = generate_skid_mark_lines(
-                parameters,
-                rng=random.Random(),
-            )
+            self._generated_skid_mark_lines = generate_skid_mark_columns(parameters).to_lines()
             _persist_dialog_values()
             self._enable_tsd_preview_overlay()
             self._refresh_tsd_preview_lines()
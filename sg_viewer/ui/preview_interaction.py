@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import copy
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Hashable
 
 from PyQt5 import QtCore, QtGui
 
@@ -286,7 +285,19 @@ class PreviewInteraction:
         if not sections:
             return None
 
-        for i in _sorted_indices(len(sections), preferred_index):
+        spatial_index = self._section_manager.spatial_index
+        if scale > 0 and spatial_index.covers(sections):
+            # Only sections with an endpoint near the cursor can be hit.
+            world_pos = ((pos.x() - ox) / scale, (widget_height - pos.y() - oy) / scale)
+            nearby = {i for i, _ in spatial_index.nodes_near(world_pos, radius / scale)}
+            indices = sorted(nearby)
+            if preferred_index in nearby:
+                indices.remove(preferred_index)
+                indices.insert(0, preferred_index)
+        else:
+            indices = _sorted_indices(len(sections), preferred_index)
+
+        for i in indices:
             for endtype in ("start", "end"):
                 world_point = (
                     sections[i].start
@@ -390,7 +401,7 @@ class PreviewInteraction:
             self._context.end_drag_transform()
             return
         self._active_node = node
-        self._node_drag_start_sections = copy.deepcopy(self._section_manager.sections)
+        self._node_drag_start_sections = list(self._section_manager.sections)
         self._is_dragging_node = True
         self._set_drag_state(True)
         self._connection_target = None
@@ -447,6 +458,7 @@ class PreviewInteraction:
             dragged_pos=track_point,
             sections=sections,
             snap_radius=snap_radius,
+            spatial_index=self._section_manager.spatial_index,
         )
 
         if target == self._active_node:
@@ -464,7 +476,11 @@ class PreviewInteraction:
         if self._drag_state_active:
             self._section_manager.set_preview_mode(False)
             before = self._node_drag_start_sections or list(self._section_manager.sections)
-            self._commit_section_edit(before=before, after=list(self._section_manager.sections))
+            self._commit_section_edit(
+                before=before,
+                after=list(self._section_manager.sections),
+                merge_key=("node_drag", self._active_node),
+            )
         self._clear_drag_state()
 
     def _clear_drag_state(self) -> None:
@@ -521,7 +537,7 @@ class PreviewInteraction:
         self._active_section_index = index
         self._active_chain_indices = chain_indices
         self._section_drag_start_mouse_screen = QtCore.QPointF(pos)
-        self._section_drag_start_sections = copy.deepcopy(self._section_manager.sections)
+        self._section_drag_start_sections = list(self._section_manager.sections)
         self._is_dragging_section = True
         self._set_drag_state(True)
         self._stop_panning()
@@ -580,7 +596,11 @@ class PreviewInteraction:
         if self._drag_state_active:
             self._section_manager.set_preview_mode(False)
             before = self._section_drag_start_sections or list(self._section_manager.sections)
-            self._commit_section_edit(before=before, after=list(self._section_manager.sections))
+            self._commit_section_edit(
+                before=before,
+                after=list(self._section_manager.sections),
+                merge_key=("section_drag", tuple(self._active_chain_indices or ())),
+            )
         self._is_dragging_section = False
         self._active_section_index = None
         self._section_drag_start_mouse_screen = None
@@ -647,11 +667,13 @@ class PreviewInteraction:
         before: list["SectionPreview"],
         after: list["SectionPreview"],
         changed_indices: list[int] | None = None,
+        merge_key: Hashable | None = None,
     ) -> None:
         payload = self._runtime_api.commit_sections(
             before=before,
             after=after,
             changed_indices=changed_indices,
+            merge_key=merge_key,
         )
         if payload.updated_sections is not None:
             self._set_sections(payload.updated_sections, changed_indices=payload.changed_indices)
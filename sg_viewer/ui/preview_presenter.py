@@ -18,6 +18,11 @@ class PreviewPresenter:
         self._runtime = runtime
         self._colors = preview_painter.default_preview_colors()
         self._colors.background = QtGui.QColor(background_color)
+        self._layer_cache = preview_painter.PreviewLayerCache()
+
+    @property
+    def layer_cache(self) -> preview_painter.PreviewLayerCache:
+        return self._layer_cache
 
     def set_preview_color(self, key: str, color: QtGui.QColor) -> None:
         if not hasattr(self._colors, key):
@@ -187,6 +192,7 @@ class PreviewPresenter:
             sg_preview_state,
             transform,
             self._context.widget_height(),
+            layer_cache=self._layer_cache,
         )
 
         box_rect = self._runtime._trackside_box_select_screen_rect()
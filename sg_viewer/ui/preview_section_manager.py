@@ -5,6 +5,7 @@ from typing import Callable, Tuple
 
 from track_viewer.geometry import CenterlineIndex, build_centerline_index
 
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
 from sg_viewer.geometry.sg_geometry import (
     rebuild_centerline_from_sections,
     update_section_geometry,
@@ -27,6 +28,7 @@ class PreviewSectionManager:
         ],
     ) -> None:
         self._combine_bounds_with_background = combine_bounds_with_background
+        self.spatial_index = SectionSpatialIndex()
         self.reset()
 
     def reset(self) -> None:
@@ -45,6 +47,8 @@ class PreviewSectionManager:
         self.sampled_dlongs: list[float] = []
         self.sampled_bounds: tuple[float, float, float, float] | None = None
         self.centerline_index: CenterlineIndex | None = None
+        self.spatial_index.rebuild(self._sections)
+        self._preview_changed_indices: set[int] = set()
         self._preview_mode = False
 
     def set_preview_mode(self, active: bool) -> None:
@@ -75,6 +79,11 @@ class PreviewSectionManager:
         self._preview_section_signatures = []
         self._preview_section_endpoints = None
         self._preview_centerline_polylines = None
+        if self.spatial_index.sections is not self._sections:
+            # The drag preview only differed from the committed sections at
+            # these indices, so only they need re-bucketing.
+            self.spatial_index.update(self._sections, self._preview_changed_indices)
+        self._preview_changed_indices = set()
 
     def load_sections(
         self,
@@ -99,6 +108,7 @@ class PreviewSectionManager:
             self._centerline_offsets,
             self._centerline_lengths,
         ) = self._compute_centerline_offsets(self._centerline_polylines)
+        self.spatial_index.rebuild(self._sections)
         self.clear_drag_preview()
 
     def set_sections(
@@ -144,6 +154,10 @@ class PreviewSectionManager:
         self._sections = new_sections
         self._section_signatures = new_signatures
         self._section_endpoints = [(sect.start, sect.end) for sect in self._sections]
+        if self._preview_sections is None:
+            self.spatial_index.update(self._sections, actual_changed_indices)
+        else:
+            self._preview_changed_indices.update(actual_changed_indices)
         if self._preview_mode:
             return False
 
@@ -365,6 +379,8 @@ class PreviewSectionManager:
 
         self._preview_sections = new_sections
         self._preview_section_signatures = new_signatures
+        self._preview_changed_indices.update(changed_indices)
+        self.spatial_index.update(new_sections, changed_indices)
         self._preview_section_endpoints = [
             (sect.start, sect.end) for sect in self._preview_sections
         ]
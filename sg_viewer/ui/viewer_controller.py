@@ -19,6 +19,7 @@ from sg_viewer.services.sg_settings_store import SGSettingsStore
 from sg_viewer.model.preview_fsection import PreviewFSection
 from sg_viewer.services.fsect_generation_service import build_generated_fsects
 from sg_viewer.services.sg_integrity_checks import (
+    IntegrityCache,
     IntegrityProgress,
     build_integrity_report,
     format_integrity_memo,
@@ -149,6 +150,7 @@ class SGViewerController:
         self._xsect_table_window: XsectTableWindow | None = None
         self._tso_attributes_dialog: TracksideObjectAttributesDialog | None = None
         self._integrity_report_window: QtWidgets.QDialog | None = None
+        self._integrity_cache = IntegrityCache()
         self._unique_tso_filenames_window: QtWidgets.QDialog | None = None
         self._section_dlongs_window: QtWidgets.QDialog | None = None
         self._current_path: Path | None = None
@@ -2040,6 +2042,7 @@ class SGViewerController:
                     self._window.measurement_units_combo.currentData()
                 ),
                 on_progress=_on_progress,
+                cache=self._integrity_cache,
             )
         except RuntimeError as exc:
             if canceled:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+from types import SimpleNamespace
+
+from sg_viewer.geometry.derived_geometry import DerivedGeometry
+from track_viewer.geometry import build_centerline_index, update_centerline_index
+
+
+class _Signal:
+    def __init__(self) -> None:
+        self._callbacks: list = []
+
+    def connect(self, func) -> None:
+        self._callbacks.append(func)
+
+    def emit(self, *args) -> None:
+        for func in list(self._callbacks):
+            func(*args)
+
+
+def _make_document(count: int = 40, radius: float = 10_000.0) -> SimpleNamespace:
+    sects = []
+    for index in range(count):
+        a0 = 2 * math.pi * index / count
+        a1 = 2 * math.pi * (index + 1) / count
+        sects.append(
+            SimpleNamespace(
+                type=2 if index % 2 else 1,
+                start_x=radius * math.cos(a0),
+                start_y=radius * math.sin(a0),
+                end_x=radius * math.cos(a1),
+                end_y=radius * math.sin(a1),
+                center_x=0.0,
+                center_y=0.0,
+                radius=radius,
+                sang1=-math.sin(a0),
+                sang2=math.cos(a0),
+                eang1=-math.sin(a1),
+                eang2=math.cos(a1),
+                start_dlong=index * 100.0,
+                length=100.0,
+                sec_prev=(index - 1) % count,
+                sec_next=(index + 1) % count,
+            )
+        )
+    return SimpleNamespace(
+        sg_data=SimpleNamespace(sects=sects),
+        geometry_changed=_Signal(),
+        sections_geometry_changed=_Signal(),
+    )
+
+
+def test_ranged_change_is_patched_and_matches_full_rebuild() -> None:
+    document = _make_document()
+    geometry = DerivedGeometry(document, verify_incremental=True)
+    geometry.rebuild_if_needed()
+    untouched = geometry.sections[10]
+
+    edited = document.sg_data.sects[5]
+    edited.radius *= 1.05
+    edited.end_x += 25.0
+    document.sections_geometry_changed.emit(5, 6)
+    geometry.rebuild_if_needed()
+
+    assert geometry.last_rebuild_incremental
+    assert geometry.sections[10] is untouched
+    assert geometry.sections[5].end[0] == edited.end_x
+
+
+def test_edit_outside_the_bounds_keeps_the_grid_layout() -> None:
+    document = _make_document()
+    geometry = DerivedGeometry(document, verify_incremental=True)
+    geometry.rebuild_if_needed()
+    layout = geometry.centerline_index.bounds
+
+    edited = document.sg_data.sects[0]
+    edited.start_x += 2_000.0
+    document.sections_geometry_changed.emit(0, 1)
+    geometry.rebuild_if_needed()
+
+    assert geometry.last_rebuild_incremental
+    assert geometry.sampled_bounds != layout
+    assert geometry.centerline_index.bounds == layout
+
+
+def test_whole_document_signal_finds_changed_sections() -> None:
+    document = _make_document()
+    geometry = DerivedGeometry(document, verify_incremental=True)
+    geometry.rebuild_if_needed()
+
+    document.sg_data.sects[3].start_x += 40.0
+    document.sg_data.sects[30].radius *= 0.95
+    document.geometry_changed.emit()
+    geometry.rebuild_if_needed()
+
+    assert geometry.last_rebuild_incremental
+
+
+def test_section_count_change_falls_back_to_full_rebuild() -> None:
+    document = _make_document()
+    geometry = DerivedGeometry(document, verify_incremental=True)
+    geometry.rebuild_if_needed()
+
+    del document.sg_data.sects[-1]
+    document.geometry_changed.emit()
+    geometry.rebuild_if_needed()
+
+    assert not geometry.last_rebuild_incremental
+    assert len(geometry.sections) == 39
+
+
+def test_update_centerline_index_matches_fresh_build() -> None:
+    points = [(float(x), float((x * 7) % 11)) for x in range(60)]
+    bounds = (0.0, 59.0, 0.0, 10.0)
+    index = build_centerline_index(points, bounds)
+
+    patched = points[:20] + [(20.5, 3.0), (21.0, 4.0), (21.5, 5.0)] + points[25:]
+    updated = update_centerline_index(index, patched, 20, 25, 23)
+    expected = build_centerline_index(patched, bounds)
+
+    assert updated is not None
+    assert updated.segments == expected.segments
+    assert updated.grid == expected.grid
+    assert index.segments[20] == (points[20], points[21])
+
+    # A growing splice at the start also moves the closing segment.
+    grown = [(0.0, 2.0), (0.5, 9.0), (1.0, 1.0)] + points[2:]
+    updated = update_centerline_index(index, grown, 0, 2, 3)
+    expected = build_centerline_index(grown, bounds)
+
+    assert updated is not None
+    assert updated.segments == expected.segments
+    assert updated.grid == expected.grid
@@ -149,3 +149,81 @@ def test_canonicalize_closed_loop_reindexes_section_ids() -> None:
     assert [s.section_id for s in canonical] == [0, 1, 2]
     validate_sections(canonical)
 
+
+
+def _chain(count: int) -> list[_Section]:
+    return [
+        _make_section(index, index - 1, index + 1 if index + 1 < count else -1)
+        for index in range(count)
+    ]
+
+
+def _moved(sections: list[_Section], index: int, x: float) -> list[_Section]:
+    updated = list(sections)
+    updated[index] = replace(
+        sections[index], end=(x, 0.0), polyline=[sections[index].start, (x, 0.0)]
+    )
+    return updated
+
+
+def test_history_shares_unchanged_sections() -> None:
+    manager = EditManager()
+    before = _chain(6)
+    manager.execute(ReplaceSectionsCommand(before=before, after=before))
+    after = _moved(before, 2, 9.0)
+
+    command = ReplaceSectionsCommand(before=before, after=after)
+    manager.execute(command)
+    undone = manager.undo()
+    redone = manager.redo()
+
+    assert [splice.index for splice in command.splices] == [2]
+    assert all(a is b for a, b in zip(undone, before))
+    assert redone[2] is after[2]
+    assert all(redone[i] is before[i] for i in range(6) if i != 2)
+
+
+def test_local_validation_catches_broken_neighbour_link() -> None:
+    manager = EditManager()
+    before = _chain(5)
+    manager.execute(ReplaceSectionsCommand(before=before, after=before))
+    after = list(before)
+    after[2] = replace(before[2], next_id=-1)
+
+    with pytest.raises(InvariantError):
+        manager.execute(ReplaceSectionsCommand(before=before, after=after))
+
+
+def test_consecutive_merge_key_edits_coalesce() -> None:
+    now = [0.0]
+    manager = EditManager(clock=lambda: now[0])
+    base = _chain(4)
+    manager.execute(ReplaceSectionsCommand(before=base, after=base))
+
+    first = _moved(base, 1, 5.0)
+    manager.execute(ReplaceSectionsCommand(before=base, after=first, merge_key="drag"))
+    now[0] += 0.2
+    second = _moved(first, 1, 6.0)
+    manager.execute(ReplaceSectionsCommand(before=first, after=second, merge_key="drag"))
+    now[0] += 5.0
+    third = _moved(second, 1, 7.0)
+    manager.execute(ReplaceSectionsCommand(before=second, after=third, merge_key="drag"))
+
+    assert manager.undo() == second
+    assert manager.undo() == base
+
+
+def test_history_is_capped_by_memory() -> None:
+    manager = EditManager(max_history_bytes=4_000)
+    sections = _chain(4)
+    manager.execute(ReplaceSectionsCommand(before=sections, after=sections))
+    for step in range(10):
+        updated = _moved(sections, step % 4, 10.0 + step)
+        manager.execute(ReplaceSectionsCommand(before=sections, after=updated))
+        sections = updated
+
+    assert manager.history_bytes <= 4_000
+    undone = 0
+    while manager.undo() is not None:
+        undone += 1
+    assert 0 < undone < 11
@@ -43,25 +43,14 @@ def test_export_sg_to_trk_writes_target_path(monkeypatch, tmp_path):
 
     calls = {}
 
-    class _FakeTRKClass:
-        @staticmethod
-        def from_sg(path: str):
-            calls["from_sg"] = path
-            return object()
-
-    def _write_trk(trk_obj, out_path: str):
-        calls["write_trk"] = out_path
+    def _convert(sg_in, trk_out):
+        calls["convert"] = (sg_in, trk_out)
         trk_path.write_bytes(b"TRK")
 
-    monkeypatch.setattr(
-        export_service,
-        "_load_trk_export_dependencies",
-        lambda: (_FakeTRKClass, _write_trk),
-    )
+    monkeypatch.setattr(export_service, "_load_trk_converter", lambda: _convert)
 
     result = export_service.export_sg_to_trk(sg_path=sg_path, trk_path=trk_path)
 
     assert result.success is True
-    assert calls["from_sg"] == str(sg_path)
-    assert calls["write_trk"] == str(trk_path)
+    assert calls["convert"] == (sg_path, trk_path)
     assert trk_path.exists()
@@ -0,0 +1,119 @@
+import math
+from types import SimpleNamespace
+
+from track_viewer.model.track_preview_model import TrackPreviewModel
+
+
+# (type, length, heading) for an oval with a compound final corner.
+_SECTIONS = [
+    (1, 150_000, 0),
+    (2, 200_000, 0),
+    (1, 150_000, 2**30),
+    (2, 200_000, 2**30),
+    (1, 150_000, -(2**31)),
+    (2, 200_000, -(2**31)),
+    (1, 150_000, -(2**30)),
+    (2, 100_000, -(2**30)),
+    (2, 100_000, -(2**29)),
+]
+
+
+def _build_trk() -> SimpleNamespace:
+    sects = []
+    start = 0
+    for sect_type, length, heading in _SECTIONS:
+        sects.append(
+            SimpleNamespace(
+                type=sect_type,
+                start_dlong=start,
+                length=length,
+                heading=heading,
+            )
+        )
+        start += length
+    return SimpleNamespace(trklength=start, num_sects=len(sects), sects=sects)
+
+
+def _build_replay(track_length: int) -> tuple[SimpleNamespace, int, int]:
+    step = 9_000
+    dlongs = []
+    dlats = []
+    for frame in range(400):
+        dlong = (track_length - 3 * step + 500 + frame * step) % track_length
+        dlongs.append(dlong)
+        dlats.append(int(round(6_000 * math.sin(frame / 7.0))))
+    boundaries = [i for i in range(1, len(dlongs)) if dlongs[i] < dlongs[i - 1]]
+    car = SimpleNamespace(dlong=dlongs, dlat=dlats)
+    rpy = SimpleNamespace(car_index=[7], cars=[car])
+    return rpy, boundaries[0], boundaries[1]
+
+
+def _build_model() -> TrackPreviewModel:
+    model = TrackPreviewModel()
+    model.trk = _build_trk()
+    model.centerline = [(0.0, 0.0)]
+    model.track_length = model.trk.trklength
+    return model
+
+
+# Output of the original per-frame implementation for the fixture above:
+# (dlong, dlat, speed_raw, lateral_speed).
+_EXPECTED = [
+    (0.0, 2448.0, 9011, 482.0),
+    (65536.0, 5953.0, 8991, 77.0),
+    (131072.0, 3577.0, 8929, -564.0),
+    (196608.0, -2331.0, 9033, -656.0),
+    (262144.0, -5944.0, 9386, -96.0),
+    (327680.0, -3676.0, 9339, 581.0),
+    (393216.0, 2215.0, 9045, 663.0),
+    (458752.0, 5927.0, 8977, 107.0),
+    (524288.0, 3777.0, 8624, -528.0),
+    (589824.0, -2098.0, 8985, -663.0),
+    (655360.0, -5900.0, 9364, -127.0),
+    (720896.0, -3877.0, 9028, 543.0),
+    (786432.0, 1981.0, 9012, 670.0),
+    (851968.0, 5874.0, 8706, 132.0),
+    (917504.0, 3969.0, 8589, -507.0),
+    (983040.0, -1864.0, 8967, -672.0),
+    (1048576.0, -5848.0, 9157, -153.0),
+    (1114112.0, -4058.0, 9003, 522.0),
+    (1179648.0, 1748.0, 9061, 683.0),
+    (1245184.0, 5822.0, 8603, 157.0),
+    (1310720.0, 4147.0, 8581, -488.0),
+    (1376256.0, -1627.0, 8946, -779.0),
+    (1400000.0, -3630.0, 9185, -775.0),
+]
+
+
+def test_replay_lp_generation_matches_reference_tables(monkeypatch) -> None:
+    model = _build_model()
+    monkeypatch.setattr(
+        "track_viewer.model.track_preview_model.getxyz",
+        lambda _trk, dlong, dlat, _cline: (float(dlong), float(dlat), 0.0),
+    )
+    rpy, start_frame, end_frame = _build_replay(model.track_length)
+
+    records, message = model._create_lp_records_from_replay(
+        rpy, 7, start_frame, end_frame
+    )
+
+    assert records is not None, message
+    actual = [
+        (record.dlong, record.dlat, record.speed_raw, record.lateral_speed)
+        for record in records
+    ]
+    assert actual == _EXPECTED
+    assert [record.x for record in records] == [row[0] for row in _EXPECTED]
+
+
+def test_replay_lp_generation_rejects_short_laps() -> None:
+    model = _build_model()
+    rpy, start_frame, _ = _build_replay(model.track_length)
+
+    records, message = model._create_lp_records_from_replay(
+        rpy, 7, start_frame, start_frame
+    )
+
+    assert records is None
+    assert message == "Replay lap is too short to generate LP data."
+
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icr2_core.dat.packdat import packdat
+from icr2_core.mip.atlas import SkylinePacker, TextureAtlas, textures_from_dat
+from icr2_core.mip.mips import encode_mip
+
+
+def _textures(count: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    sizes = [8, 16, 32, 64]
+    return {
+        f"t{index:02d}.mip": rng.integers(0, 256, (rng.choice(sizes), rng.choice(sizes)), dtype=np.uint8)
+        for index in range(count)
+    }
+
+
+def test_skyline_packer_places_without_overlap() -> None:
+    rng = np.random.default_rng(1)
+    packer = SkylinePacker(128, 128)
+    covered = np.zeros((128, 128), dtype=np.int32)
+
+    placed = 0
+    for _ in range(200):
+        width, height = (int(v) for v in rng.integers(1, 24, 2))
+        spot = packer.insert(width, height)
+        if spot is None:
+            continue
+        x, y = spot
+        covered[y : y + height, x : x + width] += 1
+        placed += 1
+
+    assert placed > 50
+    assert covered.max() == 1
+
+
+def test_atlas_pages_hold_every_texture_with_wrapped_padding() -> None:
+    textures = _textures(40)
+
+    atlas = TextureAtlas.build(textures, page_size=128, padding=1)
+    names, table = atlas.uv_table()
+
+    assert names == sorted(textures)
+    assert len(atlas.pages) > 1 and 0.5 < atlas.fill_ratio() <= 1.0
+    for row, name in enumerate(names):
+        entry = atlas.entries[name]
+        page = atlas.pages[entry.page]
+        slot = page[entry.y : entry.y + entry.height, entry.x : entry.x + entry.width]
+        assert np.array_equal(slot, textures[name])
+        # The gutter repeats the opposite edge so tiling filters cleanly.
+        assert np.array_equal(page[entry.y - 1, entry.x : entry.x + entry.width], textures[name][-1])
+        height, width = page.shape
+        assert table[row, 0] == entry.page
+        assert table[row, 1:] == pytest.approx(
+            [entry.x / width, entry.y / height, (entry.x + entry.width) / width, (entry.y + entry.height) / height]
+        )
+
+
+def test_update_touches_only_the_affected_pages() -> None:
+    textures = _textures(40)
+    atlas = TextureAtlas.build(textures, page_size=128)
+    name = "t05.mip"
+    before = [page.copy() for page in atlas.pages]
+    old = atlas.entries[name]
+    old_page, old_spot = old.page, (old.x, old.y)
+
+    assert atlas.update(name, textures[name]) == set()
+    changed = atlas.update(name, textures[name][::-1].copy())
+
+    assert changed == {old_page} and (atlas.entries[name].x, atlas.entries[name].y) == old_spot
+    for index, page in enumerate(atlas.pages):
+        if index not in changed:
+            assert np.array_equal(page, before[index])
+
+    bigger = np.full((100, 100), 7, dtype=np.uint8)
+    moved = atlas.update(name, bigger)
+    entry = atlas.entries[name]
+    assert old_page in moved and entry.page in moved
+    assert np.array_equal(atlas.pages[entry.page][entry.y : entry.y + 100, entry.x : entry.x + 100], bigger)
+    for other in textures:
+        if other != name:
+            e = atlas.entries[other]
+            assert np.array_equal(atlas.pages[e.page][e.y : e.y + e.height, e.x : e.x + e.width], textures[other])
+
+    with pytest.raises(ValueError, match="does not fit"):
+        atlas.update("huge.mip", np.zeros((128, 8), dtype=np.uint8))
+
+
+def test_freed_and_shrunk_slots_are_reused() -> None:
+    textures = _textures(40)
+    atlas = TextureAtlas.build(textures, page_size=128)
+    name = max(textures, key=lambda n: textures[n].size)
+    old = atlas.entries[name]
+    spot, height, width = (old.page, old.x, old.y), old.height, old.width
+
+    atlas.update(name, np.full((4, 4), 3, dtype=np.uint8))
+    assert atlas.update(name, textures[name]) == {spot[0]}
+    assert (atlas.entries[name].page, atlas.entries[name].x, atlas.entries[name].y) == spot
+
+    pages = len(atlas.pages)
+    atlas.remove(name)
+    replacement = np.full((height, width), 9, dtype=np.uint8)
+    atlas.update("new.mip", replacement)
+    entry = atlas.entries["new.mip"]
+
+    assert (entry.page, entry.x, entry.y) == spot and len(atlas.pages) == pages
+    assert np.array_equal(atlas.pages[entry.page][entry.y : entry.y + height, entry.x : entry.x + width], replacement)
+
+
+def test_atlas_edits_keep_textures_intact_and_apart() -> None:
+    rng = np.random.default_rng(5)
+    textures = _textures(30, seed=3)
+    atlas = TextureAtlas.build(textures, page_size=128)
+    for step in range(150):
+        name = f"t{int(rng.integers(0, 40)):02d}.mip"
+        if rng.random() < 0.25:
+            atlas.remove(name)
+            textures.pop(name, None)
+        else:
+            pixels = rng.integers(0, 256, tuple(int(v) for v in rng.integers(4, 48, 2)), dtype=np.uint8)
+            atlas.update(name, pixels)
+            textures[name] = pixels
+
+    assert sorted(atlas.entries) == sorted(textures)
+    covered = [np.zeros(page.shape, dtype=np.int32) for page in atlas.pages]
+    for name, pixels in textures.items():
+        e = atlas.entries[name]
+        assert np.array_equal(atlas.pages[e.page][e.y : e.y + e.height, e.x : e.x + e.width], pixels)
+        covered[e.page][e.y - 1 : e.y + e.height + 1, e.x - 1 : e.x + e.width + 1] += 1
+    assert max(int(c.max()) for c in covered) == 1
+
+
+def test_failed_update_keeps_the_old_texture() -> None:
+    textures = _textures(6)
+    atlas = TextureAtlas.build(textures, page_size=128)
+    before = [page.copy() for page in atlas.pages]
+
+    with pytest.raises(ValueError, match="does not fit"):
+        atlas.update("t01.mip", np.zeros((128, 8), dtype=np.uint8))
+
+    assert all(np.array_equal(page, old) for page, old in zip(atlas.pages, before))
+    assert atlas.update("t01.mip", textures["t01.mip"]) == set()
+
+
+def test_dat_textures_pack_and_save(tmp_path: Path) -> None:
+    textures = _textures(4, seed=2)
+    for name, pixels in textures.items():
+        (tmp_path / name.upper()).write_bytes(encode_mip([pixels], 0))
+    (tmp_path / "packlist.txt").write_text("\n".join(name.upper() for name in textures) + "\n")
+    packdat(str(tmp_path / "packlist.txt"), str(tmp_path / "track.dat"), backup=False)
+
+    loaded = textures_from_dat(tmp_path / "track.dat")
+    atlas = TextureAtlas.build(loaded, page_size=256)
+    written = atlas.save(tmp_path / "out", list(range(256)) * 3)
+
+    assert sorted(loaded) == sorted(name.upper() for name in textures)
+    assert [path.name for path in written] == ["atlas0.png", "atlas.json"]
+    manifest = json.loads((tmp_path / "out" / "atlas.json").read_text())
+    assert set(manifest["textures"]) == set(loaded)
+    assert manifest["pages"] == [[256, atlas.pages[0].shape[0]]]
@@ -0,0 +1,32 @@
+import numpy as np
+
+from icr2_core.mip.mips import carset_color_lut, match_closest_color
+
+
+def _reference_lut(palette: list[int]) -> list[int]:
+    rgb = {index: tuple(palette[index * 3 : index * 3 + 3]) for index in range(256)}
+    return [
+        index if 32 <= index < 176 else match_closest_color(rgb[index], rgb, 32, 177)
+        for index in range(256)
+    ]
+
+
+def test_carset_lut_matches_closest_color_scan() -> None:
+    rng = np.random.default_rng(4)
+    for _ in range(5):
+        palette = rng.integers(0, 256, 768).tolist()
+        # Duplicate colours make sure ties resolve to the lowest index.
+        palette[176 * 3 : 177 * 3] = palette[40 * 3 : 41 * 3]
+        palette[5 * 3 : 6 * 3] = palette[90 * 3 : 91 * 3]
+
+        assert carset_color_lut(palette).tolist() == _reference_lut(palette)
+
+
+def test_carset_lut_is_cached_per_palette() -> None:
+    palette = np.random.default_rng(5).integers(0, 256, 768).tolist()
+
+    first = carset_color_lut(palette)
+
+    assert carset_color_lut(list(palette)) is first
+    assert carset_color_lut(palette, 32, 100) is not first
+    assert not first.flags.writeable
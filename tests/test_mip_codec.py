@@ -0,0 +1,72 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from icr2_core.mip.mips import encode_mip, img_to_mip, mip_to_arrays, mip_to_img, read_mip_header
+
+
+def _levels(size: int, count: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(size)
+    levels = []
+    for _ in range(count):
+        levels.append(rng.integers(0, 256, (size, size), dtype=np.uint8))
+        size = int(size / 2 + 0.5)
+    return levels
+
+
+def test_encode_mip_writes_padded_levels_and_offsets() -> None:
+    main = np.arange(16, dtype=np.uint8).reshape(4, 4)
+    sub = np.array([[100, 101], [102, 103]], dtype=np.uint8)
+
+    data = encode_mip([main, sub], avg_color=9)
+
+    header_size = 20 + 12 * 2
+    assert struct.unpack_from("<6i", data, 0) == (len(data) - 4, 0, 4, 4, 2, 9)
+    assert struct.unpack_from("<i4Bi", data, 24) == (3, 0, 255, 255, 255, header_size + 4)
+    assert struct.unpack_from("<i4Bi", data, 36) == (1, 252, 255, 255, 255, header_size + 4 + 16 + 4 + 2)
+    pixels = data[4 + header_size :]
+    assert pixels == bytes([0, 1, 2, 3, *range(16), 12, 13, 14, 15, 100, 101, 100, 101, 102, 103, 102, 103])
+
+
+def test_mip_arrays_round_trip_full_chain() -> None:
+    levels = _levels(256, 8)
+
+    data = encode_mip(levels, avg_color=3)
+    header = read_mip_header(data)
+    decoded = mip_to_arrays(data)
+
+    assert header.num_images == 8
+    assert data[29] == 254
+    assert [level.shape for level in decoded] == [level.shape for level in levels]
+    for original, result in zip(levels, decoded):
+        assert np.array_equal(original, result)
+
+
+def test_mip_to_arrays_rejects_truncated_file() -> None:
+    data = encode_mip(_levels(16, 4), avg_color=0)
+
+    with pytest.raises(ValueError, match="past the end"):
+        mip_to_arrays(data[:-20])
+
+
+def test_img_to_mip_round_trips_through_mip_to_img(tmp_path: Path) -> None:
+    palette = [0] * (256 * 3)
+    for index in range(256):
+        palette[index * 3 : index * 3 + 3] = [index, 255 - index, (index * 7) % 256]
+    palette_path = tmp_path / "SUNNY.PCX"
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(palette)
+    palette_image.save(palette_path)
+    indices = np.random.default_rng(2).integers(0, 256, (32, 32), dtype=np.uint8)
+    source = Image.fromarray(np.array(palette, dtype=np.uint8).reshape(256, 3)[indices], "RGB")
+    out_path = tmp_path / "wall.mip"
+
+    img_to_mip(source, str(out_path), str(palette_path), mode="track")
+    images = mip_to_img(str(out_path), palette)
+
+    assert [image.size for image in images] == [(32, 32), (16, 16), (8, 8), (4, 4), (2, 2)]
+    assert np.array_equal(np.asarray(images[0]), indices)
+    assert images[0].getpalette()[:768] == palette
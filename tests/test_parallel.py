@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from icr2_core.parallel import PARALLEL_THRESHOLDS, total_file_size, worker_count
+
+
+def test_worker_count_stays_serial_for_small_or_single_batches(monkeypatch) -> None:
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "replay_records", 10)
+
+    assert worker_count("replay_records", 1, 100, 4) == 1
+    assert worker_count("replay_records", 8, 9, 4) == 1
+    assert worker_count("replay_records", 8, 100, 1) == 1
+    assert worker_count("replay_records", 8, 100, 4) == 4
+    assert worker_count("replay_records", 3, 100, 4) == 3
+
+
+def test_total_file_size_skips_missing_files(tmp_path: Path) -> None:
+    (tmp_path / "a.bin").write_bytes(b"x" * 5)
+    (tmp_path / "b.bin").write_bytes(b"x" * 7)
+
+    assert total_file_size([tmp_path / "a.bin", tmp_path / "missing", tmp_path / "b.bin"]) == 12
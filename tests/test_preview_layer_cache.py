@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import pytest
+
+try:  # pragma: no cover - optional dependency in CI
+    from PyQt5 import QtCore, QtGui
+except ImportError:  # pragma: no cover - optional dependency in CI
+    pytest.skip("PyQt5 not available", allow_module_level=True)
+
+from sg_viewer.services import sg_rendering
+from sg_viewer.services.preview_layer_cache import PreviewLayerCache
+
+WIDTH, HEIGHT = 300, 200
+POINTS = [(-50.0, -40.0), (20.0, 90.0), (130.0, 10.0), (260.0, 150.0)]
+
+
+def _draw_layer(painter, transform, _view_transform, widget_height) -> None:
+    painter.setPen(QtGui.QPen(QtGui.QColor("red"), 3.0))
+    mapped = [sg_rendering.map_point(x, y, transform, widget_height) for x, y in POINTS]
+    painter.drawPolyline(QtGui.QPolygonF(mapped))
+
+
+def _paint(cache: PreviewLayerCache | None, transform, key=("v1",)) -> QtGui.QImage:
+    image = QtGui.QImage(WIDTH, HEIGHT, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.QColor("black"))
+    painter = QtGui.QPainter(image)
+    try:
+        if cache is None:
+            _draw_layer(painter, transform, None, HEIGHT)
+        else:
+            cache.begin_paint()
+            cache.draw_layer(
+                "line",
+                key,
+                (),
+                painter,
+                image.rect(),
+                transform,
+                None,
+                HEIGHT,
+                _draw_layer,
+            )
+            cache.end_paint()
+    finally:
+        painter.end()
+    return image
+
+
+def test_layer_is_tiled_once_stable_and_matches_direct_drawing() -> None:
+    cache = PreviewLayerCache(show_timings=False)
+    transform = (1.5, (20.25, 10.5))
+
+    _paint(cache, transform)
+    assert cache.last_paint["line"].mode == "direct"
+
+    built = _paint(cache, transform)
+    assert cache.last_paint["line"].mode == "built"
+    reused = _paint(cache, transform)
+    assert cache.last_paint["line"].mode == "tiles"
+
+    expected = _paint(None, transform)
+    assert built == expected
+    assert reused == expected
+
+
+def test_panning_reuses_tiles() -> None:
+    cache = PreviewLayerCache(show_timings=False)
+    _paint(cache, (1.5, (20.25, 10.5)))
+    _paint(cache, (1.5, (20.25, 10.5)))
+
+    panned = (1.5, (20.25 + 37, 10.5 - 12))
+    image = _paint(cache, panned)
+
+    assert cache.last_paint["line"].tiles_reused > 0
+    assert image == _paint(None, panned)
+
+
+def test_key_change_drops_layer_tiles() -> None:
+    cache = PreviewLayerCache(show_timings=False)
+    transform = (2.0, (0.0, 0.0))
+    _paint(cache, transform)
+    _paint(cache, transform)
+    assert cache.tile_count > 0
+
+    _paint(cache, transform, key=("v2",))
+
+    assert cache.last_paint["line"].mode == "direct"
+    assert cache.tile_count == 0
+    assert "line" in cache.timings_text()
+
+
+def _square_track_model():
+    from types import SimpleNamespace
+
+    from sg_viewer.preview.sg_overlay_builder import build_sg_preview_model
+
+    corners = [(0.0, 0.0), (4000.0, 0.0), (4000.0, 3000.0), (0.0, 3000.0)]
+    sects = [
+        SimpleNamespace(
+            type=1,
+            start_x=start[0],
+            start_y=start[1],
+            end_x=end[0],
+            end_y=end[1],
+            ftype1=[2, 7],
+            ftype2=[0, 0],
+            fstart=[-300.0, 300.0],
+            fend=[-300.0, 300.0],
+        )
+        for start, end in zip(corners, corners[1:] + corners[:1])
+    ]
+    return build_sg_preview_model(SimpleNamespace(sg_data=SimpleNamespace(sects=sects)))
+
+
+def _paint_preview(model, cache: PreviewLayerCache | None) -> QtGui.QImage:
+    from sg_viewer.model.preview_state import SgPreviewViewState
+    from sg_viewer.services import preview_painter
+
+    transform = (0.05, (40.5, 20.25))
+    sg_transform = preview_painter._sg_view_transform(transform, HEIGHT)
+    image = QtGui.QImage(WIDTH, HEIGHT, QtGui.QImage.Format_ARGB32_Premultiplied)
+    painter = QtGui.QPainter(image)
+    white = QtGui.QColor("white")
+    try:
+        preview_painter.paint_preview(
+            painter,
+            preview_painter.BasePreviewState(
+                rect=image.rect(),
+                background_color=QtGui.QColor("black"),
+                background_image=None,
+                background_brightness=0,
+                background_scale_500ths_per_px=None,
+                background_origin=None,
+                track_opacity=0.6,
+                sampled_centerline=[(0.0, 0.0), (4000.0, 0.0)],
+                selected_section_points=[],
+                section_endpoints=[],
+                selected_section_index=None,
+                show_curve_markers=False,
+                show_axes=False,
+                show_crosshair=False,
+                sections=[],
+                selected_curve_index=None,
+                start_finish_mapping=None,
+                status_message="",
+                split_section_mode=False,
+                split_hover_point=None,
+                query_track_hover_point=None,
+                query_track_overlay_message="",
+                ruler_start_point=None,
+                ruler_end_point=None,
+                ruler_label="",
+                ruler_notch_interval=None,
+                land_object_points=(),
+                land_object_polygons=(),
+                xsect_dlat=None,
+                show_xsect_dlat_line=False,
+                centerline_unselected_color=white,
+                centerline_selected_color=white,
+                centerline_long_curve_color=white,
+                radii_unselected_color=white,
+                radii_selected_color=white,
+                xsect_dlat_line_color=white,
+                integrity_boundary_violation_points=(),
+                show_centerline_and_nodes=False,
+            ),
+            preview_painter.CreationOverlayState(
+                new_straight_active=False,
+                new_straight_start=None,
+                new_straight_end=None,
+                new_curve_active=False,
+                new_curve_start=None,
+                new_curve_end=None,
+                new_curve_preview=None,
+            ),
+            None,
+            None,
+            preview_painter.SgPreviewState(
+                model=model,
+                transform=sg_transform,
+                view_state=SgPreviewViewState(),
+                enabled=True,
+            ),
+            transform,
+            HEIGHT,
+            layer_cache=cache,
+        )
+    finally:
+        painter.end()
+    return image
+
+
+def test_paint_preview_with_layer_cache_matches_uncached_paint() -> None:
+    model = _square_track_model()
+
+    cache = PreviewLayerCache(show_timings=False)
+    _paint_preview(model, cache)
+    cached = _paint_preview(model, cache)
+
+    assert cache.last_paint["track"].mode == "built"
+    assert cached == _paint_preview(model, None)
+
+
+def test_fsect_color_change_rebuilds_track_tiles(monkeypatch) -> None:
+    model = _square_track_model()
+    cache = PreviewLayerCache(show_timings=False)
+    _paint_preview(model, cache)
+    _paint_preview(model, cache)
+    before = _paint_preview(model, cache)
+    assert cache.last_paint["track"].mode == "tiles"
+
+    monkeypatch.setitem(sg_rendering.SURFACE_COLORS, 2, QtGui.QColor("magenta"))
+    monkeypatch.setattr(sg_rendering, "WALL_COLOR", QtGui.QColor("yellow"))
+    recolored = _paint_preview(model, cache)
+
+    assert cache.last_paint["track"].mode == "direct"
+    assert recolored != before
+    assert recolored == _paint_preview(model, None)
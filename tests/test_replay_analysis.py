@@ -0,0 +1,126 @@
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from icr2_core.lp import replay_analysis
+from icr2_core.lp.replay_analysis import (
+    ReplayAnalyzer,
+    analyze_car_laps,
+    detect_lap_boundaries,
+    fastest_laps,
+    replay_cache_path,
+)
+
+TRACK_LENGTH = 900_000
+
+
+def _trk() -> SimpleNamespace:
+    sects = [
+        SimpleNamespace(start_dlong=0, type=1),
+        SimpleNamespace(start_dlong=300_000, type=2),
+        SimpleNamespace(start_dlong=600_000, type=1),
+    ]
+    return SimpleNamespace(trklength=TRACK_LENGTH, sects=sects)
+
+
+def _lap_dlongs(steps: list[int], start: int = 0) -> list[int]:
+    dlongs = []
+    position = start
+    for step in steps:
+        dlongs.append(position % TRACK_LENGTH)
+        position += step
+    return dlongs
+
+
+def test_detect_lap_boundaries_ignores_small_backwards_moves() -> None:
+    dlongs = _lap_dlongs([30_000] * 65)
+    dlongs[10] = dlongs[9] - 20_000
+
+    boundaries = detect_lap_boundaries(dlongs)
+
+    assert boundaries.tolist() == [30, 60]
+
+
+def test_analyze_car_laps_reports_time_envelope_and_corner_speed() -> None:
+    slow_corner = [15_000 if 10 <= index < 30 else 30_000 for index in range(40)]
+    steps = [30_000] * 30 + slow_corner
+    dlongs = _lap_dlongs(steps)
+    dlats = [index % 7 * 100 - 300 for index in range(len(dlongs))]
+    trk = _trk()
+
+    laps = analyze_car_laps(
+        4,
+        np.array(dlongs),
+        np.array(dlats),
+        np.array([sect.start_dlong for sect in trk.sects]),
+        np.array([sect.type for sect in trk.sects]),
+        TRACK_LENGTH,
+    )
+
+    assert [(lap.start_frame, lap.end_frame, lap.complete) for lap in laps] == [
+        (0, 30, True),
+        (30, 70, False),
+    ]
+    first = laps[0]
+    assert first.lap_time == pytest.approx(2.0)
+    assert (first.dlat_min, first.dlat_max) == (-300, 300)
+    assert [corner.section for corner in first.corners] == [1]
+    assert first.corners[0].min_speed_mph == pytest.approx(
+        30_000 * 15 * 3600 / replay_analysis.DLONG_UNITS_PER_MILE, rel=1e-3
+    )
+    assert laps[1].corners[0].min_speed_mph < first.corners[0].min_speed_mph
+
+
+def test_replay_analyzer_runs_every_car_and_picks_fastest_lap() -> None:
+    fast = SimpleNamespace(dlong=_lap_dlongs([30_000] * 95), dlat=[0] * 95)
+    slow = SimpleNamespace(dlong=_lap_dlongs([20_000] * 95), dlat=[0] * 95)
+    rpy = SimpleNamespace(car_index=[1, 2], cars=[fast, slow])
+
+    results = ReplayAnalyzer(_trk(), max_workers=1).analyze(rpy)
+
+    assert sorted(results) == [1, 2]
+    best = fastest_laps(results)
+    assert best[1].lap_time == pytest.approx(2.0)
+    assert best[2].lap_time == pytest.approx(3.0)
+
+
+def _write_replay(path, dlongs: list[int]) -> None:
+    frames = []
+    for dlong in dlongs:
+        record = (
+            b"\x01"
+            + ((dlong // 256) & 0xFFFFFF).to_bytes(3, "little")
+            + struct.pack("<hhB", 0, 0, 0)
+            + b"\x00" * 4
+        )
+        frames.append(record + b"\x00" + b"\x00" + b"\x00" + struct.pack("<i", 0))
+    body = b"".join(frames)
+    path.write_bytes(b"RPY\x00" + struct.pack("<iii", 16 + len(body), 0, 1) + body)
+
+
+def test_analyze_file_caches_results_beside_replay(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "race.rpy"
+    _write_replay(path, _lap_dlongs([30_720] * 65))
+    analyzer = ReplayAnalyzer(_trk(), max_workers=1)
+
+    first = analyzer.analyze_file(path)
+
+    assert replay_cache_path(path).exists()
+    monkeypatch.setattr(
+        analyzer, "analyze", lambda _rpy: pytest.fail("cache should be used")
+    )
+    assert analyzer.analyze_file(path) == first
+
+
+def test_analyze_file_ignores_cache_for_changed_replay(tmp_path) -> None:
+    path = tmp_path / "race.rpy"
+    _write_replay(path, _lap_dlongs([30_720] * 65))
+    analyzer = ReplayAnalyzer(max_workers=1)
+    analyzer.analyze_file(path)
+
+    _write_replay(path, _lap_dlongs([30_720] * 35))
+    results = analyzer.analyze_file(path)
+
+    assert len(results[1]) == 2
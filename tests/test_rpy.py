@@ -0,0 +1,120 @@
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from icr2_core.lp.rpy import Rpy, scan_frame_offsets, unpack_int24
+
+
+def _car_record(car_id: int, dlong: int, dlat: int, orient: int) -> bytes:
+    return (
+        struct.pack("<B", car_id)
+        + (dlong & 0xFFFFFF).to_bytes(3, "little")
+        + struct.pack("<hhB", dlat, orient, 3)
+        + b"\x00" * 4
+    )
+
+
+def _frame(records: list[bytes], g_objects: int, s_objects: int) -> bytes:
+    return (
+        b"".join(records)
+        + bytes([g_objects])
+        + b"\x11" * (g_objects * 14)
+        + bytes([s_objects])
+        + b"\x22" * (s_objects * 7)
+        + b"\x01"
+        + struct.pack("<i", 0)
+    )
+
+
+def _write_replay(path, frames: list[bytes], num_cars: int) -> None:
+    body = b"".join(frames)
+    header = b"RPY\x00" + struct.pack("<iii", 16 + len(body), 0, num_cars)
+    path.write_bytes(header + body)
+
+
+def _build_replay(path, frame_count: int = 40) -> dict[int, list[tuple[int, int, int]]]:
+    rng = random.Random(4)
+    expected: dict[int, list[tuple[int, int, int]]] = {5: [], 9: [], 2: []}
+    frames = []
+    for frame in range(frame_count):
+        slots = [5, 9, 2]
+        if frame % 3 == 0:
+            slots.reverse()
+        records = []
+        for car_id in slots:
+            dlong = rng.randint(-(2**23), 2**23 - 1)
+            dlat = rng.randint(-(2**15), 2**15 - 1)
+            orient = rng.randint(-(2**15), 2**15 - 1)
+            records.append(_car_record(car_id, dlong, dlat, orient))
+            expected[car_id].append((dlong * 256, dlat * 256, orient))
+        frames.append(_frame(records, frame % 4, frame % 3))
+    _write_replay(path, frames, num_cars=3)
+    return expected
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_rpy_groups_records_per_car_in_frame_order(tmp_path, lazy) -> None:
+    path = tmp_path / "race.rpy"
+    expected = _build_replay(path)
+
+    with Rpy(str(path), lazy=lazy) as rpy:
+        assert rpy.num_frames == 40
+        assert rpy.car_index == [2, 5, 9]
+        for car_id, car in zip(rpy.car_index, rpy.cars):
+            dlong, dlat, orient = zip(*expected[car_id])
+            assert car.car_id == car_id
+            assert car.dlong.tolist() == list(dlong)
+            assert car.dlat.tolist() == list(dlat)
+            assert car.orient.tolist() == list(orient)
+            assert car.wheel_orient.tolist() == [3] * 40
+
+
+def test_rpy_reports_parse_statistics(tmp_path) -> None:
+    path = tmp_path / "race.rpy"
+    _build_replay(path, frame_count=5)
+
+    rpy = Rpy(str(path))
+
+    assert rpy.num_frames == 5
+    assert rpy.bytes_parsed == path.stat().st_size
+    assert rpy.parse_seconds >= 0
+    assert rpy.throughput_mb_s >= 0
+
+
+def test_rpy_ignores_truncated_final_frame(tmp_path) -> None:
+    path = tmp_path / "race.rpy"
+    _build_replay(path, frame_count=6)
+    data = path.read_bytes()
+    path.write_bytes(data + _car_record(5, 1, 1, 1))
+
+    rpy = Rpy(str(path))
+
+    assert rpy.num_frames == 6
+
+
+def test_rpy_rejects_short_files(tmp_path) -> None:
+    path = tmp_path / "empty.rpy"
+    path.write_bytes(b"RPY")
+
+    with pytest.raises(ValueError):
+        Rpy(str(path))
+
+
+def test_scan_frame_offsets_skips_object_blocks() -> None:
+    frames = [
+        _frame([_car_record(1, 0, 0, 0)], 2, 1),
+        _frame([_car_record(1, 0, 0, 0)], 0, 0),
+    ]
+    data = b"\x00" * 16 + b"".join(frames)
+
+    offsets = scan_frame_offsets(data, len(data), num_cars=1)
+
+    assert offsets.tolist() == [16, 16 + len(frames[0])]
+
+
+def test_unpack_int24_sign_extends() -> None:
+    raw = np.array([[0xFF, 0xFF, 0x7F], [0x00, 0x00, 0x80], [0xFF, 0xFF, 0xFF]])
+
+    assert unpack_int24(raw).tolist() == [2**23 - 1, -(2**23), -1]
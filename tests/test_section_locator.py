@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from icr2_core.lp.lpcalc import get_trk_sect_id, get_trk_sect_type
+from icr2_core.trk.section_locator import SectionLocator, section_locator
+from icr2_core.trk.trk_utils import dlong2sect
+
+
+def _trk() -> SimpleNamespace:
+    sects = [
+        SimpleNamespace(start_dlong=0, length=1000, type=1),
+        SimpleNamespace(start_dlong=1000, length=500, type=2),
+        SimpleNamespace(start_dlong=1500, length=500, type=1),
+    ]
+    return SimpleNamespace(trklength=2000, num_sects=3, sects=sects)
+
+
+def _linear_section(starts: list[float], dlong: float) -> int:
+    for index in range(len(starts) - 1):
+        if starts[index] <= dlong < starts[index + 1]:
+            return index
+    return len(starts) - 1
+
+
+@pytest.mark.parametrize("dlong", [-5, 0, 999, 1000, 1499.5, 1500, 1999, 2000, 2500])
+def test_section_matches_linear_scan(dlong) -> None:
+    locator = SectionLocator.from_sections(_trk().sects, 2000)
+
+    assert locator.section(dlong) == _linear_section(locator.starts, dlong)
+    assert locator.sections([dlong]).tolist() == [locator.section(dlong)]
+
+
+def test_sections_match_scalar_queries_for_arrays() -> None:
+    locator = SectionLocator.from_sections(_trk().sects, 2000)
+    dlongs = np.linspace(-100, 2100, 97)
+
+    assert locator.sections(dlongs).tolist() == [locator.section(d) for d in dlongs]
+
+
+def test_wrap_reduces_dlong_modulo_track_length() -> None:
+    locator = SectionLocator.from_sections(_trk().sects, 2000)
+
+    assert locator.section(2500) == 2
+    assert locator.section(2500, wrap=True) == 0
+    assert locator.sections([-100, 3200], wrap=True).tolist() == [2, 1]
+    assert locator.locate(3250, wrap=True) == (1, 0.5)
+
+
+def test_dlong2sect_returns_unclamped_fraction() -> None:
+    trk = _trk()
+
+    assert dlong2sect(trk, 1250) == (1, 0.5)
+    assert dlong2sect(trk, 2250) == (2, 1.5)
+
+
+def test_section_locator_is_cached_until_sections_are_replaced() -> None:
+    trk = _trk()
+    locator = section_locator(trk)
+
+    assert section_locator(trk) is locator
+    trk.sects = trk.sects[:2]
+    assert section_locator(trk) is not locator
+    assert len(section_locator(trk)) == 2
+
+
+def test_lpcalc_lookups_accept_legacy_trk_fields() -> None:
+    sects = [
+        SimpleNamespace(dlong=100, length=900, type=1),
+        SimpleNamespace(dlong=1000, length=1000, type=2),
+    ]
+    trk = SimpleNamespace(trackLength=2000, numSections=2, sects=sects)
+
+    assert get_trk_sect_id(trk, 50) is None
+    assert get_trk_sect_id(trk, 999) == 0
+    assert get_trk_sect_type(trk, 1999) == 2
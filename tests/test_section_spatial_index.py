@@ -0,0 +1,149 @@
+import random
+from dataclasses import replace
+
+from sg_viewer.geometry.spatial_index import SectionSpatialIndex
+from sg_viewer.model.sg_model import SectionPreview
+from sg_viewer.preview.connection_detection import find_unconnected_node_target
+from sg_viewer.preview.selection import find_unconnected_node_hit
+from sg_viewer.ui.preview_section_manager import PreviewSectionManager
+
+
+def _straight(idx: int, start, end, connected: bool = False) -> SectionPreview:
+    return SectionPreview(
+        section_id=idx,
+        source_section_id=idx,
+        type_name="straight",
+        previous_id=idx - 1 if connected else -1,
+        next_id=idx + 1 if connected else -1,
+        start=start,
+        end=end,
+        start_dlong=0.0,
+        length=0.0,
+        center=None,
+        sang1=None,
+        sang2=None,
+        eang1=None,
+        eang2=None,
+        radius=None,
+        start_heading=None,
+        end_heading=None,
+        polyline=[start, end],
+    )
+
+
+def _random_sections(count: int = 300, seed: int = 5) -> list[SectionPreview]:
+    rng = random.Random(seed)
+    sections = []
+    for idx in range(count):
+        start = (rng.uniform(0, 20000), rng.uniform(0, 20000))
+        end = (start[0] + rng.uniform(-900, 900), start[1] + rng.uniform(-900, 900))
+        sections.append(_straight(idx, start, end, connected=rng.random() < 0.3))
+    # A few coincident endpoints so ties are exercised.
+    sections[7] = replace(sections[7], start=sections[3].end, polyline=[sections[3].end, sections[7].end])
+    return sections
+
+
+def test_snap_target_matches_full_scan():
+    sections = _random_sections()
+    index = SectionSpatialIndex()
+    index.rebuild(sections)
+    rng = random.Random(1)
+
+    for _ in range(300):
+        key = (rng.randrange(len(sections)), rng.choice(("start", "end")))
+        node = rng.choice(sections)
+        pos = (node.end[0] + rng.uniform(-60, 60), node.end[1] + rng.uniform(-60, 60))
+        radius = rng.choice((5.0, 80.0, 5000.0))
+
+        expected = find_unconnected_node_target(key, pos, sections, radius)
+        assert find_unconnected_node_target(key, pos, sections, radius, spatial_index=index) == expected
+
+
+def test_unconnected_node_hit_matches_full_scan():
+    sections = _random_sections()
+    index = SectionSpatialIndex()
+    index.rebuild(sections)
+    transform = (0.05, (30.0, -12.0))
+    rng = random.Random(2)
+
+    for _ in range(300):
+        pos = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        assert find_unconnected_node_hit(
+            pos, sections, transform, 1000, 6, spatial_index=index
+        ) == find_unconnected_node_hit(pos, sections, transform, 1000, 6)
+
+
+def test_sections_near_includes_every_section_within_radius():
+    sections = _random_sections()
+    index = SectionSpatialIndex()
+    index.rebuild(sections)
+    rng = random.Random(3)
+
+    for _ in range(200):
+        point = (rng.uniform(0, 20000), rng.uniform(0, 20000))
+        near = set(index.sections_near(point, 250.0))
+        for idx, section in enumerate(sections):
+            xs = [p[0] for p in section.polyline]
+            ys = [p[1] for p in section.polyline]
+            dx = max(min(xs) - point[0], 0.0, point[0] - max(xs))
+            dy = max(min(ys) - point[1], 0.0, point[1] - max(ys))
+            if dx * dx + dy * dy <= 250.0 * 250.0:
+                assert idx in near
+
+
+def test_update_rebuckets_only_changed_sections():
+    sections = _random_sections()
+    index = SectionSpatialIndex()
+    index.rebuild(sections)
+
+    moved = list(sections)
+    moved[10] = _straight(10, (50000.0, 50000.0), (50100.0, 50000.0))
+    index.update(moved, [10])
+
+    assert index.covers(moved)
+    assert (10, "start") in index.nodes_near((50000.0, 50000.0), 1.0)
+    assert 10 not in index.sections_near(sections[10].start, 1.0)
+
+    for idx, section in enumerate(moved):
+        assert (idx, "start") in index.nodes_near(section.start, 1.0)
+        assert (idx, "end") in index.nodes_near(section.end, 1.0)
+        assert idx in index.sections_near(section.polyline[0], 1.0)
+
+
+def test_section_manager_keeps_index_on_active_sections():
+    manager = PreviewSectionManager(lambda bounds: bounds)
+    sections = [_straight(idx, (idx * 100.0, 0.0), (idx * 100.0 + 100.0, 0.0)) for idx in range(20)]
+    manager.set_sections(sections)
+    assert manager.spatial_index.covers(manager.sections)
+
+    dragged = list(manager.sections)
+    dragged[4] = replace(dragged[4], end=(450.0, 300.0))
+    assert manager.update_drag_preview(dragged)
+    assert manager.spatial_index.covers(manager.sections)
+    assert (4, "end") in manager.spatial_index.nodes_near((450.0, 300.0), 1.0)
+
+    manager.clear_drag_preview()
+    assert manager.spatial_index.covers(manager.sections)
+    assert (4, "end") not in manager.spatial_index.nodes_near((450.0, 300.0), 1.0)
+    assert (4, "end") in manager.spatial_index.nodes_near((500.0, 0.0), 1.0)
+
+
+def test_selection_pick_matches_full_scan():
+    from sg_viewer.model.selection import SelectionManager
+
+    sections = _random_sections()
+    index = SectionSpatialIndex()
+    index.rebuild(sections)
+    plain = SelectionManager()
+    indexed = SelectionManager()
+    indexed.set_spatial_index(index)
+    for manager in (plain, indexed):
+        manager.update_context(sections, track_length=None, centerline_index=None, sampled_dlongs=[])
+    rng = random.Random(4)
+
+    for _ in range(200):
+        point = (rng.uniform(0, 20000), rng.uniform(0, 20000))
+        transform = (rng.choice((0.02, 0.5)), (0.0, 0.0))
+        assert indexed._find_section_by_dlong(point, transform) == plain._find_section_by_dlong(
+            point, transform
+        )
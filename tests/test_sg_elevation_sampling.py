@@ -0,0 +1,73 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from icr2_core.sg_elevation import (
+    _sg_altitude_at_with_dlats,
+    sample_sg_elevation_with_dlats,
+    sample_sg_section_elevations_with_dlats,
+)
+
+
+def _sg(num_sects: int = 12, dlats=(-600.0, -200.0, 0.0, 250.0, 700.0), seed: int = 3):
+    rng = random.Random(seed)
+    sects = [
+        SimpleNamespace(
+            length=0 if index == 4 else rng.randint(200, 4000),
+            alt=[rng.randint(-3000, 3000) for _ in dlats],
+            grade=[rng.randint(-900, 900) for _ in dlats],
+        )
+        for index in range(num_sects)
+    ]
+    return SimpleNamespace(sects=sects, xsect_dlats=list(dlats))
+
+
+def _scalar_samples(sg, xsect_idx: int, resolution: int) -> list[float]:
+    dlats = sg.xsect_dlats
+    min_dlat, max_dlat = min(dlats), max(dlats)
+    dlat_norm = (dlats[xsect_idx] - min_dlat) / (max_dlat - min_dlat)
+    return [
+        _sg_altitude_at_with_dlats(
+            sg, index, step / resolution, dlat_norm, dlats, min_dlat, max_dlat
+        )
+        for index, sect in enumerate(sg.sects)
+        if sect.length > 0
+        for step in range(resolution + 1)
+    ]
+
+
+@pytest.mark.parametrize("xsect_idx", range(5))
+def test_sample_sg_elevation_matches_scalar_evaluation(xsect_idx: int) -> None:
+    sg = _sg()
+    dlats = sg.xsect_dlats
+
+    samples = sample_sg_elevation_with_dlats(
+        sg, xsect_idx, dlats, min(dlats), max(dlats), resolution=7
+    )
+
+    assert samples == pytest.approx(_scalar_samples(sg, xsect_idx, 7), abs=1e-9)
+
+
+def test_section_samples_match_full_profile_runs() -> None:
+    sg = _sg()
+    dlats = sg.xsect_dlats
+    full = sample_sg_elevation_with_dlats(sg, 2, dlats, min(dlats), max(dlats), resolution=5)
+
+    refreshed = sample_sg_section_elevations_with_dlats(
+        sg, 2, {0, 4, 7, 99}, dlats, min(dlats), max(dlats), resolution=5
+    )
+
+    # Section 4 has no length and is skipped, shifting later runs by one.
+    assert sorted(refreshed) == [0, 7]
+    assert refreshed[0] == full[0:6]
+    assert refreshed[7] == full[6 * 6 : 7 * 6]
+
+
+def test_sample_sg_elevation_handles_single_xsect_and_bad_index() -> None:
+    sg = _sg(dlats=(0.0,))
+
+    assert sample_sg_elevation_with_dlats(sg, 1, [0.0], 0.0, 0.0) == []
+    samples = sample_sg_elevation_with_dlats(sg, 0, [0.0], 0.0, 0.0, resolution=3)
+    assert len(samples) == 11 * 4
+    assert samples[0] == pytest.approx(float(sg.sects[-1].alt[0]))
@@ -1,3 +1,4 @@
+from icr2_core.parallel import PARALLEL_THRESHOLDS
 from sg_viewer.model.preview_fsection import PreviewFSection
 from types import SimpleNamespace
 from sg_viewer.services.sg_integrity_checks import (
@@ -574,3 +575,66 @@ def test_choose_integrity_memo_author_can_be_seeded_for_tests() -> None:
     author_b = choose_integrity_memo_author(random.Random(2))
 
     assert author_a == author_b
+
+
+def _parallel_lanes(count: int) -> tuple[list, list]:
+    step = _ft_to_world(100.0)
+    lane_gap = _ft_to_world(60.0)
+    sections = []
+    for lane, y in enumerate((0.0, lane_gap)):
+        offset = lane * count
+        for index in range(count):
+            sections.append(
+                _section(
+                    section_id=offset + index,
+                    start=(index * step, y),
+                    end=((index + 1) * step, y),
+                    previous_id=offset + (index - 1) % count,
+                    next_id=offset + (index + 1) % count,
+                )
+            )
+    boundary = PreviewFSection(
+        start_dlat=_ft_to_world(40.0),
+        end_dlat=_ft_to_world(40.0),
+        surface_type=0,
+        type2=0,
+    )
+    return sections, [[boundary] for _ in sections]
+
+
+def test_integrity_cache_rechecks_only_sections_near_an_edit() -> None:
+    from sg_viewer.services.sg_integrity_checks import IntegrityCache
+
+    sections, fsects = _parallel_lanes(10)
+    cache = IntegrityCache()
+    first = build_integrity_report(sections, fsects, cache=cache)
+    assert cache.reused == 0
+
+    again = build_integrity_report(sections, fsects, cache=cache)
+    assert again == first
+    assert cache.checked == 0
+
+    moved = sections[15]
+    sections[15] = _section(
+        section_id=15,
+        start=moved.start,
+        end=(moved.end[0], moved.end[1] + _ft_to_world(5.0)),
+        previous_id=moved.previous_id,
+        next_id=moved.next_id,
+    )
+    edited = build_integrity_report(sections, fsects, cache=cache)
+
+    assert edited == build_integrity_report(sections, fsects)
+    assert 0 < cache.checked < cache.reused
+    assert cache.checked + cache.reused == 5 * len(sections)
+
+
+def test_integrity_report_process_pool_matches_serial_run(monkeypatch) -> None:
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "sg_sections", 1)
+    sections, fsects = _parallel_lanes(6)
+
+    serial = build_integrity_report(sections, fsects, max_workers=1)
+    pooled = build_integrity_report(sections, fsects, max_workers=2)
+
+    assert pooled == serial
+    assert "Boundary points closer to a different centerline: 6" in serial.text
@@ -1,7 +1,12 @@
 import random
 
+import numpy as np
+
 from sg_viewer.services.skid_marks import (
     SkidMarkGenerationParameters,
+    _interpolate_dlat_range,
+    _interpolate_dlat_ranges,
+    generate_skid_mark_columns,
     generate_skid_mark_lines,
     parse_colors_csv,
     parse_skid_sections_csv,
@@ -23,3 +28,47 @@ def test_generate_skid_mark_lines_from_csv_rows() -> None:
 
 def test_parse_colors_csv_uses_defaults_for_blank() -> None:
     assert parse_colors_csv("   ") == (45, 28, 44, 29)
+
+
+def test_generate_skid_mark_columns_stays_inside_section_ranges() -> None:
+    sections = parse_skid_sections_csv(
+        "Turn1,100000,120000,150000,3500,9000,2200,400,22000,16000,13000,7000,14000,5000\n"
+        "Short,0,0,2000,5000,6000,100,5,0,0,0,0,0,0"
+    )
+    parameters = SkidMarkGenerationParameters(colors=(45, 28), sections=sections)
+
+    columns = generate_skid_mark_columns(parameters, rng=np.random.default_rng(7))
+
+    # The second section is shorter than its minimum skid, so it yields nothing.
+    assert len(columns) == 400
+    lengths = columns.end_dlong - columns.start_dlong
+    assert lengths.min() >= 3500 and lengths.max() < 9000
+    assert columns.start_dlong.min() >= 100000 and columns.end_dlong.max() < 150000
+    assert set(columns.color_index.tolist()) == {45, 28}
+    assert set(columns.width_500ths.tolist()) == {2200}
+    assert columns.start_dlat.min() >= 5000 and columns.start_dlat.max() <= 22000
+    assert all(line.command == "Detail" for line in columns.to_lines())
+
+
+def test_interpolate_dlat_ranges_matches_scalar_helper() -> None:
+    (section,) = parse_skid_sections_csv("T,1000,4000,9000,1,2,3,4,-500,700,100,-300,900,20")
+    dlongs = np.arange(1000, 9001, 7)
+
+    low, high = _interpolate_dlat_ranges(section, dlongs)
+
+    expected = [
+        _interpolate_dlat_range(
+            section,
+            dlong=int(dlong),
+            entry_length=3000,
+            exit_length=5000,
+            start_min=-500,
+            start_max=700,
+            apex_min=-300,
+            apex_max=100,
+            end_min=20,
+            end_max=900,
+        )
+        for dlong in dlongs
+    ]
+    assert list(zip(low.tolist(), high.tolist())) == expected
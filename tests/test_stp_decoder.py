@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import struct
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icr2_core.dat.packdat import packdat
+from icr2_core.stp.stp2png import decode_dat_stps, decode_stp_bytes, decode_stp_partial
+
+
+def _reference_decode(buf: bytes) -> tuple[bytearray, int, str | None]:
+    # The byte-at-a-time decoder the run scanner replaced.
+    width, height = struct.unpack_from("<HH", buf, 0)
+    total = width * height
+    out = bytearray()
+    offset = 8
+    ctrl_offset = offset
+    while len(out) < total:
+        if offset >= len(buf):
+            return out, ctrl_offset, "Unexpected EOF"
+        ctrl_offset = offset
+        a = buf[offset]
+        offset += 1
+        if a <= 64:
+            if a == 0:
+                return out, ctrl_offset, "Literal run length 0"
+            if offset + a > len(buf):
+                return out, ctrl_offset, "EOF in literal run"
+            out.extend(buf[offset : offset + a])
+            offset += a
+        else:
+            run_len = a - 64 if a < 128 else a - 128
+            if run_len <= 0:
+                return out, ctrl_offset, "Repeat length <= 0 (a-128)"
+            if offset >= len(buf):
+                return out, ctrl_offset, "EOF reading repeat color"
+            out.extend([buf[offset]] * run_len)
+            offset += 1
+    return out, offset, None
+
+
+def _stp(width: int, height: int, seed: int, *, overshoot: bool = False) -> bytes:
+    rng = np.random.default_rng(seed)
+    body = bytearray()
+    remaining = width * height
+    while remaining > 0:
+        kind = rng.integers(0, 3)
+        if kind == 0:
+            length = int(rng.integers(1, 65))
+            body.append(length)
+            body.extend(rng.integers(0, 256, length, dtype=np.uint8).tobytes())
+        elif kind == 1:
+            length = int(rng.integers(1, 64))
+            body.extend((64 + length, int(rng.integers(0, 256))))
+        else:
+            length = int(rng.integers(1, 128))
+            body.extend((128 + length, int(rng.integers(0, 256))))
+        remaining -= length
+    if not overshoot:
+        assert remaining <= 0
+    return struct.pack("<HH", width, height) + bytes(4) + bytes(body)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_decode_matches_reference_decoder(seed: int) -> None:
+    buf = _stp(97, 61, seed)
+
+    result = decode_stp_bytes(buf)
+    expected, stop_offset, error = _reference_decode(buf)
+
+    assert error is None and result.complete
+    assert result.pixels.shape == (61, 97)
+    assert result.pixels.tobytes() == bytes(expected[: 97 * 61])
+    assert result.stop_offset == stop_offset
+
+
+@pytest.mark.parametrize(
+    "tail, reason",
+    [
+        (b"", "Unexpected EOF"),
+        (b"\x00", "Literal run length 0"),
+        (b"\x05\x01\x02", "EOF in literal run"),
+        (b"\x80\x07", "Repeat length <= 0 (a-128)"),
+        (b"\x90", "EOF reading repeat color"),
+    ],
+)
+def test_partial_decode_keeps_prefix_and_reports_error(tmp_path: Path, caplog, tail: bytes, reason: str) -> None:
+    buf = struct.pack("<HH", 8, 4) + bytes(4) + b"\x03\x0a\x0b\x0c\x44\x09" + tail
+    path = tmp_path / "broken.stp"
+    path.write_bytes(buf)
+
+    with caplog.at_level(logging.ERROR):
+        width, height, pixels, stop_offset = decode_stp_partial(path, logging.getLogger("stp-test"))
+    result = decode_stp_bytes(buf)
+    expected, expected_offset, expected_reason = _reference_decode(buf)
+
+    assert (width, height) == (8, 4)
+    assert pixels == expected == bytearray(b"\x0a\x0b\x0c" + b"\x09" * 4)
+    assert stop_offset == expected_offset
+    assert result.error == expected_reason == reason
+    assert result.decoded == 7
+    assert result.pixels.reshape(-1)[7:].tolist() == [0xFF] * 25
+    assert "DECODE STOPPED" in caplog.text
+
+
+def test_decode_dat_stps_reads_every_stp_in_memory(tmp_path: Path) -> None:
+    files = {"WALL.STP": _stp(16, 8, 3), "SKY.STP": _stp(12, 12, 4), "TRACK.TRK": b"not an stp"}
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    (tmp_path / "packlist.txt").write_text("\n".join(files) + "\n")
+    dat_path = tmp_path / "track.dat"
+    packdat(str(tmp_path / "packlist.txt"), str(dat_path), backup=False)
+
+    decoded = decode_dat_stps(dat_path)
+
+    assert list(decoded) == ["WALL.STP", "SKY.STP"]
+    for name, result in decoded.items():
+        assert result.complete
+        assert result.pixels.tobytes() == decode_stp_bytes(files[name]).pixels.tobytes()
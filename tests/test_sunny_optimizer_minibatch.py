@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from icr2_core.parallel import PARALLEL_THRESHOLDS
+from texture_tools.sunny_optimizer.model import (
+    SunnyPaletteOptimizer,
+    _color_histogram,
+    _minibatch_kmeans,
+    load_texture_images,
+)
+
+
+def _blobs() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    centers = np.array([[20.0, 0.0, 0.0], [60.0, 40.0, -30.0], [85.0, -50.0, 60.0]])
+    samples = np.vstack([center + rng.normal(0, 1.0, (400, 3)) for center in centers])
+    return centers, samples
+
+
+def test_minibatch_kmeans_finds_separated_clusters_reproducibly() -> None:
+    centers, samples = _blobs()
+
+    found = _minibatch_kmeans(samples, 3, n_init=3, random_state=5, batch_size=256)
+    again = _minibatch_kmeans(samples, 3, n_init=3, random_state=5, batch_size=256)
+
+    assert np.array_equal(found, again)
+    order = np.argsort(found[:, 0])
+    assert np.allclose(found[order], centers, atol=0.5)
+
+
+def test_minibatch_kmeans_weights_act_like_repeated_samples() -> None:
+    samples = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [50.0, 0.0, 0.0]])
+    weights = np.array([3, 1, 4])
+
+    (mean,) = _minibatch_kmeans(samples, 1, weights=weights, n_init=1, random_state=0)
+    pair = _minibatch_kmeans(samples, 2, weights=weights, n_init=2, random_state=0, batch_size=64)
+
+    assert mean == pytest.approx([26.25, 0.0, 0.0])
+    assert sorted(pair[:, 0].round(3).tolist()) == pytest.approx([2.5, 50.0], abs=0.5)
+
+
+def test_color_histogram_counts_pixels_per_colour() -> None:
+    image = np.array([[[1, 2, 3], [1, 2, 3]], [[9, 9, 9], [1, 2, 3]]], dtype=np.uint8)
+
+    colors, counts = _color_histogram(image)
+
+    assert colors.tolist() == [[1, 2, 3], [9, 9, 9]]
+    assert counts.tolist() == [3, 1]
+
+
+def test_minibatch_palette_is_reproducible() -> None:
+    rng = np.random.default_rng(3)
+    images = {
+        "a.png": rng.integers(0, 256, (32, 32, 3), dtype=np.uint8),
+        "b.png": np.full((16, 16, 3), (120, 80, 40), dtype=np.uint8),
+    }
+    fixed = rng.integers(0, 256, (256, 3), dtype=np.uint8)
+    kwargs = dict(
+        rgb_images=images,
+        per_texture_color_budget={"a.png": 20, "b.png": 3},
+        fixed_palette=fixed,
+        dirt_present=False,
+        kmeans_mode="minibatch",
+        batch_size=128,
+        random_state=11,
+    )
+
+    palette = SunnyPaletteOptimizer(**kwargs).compute_palette()
+
+    assert np.array_equal(palette, SunnyPaletteOptimizer(**kwargs).compute_palette())
+    assert np.array_equal(palette[:176], fixed[:176])
+    with pytest.raises(ValueError, match="kmeans_mode"):
+        SunnyPaletteOptimizer(**{**kwargs, "kmeans_mode": "fast"})
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_texture_images_keeps_order_and_downsamples(tmp_path: Path, monkeypatch, max_workers: int) -> None:
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "texture_image_bytes", 0)
+    paths = []
+    for index, size in enumerate((40, 8, 24)):
+        path = tmp_path / f"tex{index}.png"
+        Image.new("RGB", (size, size // 2), (index * 50, 10, 20)).save(path)
+        paths.append(path)
+
+    images = load_texture_images(paths, 16, max_workers=max_workers)
+
+    assert list(images) == ["tex0.png", "tex1.png", "tex2.png"]
+    assert [image.shape for image in images.values()] == [(8, 16, 3), (4, 8, 3), (8, 16, 3)]
+    assert images["tex2.png"][0, 0].tolist() == [100, 10, 20]
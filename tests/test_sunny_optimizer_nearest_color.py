@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from texture_tools.sunny_optimizer.color_utils import rgb_to_lab
+from texture_tools.sunny_optimizer.nearest_color import BruteForceNearest, LabGridNearest
+from texture_tools.sunny_optimizer.quantizer import Quantizer
+
+
+def _fixture(seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, (256, 3), dtype=np.uint8)
+    # Duplicate and tightly clustered entries exercise tie breaking.
+    palette[10:40] = palette[0]
+    palette[100:120] = rng.integers(100, 104, (20, 3))
+    image = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    image[:20] = palette[rng.integers(0, 256, (20, 160))]
+    return palette, image
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_grid_engine_matches_brute_force(seed: int) -> None:
+    palette, image = _fixture(seed)
+    palette_lab = rgb_to_lab(palette).reshape(256, 3)
+    lab = rgb_to_lab(image).reshape(-1, 3)
+
+    expected = BruteForceNearest(palette_lab).nearest(lab)
+
+    assert np.array_equal(LabGridNearest(palette_lab).nearest(lab), expected)
+    assert np.array_equal(LabGridNearest(palette_lab, cell_size=3.0).nearest(lab), expected)
+
+
+@pytest.mark.parametrize("engine", ["grid", "brute"])
+@pytest.mark.parametrize("cache_colors", [True, False])
+def test_quantizer_matches_per_pixel_brute_force(engine: str, cache_colors: bool) -> None:
+    palette, image = _fixture(3)
+    expected = BruteForceNearest(rgb_to_lab(palette).reshape(256, 3)).nearest(
+        rgb_to_lab(image).reshape(-1, 3)
+    )
+    quantizer = Quantizer(palette, engine=engine, cache_colors=cache_colors)
+
+    indexed, quantized = quantizer.quantize_image(image)
+    # The second image reuses the remembered colours.
+    flipped, _ = quantizer.quantize_image(image[::-1])
+
+    assert np.array_equal(indexed.ravel(), expected)
+    assert np.array_equal(quantized, palette[indexed])
+    assert np.array_equal(flipped, indexed[::-1])
+
+
+def test_cached_quantizer_handles_new_colours_in_later_images() -> None:
+    palette, first = _fixture(4)
+    _, second = _fixture(5)
+    quantizer = Quantizer(palette)
+
+    quantizer.quantize_image(first)
+    indexed, _ = quantizer.quantize_image(second)
+
+    assert np.array_equal(indexed, Quantizer(palette, cache_colors=False).quantize_image(second)[0])
+    assert not quantizer._seen.any()
+
+
+def test_quantizer_rejects_unknown_engine() -> None:
+    with pytest.raises(ValueError, match="engine"):
+        Quantizer(np.zeros((256, 3), dtype=np.uint8), engine="kd")
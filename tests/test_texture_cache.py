@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from icr2_core.mip.mips import encode_mip
+from icr2_core.mip.texture_cache import TextureCache
+from texture_tools.pmp import png_to_pmp
+from texture_tools.pmp_to_png import decode_pmp_indices
+
+
+def _write_mip(path: Path, seed: int, size: int = 32) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    levels = [rng.integers(0, 256, (size >> i, size >> i), dtype=np.uint8) for i in range(3)]
+    path.write_bytes(encode_mip(levels, 0))
+    return levels[0]
+
+
+def _write_palette(path: Path) -> Path:
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([value for index in range(256) for value in (index, index, 255 - index)])
+    palette.save(path)
+    return path
+
+
+def test_decoded_textures_are_content_addressed(tmp_path: Path) -> None:
+    expected = _write_mip(tmp_path / "a.mip", 0)
+    shutil.copy(tmp_path / "a.mip", tmp_path / "copy.mip")
+    cache = TextureCache()
+
+    indices, mask = cache.decoded(tmp_path / "a.mip")
+    again, _ = cache.decoded(tmp_path / "copy.mip")
+
+    assert np.array_equal(indices, expected) and mask is None
+    assert again is indices and not indices.flags.writeable
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    changed = _write_mip(tmp_path / "a.mip", 1)
+    assert np.array_equal(cache.decoded(tmp_path / "a.mip")[0], changed)
+    assert cache.stats().misses == 2
+
+
+def test_lru_evicts_least_recently_used(tmp_path: Path) -> None:
+    for index in range(3):
+        _write_mip(tmp_path / f"t{index}.mip", index)
+    cache = TextureCache(max_entries=2)
+
+    cache.decoded(tmp_path / "t0.mip")
+    cache.decoded(tmp_path / "t1.mip")
+    cache.decoded(tmp_path / "t0.mip")
+    cache.decoded(tmp_path / "t2.mip")
+    cache.decoded(tmp_path / "t0.mip")
+    cache.decoded(tmp_path / "t1.mip")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 4, 2, 2)
+    assert stats.bytes == 2 * 32 * 32
+
+
+def test_thumbnails_persist_on_disk(tmp_path: Path) -> None:
+    _write_mip(tmp_path / "a.mip", 0)
+    palette = _write_palette(tmp_path / "sunny.pcx")
+    store = tmp_path / "thumbs"
+
+    first = TextureCache(store).thumbnail(tmp_path / "a.mip", palette, 16)
+    reopened = TextureCache(store)
+    second = reopened.thumbnail(tmp_path / "a.mip", palette, 16)
+
+    assert first.size == (16, 16) and len(list(store.glob("*.png"))) == 1
+    assert np.array_equal(np.asarray(second.convert("RGB")), np.asarray(first.convert("RGB")))
+    assert (reopened.stats().thumbnail_hits, reopened.stats().misses) == (1, 0)
+
+
+def test_pmp_decoder_and_background_prefetch(tmp_path: Path) -> None:
+    sprite = Image.new("RGBA", (6, 3), (0, 0, 0, 0))
+    sprite.paste((255, 0, 0, 255), (1, 1, 4, 2))
+    sprite.save(tmp_path / "sprite.png")
+    png_to_pmp(tmp_path / "sprite.png", tmp_path / "sprite.pmp", size_field=0, palette_path=None)
+    (tmp_path / "sprite.png").unlink()
+    for index in range(3):
+        _write_mip(tmp_path / f"t{index}.mip", index)
+    (tmp_path / "broken.mip").write_bytes(b"\x00" * 8)
+    palette = _write_palette(tmp_path / "sunny.pcx")
+    cache = TextureCache(decoders={".pmp": decode_pmp_indices})
+
+    assert cache.prefetch_folder(tmp_path).result(timeout=30) == 4
+    image = cache.image(tmp_path / "sprite.pmp", palette)
+    cache.close()
+
+    assert cache.stats().hits == 1
+    assert image.mode == "RGBA" and image.getbbox() == (1, 1, 4, 2)
+    with pytest.raises(ValueError, match="decoder"):
+        cache.decoded(tmp_path / "sunny.pcx")
+
+
+def test_same_bytes_with_different_decoders_get_separate_entries(tmp_path: Path) -> None:
+    _write_mip(tmp_path / "a.mip", 0)
+    shutil.copy(tmp_path / "a.mip", tmp_path / "a.raw")
+    raw = lambda data: (np.frombuffer(data[:16], dtype=np.uint8).reshape(4, 4), None)  # noqa: E731
+    cache = TextureCache(decoders={".raw": raw}, max_entries=2)
+
+    mip, _ = cache.decoded(tmp_path / "a.mip")
+    flat, _ = cache.decoded(tmp_path / "a.raw")
+
+    assert mip.shape == (32, 32) and flat.shape == (4, 4)
+    assert (cache.stats().hits, cache.stats().misses) == (0, 2)
+
+    for index in range(12):
+        _write_mip(tmp_path / f"t{index}.mip", index, size=8)
+        cache.file_digest(tmp_path / f"t{index}.mip")
+    assert len(cache._digests) == 8
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from icr2_core.parallel import PARALLEL_THRESHOLDS
+from texture_tools.batch_convert import (
+    MANIFEST_NAME,
+    STATUS_CONVERTED,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    TextureBatchConverter,
+    main,
+)
+
+
+def _write_palette(path: Path) -> Path:
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([value for index in range(256) for value in (index, 255 - index, index // 2)])
+    palette.save(path)
+    return path
+
+
+def _write_textures(folder: Path, count: int = 3) -> list[Path]:
+    folder.mkdir()
+    paths = []
+    for index in range(count):
+        path = folder / f"tex{index}.png"
+        Image.new("RGB", (16, 16), (index * 40, 200 - index * 40, 60)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_manifest_skips_unchanged_outputs(tmp_path: Path) -> None:
+    palette = _write_palette(tmp_path / "sunny.pcx")
+    sources = _write_textures(tmp_path / "src")
+    target = tmp_path / "out"
+    target.mkdir()
+    converter = TextureBatchConverter("png-to-mip", palette, max_workers=1)
+
+    first = converter.convert_folder(tmp_path / "src", target)
+    assert [r.status for r in first] == [STATUS_CONVERTED] * 3
+    assert (target / MANIFEST_NAME).exists()
+
+    # A touched but identical source is matched by its hash.
+    stat = sources[0].stat()
+    os.utime(sources[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    Image.new("RGB", (16, 16), (1, 2, 3)).save(sources[1])
+    second = converter.convert_folder(tmp_path / "src", target)
+    assert [r.status for r in second] == [STATUS_SKIPPED, STATUS_CONVERTED, STATUS_SKIPPED]
+
+    (target / "tex2.mip").unlink()
+    dithered = TextureBatchConverter("png-to-mip", palette, dither=True, max_workers=1)
+    assert len(dithered.stale_jobs(dithered.jobs_for_folder(tmp_path / "src", target))) == 3
+    assert [r.status for r in converter.convert_folder(tmp_path / "src", target)] == [
+        STATUS_SKIPPED,
+        STATUS_SKIPPED,
+        STATUS_CONVERTED,
+    ]
+
+
+def test_parallel_conversion_matches_serial_and_streams_progress(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "texture_conversion_bytes", 0)
+    _write_textures(tmp_path / "src", count=4)
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    updates: list[tuple[int, int, str]] = []
+
+    serial = TextureBatchConverter("png-to-pmp", size_field=0x1234, max_workers=1)
+    serial.convert_folder(tmp_path / "src", serial_dir)
+    parallel = TextureBatchConverter("png-to-pmp", size_field=0x1234, max_workers=2)
+    results = parallel.convert_folder(
+        tmp_path / "src",
+        parallel_dir,
+        lambda done, total, result: updates.append((done, total, result.status)),
+    )
+
+    assert [r.job.source.name for r in results] == ["tex0.png", "tex1.png", "tex2.png", "tex3.png"]
+    assert [u[:2] for u in updates] == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    for index in range(4):
+        name = f"tex{index}.pmp"
+        assert (parallel_dir / name).read_bytes() == (serial_dir / name).read_bytes()
+
+
+def test_failed_files_are_reported_and_retried(tmp_path: Path) -> None:
+    palette = _write_palette(tmp_path / "sunny.pcx")
+    _write_textures(tmp_path / "src", count=2)
+    (tmp_path / "src" / "tex1.png").write_bytes(b"not a png")
+    target = tmp_path / "out"
+    target.mkdir()
+    converter = TextureBatchConverter("png-to-mip", palette, max_workers=1)
+
+    results = converter.convert_folder(tmp_path / "src", target)
+
+    assert [r.status for r in results] == [STATUS_CONVERTED, STATUS_FAILED]
+    assert results[1].error
+    assert [r.status for r in converter.convert_folder(tmp_path / "src", target)] == [
+        STATUS_SKIPPED,
+        STATUS_FAILED,
+    ]
+
+
+def test_converter_validates_settings() -> None:
+    with pytest.raises(ValueError, match="kind"):
+        TextureBatchConverter("png-to-jpg")
+    with pytest.raises(ValueError, match="palette"):
+        TextureBatchConverter("mip-to-png")
+
+
+def test_cli_round_trips_mip_folder(tmp_path: Path, capsys) -> None:
+    palette = _write_palette(tmp_path / "sunny.pcx")
+    _write_textures(tmp_path / "src", count=2)
+
+    assert main(["png-to-mip", str(tmp_path / "src"), str(tmp_path / "mip"), "--palette", str(palette), "--workers", "1"]) == 0
+    assert main(["mip-to-png", str(tmp_path / "mip"), str(tmp_path / "png"), "--palette", str(palette)]) == 0
+
+    assert sorted(p.name for p in (tmp_path / "png").glob("*.png")) == ["tex0.png", "tex1.png"]
+    assert "2 converted, 0 up to date, 0 failed" in capsys.readouterr().out
+
+
+def test_cli_rejects_non_hex_size_field(tmp_path: Path, capsys) -> None:
+    (tmp_path / "src").mkdir()
+
+    with pytest.raises(SystemExit):
+        main(["png-to-pmp", str(tmp_path / "src"), str(tmp_path / "out"), "--size-field", "zz"])
+
+    assert "--size-field must be a hex number" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from texture_tools.pmp import _encode_runs
+from texture_tools.pmp_to_png import convert_pmp_to_png, parse_pmp, render_runs
+
+
+def _reference_encode_runs(indexed: Image.Image, alpha: Image.Image | None, threshold: int) -> bytes:
+    # The per-pixel encoder the vectorized one replaced.
+    width, height = indexed.size
+    color_pixels = indexed.load()
+    alpha_pixels = alpha.load() if alpha is not None else None
+    data = bytearray()
+    for y in range(height):
+        x = 0
+        while x < width:
+            if alpha_pixels is not None and int(alpha_pixels[x, y]) <= threshold:
+                x += 1
+                continue
+            color = int(color_pixels[x, y])
+            start = x
+            x += 1
+            while x < width:
+                if alpha_pixels is not None and int(alpha_pixels[x, y]) <= threshold:
+                    break
+                if int(color_pixels[x, y]) != color:
+                    break
+                x += 1
+            data.extend((y, start, x, color))
+    return bytes(data)
+
+
+def _sprite(seed: int, size: tuple[int, int]) -> tuple[Image.Image, Image.Image]:
+    rng = np.random.default_rng(seed)
+    width, height = size
+    # Few colours and blocky alpha give long runs as well as single pixels.
+    indices = rng.integers(0, 4, (height, width), dtype=np.uint8)
+    indices[:, width // 2 :] = indices[:, :1]
+    alpha = rng.choice(np.array([0, 40, 255], dtype=np.uint8), (height, width), p=[0.2, 0.1, 0.7])
+    return Image.fromarray(indices, "L").convert("P"), Image.fromarray(alpha, "L")
+
+
+@pytest.mark.parametrize("seed, size", [(0, (1, 1)), (1, (9, 5)), (2, (255, 40)), (3, (64, 256))])
+@pytest.mark.parametrize("threshold", [0, 40])
+def test_encode_runs_matches_reference_encoder(seed: int, size: tuple[int, int], threshold: int) -> None:
+    indexed, alpha = _sprite(seed, size)
+
+    expected = _reference_encode_runs(indexed, alpha, threshold)
+
+    assert _encode_runs(indexed, alpha, alpha_transparent_threshold=threshold) == expected
+    assert _encode_runs(indexed) == _reference_encode_runs(indexed, None, threshold)
+
+
+def test_encode_runs_rejects_runs_ending_at_256() -> None:
+    with pytest.raises(ValueError, match="0..255"):
+        _encode_runs(Image.new("P", (256, 1)))
+
+
+def test_render_runs_paints_in_record_order() -> None:
+    runs = np.array([[0, 0, 4, 1], [0, 2, 3, 7], [1, 3, 3, 9], [2, 250, 255, 5]])
+
+    indices, painted, skipped = render_runs(runs, width=256, height=4)
+
+    assert indices[0, :5].tolist() == [1, 1, 7, 1, 0]
+    assert painted[0, :5].tolist() == [True, True, True, True, False]
+    assert not painted[1].any()
+    assert painted[2].sum() == 5 and indices[2, 254] == 5
+    assert skipped == 1
+
+
+def test_pmp_to_png_decodes_reference_runs(tmp_path: Path) -> None:
+    indexed, alpha = _sprite(4, (120, 30))
+    pmp_path = tmp_path / "sprite.pmp"
+    payload = _reference_encode_runs(indexed, alpha, 0)
+    pmp_path.write_bytes(bytes(4) + len(payload).to_bytes(4, "little") + bytes(4) + payload)
+    palette_path = tmp_path / "palette.pal"
+    palette = np.arange(768, dtype=np.uint32).astype(np.uint8)
+    palette_path.write_bytes(palette.tobytes())
+
+    convert_pmp_to_png(str(pmp_path), str(tmp_path / "sprite.png"), str(palette_path))
+    _metadata, runs = parse_pmp(str(pmp_path))
+    decoded = np.asarray(Image.open(tmp_path / "sprite.png").convert("RGBA"))
+
+    opaque = np.asarray(alpha) > 0
+    colours = palette.reshape(256, 3)[np.asarray(indexed)]
+    assert len(runs) == len(payload) // 4
+    assert np.array_equal(decoded[:30, :120, 3] == 255, opaque)
+    assert np.array_equal(decoded[:30, :120, :3][opaque], colours[opaque])
+    assert not decoded[30:].any() and not decoded[:, 120:].any()
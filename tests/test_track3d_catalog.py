@@ -5,8 +5,12 @@ from icr2_3d_catalog_viewer.icr2_3d_catalog_parser import parse_3d
 from sg_viewer.io.track3d_catalog import (
     Track3DCatalog,
     Track3DDetailListDefinition,
+    Track3DIndex,
     Track3DObjectListDefinition,
+    invalidate_track3d_index,
     parse_track3d_catalog,
+    parse_track3d_catalog_text,
+    track3d_index,
 )
 
 
@@ -189,3 +193,77 @@ def test_calculate_track3d_xy_bounding_box_rejects_files_without_vertices(tmp_pa
 
     with pytest.raises(ValueError, match="No vertex coordinates"):
         calculate_track3d_xy_bounding_box(path)
+
+
+def test_track3d_index_is_cached_until_file_changes(tmp_path: Path):
+    path = tmp_path / "track.3d"
+    path.write_text('__TSO1: DYNAMIC 1, 2, 3, 4, EXTERN "tree";\n', encoding="utf-8")
+
+    first = track3d_index(path)
+    assert track3d_index(path) is first
+    assert parse_track3d_catalog(path) is first.catalog
+
+    path.write_text(
+        '__TSO1: DYNAMIC 1, 2, 3, 4, EXTERN "tree";\n'
+        '__TSO2: DYNAMIC 5, 6, 7, 8, EXTERN "rock";\n',
+        encoding="utf-8",
+    )
+    invalidate_track3d_index(path)
+    second = track3d_index(path)
+
+    assert second is not first
+    assert sorted(second.catalog.tsos) == ["__TSO1", "__TSO2"]
+
+
+def test_track3d_index_face_blocks_end_at_next_label():
+    text = """// Outputing section from dlong = 0 to dlong = 50
+sec1_s0_HI: FACE
+  ObjectList_L1_0 xObjectList_L9_9
+  MIP = "grass.mip"
+sec1_s1_HI: FACE
+  TOPO_sec1_s1_R_LO
+done: LIST { sec1_s0_HI,
+  sec1_s1_HI };
+"""
+    index = Track3DIndex(text)
+
+    assert index.next_label_line(1) == 4
+    assert index.next_label_line(6) == len(index.lines)
+    assert index.statement(6) == ("done: LIST { sec1_s0_HI,\n  sec1_s1_HI };", 6, 7)
+    first, second = index.faces
+    assert first.object_lists == ["ObjectList_L1_0"]
+    assert first.materials == ["grass.mip"]
+    assert (first.dlong_start, first.dlong_end) == (0, 50)
+    assert second.topo_lists == ["TOPO_sec1_s1_R_LO"]
+    assert second.span.end_line == 6
+
+
+def test_parse_track3d_catalog_text_matches_file(tmp_path: Path):
+    text = """__TSO1: DYNAMIC 1, 2, 3, 4, EXTERN "tree";
+ObjectList_R3_1: LIST { __TSO1 };
+sec3_l0: LIST { DATA { 10, 20 } };
+"""
+    path = tmp_path / "track.3d"
+    path.write_bytes(text.encode("utf-8"))
+
+    assert asdict(parse_track3d_catalog_text(text, source="track.3d")) == asdict(
+        parse_track3d_catalog(path)
+    )
+
+
+def test_track3d_index_finds_labels_after_any_line_break():
+    lines = [
+        "sec1_s0_HI: FACE",
+        "  ObjectList_L1_0",
+        "// Outputing section from dlong = 0 to dlong = 50",
+        "sec1_s1_HI: FACE",
+        "  MIP = \"grass.mip\"",
+        "done: LIST { sec1_s0_HI };",
+    ]
+    expected = Track3DIndex("\n".join(lines))
+
+    for separator in ("\r\n", "\r", "\x0c"):
+        index = Track3DIndex(separator.join(lines) + separator)
+        assert index.labels == expected.labels
+        assert [face.dlong_start for face in index.faces] == [None, 0]
+        assert index.faces[1].span.start_offset == len(separator.join(lines[:3]) + separator)
@@ -0,0 +1,71 @@
+import csv
+from pathlib import Path
+
+from icr2_core.parallel import PARALLEL_THRESHOLDS
+from icr2_core.three_d.track3d_scan import (
+    scan_track3d,
+    scan_tracks_library,
+    write_inventory_csv,
+)
+
+SAMPLE = """3D VERSION 3.0;
+% comment: NOT A LABEL
+__TSO1: DYNAMIC 1, 2, 3, 4, EXTERN "tree";
+a: [<-10, 25, 0>];
+b: [<40.5, -5, 10>];
+sec1_s0_HI: FACE
+  MIP = "road.mip"
+  [< 15, 35, -2 >],
+  [<1, 2, 3>];
+poly: POLY <1> {a, b};
+wall: POLY <2> {b, a};
+sec1_s1_HI: FACE
+  MIP = "wall.mip"
+  MIP = "road.mip";
+root: BSPF (a, b, a), nil, poly, nil;
+"""
+
+
+def test_scan_track3d_collects_counts_and_extents(tmp_path: Path) -> None:
+    path = tmp_path / "track.3d"
+    path.write_text(SAMPLE, encoding="utf-8")
+
+    stats = scan_track3d(path)
+
+    assert stats.size == len(SAMPLE)
+    assert stats.vertices == 4
+    assert (stats.min_x, stats.max_x) == (-10, 40.5)
+    assert (stats.min_y, stats.max_y) == (-5, 35)
+    assert (stats.min_z, stats.max_z) == (-2, 10)
+    assert stats.mips == ("road.mip", "wall.mip")
+    assert stats.label_types == {"BSPF": 1, "DYNAMIC": 1, "FACE": 2, "POLY": 2}
+    assert (stats.polygons, stats.objects, stats.labels) == (4, 1, 6)
+
+
+def test_scan_track3d_results_do_not_depend_on_chunk_size(tmp_path: Path) -> None:
+    path = tmp_path / "track.3d"
+    path.write_text(SAMPLE * 50, encoding="utf-8")
+
+    assert scan_track3d(path, chunk_size=16) == scan_track3d(path)
+
+
+def test_scan_tracks_library_writes_inventory(tmp_path: Path, monkeypatch) -> None:
+    for folder in ("indy", "mich"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / f"{folder}.3D").write_text(SAMPLE, encoding="utf-8")
+    (tmp_path / "mich" / "empty.3d").write_bytes(b"")
+    (tmp_path / "mich" / "notes.txt").write_text("a: [<1, 2, 3>];", encoding="utf-8")
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "track3d_bytes", 0)
+
+    stats = scan_tracks_library(tmp_path, max_workers=2)
+    output = tmp_path / "inventory.csv"
+    write_inventory_csv(stats, output)
+
+    with open(output, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [Path(row["path"]).name for row in rows] == ["indy.3D", "empty.3d", "mich.3D"]
+    assert rows[0]["vertices"] == "4"
+    assert rows[0]["polygons"] == "4"
+    assert rows[0]["mips"] == "road.mip;wall.mip"
+    assert rows[1]["vertices"] == "0"
+    assert rows[1]["min_x"] == ""
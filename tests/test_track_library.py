@@ -0,0 +1,103 @@
+import os
+
+from icr2_core.track_library import INDEX_FILE_NAME, TrackLibrary, track_library
+
+
+def _make_track(root, folder: str, tname: str | None, *, trk: bool = True) -> None:
+    path = root / folder
+    path.mkdir()
+    if tname is not None:
+        (path / f"{folder}.TXT").write_text(f"TNAME {tname}\nSNAME x\n")
+    (path / f"{folder}.DAT").write_bytes(b"dat")
+    if trk:
+        (path / f"{folder}.TRK").write_bytes(b"trk")
+
+
+def _bump_mtime(path, seconds: float = 10) -> None:
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + seconds))
+
+
+def test_library_lists_folders_and_orders_by_tname(tmp_path) -> None:
+    _make_track(tmp_path, "mich", "Michigan")
+    _make_track(tmp_path, "Cleveland", "Burke Lakefront", trk=False)
+    _make_track(tmp_path, "empty", None)
+
+    library = TrackLibrary(tmp_path)
+
+    assert library.folders == ["Cleveland", "empty", "mich"]
+    assert "MICH" in library
+    assert library.tname_ordered_folders() == ["Cleveland", "mich"]
+    assert library.folder_at_tname_index(1) == "mich"
+    assert library.folder_at_tname_index(2) is None
+    assert library.folder_for_tname("michigan") == "mich"
+    metadata = library.metadata("Cleveland")
+    assert metadata.has_dat and not metadata.has_trk
+
+
+def test_metadata_is_read_lazily_and_persisted(tmp_path, monkeypatch) -> None:
+    _make_track(tmp_path, "mich", "Michigan")
+    library = TrackLibrary(tmp_path)
+    assert library._entries["mich"].metadata is None
+
+    assert library.tname("mich") == "Michigan"
+    library.save()
+    assert (tmp_path / INDEX_FILE_NAME).exists()
+
+    monkeypatch.setattr(
+        "icr2_core.track_library.read_tname",
+        lambda _path: (_ for _ in ()).throw(AssertionError("index should be used")),
+    )
+    reloaded = TrackLibrary(tmp_path)
+    assert reloaded.tname("mich") == "Michigan"
+
+
+def test_refresh_picks_up_added_removed_and_edited_tracks(tmp_path) -> None:
+    _make_track(tmp_path, "mich", "Michigan")
+    _make_track(tmp_path, "nazareth", "Nazareth")
+    library = TrackLibrary(tmp_path)
+    assert library.tname("mich") == "Michigan"
+
+    assert library.refresh() is False
+
+    _make_track(tmp_path, "laguna", "Laguna Seca")
+    (tmp_path / "nazareth" / "nazareth.TXT").unlink()
+    (tmp_path / "nazareth" / "nazareth.DAT").unlink()
+    (tmp_path / "nazareth" / "nazareth.TRK").unlink()
+    (tmp_path / "nazareth").rmdir()
+    txt = tmp_path / "mich" / "mich.TXT"
+    txt.write_text("TNAME Michigan International\n")
+    _bump_mtime(txt)
+
+    assert library.refresh() is True
+    assert library.folders == ["laguna", "mich"]
+    assert library.tname("mich") == "Michigan International"
+
+
+def test_refresh_picks_up_edited_dat_and_trk_files(tmp_path) -> None:
+    _make_track(tmp_path, "mich", "Michigan")
+    library = TrackLibrary(tmp_path)
+    assert [info.size for info in library.metadata("mich").dat_files] == [3]
+
+    dat = tmp_path / "mich" / "mich.DAT"
+    dat.write_bytes(b"bigger dat")
+    _bump_mtime(dat)
+
+    assert library.refresh() is True
+    assert [info.size for info in library.metadata("mich").dat_files] == [10]
+
+    trk = tmp_path / "mich" / "mich.TRK"
+    _bump_mtime(trk)
+    assert library.refresh() is True
+    assert library.refresh() is False
+
+
+def test_track_library_shares_one_instance_per_root(tmp_path) -> None:
+    _make_track(tmp_path, "mich", "Michigan")
+
+    first = track_library(tmp_path)
+    _make_track(tmp_path, "laguna", "Laguna Seca")
+    second = track_library(tmp_path)
+
+    assert first is second
+    assert second.folders == ["laguna", "mich"]
@@ -0,0 +1,128 @@
+import math
+import os
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icr2_core.trk import trk_builder
+from icr2_core.trk.sg_classes import SGFile
+from icr2_core.trk.trk_builder import build_trk_array, convert_sg_to_trk, watch_sg
+from icr2_core.trk.trk_classes import TRKFile
+from icr2_core.trk.trk_exporter import write_trk
+
+DLATS = (-1800, -600, -100, 300, 1500)
+
+
+def _sg_words(num_sects: int, dlats=DLATS, seed: int = 0) -> np.ndarray:
+    """Random (not necessarily closed) SG layout with walls and ground fsects."""
+    rng = random.Random(seed)
+    words = [0, 0, 0, 0, num_sects, len(dlats), *dlats]
+    x = y = heading = 0.0
+    for index in range(num_sects):
+        sect_type = rng.choice((1, 1, 2))
+        length = rng.randint(5000, 300000)
+        start_x, start_y = round(x), round(y)
+        center_x = center_y = radius = 0
+        if sect_type == 1:
+            x += length * math.cos(heading)
+            y += length * math.sin(heading)
+        else:
+            radius = rng.choice((-1, 1)) * rng.randint(200000, 2000000)
+            center_x = round(x - math.sin(heading) * radius)
+            center_y = round(y + math.cos(heading) * radius)
+            angle = math.atan2(y - center_y, x - center_x) + length / radius
+            x = center_x + abs(radius) * math.cos(angle)
+            y = center_y + abs(radius) * math.sin(angle)
+            heading += length / radius
+        sang = (round(32768 * math.cos(heading)), round(32768 * math.sin(heading)))
+        words += [
+            sect_type, (index + 1) % num_sects, (index - 1) % num_sects,
+            start_x, start_y, round(x), round(y), 0, length,
+            center_x, center_y, *sang, *sang, radius, 0,
+        ]
+        for _ in dlats:
+            words += [rng.randint(-20000, 20000), rng.randint(-800, 800)]
+        fsects = []
+        for _ in range(rng.randint(0, 10)):
+            fsects += [
+                rng.randint(0, 8),
+                rng.choice((0, 2, 4, 6, 8)),
+                rng.randint(-300000, 300000),
+                rng.randint(-300000, 300000),
+            ]
+        words += [len(fsects) // 4, *fsects, *[0] * (40 - len(fsects))]
+    return np.array(words, dtype=np.int32)
+
+
+def _reference_trk(sg_path: Path, tmp_path: Path) -> bytes:
+    reference = tmp_path / "reference.trk"
+    write_trk(TRKFile.from_sg(str(sg_path)), str(reference))
+    return reference.read_bytes()
+
+
+@pytest.mark.parametrize(
+    ("num_sects", "dlats", "seed"),
+    [
+        (1, DLATS, 0),
+        (2, (-500, 0), 1),
+        (9, DLATS, 2),
+        (120, (-900, -10, 10, 900, 1000, 1100, 1200, 1300, 1400, 1500), 3),
+        (120, DLATS, 4),
+    ],
+)
+def test_build_trk_array_matches_existing_exporter(tmp_path, num_sects, dlats, seed):
+    sg_path = tmp_path / "track.sg"
+    _sg_words(num_sects, dlats, seed).tofile(sg_path)
+    trk_path = tmp_path / "track.trk"
+
+    convert_sg_to_trk(sg_path, trk_path)
+
+    assert trk_path.read_bytes() == _reference_trk(sg_path, tmp_path)
+    assert TRKFile.from_trk(str(trk_path)).num_sects == num_sects
+
+
+def test_rebuild_after_edit_matches_exporter_with_cached_lengths(tmp_path):
+    sg_path = tmp_path / "track.sg"
+    words = _sg_words(60, seed=7)
+    words.tofile(sg_path)
+    convert_sg_to_trk(sg_path, tmp_path / "first.trk")
+
+    sgfile = SGFile.from_sg(str(sg_path))
+    sgfile.sects[10].alt[2] += 2500
+    sgfile.output_sg(str(sg_path))
+    trk_path = tmp_path / "second.trk"
+    convert_sg_to_trk(sg_path, trk_path)
+
+    assert trk_path.read_bytes() == _reference_trk(sg_path, tmp_path)
+    assert trk_path.read_bytes() != (tmp_path / "first.trk").read_bytes()
+
+
+def test_build_trk_array_requires_centreline_xsects(tmp_path):
+    sg_path = tmp_path / "track.sg"
+    _sg_words(3, dlats=(100, 200), seed=1).tofile(sg_path)
+
+    with pytest.raises(ValueError, match="centreline"):
+        build_trk_array(SGFile.from_sg(str(sg_path)))
+
+
+def test_watch_sg_reexports_when_sg_changes(tmp_path, monkeypatch):
+    sg_path = tmp_path / "track.sg"
+    trk_path = tmp_path / "track.trk"
+    _sg_words(5, seed=1).tofile(sg_path)
+
+    def save_edit():
+        _sg_words(5, seed=2).tofile(sg_path)
+        # Make the save visible even on file systems with coarse mtimes.
+        mtime = sg_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(sg_path, ns=(mtime, mtime))
+
+    between_polls = iter([lambda: None, save_edit, lambda: None])
+    monkeypatch.setattr(trk_builder.time, "sleep", lambda _seconds: next(between_polls)())
+    exports = []
+
+    watch_sg(sg_path, trk_path, max_polls=4, on_export=lambda path, _ms: exports.append(path.read_bytes()))
+
+    assert len(exports) == 2
+    assert exports[-1] == _reference_trk(sg_path, tmp_path)
@@ -1,8 +1,11 @@
 from sg_viewer.services.tsd_io import (
+    TrackSurfaceDetailColumns,
     TrackSurfaceDetailFile,
     TrackSurfaceDetailLine,
     parse_tsd,
+    parse_tsd_columns,
     serialize_tsd,
+    serialize_tsd_columns,
 )
 
 
@@ -50,3 +53,53 @@ def test_parse_tsd_rejects_invalid_line() -> None:
         assert "Detail" in str(exc)
     else:
         raise AssertionError("Expected ValueError")
+
+
+def test_tsd_columns_round_trip_matches_line_serialization() -> None:
+    text = (
+        "% header\n"
+        "Detail: 36 4000 0 -126000 919091 -126000\n"
+        "Detail_Tex: 1 2 3 4 5 6\n"
+        "  detail_dash:  7 12 -5 +6 7 8  \n"
+    )
+
+    columns = parse_tsd_columns(text)
+
+    assert columns.to_lines() == parse_tsd(text).lines
+    assert columns.command.tolist() == [0, 1]
+    assert columns.start_dlat.tolist() == [-126000, 6]
+    assert serialize_tsd_columns(columns) == serialize_tsd(parse_tsd(text))
+    assert TrackSurfaceDetailColumns.from_lines(columns.to_lines()).to_lines() == columns.to_lines()
+
+
+def test_parse_tsd_columns_reports_bad_line_numbers() -> None:
+    text = "Detail: 1 2 3 4 5 6\nDetail: 1 2 3 4 5 x\n"
+
+    try:
+        parse_tsd_columns(text)
+    except ValueError as exc:
+        assert str(exc).startswith("Line 2:")
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+def test_parse_tsd_columns_empty_text() -> None:
+    columns = parse_tsd_columns("% nothing here\n")
+
+    assert len(columns) == 0
+    assert serialize_tsd_columns(columns) == ""
+
+
+def test_parse_tsd_columns_rejects_values_beyond_int64() -> None:
+    limit = 9223372036854775807
+    edge = f"Detail: 1 2 {limit} {-limit - 1} 5 6\n"
+
+    assert parse_tsd_columns(edge).start_dlong.tolist() == [limit]
+    for value in (limit + 1, -limit - 2):
+        text = f"Detail: 1 2 3 4 5 6\nDetail: 1 2 {value} 4 5 6\n"
+        try:
+            parse_tsd_columns(text)
+        except ValueError as exc:
+            assert str(exc).startswith("Line 2:")
+        else:
+            raise AssertionError("Expected ValueError")
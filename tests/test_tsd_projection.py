@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+import pytest
+
+from sg_viewer.geometry.sg_geometry import update_section_geometry
+from sg_viewer.model.sg_model import SectionPreview
+from sg_viewer.services.preview_painter import _point_on_track_at_dlong
+from sg_viewer.services.tsd_io import TrackSurfaceDetailColumns
+from sg_viewer.services.tsd_projection import (
+    MIN_TSD_SAMPLE_STEP,
+    TrackProjector,
+    project_tsd_columns,
+)
+
+STRAIGHT = 400_000.0
+RADIUS = 150_000.0
+
+
+def _oval() -> list[SectionPreview]:
+    layout = [
+        ((0.0, 0.0), (STRAIGHT, 0.0), None),
+        ((STRAIGHT, 0.0), (STRAIGHT, 2 * RADIUS), (STRAIGHT, RADIUS)),
+        ((STRAIGHT, 2 * RADIUS), (0.0, 2 * RADIUS), None),
+        ((0.0, 2 * RADIUS), (0.0, 0.0), (0.0, RADIUS)),
+    ]
+    sections = []
+    dlong = 0.0
+    for index, (start, end, center) in enumerate(layout):
+        length = STRAIGHT if center is None else math.pi * RADIUS
+        sections.append(
+            update_section_geometry(
+                SectionPreview(
+                    section_id=index,
+                    source_section_id=index,
+                    type_name="straight" if center is None else "curve",
+                    previous_id=(index - 1) % 4,
+                    next_id=(index + 1) % 4,
+                    start=start,
+                    end=end,
+                    start_dlong=dlong,
+                    length=length,
+                    center=center,
+                    sang1=None,
+                    sang2=None,
+                    eang1=None,
+                    eang2=None,
+                    radius=None if center is None else RADIUS,
+                    start_heading=(1.0, 0.0) if index == 0 else None,
+                    end_heading=None,
+                    polyline=[],
+                )
+            )
+        )
+        dlong += length
+    return sections
+
+
+def test_project_matches_scalar_point_lookup() -> None:
+    sections = _oval()
+    track_length = 2 * STRAIGHT + 2 * math.pi * RADIUS
+    projector = TrackProjector(sections, track_length)
+    rng = np.random.default_rng(3)
+    dlongs = np.concatenate(
+        ([0.0, STRAIGHT, track_length, track_length + 10.0, -5.0], rng.uniform(0, track_length, 500))
+    )
+    dlats = rng.uniform(-30_000, 30_000, len(dlongs))
+
+    points = projector.project(dlongs, dlats)
+
+    for (x, y), dlong, dlat in zip(points.tolist(), dlongs, dlats):
+        expected = _point_on_track_at_dlong(sections, float(dlong), float(dlat), track_length)
+        assert expected is not None
+        assert (x, y) == pytest.approx(expected, abs=1e-6)
+
+
+def test_sample_segments_wraps_and_ends_on_the_end_point() -> None:
+    sections = _oval()
+    track_length = 2 * STRAIGHT + 2 * math.pi * RADIUS
+    projector = TrackProjector(sections, track_length)
+
+    wrapped, empty = projector.sample_segments(
+        np.array([track_length - 1000.0, 5000.0]),
+        np.array([100.0, 0.0]),
+        np.array([2000.0, 5000.0]),
+        np.array([-100.0, 0.0]),
+        pixels_per_world_unit=1.0,
+    )
+
+    assert len(empty) == 0
+    assert len(wrapped) == math.ceil(3000.0 / MIN_TSD_SAMPLE_STEP) + 1
+    start = _point_on_track_at_dlong(sections, track_length - 1000.0, 100.0, track_length)
+    end = _point_on_track_at_dlong(sections, 2000.0, -100.0, track_length)
+    assert tuple(wrapped[0]) == pytest.approx(start)
+    assert tuple(wrapped[-1]) == pytest.approx(end)
+
+
+def test_project_tsd_columns_returns_one_polyline_per_line() -> None:
+    sections = _oval()
+    columns = TrackSurfaceDetailColumns.from_values(
+        np.zeros(3, dtype=np.uint8),
+        np.array(
+            [
+                [36, 4000, 0, -1000, 90_000, -1000],
+                [36, 4000, 100_000, 0, 100_000, 0],
+                [36, 4000, STRAIGHT, 5000, STRAIGHT + 50_000, 5000],
+            ],
+            dtype=np.int64,
+        ),
+    )
+
+    polylines = project_tsd_columns(columns, sections, pixels_per_world_unit=0.01)
+
+    assert [len(points) > 1 for points in polylines] == [True, False, True]
+    assert len(set(polylines[0][:, 1].tolist())) == 1
+    # The third line runs into the first turn and ends on the arc.
+    track_length = 2 * STRAIGHT + 2 * math.pi * RADIUS
+    expected_end = _point_on_track_at_dlong(sections, STRAIGHT + 50_000, 5000.0, track_length)
+    assert tuple(polylines[2][-1]) == pytest.approx(expected_end)
+
+
+def test_projector_without_sections_is_empty() -> None:
+    projector = TrackProjector([], 0.0)
+
+    assert projector.project(np.array([1.0, 2.0]), 0.0).shape == (0, 2)
+    assert [len(points) for points in projector.sample_segments([0.0], [0.0], [10.0], [0.0], 1.0)] == [0]
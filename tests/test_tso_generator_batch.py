@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icr2_core.parallel import PARALLEL_THRESHOLDS
+from tso_generator.batch import Mesh, expand_sweep, generate_batch, load_parameter_table, main
+from tso_generator.tso_generator import generate_building, write_3d
+
+# collect_current_values() of a freshly opened generator window.
+WINDOW_VALUES = {
+    "building_shape": "rectangular",
+    "width": 320,
+    "depth": 1042,
+    "rect_center_origin": False,
+    "diameter": 320,
+    "num_sides": 16,
+    "height": 100,
+    "bridge_length": 320,
+    "bridge_width": 80,
+    "bridge_clearance": 100,
+    "bridge_height": 20,
+    "bridge_half": False,
+    "grandstand_length": 320,
+    "grandstand_width": 120,
+    "grandstand_height": 100,
+    "grandstand_angle": 39.8,
+    "grandstand_front_height": 0,
+    "tree_trunk_width": 30,
+    "tree_leaf_base_height": 100,
+    "tree_num_sides": 12,
+    "tree_profile": "pointy",
+    "roof_type": "flat",
+    "parapet_inset": 30,
+    "parapet_height": 15,
+    "gable_rise": 50,
+    "pyramid_rise": 50,
+    "dome_layers": 4,
+    "dome_roundness": 100,
+    "sunny_pcx": "",
+    "roof_color_bright": 0,
+    "roof_color_dark": 0,
+    "side_color_bright": 0,
+    "side_color_dark": 0,
+    "tree_trunk_color_bright": 0,
+    "tree_trunk_color_dark": 0,
+    "tree_leaves_color_bright": 0,
+    "tree_leaves_color_dark": 0,
+}
+
+# Table row, the window values that describe the same object.
+CASES = [
+    (
+        {"name": "flat", "roof_type": "flat", "side_color_bright": "12"},
+        {"side_color_bright": 12, "side_color_dark": 12},
+    ),
+    (
+        {"name": "parapet", "roof_type": "parapet", "rect_center_origin": "yes", "parapet_inset": 20},
+        {"roof_type": "parapet", "rect_center_origin": True, "parapet_inset": 20},
+    ),
+    (
+        {"name": "gable", "roof_type": "gable", "gable_rise": 80, "width": 200, "roof_color_bright": 7},
+        {"roof_type": "gable", "gable_rise": 80, "width": 200, "roof_color_bright": 7, "roof_color_dark": 7},
+    ),
+    (
+        {"name": "pyramid", "roof_type": "pyramid", "pyramid_rise": 0, "roof_color_dark": 3},
+        {"roof_type": "pyramid", "pyramid_rise": 0, "roof_color_dark": 3},
+    ),
+    (
+        {"name": "silo", "building_shape": "circular", "roof_type": "dome", "num_sides": 9, "dome_roundness": 60},
+        {"building_shape": "circular", "roof_type": "dome", "num_sides": 9, "dome_roundness": 60},
+    ),
+    (
+        {"name": "tank", "building_shape": "circular", "roof_type": "flat", "diameter": 150},
+        {"building_shape": "circular", "diameter": 150},
+    ),
+    (
+        {"name": "pine", "building_shape": "tree", "roof_type": "none", "tree_num_sides": 7},
+        {"building_shape": "tree", "roof_type": "none", "tree_num_sides": 7},
+    ),
+    (
+        {"name": "oak", "building_shape": "tree", "roof_type": "none", "tree_profile": "round", "tree_trunk_color": 5},
+        {
+            "building_shape": "tree",
+            "roof_type": "none",
+            "tree_profile": "round",
+            "tree_trunk_color_bright": 5,
+            "tree_trunk_color_dark": 5,
+        },
+    ),
+    (
+        {
+            "name": "palm",
+            "building_shape": "tree",
+            "roof_type": "none",
+            "tree_profile": "palm",
+            "tree_leaves_color": 9,
+            "tree_leaves_color_dark": 4,
+        },
+        {
+            "building_shape": "tree",
+            "roof_type": "none",
+            "tree_profile": "palm",
+            "tree_leaves_color_bright": 9,
+            "tree_leaves_color_dark": 4,
+        },
+    ),
+    (
+        {"name": "bridge", "building_shape": "bridge", "roof_type": "none", "bridge_half": True},
+        {"building_shape": "bridge", "roof_type": "none", "bridge_half": True},
+    ),
+    (
+        {"name": "stand", "building_shape": "grandstand", "roof_type": "none", "grandstand_front_height": 25},
+        {"building_shape": "grandstand", "roof_type": "none", "grandstand_front_height": 25},
+    ),
+]
+
+
+def _single_object(tmp_path: Path, name: str, changes: dict) -> str:
+    # What the generator window writes for one object.
+    values = {**WINDOW_VALUES, **changes}
+    verts, faces = generate_building(
+        values["width"],
+        values["depth"],
+        values["height"],
+        values["roof_type"],
+        values["parapet_inset"],
+        values["parapet_height"],
+        values["gable_rise"],
+        values["pyramid_rise"],
+        values["building_shape"],
+        values["diameter"],
+        values["num_sides"],
+        values["dome_layers"],
+        values["dome_roundness"],
+        values["rect_center_origin"],
+        values["tree_trunk_width"],
+        values["tree_leaf_base_height"],
+        values["tree_num_sides"],
+        values["tree_profile"],
+        values["bridge_length"],
+        values["bridge_width"],
+        values["bridge_clearance"],
+        values["bridge_height"],
+        values["bridge_half"],
+        values["grandstand_length"],
+        values["grandstand_width"],
+        values["grandstand_height"],
+        values["grandstand_front_height"],
+    )
+    out = tmp_path / f"single_{name}.3D"
+    write_3d(out, verts, faces, values)
+    return out.read_text(encoding="utf-8")
+
+
+def test_batch_output_matches_single_object_writer(tmp_path: Path) -> None:
+    result = generate_batch([row for row, _changes in CASES])
+    written = result.write(tmp_path / "out")
+
+    assert [path.name for path in written] == [f"{row['name']}.3D" for row, _changes in CASES]
+    for (row, changes), path in zip(CASES, written):
+        assert path.read_text(encoding="utf-8") == _single_object(tmp_path, row["name"], changes), row["name"]
+
+    texts = result.texts
+    assert "roofR: POLY <7>" in texts["gable"] and "roofL: POLY <7>" in texts["gable"]
+    assert "pyrR: POLY <3>" in texts["pyramid"] and "pyrL: POLY <0>" in texts["pyramid"]
+    assert "trunkB0: POLY <5>" in texts["oak"]
+    assert "% tree_leaves_color_bright: 9" in texts["palm"] and "% tree_leaves_color_dark: 4" in texts["palm"]
+
+
+def test_identical_geometry_is_generated_once_and_meshes_are_shared() -> None:
+    rows = [
+        {"name": "a", "building_shape": "tree", "depth": 100, "tree_leaves_color_bright": 1},
+        {"name": "b", "building_shape": "tree", "depth": 900, "tree_leaves_color_bright": 2},
+        {"name": "c", "roof_type": "flat", "gable_rise": 10},
+        {"name": "d", "roof_type": "flat", "gable_rise": 99},
+        {"name": "e", "roof_type": "gable"},
+    ]
+
+    result = generate_batch(rows)
+
+    assert result.generated == 3 and len(result.meshes) == 3
+    assert result.object_meshes["a"] == result.object_meshes["b"]
+    assert result.object_meshes["c"] == result.object_meshes["d"] != result.object_meshes["e"]
+    assert "<1>" in result.texts["a"] and "<2>" in result.texts["b"]
+
+    verts, faces = generate_building(320, 1042, 100, "gable", 30, 15, 50, 50)
+    mesh = Mesh.from_geometry(verts, faces)
+    assert mesh.digest == result.object_meshes["e"]
+    assert mesh.to_geometry() == (verts, faces)
+
+
+def test_merge_vertices_collapses_degenerate_parapet() -> None:
+    row = {"name": "flat_top", "roof_type": "parapet", "parapet_inset": 0, "parapet_height": 0}
+
+    plain = generate_batch([row])
+    merged = generate_batch([row], merge_vertices=True)
+
+    before = next(iter(plain.meshes.values()))
+    after = next(iter(merged.meshes.values()))
+    assert len(after.vertices) < len(before.vertices)
+    assert len(np.unique(after.vertices, axis=0)) == len(after.vertices)
+    offsets = after.face_offsets.tolist()
+    for start, end in zip(offsets, offsets[1:]):
+        corners = after.face_indices[start:end]
+        assert len(corners) >= 3 and np.all(corners != np.roll(corners, 1))
+    assert len(merged.texts["flat_top"]) < len(plain.texts["flat_top"])
+
+
+def test_table_sweep_runs_in_parallel(tmp_path: Path, monkeypatch) -> None:
+    table = tmp_path / "objects.csv"
+    table.write_text(
+        "name,building_shape,roof_type,height,tree_profile\n"
+        "shed,rectangular,gable,,\n"
+        "tree,tree,none,250,round\n",
+        encoding="utf-8",
+    )
+    rows = expand_sweep(load_parameter_table(table), {"width": [100, 200, 300], "side_color_dark": [4, 5]})
+
+    serial = generate_batch(rows, max_workers=1)
+    monkeypatch.setitem(PARALLEL_THRESHOLDS, "tso_objects", 0)
+    parallel = generate_batch(rows, max_workers=2)
+
+    assert len(rows) == 12 and rows[0]["name"] == "shed_0" and rows[-1]["name"] == "tree_5"
+    assert parallel.texts == serial.texts
+    assert serial.generated == 6 and len(serial.meshes) == 6
+    assert "% height: 100" in serial.texts["shed_0"] and "% height: 250" in serial.texts["tree_0"]
+
+
+def test_json_table_defaults_and_bad_rows(tmp_path: Path) -> None:
+    table = tmp_path / "objects.json"
+    table.write_text(
+        '{"defaults": {"building_shape": "bridge", "bridge_length": 640},'
+        ' "objects": [{"name": "long"}, {"name": "short", "bridge_length": 160}]}',
+        encoding="utf-8",
+    )
+
+    rows = load_parameter_table(table)
+
+    assert [row["bridge_length"] for row in rows] == [640, 160]
+    with pytest.raises(ValueError, match="Unknown TSO parameter: widht"):
+        generate_batch([{"widht": 10}])
+    with pytest.raises(ValueError, match="Duplicate object name"):
+        generate_batch([{"name": "x"}, {"name": "x"}])
+    with pytest.raises(ValueError, match="Invalid object name"):
+        generate_batch([{"name": "../x"}])
+    with pytest.raises(ValueError, match=r"Row 2 \(b\): width must be an integer, got 'abc'"):
+        generate_batch([{"name": "a"}, {"name": "b", "width": "abc"}])
+    with pytest.raises(ValueError, match="Row 1 .*roof_type must be one of"):
+        generate_batch([{"roof_type": "gabel"}])
+    with pytest.raises(ValueError, match="building_shape must be one of"):
+        generate_batch([{"building_shape": "cube"}])
+
+
+def test_generator_failures_are_reported_per_object(tmp_path: Path, capsys) -> None:
+    table = tmp_path / "objects.csv"
+    table.write_text(
+        "name,building_shape,num_sides\n"
+        "ok,circular,8\n"
+        "broken,circular,0\n",
+        encoding="utf-8",
+    )
+
+    assert main([str(table), str(tmp_path / "out")]) == 1
+
+    assert [path.name for path in (tmp_path / "out").iterdir()] == ["ok.3D"]
+    assert "broken: IndexError" in capsys.readouterr().err
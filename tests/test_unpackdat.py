@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from icr2_core.dat.packdat import packdat
+from icr2_core.dat.unpackdat import extract_file_bytes, iter_dat_entries
+
+
+def test_iter_dat_entries_reads_contents_in_order(tmp_path: Path) -> None:
+    files = {"WALL.MIP": b"mip bytes", "SKY.STP": b"stp", "TRACK.TRK": b"\x00\x01\x02"}
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    (tmp_path / "packlist.txt").write_text("\n".join(files) + "\n")
+    dat_path = tmp_path / "track.dat"
+    packdat(str(tmp_path / "packlist.txt"), str(dat_path), backup=False)
+
+    assert list(iter_dat_entries(str(dat_path))) == list(files.items())
+    assert list(iter_dat_entries(str(dat_path), ".mip")) == [("WALL.MIP", b"mip bytes")]
+    assert extract_file_bytes(str(dat_path), "sky.stp") == b"stp"
@@ -0,0 +1,453 @@
+"""Headless folder conversion for the texture tools.
+
+:class:`TextureBatchConverter` turns every matching file in a source folder
+into the chosen output format, spreading the work over worker processes
+when the batch is large enough to pay for them. A manifest in the target
+folder remembers the source hash, size and mtime plus the conversion
+settings of each output, so re-running a batch only converts what changed.
+
+Usage:
+    python -m texture_tools.batch_convert png-to-mip textures/ out/ --palette SUNNY.PCX
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from icr2_core.parallel import total_file_size, worker_count
+
+MANIFEST_NAME = ".texture_tools_manifest.json"
+MANIFEST_VERSION = 1
+
+# kind -> (input suffixes, output suffix, palette required)
+CONVERSION_KINDS: dict[str, tuple[tuple[str, ...], str, bool]] = {
+    "png-to-mip": ((".png", ".bmp"), ".mip", True),
+    "mip-to-png": ((".mip",), ".png", True),
+    "png-to-pmp": ((".png",), ".pmp", False),
+    "pmp-to-png": ((".pmp",), ".png", True),
+    "stp-to-png": ((".stp",), ".png", True),
+}
+
+STATUS_CONVERTED = "converted"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+def collect_folder_image_inputs(source_dir: Path) -> list[Path]:
+    """PNG and BMP files in ``source_dir``, preferring the PNG when a stem has both."""
+    preferred: dict[str, Path] = {}
+    for path in sorted(source_dir.iterdir(), key=lambda p: p.name.lower()):
+        if not path.is_file():
+            continue
+        suffix = path.suffix.lower()
+        if suffix not in {".png", ".bmp"}:
+            continue
+        stem_key = path.stem.lower()
+        if suffix == ".png":
+            preferred[stem_key] = path
+        elif stem_key not in preferred:
+            preferred[stem_key] = path
+    return list(preferred.values())
+
+
+def prepare_image_for_mip(image: Image.Image) -> Image.Image:
+    """Prepare image for MIP conversion without introducing implicit dithering."""
+    return image.convert("RGB")
+
+
+@dataclass(frozen=True)
+class ConversionJob:
+    kind: str
+    source: Path
+    target: Path
+    options: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    job: ConversionJob
+    status: str
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != STATUS_FAILED
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_state(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _convert_png_to_mip(job: ConversionJob) -> None:
+    from icr2_core.mip.mips import img_to_mip
+
+    options = job.options
+    with Image.open(job.source) as image:
+        prepared = prepare_image_for_mip(image)
+    img_to_mip(
+        prepared,
+        str(job.target),
+        options["palette_path"],
+        options["mode"],
+        dither=options["dither"],
+    )
+
+
+def _convert_mip_to_png(job: ConversionJob) -> None:
+    from icr2_core.mip.mips import load_palette, mip_to_img
+
+    palette = load_palette(job.options["palette_path"])
+    mip_to_img(str(job.source), palette)[0].save(job.target)
+
+
+def _convert_png_to_pmp(job: ConversionJob) -> None:
+    from texture_tools.pmp import png_to_pmp
+
+    options = job.options
+    png_to_pmp(
+        job.source,
+        job.target,
+        size_field=options["size_field"],
+        palette_path=options["palette_path"],
+        alpha_transparent_threshold=options["alpha_threshold"],
+        dither=options["dither"],
+    )
+
+
+def _convert_pmp_to_png(job: ConversionJob) -> None:
+    from texture_tools.pmp_to_png import convert_pmp_to_png
+
+    convert_pmp_to_png(
+        str(job.source),
+        str(job.target),
+        job.options["palette_path"],
+        crop=job.options["crop"],
+    )
+
+
+def _convert_stp_to_png(job: ConversionJob) -> None:
+    from icr2_core.stp.stp2png import (
+        STPDecodeError,
+        decode_stp_bytes,
+        read_pcx_256_palette,
+        stp_to_image,
+    )
+
+    palette = read_pcx_256_palette(Path(job.options["palette_path"]))
+    result = decode_stp_bytes(job.source.read_bytes(), logging.getLogger(__name__), job.source.name)
+    stp_to_image(result, palette).save(job.target)
+    if not result.complete:
+        raise STPDecodeError(
+            f"Decoding stopped at offset 0x{result.stop_offset:08X} ({result.error}); "
+            "partial PNG written"
+        )
+
+
+_CONVERTERS: dict[str, Callable[[ConversionJob], None]] = {
+    "png-to-mip": _convert_png_to_mip,
+    "mip-to-png": _convert_mip_to_png,
+    "png-to-pmp": _convert_png_to_pmp,
+    "pmp-to-png": _convert_pmp_to_png,
+    "stp-to-png": _convert_stp_to_png,
+}
+
+
+def _run_job(job: ConversionJob) -> ConversionResult:
+    try:
+        _CONVERTERS[job.kind](job)
+    except Exception as exc:
+        return ConversionResult(job, STATUS_FAILED, str(exc) or type(exc).__name__)
+    return ConversionResult(job, STATUS_CONVERTED)
+
+
+class ConversionManifest:
+    """Per-target-folder record of what each output was converted from."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+
+    @classmethod
+    def for_folder(cls, target_dir: Path) -> "ConversionManifest":
+        manifest = cls(Path(target_dir) / MANIFEST_NAME)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+            return
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            self.entries = {}
+            return
+        entries = data.get("outputs", {})
+        self.entries = entries if isinstance(entries, dict) else {}
+
+    def save(self) -> None:
+        payload = {"version": MANIFEST_VERSION, "outputs": self.entries}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+    def is_current(self, job: ConversionJob, settings_key: str) -> bool:
+        entry = self.entries.get(job.target.name)
+        if not entry or not job.target.exists():
+            return False
+        if entry.get("source") != job.source.name or entry.get("settings") != settings_key:
+            return False
+        state = _source_state(job.source)
+        if state["size"] != entry.get("size"):
+            return False
+        if state["mtime_ns"] == entry.get("mtime_ns"):
+            return True
+        # Touched but possibly unchanged (e.g. copied or checked out again).
+        if _file_sha1(job.source) != entry.get("sha1"):
+            return False
+        entry["mtime_ns"] = state["mtime_ns"]
+        return True
+
+    def record(self, job: ConversionJob, settings_key: str, state: dict) -> None:
+        self.entries[job.target.name] = {
+            "source": job.source.name,
+            "settings": settings_key,
+            **state,
+        }
+
+    def forget(self, job: ConversionJob) -> None:
+        self.entries.pop(job.target.name, None)
+
+
+class TextureBatchConverter:
+    """Convert a folder of textures with one of :data:`CONVERSION_KINDS`.
+
+    ``max_workers=1`` forces serial conversion; ``use_manifest=False``
+    converts every input regardless of earlier runs.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        palette_path: str | Path | None = None,
+        *,
+        mode: str = "track",
+        dither: bool = False,
+        size_field: int = 0,
+        alpha_threshold: int = 0,
+        crop: bool = False,
+        max_workers: int | None = None,
+        use_manifest: bool = True,
+    ) -> None:
+        if kind not in CONVERSION_KINDS:
+            raise ValueError(f"kind must be one of {sorted(CONVERSION_KINDS)}")
+        _suffixes, _output, needs_palette = CONVERSION_KINDS[kind]
+        if needs_palette and not palette_path:
+            raise ValueError(f"{kind} conversion requires a palette")
+        if kind == "png-to-mip" and mode not in {"track", "carset"}:
+            raise ValueError("mode must be 'track' or 'carset'")
+        if not 0 <= size_field <= 0xFFFF:
+            raise ValueError("Header size field must be in range 0000..FFFF")
+        self.kind = kind
+        self.palette_path = str(palette_path) if palette_path else None
+        self.options = {
+            "palette_path": self.palette_path,
+            "mode": mode,
+            "dither": dither,
+            "size_field": size_field,
+            "alpha_threshold": alpha_threshold,
+            "crop": crop,
+        }
+        self.max_workers = max_workers
+        self.use_manifest = use_manifest
+        self._settings_key: str | None = None
+
+    def collect_inputs(self, source_dir: Path) -> list[Path]:
+        source_dir = Path(source_dir)
+        if self.kind == "png-to-mip":
+            return collect_folder_image_inputs(source_dir)
+        suffixes = CONVERSION_KINDS[self.kind][0]
+        return sorted(
+            (p for p in source_dir.iterdir() if p.is_file() and p.suffix.lower() in suffixes),
+            key=lambda p: p.name.lower(),
+        )
+
+    def jobs_for_folder(self, source_dir: Path, target_dir: Path) -> list[ConversionJob]:
+        output_suffix = CONVERSION_KINDS[self.kind][1]
+        return [
+            ConversionJob(self.kind, path, Path(target_dir) / f"{path.stem}{output_suffix}", self.options)
+            for path in self.collect_inputs(source_dir)
+        ]
+
+    def settings_key(self) -> str:
+        """Digest of the kind, options and palette contents used for outputs."""
+        if self._settings_key is None:
+            palette_digest = None
+            if self.palette_path and Path(self.palette_path).is_file():
+                palette_digest = _file_sha1(Path(self.palette_path))
+            settings = {"kind": self.kind, "options": self.options, "palette": palette_digest}
+            encoded = json.dumps(settings, sort_keys=True).encode("utf-8")
+            self._settings_key = hashlib.sha1(encoded).hexdigest()
+        return self._settings_key
+
+    def stale_jobs(self, jobs: Sequence[ConversionJob]) -> list[ConversionJob]:
+        """Jobs whose output is missing or out of date according to the manifest."""
+        if not self.use_manifest:
+            return list(jobs)
+        manifests: dict[Path, ConversionManifest] = {}
+        stale = []
+        for job in jobs:
+            folder = job.target.parent
+            if folder not in manifests:
+                manifests[folder] = ConversionManifest.for_folder(folder)
+            if not manifests[folder].is_current(job, self.settings_key()):
+                stale.append(job)
+        return stale
+
+    def run(
+        self,
+        jobs: Sequence[ConversionJob],
+        on_progress: Callable[[int, int, ConversionResult], None] | None = None,
+        *,
+        force: bool = False,
+    ) -> list[ConversionResult]:
+        """Convert ``jobs`` and return one result per job, in job order.
+
+        ``on_progress(done, total, result)`` is called in the calling process
+        as each file finishes, in completion order.
+        """
+        jobs = list(jobs)
+        total = len(jobs)
+        results: dict[int, ConversionResult] = {}
+        done = 0
+
+        def report(index: int, result: ConversionResult) -> None:
+            nonlocal done
+            done += 1
+            results[index] = result
+            if on_progress is not None:
+                on_progress(done, total, result)
+
+        manifests: dict[Path, ConversionManifest] = {}
+        pending: list[int] = []
+        states: dict[int, dict] = {}
+        for index, job in enumerate(jobs):
+            folder = job.target.parent
+            if self.use_manifest and folder not in manifests:
+                manifests[folder] = ConversionManifest.for_folder(folder)
+            if self.use_manifest and not force and manifests[folder].is_current(job, self.settings_key()):
+                report(index, ConversionResult(job, STATUS_SKIPPED))
+                continue
+            if self.use_manifest:
+                # Captured before converting so an edit mid-run forces a redo.
+                states[index] = {**_source_state(job.source), "sha1": _file_sha1(job.source)}
+            pending.append(index)
+
+        sources = [jobs[i].source for i in pending]
+        workers = worker_count("texture_conversion_bytes", len(sources), total_file_size(sources), self.max_workers)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_run_job, jobs[i]): i for i in pending}
+                for future in as_completed(futures):
+                    report(futures[future], future.result())
+        else:
+            for index in pending:
+                report(index, _run_job(jobs[index]))
+
+        if self.use_manifest:
+            for index in pending:
+                job = jobs[index]
+                manifest = manifests[job.target.parent]
+                if results[index].ok:
+                    manifest.record(job, self.settings_key(), states[index])
+                else:
+                    manifest.forget(job)
+            for manifest in manifests.values():
+                manifest.save()
+        return [results[index] for index in range(total)]
+
+    def convert_folder(
+        self,
+        source_dir: Path,
+        target_dir: Path,
+        on_progress: Callable[[int, int, ConversionResult], None] | None = None,
+        *,
+        force: bool = False,
+    ) -> list[ConversionResult]:
+        return self.run(self.jobs_for_folder(source_dir, target_dir), on_progress, force=force)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert a folder of ICR2 textures.")
+    parser.add_argument("kind", choices=sorted(CONVERSION_KINDS))
+    parser.add_argument("source", type=Path, help="Folder with input files")
+    parser.add_argument("target", type=Path, help="Folder for converted files")
+    parser.add_argument("--palette", help="Palette file, usually SUNNY.PCX")
+    parser.add_argument("--mode", choices=("track", "carset"), default="track", help="MIP palette mode")
+    parser.add_argument("--dither", action="store_true", help="Dither when quantizing to the palette")
+    parser.add_argument("--size-field", default="0", help="PMP header size field in hex")
+    parser.add_argument("--alpha-threshold", type=int, default=0, help="PMP alpha transparency threshold")
+    parser.add_argument("--crop", action="store_true", help="Crop transparent border of PMP output")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="Convert even if outputs are up to date")
+    args = parser.parse_args(argv)
+
+    if not args.source.is_dir():
+        parser.error(f"Source folder not found: {args.source}")
+    try:
+        size_field = int(args.size_field, 16)
+    except ValueError:
+        parser.error(f"--size-field must be a hex number, got {args.size_field!r}")
+    args.target.mkdir(parents=True, exist_ok=True)
+    try:
+        converter = TextureBatchConverter(
+            args.kind,
+            args.palette,
+            mode=args.mode,
+            dither=args.dither,
+            size_field=size_field,
+            alpha_threshold=args.alpha_threshold,
+            crop=args.crop,
+            max_workers=args.workers,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    def report(done: int, total: int, result: ConversionResult) -> None:
+        detail = f": {result.error}" if result.error else ""
+        print(f"[{done}/{total}] {result.status:9s} {result.job.source.name}{detail}")
+
+    results = converter.convert_folder(args.source, args.target, report, force=args.force)
+    counts = {status: 0 for status in (STATUS_CONVERTED, STATUS_SKIPPED, STATUS_FAILED)}
+    for result in results:
+        counts[result.status] += 1
+    print(
+        f"{counts[STATUS_CONVERTED]} converted, {counts[STATUS_SKIPPED]} up to date, "
+        f"{counts[STATUS_FAILED]} failed"
+    )
+    return 1 if counts[STATUS_FAILED] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -14,9 +15,18 @@ try:
 except ImportError:  # pragma: no cover
     from PySide6 import QtCore, QtGui, QtWidgets  # type: ignore
 
+Signal = getattr(QtCore, "pyqtSignal", None) or QtCore.Signal
+
 from icr2_core.mip.mips import img_to_mip, load_palette, mip_to_img
+from icr2_core.mip.texture_cache import TextureCache
+from texture_tools.batch_convert import (
+    STATUS_FAILED as BATCH_FAILED,
+    STATUS_SKIPPED as BATCH_SKIPPED,
+    TextureBatchConverter,
+    prepare_image_for_mip,
+)
 from texture_tools.pmp import png_to_pmp
-from texture_tools.pmp_to_png import convert_pmp_to_png
+from texture_tools.pmp_to_png import convert_pmp_to_png, decode_pmp_indices
 from texture_tools.sunny_optimizer.chop_horizon import chop_horizon
 from texture_tools.sunny_optimizer.ui.settings import SunnyOptimizerSettings
 from texture_tools.sunny_optimizer.ui.main_window import MainWindow as SunnyOptimizerWindow
@@ -40,6 +50,9 @@ ABOUT_TEXT = (
     "by SK Chow (\"checkpoint10\" on the icr2.net forums)"
 )
 
+# Previews re-read the same few files on every field edit.
+TEXTURE_CACHE = TextureCache(decoders={".pmp": decode_pmp_indices})
+
 
 def _apply_panel_layout(layout: QtWidgets.QVBoxLayout) -> None:
     layout.setContentsMargins(*UI_PANEL_MARGINS)
@@ -79,6 +92,75 @@ class SharedStatusMixin:
         self.status_label.setText(f"[{self.STATUS_PREFIX.get(state, 'Status')}] {message}")
 
 
+class BatchConversionWorker(QtCore.QObject):
+    """Runs a :class:`TextureBatchConverter` off the GUI thread."""
+
+    file_finished = Signal(int, int, object)
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, converter: TextureBatchConverter, jobs: list) -> None:
+        super().__init__()
+        self._converter = converter
+        self._jobs = jobs
+
+    def run(self) -> None:
+        try:
+            results = self._converter.run(self._jobs, self.file_finished.emit)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.finished.emit(results)
+
+
+class BatchConversionMixin:
+    """Folder conversion with per-file status updates for widgets with ``batch_btn``."""
+
+    def _start_batch_conversion(self, converter: TextureBatchConverter, jobs: list, label: str, target_dir: Path) -> None:
+        self._batch_label = label
+        self._batch_target_dir = target_dir
+        self._batch_thread = QtCore.QThread(self)
+        self._batch_worker = BatchConversionWorker(converter, jobs)
+        self._batch_worker.moveToThread(self._batch_thread)
+        self._batch_thread.started.connect(self._batch_worker.run)
+        self._batch_worker.file_finished.connect(self._on_batch_file_finished)
+        self._batch_worker.finished.connect(self._on_batch_finished)
+        self._batch_worker.failed.connect(self._on_batch_failed)
+        self._batch_worker.finished.connect(self._batch_thread.quit)
+        self._batch_worker.failed.connect(self._batch_thread.quit)
+        self._batch_thread.finished.connect(self._batch_worker.deleteLater)
+        self._batch_thread.finished.connect(self._batch_thread.deleteLater)
+        self.batch_btn.setEnabled(False)
+        self.set_status(STATUS_PROCESSING, f"Converting {len(jobs)} file(s) to {label}...")
+        self._batch_thread.start()
+
+    def _on_batch_file_finished(self, done: int, total: int, result) -> None:
+        detail = f" failed: {result.error}" if result.error else f" {result.status}"
+        self.set_status(STATUS_PROCESSING, f"{done}/{total} {result.job.source.name}{detail}")
+
+    def _on_batch_finished(self, results: list) -> None:
+        self.batch_btn.setEnabled(True)
+        failures = [r for r in results if r.status == BATCH_FAILED]
+        skipped = sum(1 for r in results if r.status == BATCH_SKIPPED)
+        converted = len(results) - len(failures) - skipped
+        message = f"Converted {converted} file(s) to {self._batch_label} in {self._batch_target_dir}"
+        if skipped:
+            message += f"; {skipped} already up to date"
+        if not failures:
+            self.set_status(STATUS_SUCCESS, message)
+            return
+        self.set_status(STATUS_FAILURE, f"{message}; {len(failures)} failed")
+        details = "\n".join(f"{r.job.source.name}: {r.error}" for r in failures[:10])
+        if len(failures) > 10:
+            details += f"\n... and {len(failures) - 10} more"
+        QtWidgets.QMessageBox.warning(self, f"Folder {self._batch_label} conversion", details)
+
+    def _on_batch_failed(self, error: str) -> None:
+        self.batch_btn.setEnabled(True)
+        self.set_status(STATUS_FAILURE, f"Folder {self._batch_label} conversion failed: {error}")
+        QtWidgets.QMessageBox.critical(self, f"Folder {self._batch_label} conversion failed", error)
+
+
 class PresettableMixin:
     TOOL_PRESET_KEY = ""
 
@@ -250,27 +332,6 @@ def _validate_path(
 def _fmt_dimensions(image: Image.Image) -> str:
     return f"{image.width}x{image.height}"
 
-def _collect_folder_image_inputs(source_dir: Path) -> list[Path]:
-    preferred: dict[str, Path] = {}
-    for path in sorted(source_dir.iterdir(), key=lambda p: p.name.lower()):
-        if not path.is_file():
-            continue
-        suffix = path.suffix.lower()
-        if suffix not in {".png", ".bmp"}:
-            continue
-        stem_key = path.stem.lower()
-        if suffix == ".png":
-            preferred[stem_key] = path
-        elif stem_key not in preferred:
-            preferred[stem_key] = path
-    return list(preferred.values())
-
-
-def _prepare_image_for_mip(image: Image.Image) -> Image.Image:
-    """Prepare image for MIP conversion without introducing implicit dithering."""
-    return image.convert("RGB")
-
-
 def _confirm_summary(parent: QtWidgets.QWidget, *, dimensions: str, output_format: str, palette_source: str, destination: Path) -> bool:
     message = (
         "Output summary:\n"
@@ -408,7 +469,7 @@ class PreviewPane(QtWidgets.QGroupBox):
             elif event.type() == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.LeftButton:
                 self.image_view.setCursor(QtCore.Qt.OpenHandCursor)
         return super().eventFilter(watched, event)
-class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin, RecentPathMixin):
+class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, BatchConversionMixin, PresettableMixin, RecentPathMixin):
     TOOL_PRESET_KEY = "mip_conversion"
     TOOL_RECENT_KEY = "mip_conversion"
     def _set_status_warning(self, message: str) -> None:
@@ -517,7 +578,7 @@ class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
                 if not palette_path:
                     self.preview_pane.clear_preview("Palette file required for .mip preview.")
                     return
-                preview = mip_to_img(str(input_path), load_palette(palette_path))[0]
+                preview = TEXTURE_CACHE.image(input_path, palette_path)
                 self.preview_pane.set_preview(preview, caption=f"{_fmt_dimensions(preview)} • Decoded from MIP")
                 return
             source = Image.open(input_path)
@@ -640,7 +701,7 @@ class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
             output_path = Path(self.output_edit.text().strip())
             mode = self.mode_combo.currentText()
             image = Image.open(input_path)
-            prepared = _prepare_image_for_mip(image)
+            prepared = prepare_image_for_mip(image)
             if not _confirm_summary(
                 self,
                 dimensions=_fmt_dimensions(prepared),
@@ -691,13 +752,17 @@ class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
         try:
             source_dir = Path(self.source_folder_edit.text().strip())
             target_dir = Path(self.target_folder_edit.text().strip())
-            palette_path = Path(self.palette_edit.text().strip())
-            mode = self.mode_combo.currentText()
-            selected_inputs = _collect_folder_image_inputs(source_dir)
-            if not selected_inputs:
+            converter = TextureBatchConverter(
+                "png-to-mip",
+                self.palette_edit.text().strip(),
+                mode=self.mode_combo.currentText(),
+                dither=self.dither_checkbox.isChecked(),
+            )
+            jobs = converter.jobs_for_folder(source_dir, target_dir)
+            if not jobs:
                 self.set_status(STATUS_IDLE, "No .png or .bmp files found in source folder.")
                 return
-            overwrite_targets = [target_dir / f"{src.stem}.mip" for src in selected_inputs if (target_dir / f"{src.stem}.mip").exists()]
+            overwrite_targets = [job.target for job in converter.stale_jobs(jobs) if job.target.exists()]
             if overwrite_targets:
                 answer = QtWidgets.QMessageBox.warning(
                     self,
@@ -709,13 +774,7 @@ class MipConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
                 if answer != QtWidgets.QMessageBox.Yes:
                     self.set_status(STATUS_IDLE, "Folder conversion cancelled.")
                     return
-            converted = 0
-            for source_path in selected_inputs:
-                out_path = target_dir / f"{source_path.stem}.mip"
-                prepared = _prepare_image_for_mip(Image.open(source_path))
-                img_to_mip(prepared, str(out_path), str(palette_path), mode, dither=self.dither_checkbox.isChecked())
-                converted += 1
-            self.set_status(STATUS_SUCCESS, f"Converted {converted} file(s) to MIP in {target_dir}")
+            self._start_batch_conversion(converter, jobs, "MIP", target_dir)
         except Exception as exc:  # pragma: no cover
             self.set_status(STATUS_FAILURE, f"Folder MIP conversion failed: {exc}")
             QtWidgets.QMessageBox.critical(self, "Folder MIP conversion failed", str(exc))
@@ -839,7 +898,7 @@ class ChopHorizonWidget(QtWidgets.QWidget, SharedStatusMixin):
             QtWidgets.QMessageBox.critical(self, "Chop Horizon failed", str(exc))
 
 
-class PmpConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin):
+class PmpConversionWidget(QtWidgets.QWidget, SharedStatusMixin, BatchConversionMixin, PresettableMixin):
     TOOL_PRESET_KEY = "png_to_pmp"
     def _set_status_warning(self, message: str) -> None:
         self.status_label.setText(message)
@@ -1051,12 +1110,23 @@ class PmpConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
         try:
             source_dir = Path(self.source_folder_edit.text().strip())
             target_dir = Path(self.target_folder_edit.text().strip())
-            selected_inputs = sorted(p for p in source_dir.iterdir() if p.is_file() and p.suffix.lower() == ".png")
-            if not selected_inputs:
+            raw = self.size_field.text().strip()
+            if raw.lower().startswith("0x"):
+                raw = raw[2:]
+            palette_raw = self.palette_edit.text().strip()
+            converter = TextureBatchConverter(
+                "png-to-pmp",
+                palette_raw if palette_raw else None,
+                dither=self.dither_checkbox.isChecked(),
+                size_field=int(raw, 16),
+                alpha_threshold=self.alpha_threshold_spin.value(),
+            )
+            jobs = converter.jobs_for_folder(source_dir, target_dir)
+            if not jobs:
                 self.set_status(STATUS_IDLE, "No .png files found in source folder.")
                 return
 
-            overwrite_targets = [target_dir / f"{src.stem}.pmp" for src in selected_inputs if (target_dir / f"{src.stem}.pmp").exists()]
+            overwrite_targets = [job.target for job in converter.stale_jobs(jobs) if job.target.exists()]
             if overwrite_targets:
                 answer = QtWidgets.QMessageBox.warning(
                     self,
@@ -1069,28 +1139,7 @@ class PmpConversionWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin
                     self.set_status(STATUS_IDLE, "Folder conversion cancelled.")
                     return
 
-            raw = self.size_field.text().strip()
-            if raw.lower().startswith("0x"):
-                raw = raw[2:]
-            size_field = int(raw, 16)
-            if not 0 <= size_field <= 0xFFFF:
-                raise ValueError("Header size field must be in range 0000..FFFF")
-            palette_raw = self.palette_edit.text().strip()
-            palette_path = palette_raw if palette_raw else None
-
-            converted = 0
-            for source_path in selected_inputs:
-                out_path = target_dir / f"{source_path.stem}.pmp"
-                png_to_pmp(
-                    str(source_path),
-                    str(out_path),
-                    size_field=size_field,
-                    palette_path=palette_path,
-                    alpha_transparent_threshold=self.alpha_threshold_spin.value(),
-                    dither=self.dither_checkbox.isChecked(),
-                )
-                converted += 1
-            self.set_status(STATUS_SUCCESS, f"Converted {converted} file(s) to PMP in {target_dir}")
+            self._start_batch_conversion(converter, jobs, "PMP", target_dir)
         except Exception as exc:  # pragma: no cover
             self.set_status(STATUS_FAILURE, f"Folder PMP conversion failed: {exc}")
             QtWidgets.QMessageBox.critical(self, "Folder PMP conversion failed", str(exc))
@@ -1168,7 +1217,7 @@ class PmpToPngWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin):
             self.preview_pane.clear_preview("Palette file required for preview.")
             return
         try:
-            preview = mip_to_img(input_path, load_palette(palette_path))[0]
+            preview = TEXTURE_CACHE.image(input_path, palette_path)
             if self.crop_checkbox.isChecked():
                 preview = preview.crop(preview.getbbox()) if preview.getbbox() else preview
             self.preview_pane.set_preview(preview, caption=f"{_fmt_dimensions(preview)} • PNG output preview")
@@ -1218,8 +1267,7 @@ class PmpToPngWidget(QtWidgets.QWidget, SharedStatusMixin, PresettableMixin):
             palette_path = self.palette_edit.text().strip()
             input_path = self.input_edit.text().strip()
             output_path = Path(self.output_edit.text().strip())
-            preview_palette = load_palette(palette_path)
-            preview_image = mip_to_img(input_path, preview_palette)[0]
+            preview_image = TEXTURE_CACHE.image(input_path, palette_path)
             if not _confirm_summary(
                 self,
                 dimensions=_fmt_dimensions(preview_image),
@@ -1300,4 +1348,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
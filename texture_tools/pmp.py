@@ -3,6 +3,7 @@ from __future__ import annotations
 from io import BytesIO
 from pathlib import Path
 
+import numpy as np
 from PIL import Image, ImageFile, UnidentifiedImageError
 
 
@@ -56,39 +57,48 @@ def _load_rgba_image_with_tolerant_fallback(src: Path) -> Image.Image:
         ImageFile.LOAD_TRUNCATED_IMAGES = original_truncated_setting
 
 
+def _run_table(indices: np.ndarray, opaque: np.ndarray | None = None) -> np.ndarray:
+    """Maximal same-index runs of opaque pixels as ``(y, start, end, index)`` rows.
+
+    Runs come out in scan order (rows top to bottom, left to right) with
+    exclusive ends, matching the PMP run payload.
+    """
+    indices = np.asarray(indices)
+    height, width = indices.shape
+    if opaque is None:
+        opaque = np.ones((height, width), dtype=bool)
+    # A run breaks wherever the index changes or either neighbour is transparent.
+    breaks = (np.diff(indices.astype(np.int16), axis=1) != 0) | ~opaque[:, :-1] | ~opaque[:, 1:]
+    starts = opaque.copy()
+    starts[:, 1:] &= breaks
+    ends = opaque.copy()
+    ends[:, :-1] &= breaks
+    start_flat = np.flatnonzero(starts)
+    end_flat = np.flatnonzero(ends)
+    return np.stack(
+        (
+            start_flat // width,
+            start_flat % width,
+            end_flat % width + 1,
+            indices.ravel()[start_flat],
+        ),
+        axis=1,
+    ).astype(np.int64)
+
+
 def _encode_runs(
     indexed: Image.Image,
     alpha: Image.Image | None = None,
     *,
     alpha_transparent_threshold: int = 0,
 ) -> bytes:
-    width, height = indexed.size
-    color_pixels = indexed.load()
-    alpha_pixels = alpha.load() if alpha is not None else None
-    data = bytearray()
-
-    for y in range(height):
-        x = 0
-        while x < width:
-            if alpha_pixels is not None and int(alpha_pixels[x, y]) <= alpha_transparent_threshold:
-                x += 1
-                continue
-
-            color = int(color_pixels[x, y])
-            start = x
-            x += 1
-
-            while x < width:
-                if alpha_pixels is not None and int(alpha_pixels[x, y]) <= alpha_transparent_threshold:
-                    break
-                if int(color_pixels[x, y]) != color:
-                    break
-                x += 1
-
-            end_exclusive = x
-            data.extend((y, start, end_exclusive, color))
-
-    return bytes(data)
+    opaque = None
+    if alpha is not None:
+        opaque = np.asarray(alpha, dtype=np.uint8) > alpha_transparent_threshold
+    runs = _run_table(np.asarray(indexed, dtype=np.uint8), opaque)
+    if runs.size and runs.max() > 255:
+        raise ValueError("PMP run coordinates must be in range 0..255")
+    return runs.astype(np.uint8).tobytes()
 
 
 def _quantize_with_palette(image: Image.Image, palette_path: str | Path | None, *, dither: bool = False) -> Image.Image:
@@ -10,11 +10,13 @@ Optional:
     python pmp_to_png.py input.pmp output.png SUNNY.PCX --crop
 
 Requires:
-    pip install pillow
+    pip install numpy pillow
 """
 
 import argparse
 from pathlib import Path
+
+import numpy as np
 from PIL import Image
 
 
@@ -79,8 +81,10 @@ def load_palette(path: str):
 
 def parse_pmp(path: str):
     with open(path, "rb") as f:
-        data = f.read()
+        return parse_pmp_bytes(f.read())
+
 
+def parse_pmp_bytes(data: bytes):
     if len(data) < 12:
         raise ValueError("File is too small to be a valid PMP.")
 
@@ -104,25 +108,14 @@ def parse_pmp(path: str):
             f"but actual run data size is {len(run_data)}"
         )
 
-    runs = []
-    max_x = 0
-    max_y = 0
-    bad_run_count = 0
-
-    for i in range(0, len(run_data) - 3, 4):
-        y = run_data[i]
-        x_start = run_data[i + 1]
-        x_end_exclusive = run_data[i + 2]
-        color_index = run_data[i + 3]
-
-        if x_start > x_end_exclusive:
-            bad_run_count += 1
-            continue
-
-        runs.append((y, x_start, x_end_exclusive, color_index))
-
-        max_y = max(max_y, y)
-        max_x = max(max_x, x_end_exclusive)
+    # One (y, x_start, x_end_exclusive, color_index) row per run record.
+    records = np.frombuffer(run_data, dtype=np.uint8, count=len(run_data) // 4 * 4)
+    records = records.reshape(-1, 4).astype(np.int64)
+    valid = records[:, 1] <= records[:, 2]
+    runs = records[valid]
+    bad_run_count = int(np.count_nonzero(~valid))
+    max_x = int(runs[:, 2].max()) if len(runs) else 0
+    max_y = int(runs[:, 0].max()) if len(runs) else 0
 
     metadata = {
         "bbox_width": bbox_width,
@@ -141,6 +134,43 @@ def parse_pmp(path: str):
     return metadata, runs
 
 
+def render_runs(runs: np.ndarray, width: int = 256, height: int = 256):
+    """Paint ``(y, x_start, x_end_exclusive, color_index)`` runs onto a canvas.
+
+    Returns the ``(height, width)`` palette indices, a mask of painted pixels
+    and the number of runs that painted nothing. Later runs win where runs
+    overlap.
+    """
+    runs = np.asarray(runs, dtype=np.int64).reshape(-1, 4)
+    indices = np.zeros((height, width), dtype=np.uint8)
+    painted = np.zeros((height, width), dtype=bool)
+
+    starts = np.clip(runs[:, 1], 0, width)
+    ends = np.clip(runs[:, 2], 0, width)
+    lengths = np.where(runs[:, 0] < height, np.maximum(ends - starts, 0), 0)
+    skipped = int(np.count_nonzero(lengths == 0))
+
+    total = int(lengths.sum())
+    if total:
+        run_of_pixel = np.repeat(np.arange(len(runs)), lengths)
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        flat = runs[run_of_pixel, 0] * width + starts[run_of_pixel] + offsets
+        # Keep the last run covering each pixel, as sequential painting would.
+        last_first, keep = np.unique(flat[::-1], return_index=True)
+        keep = total - 1 - keep
+        indices.ravel()[last_first] = runs[run_of_pixel[keep], 3]
+        painted.ravel()[last_first] = True
+
+    return indices, painted, skipped
+
+
+def decode_pmp_indices(data: bytes):
+    """Palette indices and painted mask of PMP contents on the 256x256 canvas."""
+    _metadata, runs = parse_pmp_bytes(data)
+    indices, painted, _skipped = render_runs(runs)
+    return indices, painted
+
+
 def convert_pmp_to_png(
     pmp_path: str,
     png_path: str,
@@ -155,31 +185,10 @@ def convert_pmp_to_png(
     width = 256
     height = 256
 
-    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    pixels = img.load()
-
-    skipped_out_of_bounds = 0
-
-    for y, x_start, x_end_exclusive, color_index in runs:
-        if y >= height:
-            skipped_out_of_bounds += 1
-            continue
-
-        if x_start >= width:
-            skipped_out_of_bounds += 1
-            continue
-
-        clipped_x_start = max(0, x_start)
-        clipped_x_end = min(x_end_exclusive, width)
-
-        if clipped_x_start >= clipped_x_end:
-            skipped_out_of_bounds += 1
-            continue
-
-        rgba = palette[color_index]
-
-        for x in range(clipped_x_start, clipped_x_end):
-            pixels[x, y] = rgba
+    indices, painted, skipped_out_of_bounds = render_runs(runs, width, height)
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+    rgba[painted] = np.asarray(palette, dtype=np.uint8)[indices[painted]]
+    img = Image.fromarray(rgba, "RGBA")
 
     if crop:
         bbox = img.getbbox()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict
+from typing import Callable, Dict, Sequence
 
 import numpy as np
+
+from icr2_core.parallel import total_file_size, worker_count
+
 from .color_utils import lab_to_rgb_u8, rgb_to_lab
 from .quantizer import Quantizer
 from .palette import load_sunny_palette, save_palette
@@ -16,6 +20,8 @@ OPTIMIZED_END = 245
 OPTIMIZED_SLOTS = OPTIMIZED_END - OPTIMIZED_START + 1
 BROWN_BASE_INDEX = 244
 BROWN_DARK_INDEX = 245
+KMEANS_MODES = ("full", "minibatch")
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
 
 
 def _nearest_centroid_indices(
@@ -31,19 +37,26 @@ def _nearest_centroid_indices(
 
 
 def _initial_centers_kmeans_plus_plus(
-    samples: np.ndarray, n_clusters: int, rng: np.random.Generator
+    samples: np.ndarray,
+    n_clusters: int,
+    rng: np.random.Generator,
+    weights: np.ndarray | None = None,
 ) -> np.ndarray:
     centers = np.empty((n_clusters, samples.shape[1]), dtype=np.float64)
-    first = int(rng.integers(samples.shape[0]))
+    if weights is None:
+        first = int(rng.integers(samples.shape[0]))
+    else:
+        first = int(rng.choice(samples.shape[0], p=weights / weights.sum()))
     centers[0] = samples[first]
     closest_dist_sq = np.sum((samples - centers[0]) ** 2, axis=1)
 
     for i in range(1, n_clusters):
-        total = float(np.sum(closest_dist_sq))
+        weighted_dist_sq = closest_dist_sq if weights is None else closest_dist_sq * weights
+        total = float(np.sum(weighted_dist_sq))
         if total <= 0.0:
             centers[i:] = centers[i - 1]
             break
-        next_idx = int(rng.choice(samples.shape[0], p=closest_dist_sq / total))
+        next_idx = int(rng.choice(samples.shape[0], p=weighted_dist_sq / total))
         centers[i] = samples[next_idx]
         new_dist_sq = np.sum((samples - centers[i]) ** 2, axis=1)
         closest_dist_sq = np.minimum(closest_dist_sq, new_dist_sq)
@@ -125,6 +138,150 @@ def _kmeans(
     return best_centers
 
 
+def _minibatch_kmeans(
+    samples: np.ndarray,
+    n_clusters: int,
+    *,
+    weights: np.ndarray | None = None,
+    n_init: int,
+    random_state: int,
+    batch_size: int = 4096,
+    tol: float = 1e-4,
+    max_iter: int = 200,
+    max_no_improvement: int = 10,
+    progress_callback: ProgressCallback | None = None,
+    progress_label: str = "k-means",
+) -> np.ndarray:
+    """Mini-batch k-means over ``samples`` with optional per-sample ``weights``.
+
+    Batches are drawn with probability proportional to the weights, so a
+    colour histogram (unique colours plus pixel counts) clusters like the
+    pixels it summarizes. A pass stops when the summed squared centre shift
+    of an iteration drops below ``tol`` times the mean sample variance, or
+    when the smoothed batch inertia has not improved for
+    ``max_no_improvement`` iterations. The pass with the lowest weighted
+    inertia wins. Results depend only on ``random_state``.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.ndim != 2 or samples.shape[1] != 3:
+        raise ValueError("samples must have shape (n_samples, 3)")
+    if n_clusters < 1:
+        raise ValueError("n_clusters must be at least 1")
+    if samples.shape[0] < n_clusters:
+        raise ValueError("n_clusters cannot exceed the number of samples")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    weights = (
+        np.ones(samples.shape[0], dtype=np.float64)
+        if weights is None
+        else np.asarray(weights, dtype=np.float64)
+    )
+    if weights.shape != (samples.shape[0],) or np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("weights must be non-negative with one value per sample")
+    if n_clusters == 1:
+        if progress_callback is not None:
+            progress_callback(f"{progress_label}: averaging one cluster", 1.0)
+        return np.average(samples, axis=0, weights=weights).reshape(1, 3)
+
+    # Batches are drawn by inverting the cumulative weights.
+    cumulative = np.cumsum(weights)
+    cumulative /= cumulative[-1]
+    mean = np.average(samples, axis=0, weights=weights)
+    variance = np.average((samples - mean) ** 2, axis=0, weights=weights)
+    shift_tol = tol * float(np.mean(variance))
+    smoothing = min(1.0, 2.0 * batch_size / (float(weights.sum()) + 1.0))
+    init_count = max(1, n_init)
+    # k-means++ on a weighted subsample keeps initialization cheap for
+    # textures with hundreds of thousands of distinct colours.
+    init_size = min(samples.shape[0], max(3 * batch_size, 10 * n_clusters))
+    best_centers: np.ndarray | None = None
+    best_inertia = np.inf
+
+    def emit(init_index: int, iteration: int, message: str) -> None:
+        if progress_callback is None:
+            return
+        progress = min(1.0, max(0.0, (init_index + iteration / max_iter) / init_count))
+        progress_callback(f"{progress_label}: {message}", progress)
+
+    seed_sequence = np.random.SeedSequence(random_state)
+    for init_index, child_seed in enumerate(seed_sequence.spawn(init_count)):
+        rng = np.random.default_rng(child_seed)
+        emit(init_index, 0, f"initializing pass {init_index + 1}/{init_count}")
+        if init_size < samples.shape[0]:
+            subset = rng.choice(
+                samples.shape[0], size=init_size, replace=False, p=weights / weights.sum()
+            )
+            centers = _initial_centers_kmeans_plus_plus(samples[subset], n_clusters, rng)
+        else:
+            centers = _initial_centers_kmeans_plus_plus(samples, n_clusters, rng, weights)
+        center_counts = np.zeros(n_clusters, dtype=np.float64)
+        smoothed_inertia = 0.0
+        best_smoothed = np.inf
+        stale_iterations = 0
+
+        for iteration in range(max_iter):
+            picks = np.searchsorted(cumulative, rng.random(batch_size), side="right")
+            batch = samples[np.minimum(picks, samples.shape[0] - 1)]
+            labels = _nearest_centroid_indices(batch, centers)
+            batch_inertia = float(np.mean(np.sum((batch - centers[labels]) ** 2, axis=1)))
+            batch_counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+            batch_sums = np.stack(
+                [
+                    np.bincount(labels, weights=batch[:, axis], minlength=n_clusters)
+                    for axis in range(3)
+                ],
+                axis=1,
+            )
+            center_counts += batch_counts
+            touched = batch_counts > 0
+            shift = (
+                batch_sums[touched] - batch_counts[touched, None] * centers[touched]
+            ) / center_counts[touched, None]
+            centers[touched] += shift
+            emit(
+                init_index,
+                iteration + 1,
+                f"pass {init_index + 1}/{init_count}, iteration {iteration + 1}/{max_iter}",
+            )
+            if iteration == 0:
+                smoothed_inertia = batch_inertia
+                continue
+            if float(np.sum(shift * shift)) <= shift_tol:
+                break
+            smoothed_inertia += (batch_inertia - smoothed_inertia) * smoothing
+            if smoothed_inertia < best_smoothed:
+                best_smoothed = smoothed_inertia
+                stale_iterations = 0
+            else:
+                stale_iterations += 1
+                if stale_iterations >= max_no_improvement:
+                    break
+
+        emit(init_index + 1, 0, f"scoring pass {init_index + 1}/{init_count}")
+        labels = _nearest_centroid_indices(samples, centers)
+        inertia = float(np.sum(weights * np.sum((samples - centers[labels]) ** 2, axis=1)))
+        if inertia < best_inertia:
+            best_inertia = inertia
+            best_centers = centers.copy()
+
+    if best_centers is None:
+        raise RuntimeError("k-means failed to initialize")
+    return best_centers
+
+
+def _color_histogram(rgb_image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct RGB colours of an image and how many pixels use each."""
+    flat = np.asarray(rgb_image, dtype=np.uint8).reshape(-1, 3)
+    packed = (
+        (flat[:, 0].astype(np.uint32) << 16)
+        | (flat[:, 1].astype(np.uint32) << 8)
+        | flat[:, 2]
+    )
+    colors, counts = np.unique(packed, return_counts=True)
+    rgb = np.stack(((colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF), axis=1)
+    return rgb.astype(np.uint8), counts
+
+
 def optimized_slot_count(dirt_present: bool) -> int:
     return OPTIMIZED_SLOTS - 2 if dirt_present else OPTIMIZED_SLOTS
 
@@ -153,6 +310,9 @@ class SunnyPaletteOptimizer:
         per_texture_required_unique_colors: Dict[str, int] | None = None,
         random_state: int = 7,
         max_texture_samples: int = 50_000,
+        kmeans_mode: str = "full",
+        batch_size: int = 4096,
+        tol: float = 1e-4,
         progress_callback: ProgressCallback | None = None,
     ) -> None:
         self.rgb_images = rgb_images
@@ -162,10 +322,15 @@ class SunnyPaletteOptimizer:
         self.dirt_present = dirt_present
         self.random_state = random_state
         self.max_texture_samples = max_texture_samples
+        self.kmeans_mode = kmeans_mode
+        self.batch_size = batch_size
+        self.tol = tol
         self.progress_callback = progress_callback
 
         if self.fixed_palette.shape != (256, 3):
             raise ValueError("fixed_palette must have shape (256, 3)")
+        if kmeans_mode not in KMEANS_MODES:
+            raise ValueError(f"kmeans_mode must be one of {KMEANS_MODES}")
 
     @staticmethod
     def _rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
@@ -201,7 +366,12 @@ class SunnyPaletteOptimizer:
                 f"Sampling {name} ({texture_index + 1}/{texture_total})",
                 0.02 + (0.18 * texture_index / max(1, texture_total)),
             )
-            sampled_rgb = self._sample_pixels(image)
+            weights = None
+            if self.kmeans_mode == "minibatch":
+                # Every pixel counts, summarized as a colour histogram.
+                sampled_rgb, weights = _color_histogram(image)
+            else:
+                sampled_rgb = self._sample_pixels(image)
             self._emit_progress(
                 f"Converting {name} to Lab ({texture_index + 1}/{texture_total})",
                 0.02 + (0.18 * (texture_index + 0.35) / max(1, texture_total)),
@@ -221,14 +391,27 @@ class SunnyPaletteOptimizer:
             ) -> None:
                 self._emit_progress(message, start + (span * fraction))
 
-            texture_centroids = _kmeans(
-                sampled_lab,
-                cluster_count,
-                n_init=5,
-                random_state=self.random_state,
-                progress_callback=texture_progress,
-                progress_label=f"Clustering {name}",
-            )
+            if weights is not None:
+                texture_centroids = _minibatch_kmeans(
+                    sampled_lab,
+                    cluster_count,
+                    weights=weights,
+                    n_init=3,
+                    random_state=self.random_state,
+                    batch_size=self.batch_size,
+                    tol=self.tol,
+                    progress_callback=texture_progress,
+                    progress_label=f"Clustering {name}",
+                )
+            else:
+                texture_centroids = _kmeans(
+                    sampled_lab,
+                    cluster_count,
+                    n_init=5,
+                    random_state=self.random_state,
+                    progress_callback=texture_progress,
+                    progress_label=f"Clustering {name}",
+                )
             all_centroids.append(texture_centroids)
             if required > 0:
                 required_centroids.append(
@@ -400,18 +583,48 @@ class SunnyPaletteOptimizer:
         return indexed, quantized
 
 
-def _load_images_from_folder(folder: Path, max_dim: int = 512) -> dict[str, np.ndarray]:
+def _load_texture_image(job: tuple[Path, int, int]) -> np.ndarray:
     from PIL import Image
 
-    images: dict[str, np.ndarray] = {}
-    for path in sorted(folder.iterdir()):
-        if path.suffix.lower() not in {".png", ".jpg", ".jpeg", ".bmp"}:
-            continue
-        with Image.open(path) as img:
-            img = img.convert("RGB")
-            img.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
-            images[path.name] = np.asarray(img, dtype=np.uint8)
-    return images
+    path, max_dim, resample = job
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+        img.thumbnail((max_dim, max_dim), resample)
+        return np.asarray(img, dtype=np.uint8)
+
+
+def load_texture_images(
+    paths: Sequence[Path],
+    max_dim: int = 512,
+    *,
+    resample: int | None = None,
+    max_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Decode and downsample textures, in worker processes when worthwhile.
+
+    Returns RGB arrays keyed by file name in the order of ``paths``.
+    ``max_workers=1`` forces serial loading.
+    """
+    from PIL import Image
+
+    paths = [Path(path) for path in paths]
+    if resample is None:
+        resample = Image.Resampling.LANCZOS
+    jobs = [(path, max_dim, int(resample)) for path in paths]
+    workers = worker_count("texture_image_bytes", len(paths), total_file_size(paths), max_workers)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            arrays = list(pool.map(_load_texture_image, jobs))
+    else:
+        arrays = [_load_texture_image(job) for job in jobs]
+    return {path.name: array for path, array in zip(paths, arrays)}
+
+
+def _load_images_from_folder(
+    folder: Path, max_dim: int = 512, max_workers: int | None = None
+) -> dict[str, np.ndarray]:
+    paths = [path for path in sorted(folder.iterdir()) if path.suffix.lower() in IMAGE_SUFFIXES]
+    return load_texture_images(paths, max_dim, max_workers=max_workers)
 
 
 if __name__ == "__main__":
@@ -424,9 +637,18 @@ if __name__ == "__main__":
         "output_palette", type=Path, nargs="?", default=Path("sunny_optimized.pcx")
     )
     parser.add_argument("--dirt-present", action="store_true")
+    parser.add_argument(
+        "--minibatch",
+        action="store_true",
+        help="Cluster full colour histograms with mini-batch k-means",
+    )
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--tol", type=float, default=1e-4)
+    parser.add_argument("--workers", type=int, default=None, help="Image loading processes")
+    parser.add_argument("--seed", type=int, default=7)
     args = parser.parse_args()
 
-    images = _load_images_from_folder(args.image_folder)
+    images = _load_images_from_folder(args.image_folder, max_workers=args.workers)
     if not images:
         raise SystemExit("No input images found")
 
@@ -434,7 +656,16 @@ if __name__ == "__main__":
     budgets = {name: budget for name in images}
 
     fixed_palette = load_sunny_palette(args.input_palette)
-    optimizer = SunnyPaletteOptimizer(images, budgets, fixed_palette, args.dirt_present)
+    optimizer = SunnyPaletteOptimizer(
+        images,
+        budgets,
+        fixed_palette,
+        args.dirt_present,
+        random_state=args.seed,
+        kmeans_mode="minibatch" if args.minibatch else "full",
+        batch_size=args.batch_size,
+        tol=args.tol,
+    )
     optimized_palette = optimizer.compute_palette()
     save_palette(args.output_palette, optimized_palette)
 
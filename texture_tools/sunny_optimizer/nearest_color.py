@@ -0,0 +1,136 @@
+"""Nearest-palette-colour search engines for :class:`Quantizer`.
+
+Both engines return the index of the closest palette entry in Lab space and
+resolve ties to the lowest palette index, so they are interchangeable.
+:class:`BruteForceNearest` measures every pixel against all palette
+entries. :class:`LabGridNearest` buckets the query colours into a coarse Lab
+grid and keeps, per occupied cell, only the palette entries that can be the
+nearest one for some point in that cell; distances are then measured
+against those few candidates with the same arithmetic as the brute-force
+path.
+"""
+from __future__ import annotations
+
+from typing import Protocol
+
+import numpy as np
+
+
+class NearestColorEngine(Protocol):
+    def nearest(self, lab_pixels: np.ndarray) -> np.ndarray:
+        """Index of the closest palette entry for each ``(n, 3)`` Lab row."""
+
+
+def _squared_distances(lab_pixels: np.ndarray, palette_lab: np.ndarray) -> np.ndarray:
+    """Squared Lab distances; ``palette_lab`` is ``(m, 3)`` or ``(n, m, 3)``."""
+    if palette_lab.ndim == 2:
+        palette_lab = palette_lab[None, :, :]
+    diff = lab_pixels[:, None, :] - palette_lab
+    return np.einsum("ijk,ijk->ij", diff, diff, optimize=True)
+
+
+class BruteForceNearest:
+    def __init__(self, palette_lab: np.ndarray, chunk_size: int = 16_384) -> None:
+        self.palette_lab = np.asarray(palette_lab, dtype=np.float64).reshape(-1, 3)
+        self.chunk_size = chunk_size
+
+    def nearest(self, lab_pixels: np.ndarray) -> np.ndarray:
+        nearest = np.empty(lab_pixels.shape[0], dtype=np.uint8)
+        for start in range(0, lab_pixels.shape[0], self.chunk_size):
+            chunk = lab_pixels[start : start + self.chunk_size].astype(
+                np.float64, copy=False
+            )
+            distances = _squared_distances(chunk, self.palette_lab)
+            nearest[start : start + chunk.shape[0]] = np.argmin(
+                distances, axis=1
+            ).astype(np.uint8)
+        return nearest
+
+
+class LabGridNearest:
+    """Exact nearest search that prunes palette entries per Lab grid cell."""
+
+    def __init__(
+        self,
+        palette_lab: np.ndarray,
+        cell_size: float = 6.0,
+        max_block: int = 1 << 22,
+    ) -> None:
+        self.palette_lab = np.asarray(palette_lab, dtype=np.float64).reshape(-1, 3)
+        self.cell_size = float(cell_size)
+        self.max_block = max_block
+
+    def nearest(self, lab_pixels: np.ndarray) -> np.ndarray:
+        lab = np.asarray(lab_pixels, dtype=np.float64).reshape(-1, 3)
+        result = np.empty(lab.shape[0], dtype=np.uint8)
+        if lab.shape[0] == 0:
+            return result
+
+        origin = lab.min(axis=0)
+        cells = np.floor((lab - origin) / self.cell_size).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        cell_ids = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+        occupied, query_cell = np.unique(cell_ids, return_inverse=True)
+        corners = np.stack(
+            (
+                occupied // (dims[1] * dims[2]),
+                (occupied // dims[2]) % dims[1],
+                occupied % dims[2],
+            ),
+            axis=1,
+        )
+        candidates = self._cell_candidates(origin + corners * self.cell_size)
+        counts = candidates.sum(axis=1)
+
+        # Cells with a similar number of candidates are searched together so
+        # the padded candidate matrices stay narrow.
+        width_of_cell = 1 << np.ceil(np.log2(counts)).astype(np.int64)
+        query_width = width_of_cell[query_cell]
+        for width in np.unique(width_of_cell):
+            rows = np.flatnonzero(query_width == width)
+            cell_rows = np.flatnonzero(width_of_cell == width)
+            table = self._padded_candidates(candidates[cell_rows], int(width))
+            local_cell = np.searchsorted(cell_rows, query_cell[rows])
+            step = max(1, self.max_block // int(width))
+            for start in range(0, rows.shape[0], step):
+                block = rows[start : start + step]
+                choices = table[local_cell[start : start + step]]
+                distances = _squared_distances(lab[block], self.palette_lab[choices])
+                best = np.argmin(distances, axis=1)
+                result[block] = choices[np.arange(block.shape[0]), best]
+        return result
+
+    def _cell_candidates(self, low: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """Boolean ``(cells, palette)`` mask of possible nearest entries."""
+        return np.concatenate(
+            [
+                self._cell_candidates_chunk(low[start : start + chunk_size])
+                for start in range(0, low.shape[0], chunk_size)
+            ]
+        )
+
+    def _cell_candidates_chunk(self, low: np.ndarray) -> np.ndarray:
+        high = low + self.cell_size
+        palette = self.palette_lab[None, :, :]
+        below = low[:, None, :] - palette
+        above = palette - high[:, None, :]
+        gap = np.maximum(np.maximum(below, above), 0.0)
+        min_dist = (gap * gap).sum(axis=2)
+        far = np.maximum(np.abs(below), np.abs(above))
+        max_dist = (far * far).sum(axis=2)
+        # Every point in the cell is within ``bound`` of some palette entry,
+        # so entries whose nearest possible point is farther cannot win. The
+        # slack keeps rounding from dropping an entry that ties the bound.
+        bound = max_dist.min(axis=1, keepdims=True)
+        return min_dist <= bound * (1.0 + 1e-9) + 1e-9
+
+    @staticmethod
+    def _padded_candidates(mask: np.ndarray, width: int) -> np.ndarray:
+        """Candidate indices per cell in ascending order, padded to ``width``.
+
+        Padding repeats the cell's first candidate, which never changes the
+        argmin because the earlier occurrence wins ties.
+        """
+        order = np.argsort(~mask, axis=1, kind="stable")[:, :width]
+        valid = np.take_along_axis(mask, order, axis=1)
+        return np.where(valid, order, order[:, :1]).astype(np.intp)
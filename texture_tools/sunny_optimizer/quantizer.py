@@ -3,15 +3,37 @@ from __future__ import annotations
 import numpy as np
 
 from .color_utils import rgb_to_lab
+from .nearest_color import BruteForceNearest, LabGridNearest, NearestColorEngine
+
+_ENGINES = {"grid": LabGridNearest, "brute": BruteForceNearest}
 
 
 class Quantizer:
-    def __init__(self, full_palette: np.ndarray) -> None:
+    """Maps RGB images onto a fixed 256-colour palette by nearest Lab colour.
+
+    ``engine`` picks the nearest-colour search (``"grid"`` or ``"brute"``;
+    both give identical indices). With ``cache_colors`` each distinct RGB
+    colour is searched once per quantizer and remembered for later images,
+    which pays off on texture sets that share most of their colours.
+    """
+
+    def __init__(
+        self,
+        full_palette: np.ndarray,
+        engine: str = "grid",
+        cache_colors: bool = True,
+    ) -> None:
         palette = np.asarray(full_palette, dtype=np.uint8)
         if palette.shape != (256, 3):
             raise ValueError("full_palette must be shape (256, 3)")
+        if engine not in _ENGINES:
+            raise ValueError(f"engine must be one of {sorted(_ENGINES)}")
         self.palette = palette
         self._palette_lab = rgb_to_lab(palette).reshape(256, 3)
+        self.engine: NearestColorEngine = _ENGINES[engine](self._palette_lab)
+        self.cache_colors = cache_colors
+        self._color_cache: np.ndarray | None = None
+        self._seen: np.ndarray | None = None
 
     def quantize_image(self, rgb_image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         rgb = np.asarray(rgb_image, dtype=np.uint8)
@@ -19,24 +41,43 @@ class Quantizer:
             raise ValueError("rgb_image must have shape (height, width, 3)")
 
         h, w, _ = rgb.shape
-        lab = rgb_to_lab(rgb).reshape(-1, 3)
-        indices = self._nearest_palette_indices(lab)
+        indices = self._indices_for_colors(rgb.reshape(-1, 3))
         indexed = indices.reshape(h, w).astype(np.uint8)
         quantized_rgb = self.palette[indexed]
         return indexed, quantized_rgb.astype(np.uint8)
 
-    def _nearest_palette_indices(
-        self, lab_pixels: np.ndarray, chunk_size: int = 16_384
-    ) -> np.ndarray:
-        nearest = np.empty(lab_pixels.shape[0], dtype=np.uint8)
-        palette_lab = self._palette_lab.astype(np.float64, copy=False)
-        for start in range(0, lab_pixels.shape[0], chunk_size):
-            chunk = lab_pixels[start : start + chunk_size].astype(
-                np.float64, copy=False
-            )
-            diff = chunk[:, None, :] - palette_lab[None, :, :]
-            distances = np.einsum("ijk,ijk->ij", diff, diff, optimize=True)
-            nearest[start : start + chunk.shape[0]] = np.argmin(
-                distances, axis=1
-            ).astype(np.uint8)
-        return nearest
+    def _indices_for_colors(self, rgb_pixels: np.ndarray) -> np.ndarray:
+        packed = (
+            (rgb_pixels[:, 0].astype(np.uint32) << 16)
+            | (rgb_pixels[:, 1].astype(np.uint32) << 8)
+            | rgb_pixels[:, 2]
+        )
+        if not self.cache_colors:
+            colors, inverse = np.unique(packed, return_inverse=True)
+            return self._nearest_for_packed(colors)[inverse]
+
+        if self._color_cache is None:
+            # -1 marks colours that have not been searched yet.
+            self._color_cache = np.full(1 << 24, -1, dtype=np.int16)
+            # Scratch bitmap for deduplicating the missing colours; it is
+            # cleared again after each use.
+            self._seen = np.zeros(1 << 24, dtype=bool)
+        found = self._color_cache[packed]
+        missing = found < 0
+        if missing.any():
+            seen = self._seen
+            seen[packed[missing]] = True
+            colors = np.flatnonzero(seen).astype(np.uint32)
+            seen[colors] = False
+            self._color_cache[colors] = self._nearest_for_packed(colors)
+            found = self._color_cache[packed]
+        return found.astype(np.uint8)
+
+    def _nearest_for_packed(self, colors: np.ndarray) -> np.ndarray:
+        rgb = np.stack(
+            ((colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF), axis=1
+        ).astype(np.uint8)
+        return self._nearest_palette_indices(rgb_to_lab(rgb))
+
+    def _nearest_palette_indices(self, lab_pixels: np.ndarray) -> np.ndarray:
+        return self.engine.nearest(lab_pixels)
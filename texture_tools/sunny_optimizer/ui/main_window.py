@@ -800,6 +800,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def _load_folder(self, folder: Path) -> None:
         from PIL import Image
 
+        from texture_tools.sunny_optimizer.model import load_texture_images
+
         resolved_folder = folder.resolve()
 
         self.texture_images.clear()
@@ -823,12 +825,13 @@ class MainWindow(QtWidgets.QMainWindow):
         equal_budget = max(1, OPTIMIZED_SLOTS // len(image_files))
         saved_budgets = self.settings.budgets_for_folder(resolved_folder)
         saved_required_counts = self.settings.required_unique_colors_for_folder(resolved_folder)
+        self.texture_images.update(
+            load_texture_images(
+                image_files, self.preview_max_dim, resample=Image.Resampling.NEAREST
+            )
+        )
         for path in image_files:
-            with Image.open(path) as img:
-                img = img.convert("RGB")
-                img.thumbnail((self.preview_max_dim, self.preview_max_dim), Image.Resampling.NEAREST)
-                arr = np.asarray(img, dtype=np.uint8)
-            self.texture_images[path.name] = arr
+            arr = self.texture_images[path.name]
             self.texture_color_counts[path.name] = self._count_unique_rgb_colors(arr)
             budget = saved_budgets.get(path.name, equal_budget)
             budget = max(1, min(OPTIMIZED_SLOTS, int(budget)))
@@ -6,6 +6,7 @@ from typing import Optional, TYPE_CHECKING
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from icr2_core.track_library import track_library
 from track_viewer.preview_api import TrackPreviewApi
 from track_viewer.model.pit_models import PitParameters
 from track_viewer.services.io_service import (
@@ -77,11 +78,7 @@ class WindowController(QtCore.QObject):
             self.aiLinesUpdated.emit([], set(), False)
             return
 
-        folders = [
-            path
-            for path in sorted(track_root.iterdir(), key=lambda p: p.name.lower())
-            if path.is_dir()
-        ]
+        folders = track_library(track_root).folder_paths()
         self.app_state.update_tracks([folder.name for folder in folders])
 
         if not folders:
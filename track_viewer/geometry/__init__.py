@@ -6,6 +6,7 @@ performing rendering. The only file IO here is optional LP loading.
 """
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -23,7 +24,8 @@ class CenterlineIndex:
 
     The index is immutable after construction and contains precomputed
     segment bounds for fast nearest-segment queries. It is transient and
-    rebuilt when the track changes.
+    rebuilt when the track changes; :func:`update_centerline_index` returns
+    a patched copy when only a few points moved.
     """
     segments: List[Tuple[Point, Point]]
     grid: Dict[tuple[int, int], List[int]]
@@ -105,6 +107,73 @@ def build_centerline_index(
     return CenterlineIndex(segments, grid, origin, cell_size, sampled_bounds)
 
 
+def _segment_cells(
+    start: Point, end: Point, origin: Tuple[float, float], cell_size: float
+) -> list[tuple[int, int]]:
+    min_x, min_y = origin
+    gx0 = int((min(start[0], end[0]) - min_x) // cell_size)
+    gx1 = int((max(start[0], end[0]) - min_x) // cell_size)
+    gy0 = int((min(start[1], end[1]) - min_y) // cell_size)
+    gy1 = int((max(start[1], end[1]) - min_y) // cell_size)
+    return [(gx, gy) for gx in range(gx0, gx1 + 1) for gy in range(gy0, gy1 + 1)]
+
+
+def update_centerline_index(
+    index: CenterlineIndex,
+    sampled_centerline: List[Point],
+    start: int,
+    old_stop: int,
+    new_stop: int,
+) -> CenterlineIndex | None:
+    """Return a copy of ``index`` after a splice of the sampled centreline.
+
+    Points ``start:old_stop`` of the indexed centreline were replaced by
+    ``sampled_centerline[start:new_stop]``. Only the segments touching the
+    splice are re-bucketed; later segment numbers are shifted. The bounds
+    must be unchanged so the grid origin and cell size still apply. Returns
+    ``None`` when the index has no grid; callers then rebuild from scratch.
+    """
+    old_count = len(index.segments)
+    count = len(sampled_centerline)
+    if not index.grid or index.origin is None or index.cell_size is None or not old_count or count < 2:
+        return None
+
+    delta = count - old_count
+    changed = sorted({i % count for i in range(start - 1, new_stop)})
+    grid = dict(index.grid)
+    copied: set[tuple[int, int]] = set()
+
+    def cell_list(cell: tuple[int, int]) -> list[int]:
+        if cell not in copied:
+            grid[cell] = list(grid.get(cell, ()))
+            copied.add(cell)
+        return grid[cell]
+
+    for seg_index in sorted({i % old_count for i in range(start - 1, old_stop)}):
+        seg_start, seg_end = index.segments[seg_index]
+        for cell in _segment_cells(seg_start, seg_end, index.origin, index.cell_size):
+            cell_list(cell).remove(seg_index)
+
+    if delta:
+        # Cell lists are sorted, so only their tails need renumbering.
+        for cell, members in grid.items():
+            first = bisect_left(members, old_stop)
+            if first < len(members):
+                grid[cell] = members[:first] + [i + delta for i in members[first:]]
+                copied.add(cell)
+
+    segments = index.segments[:start] + [None] * (new_stop - start) + index.segments[old_stop:]
+    for seg_index in changed:
+        segments[seg_index] = (sampled_centerline[seg_index], sampled_centerline[(seg_index + 1) % count])
+    for seg_index in changed:
+        seg_start, seg_end = segments[seg_index]
+        for cell in _segment_cells(seg_start, seg_end, index.origin, index.cell_size):
+            insort(cell_list(cell), seg_index)
+
+    grid = {cell: members for cell, members in grid.items() if members}
+    return CenterlineIndex(segments, grid, index.origin, index.cell_size, index.bounds)
+
+
 def query_centerline_segments(index: CenterlineIndex, x: float, y: float) -> list[int]:
     """Return candidate segment indices near a world-space point."""
     if not index.grid or index.origin is None or index.cell_size is None:
@@ -10,12 +10,18 @@ import math
 from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
 from PyQt5 import QtCore
 
 from icr2_core.lp.csv2lp import load_csv as load_lp_csv
 from icr2_core.lp.loader import LP_RESOLUTION, papy_speed_to_mph
-from icr2_core.lp.lpcalc import get_fake_radius1, get_fake_radius2, get_fake_radius3
+from icr2_core.lp.lpcalc import (
+    get_fake_radius1_array,
+    get_fake_radius2_array,
+    get_fake_radius3_array,
+)
 from icr2_core.lp.rpy import Rpy
+from icr2_core.trk.section_locator import section_locator
 from icr2_core.trk.surface_mesh import GroundSurfaceStrip
 from icr2_core.trk.trk_classes import TRKFile
 from icr2_core.trk.trk_utils import dlong2sect, getbounddlat, getxyz
@@ -321,7 +327,7 @@ class TrackPreviewModel(QtCore.QObject):
         car_index = rpy.car_index.index(car_id)
         dlongs = rpy.cars[car_index].dlong
         dlats = rpy.cars[car_index].dlat
-        if not dlongs or not dlats:
+        if len(dlongs) == 0 or len(dlats) == 0:
             return None, "Replay lap data is empty."
         start = max(0, start_frame - 2)
         end = min(len(dlongs), end_frame + 2)
@@ -334,305 +340,180 @@ class TrackPreviewModel(QtCore.QObject):
         if track_length <= 0:
             return None, "Track length is not available."
 
-        t1_dlong: list[int] = []
-        t1_dlat: list[int] = []
-        t1_radius: list[float] = []
-        t1_prev_rw_len: list[float] = [0.0]
-        t1_next_rw_len: list[float] = []
-        t1_rw_speed: list[float] = [0.0]
-        t1_sect: list[int] = []
-        t1_sect_type: list[int] = []
-
-        for i in range(start, end):
-            t1_dlong.append(int(dlongs[i]))
-            t1_dlat.append(int(dlats[i]))
-            cur_sect = self._trk_sect_id(self.trk, dlongs[i])
-            t1_sect.append(cur_sect)
-            t1_sect_type.append(self.trk.sects[cur_sect].type)
-
-        t1_dlong[0] = t1_dlong[0] - track_length
-        t1_dlong[1] = t1_dlong[1] - track_length
-        t1_dlong[-1] = t1_dlong[-1] + track_length
-        t1_dlong[-2] = t1_dlong[-2] + track_length
-
-        for i in range(0, frames):
-            cur_frame = i
-            next_frame = 4 if i == frames - 1 else i + 1
-            if t1_sect_type[cur_frame] == 1 and t1_sect_type[next_frame] == 1:
-                t1_radius.append(0.0)
-            elif t1_sect_type[cur_frame] == 2 and t1_sect_type[next_frame] == 2:
-                if t1_sect[cur_frame] == t1_sect[next_frame]:
-                    t1_radius.append(
-                        self._trk_sect_radius(self.trk, t1_sect[cur_frame])
-                    )
-                else:
-                    dlongc = self.trk.sects[t1_sect[next_frame]].start_dlong
-                    dlong0 = t1_dlong[cur_frame]
-                    r0 = self._trk_sect_radius(self.trk, t1_sect[cur_frame])
-                    dlong1 = t1_dlong[next_frame]
-                    r1 = self._trk_sect_radius(self.trk, t1_sect[next_frame])
-                    t1_radius.append(get_fake_radius3(dlongc, dlong0, r0, dlong1, r1))
-            elif t1_sect_type[cur_frame] == 1 and t1_sect_type[next_frame] == 2:
-                t1_radius.append(
-                    get_fake_radius1(
-                        self._trk_sect_radius(self.trk, t1_sect[next_frame]),
-                        t1_dlong[next_frame],
-                        self.trk.sects[t1_sect[next_frame]].start_dlong,
-                        t1_dlong[cur_frame],
-                    )
-                )
-                t1_sect_type[cur_frame] = 2
-            elif t1_sect_type[cur_frame] == 2 and t1_sect_type[next_frame] == 1:
-                t1_radius.append(
-                    get_fake_radius2(
-                        self._trk_sect_radius(self.trk, t1_sect[cur_frame - 1]),
-                        self.trk.sects[t1_sect[next_frame]].start_dlong,
-                        t1_dlong[cur_frame],
-                        t1_dlong[next_frame],
-                    )
-                )
-            else:
-                return None, f"Unable to calculate replay radius at frame {i}."
-
-        for i in range(1, frames):
-            cur = i
-            prev = i - 1
-            next_frame = 4 if i == frames - 1 else i + 1
-            if t1_sect_type[prev] == 1:
-                a = (t1_dlong[cur] - t1_dlong[prev]) ** 2
-                b = (t1_dlat[cur] - t1_dlat[prev]) ** 2
-                t1_prev_rw_len.append(math.sqrt(a + b))
-            else:
-                denom = 2 * float(t1_radius[prev])
-                if denom == 0:
-                    return None, "Replay radius calculation produced zero values."
-                a = (
-                    (2 * t1_radius[prev] - t1_dlat[cur] - t1_dlat[prev])
-                    * (t1_dlong[cur] - t1_dlong[prev])
-                    / denom
-                )
-                b = t1_dlat[cur] - t1_dlat[prev]
-                t1_prev_rw_len.append(math.sqrt(a**2 + b**2))
-            if next_frame >= frames:
-                return None, "Replay lap data is too short for interpolation."
-
-        for i in range(0, frames):
-            next_frame = 4 if i == frames - 1 else i + 1
-            t1_next_rw_len.append(t1_prev_rw_len[next_frame])
-
-        for i in range(1, frames):
-            t1_rw_speed.append(
-                (t1_prev_rw_len[i] + t1_next_rw_len[i]) / 2 * 54000 / 31680000
-            )
-
-        num_lp_recs = (track_length // 65536) + 2
-        lp_dlong: list[float] = []
-        lp_dlat: list[float] = []
-        lp_rw_speed: list[float] = []
-
-        for i in range(0, num_lp_recs):
-            cur_dlong = track_length if i == num_lp_recs - 1 else i * 65536
-            lp_dlong.append(cur_dlong)
-            ref_index = None
-            for j in range(0, len(t1_dlong) - 1):
-                if t1_dlong[j] <= cur_dlong < t1_dlong[j + 1]:
-                    ref_index = j
-                    break
-            if ref_index is None:
-                if cur_dlong < t1_dlong[0]:
-                    ref_index = 0
-                else:
-                    ref_index = len(t1_dlong) - 2
-            denom = t1_dlong[ref_index + 1] - t1_dlong[ref_index]
-            if denom == 0:
-                return None, "Replay lap data has duplicate DLONG entries."
-            cur_dlat = (
-                (cur_dlong - t1_dlong[ref_index]) * t1_dlat[ref_index + 1]
-                + (t1_dlong[ref_index + 1] - cur_dlong) * t1_dlat[ref_index]
-            ) / denom
-            lp_dlat.append(cur_dlat)
-            cur_rw_speed = (
-                (cur_dlong - t1_dlong[ref_index]) * t1_rw_speed[ref_index + 1]
-                + (t1_dlong[ref_index + 1] - cur_dlong) * t1_rw_speed[ref_index]
-            ) / denom
-            lp_rw_speed.append(cur_rw_speed)
-
-        lp_dlong = (
-            [track_length - 65536 * 2, track_length - 65536]
-            + lp_dlong
-            + [
-                track_length - lp_dlong[-2],
-                (track_length - lp_dlong[-2]) * 2,
-            ]
+        sect_starts = np.array(
+            [sect.start_dlong for sect in self.trk.sects], dtype=np.float64
         )
-
-        dlat_start_change = lp_dlat[1] - lp_dlat[0]
-        dlat_end_change = lp_dlat[-1] - lp_dlat[-2]
-        lp_dlat = (
-            [lp_dlat[0] - dlat_start_change * 2, lp_dlat[0] - dlat_start_change]
-            + lp_dlat
-            + [lp_dlat[-1] + dlat_end_change, lp_dlat[-1] + dlat_end_change * 2]
+        sect_radii = np.array(
+            [
+                self._trk_sect_radius(self.trk, sect_id)
+                for sect_id in range(self.trk.num_sects)
+            ],
+            dtype=np.float64,
         )
-
-        speed_start_change = lp_rw_speed[1] - lp_rw_speed[0]
-        speed_end_change = lp_rw_speed[-1] - lp_rw_speed[-2]
+        sect_types = np.array([sect.type for sect in self.trk.sects])
+        locator = section_locator(self.trk)
+
+        # Table 1: replay frames on the TRK, padded by two frames either side
+        # of the lap and unwrapped across the start/finish line.
+        raw_dlong = np.asarray(dlongs[start:end])
+        t1_sect = locator.sections(raw_dlong)
+        t1_dlong = raw_dlong.astype(np.int64).astype(np.float64)
+        t1_dlat = np.asarray(dlats[start:end]).astype(np.int64).astype(np.float64)
+        t1_dlong[:2] -= track_length
+        t1_dlong[-2:] += track_length
+
+        frame_ids = np.arange(frames)
+        next_frames = frame_ids + 1
+        next_frames[-1] = 4
+        t1_radius, t1_sect_type, bad_frame = self._replay_radii(
+            t1_sect,
+            sect_types[t1_sect],
+            t1_dlong,
+            next_frames,
+            frame_ids - 1,
+            sect_starts,
+            sect_radii,
+        )
+        if bad_frame is not None:
+            return None, f"Unable to calculate replay radius at frame {bad_frame}."
+
+        t1_prev_rw_len = np.zeros(frames)
+        lengths = self._replay_rw_lengths(
+            t1_sect_type[:-1],
+            t1_radius[:-1],
+            t1_dlong[1:] - t1_dlong[:-1],
+            t1_dlat[1:],
+            t1_dlat[:-1],
+        )
+        if lengths is None:
+            return None, "Replay radius calculation produced zero values."
+        t1_prev_rw_len[1:] = lengths
+        t1_next_rw_len = t1_prev_rw_len[next_frames]
+        t1_rw_speed = (t1_prev_rw_len + t1_next_rw_len) / 2 * 54000 / 31680000
+        t1_rw_speed[0] = 0.0
+
+        # Resample the replay onto LP spacing, extrapolating from the end
+        # segments for DLONGs outside the replay range.
+        num_lp_recs = (track_length // 65536) + 2
+        lp_dlong = np.arange(num_lp_recs, dtype=np.int64) * 65536
+        lp_dlong[-1] = track_length
+        ref_index = self._replay_segment_index(t1_dlong, lp_dlong)
+        seg_start = t1_dlong[ref_index]
+        seg_end = t1_dlong[ref_index + 1]
+        denom = seg_end - seg_start
+        if np.any(denom == 0):
+            return None, "Replay lap data has duplicate DLONG entries."
+        lp_dlat = (
+            (lp_dlong - seg_start) * t1_dlat[ref_index + 1]
+            + (seg_end - lp_dlong) * t1_dlat[ref_index]
+        ) / denom
         lp_rw_speed = (
-            [
-                lp_rw_speed[0] - speed_start_change * 2,
-                lp_rw_speed[0] - speed_start_change,
-            ]
-            + lp_rw_speed
-            + [
-                lp_rw_speed[-1] + speed_end_change,
-                lp_rw_speed[-1] + speed_end_change * 2,
-            ]
+            (lp_dlong - seg_start) * t1_rw_speed[ref_index + 1]
+            + (seg_end - lp_dlong) * t1_rw_speed[ref_index]
+        ) / denom
+
+        tail_dlong = track_length - int(lp_dlong[-2])
+        lp_dlong = np.concatenate(
+            (
+                [track_length - 65536 * 2, track_length - 65536],
+                lp_dlong,
+                [tail_dlong, tail_dlong * 2],
+            )
         )
+        lp_dlat = self._extend_linear(lp_dlat)
+        lp_rw_speed = self._extend_linear(lp_rw_speed)
 
+        # Table 3: LP records, padded by two records either side.
         num_lp_recs2 = num_lp_recs + 4
-        t3_next_rw_len: list[float] = []
-        t3_prev_rw_len: list[float] = []
-        t3_next_lp_len: list[float] = []
-        t3_prev_lp_len: list[float] = [0.0]
-        t3_radius: list[float] = []
-        t3_sect: list[int] = []
-        t3_sect_type: list[int] = []
-        lp_speed: list[float] = [0.0]
-        coriolis1: list[float] = [0.0]
-
-        for i in range(0, num_lp_recs2):
-            t3_sect_type.append(self._trk_sect_type(self.trk, lp_dlong[i]))
-            t3_sect.append(self._trk_sect_id(self.trk, lp_dlong[i]))
-
-        lp_dlong[0] = lp_dlong[0] - track_length
-        lp_dlong[1] = lp_dlong[1] - track_length
-        lp_dlong[-1] = lp_dlong[-1] + track_length
-        lp_dlong[-2] = lp_dlong[-2] + track_length
-
-        for i in range(0, num_lp_recs2):
-            cur = i
-            prev = num_lp_recs + 2 if i == 0 else i - 1
-            next_record = 0 if i == num_lp_recs + 3 else i + 1
-
-            if t3_sect_type[cur] == 1 and t3_sect_type[next_record] == 1:
-                t3_radius.append(0.0)
-            elif t3_sect_type[cur] == 2 and t3_sect_type[next_record] == 2:
-                if t3_sect[cur] == t3_sect[next_record]:
-                    t3_radius.append(self._trk_sect_radius(self.trk, t3_sect[cur]))
-                else:
-                    dlongc = self.trk.sects[t3_sect[next_record]].start_dlong
-                    dlong0 = lp_dlong[cur]
-                    r0 = self._trk_sect_radius(self.trk, t3_sect[cur])
-                    dlong1 = lp_dlong[next_record]
-                    r1 = self._trk_sect_radius(self.trk, t3_sect[next_record])
-                    t3_radius.append(get_fake_radius3(dlongc, dlong0, r0, dlong1, r1))
-            elif t3_sect_type[cur] == 1 and t3_sect_type[next_record] == 2:
-                t3_radius.append(
-                    get_fake_radius1(
-                        self._trk_sect_radius(self.trk, t3_sect[next_record]),
-                        lp_dlong[next_record],
-                        self.trk.sects[t3_sect[next_record]].start_dlong,
-                        lp_dlong[cur],
-                    )
-                )
-                t3_sect_type[cur] = 2
-            elif t3_sect_type[cur] == 2 and t3_sect_type[next_record] == 1:
-                t3_radius.append(
-                    get_fake_radius2(
-                        self._trk_sect_radius(self.trk, t3_sect[prev]),
-                        self.trk.sects[t3_sect[next_record]].start_dlong,
-                        lp_dlong[cur],
-                        lp_dlong[next_record],
-                    )
-                )
-            else:
-                return None, f"Unable to calculate LP radius at record {i}."
-
-        for i in range(0, num_lp_recs2):
-            cur = i
-            if i == 0:
-                prev = num_lp_recs - 2
-                prev_dlong = -65536
-            else:
-                prev = i - 1
-                prev_dlong = int(lp_dlong[prev])
-            if i == num_lp_recs - 1:
-                next_record = 0
-            else:
-                next_record = i + 1
-
-            if t3_sect_type[prev] == 1:
-                a = (lp_dlong[cur] - prev_dlong) ** 2
-                b = (lp_dlat[cur] - lp_dlat[prev]) ** 2
-                t3_prev_rw_len.append(math.sqrt(a + b))
-            else:
-                denom = 2 * float(t3_radius[prev])
-                if denom == 0:
-                    return None, "LP radius calculation produced zero values."
-                a = (
-                    (2 * t3_radius[prev] - lp_dlat[cur] - lp_dlat[prev])
-                    * (lp_dlong[cur] - lp_dlong[prev])
-                    / denom
-                )
-                b = lp_dlat[cur] - lp_dlat[prev]
-                t3_prev_rw_len.append(math.sqrt(a**2 + b**2))
-
-        for i in range(0, num_lp_recs2):
-            next_record = 0 if i == num_lp_recs2 - 1 else i + 1
-            t3_next_rw_len.append(t3_prev_rw_len[next_record])
-
-        for i in range(0, num_lp_recs2 - 1):
-            if t3_radius[i] == 0:
-                t3_next_lp_len.append(lp_dlong[i + 1] - lp_dlong[i])
-            else:
-                t3_next_lp_len.append(
-                    (lp_dlong[i + 1] - lp_dlong[i])
-                    * (t3_radius[i] - lp_dlat[i])
-                    / t3_radius[i]
-                )
-
-        for i in range(1, num_lp_recs2 - 1):
-            t3_prev_lp_len.append(t3_next_lp_len[i - 1])
+        t3_sect = locator.sections(lp_dlong)
+        lp_dlong = lp_dlong.astype(np.float64)
+        lp_dlong[:2] -= track_length
+        lp_dlong[-2:] += track_length
+
+        record_ids = np.arange(num_lp_recs2)
+        next_records = record_ids + 1
+        next_records[-1] = 0
+        prev_records = record_ids - 1
+        prev_records[0] = num_lp_recs + 2
+        t3_radius, t3_sect_type, bad_record = self._replay_radii(
+            t3_sect,
+            sect_types[t3_sect],
+            lp_dlong,
+            next_records,
+            prev_records,
+            sect_starts,
+            sect_radii,
+        )
+        if bad_record is not None:
+            return None, f"Unable to calculate LP radius at record {bad_record}."
+
+        # The first record measures from one LP step before the line against
+        # the DLAT at the end of the lap.
+        prev_records[0] = num_lp_recs - 2
+        prev_dlong = lp_dlong[prev_records]
+        prev_dlong[0] = -65536
+        t3_prev_rw_len = self._replay_rw_lengths(
+            t3_sect_type[prev_records],
+            t3_radius[prev_records],
+            lp_dlong - prev_dlong,
+            lp_dlat,
+            lp_dlat[prev_records],
+            curve_dlong_delta=lp_dlong - lp_dlong[prev_records],
+        )
+        if t3_prev_rw_len is None:
+            return None, "LP radius calculation produced zero values."
+        t3_next_rw_len = t3_prev_rw_len[next_records]
+
+        step = lp_dlong[1:] - lp_dlong[:-1]
+        radius = t3_radius[:-1]
+        curved = radius != 0
+        t3_next_lp_len = step.copy()
+        t3_next_lp_len[curved] = (
+            step[curved] * (radius[curved] - lp_dlat[:-1][curved]) / radius[curved]
+        )
+        t3_prev_lp_len = np.concatenate(([0.0], t3_next_lp_len[:-1]))
+
+        inner = slice(1, num_lp_recs2 - 1)
+        lp_speed = np.zeros(num_lp_recs2 - 1)
+        rw_len = t3_next_rw_len[inner] + t3_prev_rw_len[inner]
+        moving = rw_len != 0
+        lp_speed[1:][moving] = (
+            lp_rw_speed[inner][moving]
+            * (t3_prev_lp_len[1:][moving] + t3_next_lp_len[1:][moving])
+            / rw_len[moving]
+        )
 
-        for i in range(1, num_lp_recs2 - 1):
-            denom = t3_next_rw_len[i] + t3_prev_rw_len[i]
-            if denom == 0:
-                lp_speed.append(0.0)
-            else:
-                lp_speed.append(
-                    lp_rw_speed[i] * (t3_prev_lp_len[i] + t3_next_lp_len[i]) / denom
-                )
+        coriolis1 = np.zeros(num_lp_recs2 - 1)
+        span = lp_dlong[2:] - lp_dlong[:-2]
+        spanned = span != 0
+        coriolis1[1:][spanned] = (
+            (lp_dlat[2:][spanned] - lp_dlat[:-2][spanned]) / span[spanned]
+        ) * (lp_speed[1:][spanned] * 31680000 / 54000)
 
-        for i in range(1, num_lp_recs2 - 1):
-            denom = lp_dlong[i + 1] - lp_dlong[i - 1]
-            if denom == 0:
-                coriolis1.append(0.0)
-            else:
-                coriolis1.append(
-                    ((lp_dlat[i + 1] - lp_dlat[i - 1]) / denom)
-                    * (lp_speed[i] * 31680000 / 54000)
-                )
+        output = slice(2, num_lp_recs2 - 2)
+        speed_raw = np.rint(lp_speed[output] * (1 / 15) * (1 / 3600) * 6000 * 5280)
+        coriolis = np.rint(coriolis1[output])
+        out_dlat = np.rint(lp_dlat[output])
+        out_dlong = lp_dlong[output]
 
         records: list[LpPoint] = []
-        for i in range(2, num_lp_recs2 - 2):
-            speed_raw = int(
-                round(lp_speed[i] * (1 / 15) * (1 / 3600) * 6000 * 5280)
-            )
-            coriolis = float(round(coriolis1[i]))
-            dlat = float(round(lp_dlat[i]))
-            dlong = float(lp_dlong[i])
+        for i in range(len(out_dlong)):
+            dlong = float(out_dlong[i])
+            dlat = float(out_dlat[i])
             try:
                 x, y, _ = getxyz(self.trk, dlong, dlat, self.centerline)
             except Exception as exc:
                 return None, f"Failed to project LP record at DLONG {dlong:.0f}: {exc}"
+            record_speed = int(speed_raw[i])
             records.append(
                 LpPoint(
                     x=x,
                     y=y,
                     dlong=dlong,
                     dlat=dlat,
-                    speed_raw=speed_raw,
-                    speed_mph=papy_speed_to_mph(speed_raw),
-                    lateral_speed=coriolis,
+                    speed_raw=record_speed,
+                    speed_mph=papy_speed_to_mph(record_speed),
+                    lateral_speed=float(coriolis[i]),
                 )
             )
 
@@ -948,15 +829,133 @@ class TrackPreviewModel(QtCore.QObject):
         return (min_x, max_x, min_y, max_y)
 
     @staticmethod
-    def _trk_sect_id(trk: TRKFile, dlong: float) -> int:
-        for i in range(0, trk.num_sects - 1):
-            if trk.sects[i].start_dlong <= dlong < trk.sects[i + 1].start_dlong:
-                return i
-        return trk.num_sects - 1
+    def _replay_radii(
+        sect_ids: np.ndarray,
+        sect_types: np.ndarray,
+        dlongs: np.ndarray,
+        next_ids: np.ndarray,
+        prev_ids: np.ndarray,
+        sect_starts: np.ndarray,
+        sect_radii: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, int | None]:
+        """Return per-point radii, adjusted section types and any bad index.
+
+        Points on a straight that lead into a curve are re-typed as curves,
+        matching the spreadsheet method the LP tools are based on. Only the
+        wrapped final point sees the re-typed value of its successor.
+        """
+        types = sect_types.copy()
+        promoted = (sect_types[:-1] == 1) & (sect_types[1:] == 2)
+        types[:-1][promoted] = 2
+        next_types = sect_types[next_ids]
+        next_types[-1] = types[next_ids[-1]]
+
+        straight = (sect_types == 1) & (next_types == 1)
+        curve = (sect_types == 2) & (next_types == 2)
+        entry = (sect_types == 1) & (next_types == 2)
+        exit_ = (sect_types == 2) & (next_types == 1)
+        types[entry] = 2
+        invalid = ~(straight | curve | entry | exit_)
+
+        next_sects = sect_ids[next_ids]
+        next_dlongs = dlongs[next_ids]
+        next_starts = sect_starts[next_sects]
+        radius = np.zeros(len(dlongs))
+        same = curve & (sect_ids == next_sects)
+        blend = curve & ~same
+        with np.errstate(divide="ignore", invalid="ignore"):
+            radius[same] = sect_radii[sect_ids[same]]
+            radius[blend] = get_fake_radius3_array(
+                next_starts[blend],
+                dlongs[blend],
+                sect_radii[sect_ids[blend]],
+                next_dlongs[blend],
+                sect_radii[next_sects[blend]],
+            )
+            radius[entry] = get_fake_radius1_array(
+                sect_radii[next_sects[entry]],
+                next_dlongs[entry],
+                next_starts[entry],
+                dlongs[entry],
+            )
+            radius[exit_] = get_fake_radius2_array(
+                sect_radii[sect_ids[prev_ids[exit_]]],
+                next_starts[exit_],
+                dlongs[exit_],
+                next_dlongs[exit_],
+            )
+        invalid |= ~np.isfinite(radius)
+        if np.any(invalid):
+            return radius, types, int(np.argmax(invalid))
+        return radius, types, None
+
+    @staticmethod
+    def _replay_rw_lengths(
+        prev_types: np.ndarray,
+        prev_radius: np.ndarray,
+        dlong_delta: np.ndarray,
+        dlats: np.ndarray,
+        prev_dlats: np.ndarray,
+        *,
+        curve_dlong_delta: np.ndarray | None = None,
+    ) -> np.ndarray | None:
+        """Return real-world distances from each previous point, or ``None``.
+
+        Straights use the plain DLONG/DLAT distance; curves scale the DLONG
+        step by the radius at the mean DLAT. ``None`` signals a zero radius.
+        """
+        if curve_dlong_delta is None:
+            curve_dlong_delta = dlong_delta
+        straight = prev_types == 1
+        curved = ~straight
+        if np.any(prev_radius[curved] == 0):
+            return None
+        dlat_delta = dlats - prev_dlats
+        lengths = np.sqrt(dlong_delta**2 + dlat_delta**2)
+        radius = prev_radius[curved]
+        a = (
+            (2 * radius - dlats[curved] - prev_dlats[curved])
+            * curve_dlong_delta[curved]
+            / (2 * radius)
+        )
+        lengths[curved] = np.sqrt(a**2 + dlat_delta[curved] ** 2)
+        return lengths
+
+    @staticmethod
+    def _replay_segment_index(
+        sample_dlongs: np.ndarray, dlongs: np.ndarray
+    ) -> np.ndarray:
+        """Return the sample segment used to interpolate each DLONG.
+
+        Each DLONG maps to the first segment containing it; DLONGs outside the
+        samples use the first or last segment so values are extrapolated.
+        """
+        last_segment = len(sample_dlongs) - 2
+        if np.all(np.diff(sample_dlongs) > 0):
+            index = np.searchsorted(sample_dlongs, dlongs, side="right") - 1
+            return np.clip(index, 0, last_segment)
+        # Replays where the car backs up are not sorted; scan for the first
+        # containing segment instead.
+        contains = (sample_dlongs[:-1] <= dlongs[:, None]) & (
+            dlongs[:, None] < sample_dlongs[1:]
+        )
+        index = np.argmax(contains, axis=1)
+        missing = ~contains.any(axis=1)
+        index[missing] = np.where(dlongs[missing] < sample_dlongs[0], 0, last_segment)
+        return index
 
     @staticmethod
-    def _trk_sect_type(trk: TRKFile, dlong: float) -> int:
-        return trk.sects[TrackPreviewModel._trk_sect_id(trk, dlong)].type
+    def _extend_linear(values: np.ndarray) -> np.ndarray:
+        """Pad two linearly extrapolated values onto each end of ``values``."""
+        start_change = values[1] - values[0]
+        end_change = values[-1] - values[-2]
+        return np.concatenate(
+            (
+                [values[0] - start_change * 2, values[0] - start_change],
+                values,
+                [values[-1] + end_change, values[-1] + end_change * 2],
+            )
+        )
 
     @staticmethod
     def _trk_sect_radius(trk: TRKFile, sect_id: int) -> float:
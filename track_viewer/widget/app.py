@@ -5,9 +5,11 @@ import math
 from pathlib import Path
 from typing import Callable, Optional, Sequence
 
+import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from icr2_core.cam.helpers import CameraPosition
+from icr2_core.lp.replay_analysis import detect_lap_boundaries, lap_drop_threshold
 from icr2_core.lp.rpy import Rpy
 from track_viewer.model.camera_models import CameraViewListing
 from track_viewer.sidebar.coordinate_sidebar import CoordinateSidebar
@@ -1361,19 +1363,11 @@ class TrackViewerWindow(TrackTxtFieldMixin, QtWidgets.QMainWindow):
         if car_id not in rpy.car_index:
             return []
         car_index = rpy.car_index.index(car_id)
-        dlong = rpy.cars[car_index].dlong
-        if not dlong:
+        dlong = np.asarray(rpy.cars[car_index].dlong)
+        if len(dlong) == 0 or dlong.max() <= dlong.min():
             return []
-        min_dlong = min(dlong)
-        max_dlong = max(dlong)
-        dlong_range = max_dlong - min_dlong
-        if dlong_range <= 0:
-            return []
-        drop_threshold = max(10_000, int(dlong_range * 0.5))
-        lap_frames: list[int] = []
-        for i in range(1, len(dlong)):
-            if dlong[i] < dlong[i - 1] - drop_threshold:
-                lap_frames.append(i)
+        drop_threshold = lap_drop_threshold(dlong)
+        lap_frames = detect_lap_boundaries(dlong).tolist()
         laps: list[ReplayLapInfo] = []
         start_frame = 0
         lap_number = 1
@@ -0,0 +1,504 @@
+"""Batch generation of TSO objects from a parameter table.
+
+Each row of a CSV or JSON table describes one object using the same keys as
+the generator window and its templates, plus an optional ``name`` for the
+output file. Rows that describe the same geometry are generated once, the
+meshes are held as NumPy vertex and face arrays and deduplicated by content
+hash, and every .3D file is formatted before any of them is written. Large
+tables and parameter sweeps are spread over worker processes.
+
+Usage:
+    python -m tso_generator.batch objects.csv out/
+    python -m tso_generator.batch tower.json out/ --sweep height=100,200,300
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Iterable, Mapping, Sequence
+
+if __package__ is None or __package__ == "":
+    # Run as a script this folder comes first, where tso_generator.py would
+    # shadow the package of the same name.
+    sys.path[0] = str(Path(__file__).resolve().parent.parent)
+
+import numpy as np
+
+from icr2_core.parallel import worker_count
+from tso_generator.tso_generator import format_3d, generate_building
+
+# Defaults of the generator window, in the order it passes them to write_3d.
+DEFAULT_PARAMETERS: dict[str, object] = {
+    "building_shape": "rectangular",
+    "width": 320,
+    "depth": 1042,
+    "rect_center_origin": False,
+    "diameter": 320,
+    "num_sides": 16,
+    "height": 100,
+    "bridge_length": 320,
+    "bridge_width": 80,
+    "bridge_clearance": 100,
+    "bridge_height": 20,
+    "bridge_half": False,
+    "grandstand_length": 320,
+    "grandstand_width": 120,
+    "grandstand_height": 100,
+    "grandstand_angle": 39.8,
+    "grandstand_front_height": 0,
+    "tree_trunk_width": 30,
+    "tree_leaf_base_height": 100,
+    "tree_num_sides": 12,
+    "tree_profile": "pointy",
+    "roof_type": "flat",
+    "parapet_inset": 30,
+    "parapet_height": 15,
+    "gable_rise": 50,
+    "pyramid_rise": 50,
+    "dome_layers": 4,
+    "dome_roundness": 100,
+    "sunny_pcx": "",
+    "roof_color_bright": 0,
+    "roof_color_dark": 0,
+    "side_color_bright": 0,
+    "side_color_dark": 0,
+    "tree_trunk_color_bright": 0,
+    "tree_trunk_color_dark": 0,
+    "tree_leaves_color_bright": 0,
+    "tree_leaves_color_dark": 0,
+}
+
+_TEXT_FIELDS = {"building_shape", "tree_profile", "roof_type", "sunny_pcx"}
+_BOOL_FIELDS = {"rect_center_origin", "bridge_half"}
+_FLOAT_FIELDS = {"grandstand_angle"}
+_CHOICES = {
+    "building_shape": ("rectangular", "circular", "tree", "bridge", "grandstand"),
+    "roof_type": ("none", "flat", "parapet", "gable", "pyramid", "dome"),
+    "tree_profile": ("pointy", "round", "palm"),
+}
+# Older templates only have one colour per tree part, which is the bright one.
+_LEGACY_COLOR_KEYS = {
+    "tree_trunk_color": "tree_trunk_color_bright",
+    "tree_leaves_color": "tree_leaves_color_bright",
+}
+# A dark colour that is not given is the same as its bright colour.
+_DARK_COLOR_KEYS = {
+    "roof_color_dark": "roof_color_bright",
+    "side_color_dark": "side_color_bright",
+    "tree_trunk_color_dark": "tree_trunk_color_bright",
+    "tree_leaves_color_dark": "tree_leaves_color_bright",
+}
+
+# Table key -> generate_building argument.
+_GEOMETRY_ARGUMENTS = {
+    "width": "width",
+    "depth": "depth",
+    "height": "height",
+    "roof_type": "roof_type",
+    "parapet_inset": "inset",
+    "parapet_height": "roof_height",
+    "gable_rise": "gable_rise",
+    "pyramid_rise": "pyramid_rise",
+    "building_shape": "building_shape",
+    "diameter": "diameter",
+    "num_sides": "num_sides",
+    "dome_layers": "dome_layers",
+    "dome_roundness": "dome_roundness",
+    "rect_center_origin": "rect_center_origin",
+    "tree_trunk_width": "tree_trunk_width",
+    "tree_leaf_base_height": "tree_leaf_base_height",
+    "tree_num_sides": "tree_num_sides",
+    "tree_profile": "tree_profile",
+    "bridge_length": "bridge_length",
+    "bridge_width": "bridge_width",
+    "bridge_clearance": "bridge_clearance",
+    "bridge_height": "bridge_height",
+    "bridge_half": "bridge_half",
+    "grandstand_length": "grandstand_length",
+    "grandstand_width": "grandstand_width",
+    "grandstand_height": "grandstand_height",
+    "grandstand_front_height": "grandstand_front_height",
+}
+_SHAPE_GEOMETRY_KEYS = {
+    "tree": ("width", "height", "tree_trunk_width", "tree_leaf_base_height", "tree_num_sides", "tree_profile"),
+    "circular": ("diameter", "num_sides", "height", "roof_type", "dome_layers", "dome_roundness"),
+    "bridge": ("bridge_length", "bridge_width", "bridge_clearance", "bridge_height", "bridge_half"),
+    "grandstand": ("grandstand_length", "grandstand_width", "grandstand_height", "grandstand_front_height"),
+}
+_RECTANGULAR_ROOF_KEYS = {
+    "parapet": ("parapet_inset", "parapet_height"),
+    "gable": ("gable_rise",),
+    "pyramid": ("pyramid_rise",),
+}
+
+
+def _parse_value(key: str, raw: object) -> object:
+    if isinstance(raw, bool) and key in _BOOL_FIELDS:
+        return raw
+    text = str(raw).strip()
+    if key in _TEXT_FIELDS:
+        choices = _CHOICES.get(key)
+        if choices is not None and text not in choices:
+            raise ValueError(f"{key} must be one of {', '.join(choices)}, got {text!r}")
+        return text
+    if key in _BOOL_FIELDS:
+        if text.lower() in {"1", "true", "yes", "on"}:
+            return True
+        if text.lower() in {"0", "false", "no", "off"}:
+            return False
+        raise ValueError(f"{key} must be true or false, got {text!r}")
+    try:
+        return float(raw) if key in _FLOAT_FIELDS else int(raw)
+    except (TypeError, ValueError):
+        kind = "a number" if key in _FLOAT_FIELDS else "an integer"
+        raise ValueError(f"{key} must be {kind}, got {text!r}") from None
+
+
+def normalize_parameters(row: Mapping[str, object]) -> dict[str, object]:
+    """Table row merged over the window defaults, with values coerced.
+
+    Blank cells keep the default and missing colours follow the rules of the
+    generator window's templates: the legacy ``tree_trunk_color`` and
+    ``tree_leaves_color`` keys set the bright colour and a dark colour falls
+    back to its bright one. Unknown keys, unparsable values and unknown
+    shape, roof or profile names raise :class:`ValueError`.
+    """
+    params = dict(DEFAULT_PARAMETERS)
+    given: dict[str, object] = {}
+    for key, raw in row.items():
+        if key == "name":
+            continue
+        if key not in params and key not in _LEGACY_COLOR_KEYS:
+            raise ValueError(f"Unknown TSO parameter: {key}")
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            continue
+        given[key] = _parse_value(key, raw)
+    for legacy, bright in _LEGACY_COLOR_KEYS.items():
+        if legacy in given:
+            given.setdefault(bright, given.pop(legacy))
+    for dark, bright in _DARK_COLOR_KEYS.items():
+        if dark not in given and bright in given:
+            given[dark] = given[bright]
+    params.update(given)
+    return params
+
+
+def geometry_key(params: Mapping[str, object]) -> tuple[tuple[str, object], ...]:
+    """The parameters that affect the mesh of ``params``, as a hashable key."""
+    shape = str(params["building_shape"])
+    keys = _SHAPE_GEOMETRY_KEYS.get(shape)
+    if keys is None:
+        roof = str(params["roof_type"])
+        keys = ("width", "depth", "height", "roof_type", "rect_center_origin") + _RECTANGULAR_ROOF_KEYS.get(roof, ())
+    return (("building_shape", shape),) + tuple((key, params[key]) for key in keys)
+
+
+def _generate(key: tuple[tuple[str, object], ...]):
+    arguments = {_GEOMETRY_ARGUMENTS[name]: DEFAULT_PARAMETERS[name] for name in _GEOMETRY_ARGUMENTS}
+    arguments.update({_GEOMETRY_ARGUMENTS[name]: value for name, value in key})
+    return generate_building(**arguments)
+
+
+@dataclass(frozen=True)
+class Mesh:
+    """A generated object as arrays.
+
+    ``vertices`` holds the coordinates and ``integral`` marks components the
+    generator produced as ints, so :meth:`to_geometry` gives back exactly
+    what :func:`generate_building` returned. Face ``i`` uses the vertex
+    indices ``face_indices[face_offsets[i]:face_offsets[i + 1]]``.
+    """
+
+    vertex_names: tuple[str, ...]
+    vertices: np.ndarray
+    integral: np.ndarray
+    face_names: tuple[str, ...]
+    face_indices: np.ndarray
+    face_offsets: np.ndarray
+
+    @classmethod
+    def from_geometry(cls, verts: Mapping[str, tuple], faces: Sequence[tuple[str, Sequence[str]]]) -> Mesh:
+        names = tuple(verts)
+        lookup = {name: index for index, name in enumerate(names)}
+        points = [verts[name] for name in names]
+        indices = [lookup[name] for _face, members in faces for name in members]
+        counts = [len(members) for _face, members in faces]
+        return cls(
+            vertex_names=names,
+            vertices=np.array(points, dtype=np.float64).reshape(-1, 3),
+            integral=np.array([[isinstance(c, int) for c in point] for point in points], dtype=bool).reshape(-1, 3),
+            face_names=tuple(name for name, _members in faces),
+            face_indices=np.array(indices, dtype=np.int32),
+            face_offsets=np.concatenate(([0], np.cumsum(counts, dtype=np.int32))).astype(np.int32),
+        )
+
+    def to_geometry(self) -> tuple[dict[str, tuple], list[tuple[str, list[str]]]]:
+        """``(verts, faces)`` in the form :func:`format_3d` takes."""
+        verts = {}
+        for name, point, integral in zip(self.vertex_names, self.vertices.tolist(), self.integral.tolist()):
+            verts[name] = tuple(int(c) if is_int else c for c, is_int in zip(point, integral))
+        names = self.vertex_names
+        indices = self.face_indices.tolist()
+        offsets = self.face_offsets.tolist()
+        faces = [
+            (face, [names[i] for i in indices[start:end]])
+            for face, start, end in zip(self.face_names, offsets, offsets[1:])
+        ]
+        return verts, faces
+
+    @cached_property
+    def digest(self) -> str:
+        sha = hashlib.sha1()
+        sha.update("\0".join(self.vertex_names).encode("utf-8"))
+        sha.update("\0".join(self.face_names).encode("utf-8"))
+        for array in (self.vertices, self.integral, self.face_indices, self.face_offsets):
+            sha.update(np.ascontiguousarray(array).tobytes())
+        return sha.hexdigest()
+
+    def merge_vertices(self) -> Mesh:
+        """Collapse vertices at the same position into the first of them.
+
+        Faces lose the repeated corners this leaves behind, and faces with
+        fewer than three corners left are dropped.
+        """
+        if not len(self.vertices):
+            return self
+        _unique, first, inverse = np.unique(self.vertices, axis=0, return_index=True, return_inverse=True)
+        if len(first) == len(self.vertices):
+            return self
+        keep = np.sort(first)
+        renumber = np.empty(len(self.vertices), dtype=np.int32)
+        renumber[keep] = np.arange(len(keep), dtype=np.int32)
+        canonical = renumber[first[inverse.reshape(-1)]]
+
+        indices = canonical[self.face_indices]
+        face_names = []
+        kept_indices = []
+        counts = []
+        offsets = self.face_offsets.tolist()
+        for face, start, end in zip(self.face_names, offsets, offsets[1:]):
+            corners = indices[start:end]
+            # Drop corners equal to the previous one, wrapping around the face.
+            corners = corners[corners != np.roll(corners, 1)] if len(corners) > 1 else corners
+            if len(corners) < 3:
+                continue
+            face_names.append(face)
+            kept_indices.append(corners)
+            counts.append(len(corners))
+        if not face_names:
+            raise ValueError("Merging vertices left no faces")
+        return Mesh(
+            vertex_names=tuple(self.vertex_names[i] for i in keep),
+            vertices=self.vertices[keep],
+            integral=self.integral[keep],
+            face_names=tuple(face_names),
+            face_indices=np.concatenate(kept_indices).astype(np.int32),
+            face_offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int32),
+        )
+
+
+def _build_group(
+    key: tuple[tuple[str, object], ...],
+    parameter_sets: Sequence[dict[str, object]],
+    merge_vertices: bool,
+) -> tuple[Mesh, list[str]] | str:
+    try:
+        mesh = Mesh.from_geometry(*_generate(key))
+        if merge_vertices:
+            mesh = mesh.merge_vertices()
+        verts, faces = mesh.to_geometry()
+        texts: dict[tuple, str] = {}
+        out = []
+        for params in parameter_sets:
+            text_key = tuple(params.items())
+            if text_key not in texts:
+                texts[text_key] = format_3d(verts, faces, params)
+            out.append(texts[text_key])
+    except Exception as exc:  # The generator and writer do not validate their input.
+        return f"{type(exc).__name__}: {exc}"
+    return mesh, out
+
+
+@dataclass
+class BatchResult:
+    """Formatted .3D text per object name plus the deduplicated meshes.
+
+    Objects whose mesh could not be generated are left out of ``texts`` and
+    listed in ``failed`` with the error.
+    """
+
+    texts: dict[str, str] = field(default_factory=dict)
+    meshes: dict[str, Mesh] = field(default_factory=dict)
+    object_meshes: dict[str, str] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+    generated: int = 0
+
+    def write(self, target_dir: str | Path) -> list[Path]:
+        """Write one ``<name>.3D`` per object into ``target_dir``."""
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, text in self.texts.items():
+            path = target_dir / f"{name}.3D"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            written.append(path)
+        return written
+
+
+def generate_batch(
+    rows: Iterable[Mapping[str, object]],
+    *,
+    merge_vertices: bool = False,
+    max_workers: int | None = None,
+) -> BatchResult:
+    """Generate and format every row; see :func:`normalize_parameters`.
+
+    Rows without a ``name`` are called ``object_0000`` and so on by position.
+    With ``merge_vertices`` coincident vertices are collapsed, which changes
+    the output compared to the generator window.
+    """
+    names: list[str] = []
+    groups: dict[tuple, list[int]] = {}
+    parameter_sets: list[dict[str, object]] = []
+    for index, row in enumerate(rows):
+        name = str(row.get("name") or "").strip() or f"object_{index:04d}"
+        if Path(name).name != name or name in (".", ".."):
+            raise ValueError(f"Invalid object name: {name}")
+        if name in names:
+            raise ValueError(f"Duplicate object name: {name}")
+        try:
+            params = normalize_parameters(row)
+        except ValueError as exc:
+            raise ValueError(f"Row {index + 1} ({name}): {exc}") from None
+        names.append(name)
+        parameter_sets.append(params)
+        groups.setdefault(geometry_key(params), []).append(index)
+
+    keys = list(groups)
+    work = [[parameter_sets[i] for i in groups[key]] for key in keys]
+    workers = worker_count("tso_objects", len(keys), len(names), max_workers)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(
+                pool.map(
+                    _build_group,
+                    keys,
+                    work,
+                    itertools.repeat(merge_vertices),
+                    chunksize=max(1, len(keys) // (workers * 4)),
+                )
+            )
+    else:
+        built = [_build_group(key, sets, merge_vertices) for key, sets in zip(keys, work)]
+
+    result = BatchResult(generated=len(keys))
+    texts: list[str | None] = [None] * len(names)
+    for key, outcome in zip(keys, built):
+        if isinstance(outcome, str):
+            for index in groups[key]:
+                result.failed[names[index]] = outcome
+            continue
+        mesh, group_texts = outcome
+        mesh = result.meshes.setdefault(mesh.digest, mesh)
+        for index, text in zip(groups[key], group_texts):
+            texts[index] = text
+            result.object_meshes[names[index]] = mesh.digest
+    result.texts = {name: text for name, text in zip(names, texts) if text is not None}
+    return result
+
+
+def load_parameter_table(path: str | Path) -> list[dict[str, object]]:
+    """Rows of a ``.csv`` table or a ``.json`` list of objects.
+
+    A JSON file may also hold ``{"defaults": {...}, "objects": [...]}``, in
+    which case each object is laid over the shared defaults.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return [dict(row) for row in csv.DictReader(f)]
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    defaults: dict = {}
+    if isinstance(payload, dict):
+        defaults = payload.get("defaults") or {}
+        payload = payload.get("objects", [])
+    if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+        raise ValueError(f"{path.name}: expected a list of parameter objects")
+    return [{**defaults, **row} for row in payload]
+
+
+def expand_sweep(
+    rows: Sequence[Mapping[str, object]],
+    axes: Mapping[str, Sequence[object]],
+) -> list[dict[str, object]]:
+    """Every row combined with every combination of the ``axes`` values.
+
+    Generated objects are named ``<row name>_<n>``, numbered per row.
+    """
+    if not axes:
+        return [dict(row) for row in rows]
+    keys = list(axes)
+    combos = list(itertools.product(*(axes[key] for key in keys)))
+    width = len(str(len(combos) - 1))
+    expanded = []
+    for index, row in enumerate(rows):
+        base_name = str(row.get("name") or "").strip() or f"object_{index:04d}"
+        for number, values in enumerate(combos):
+            expanded.append({**row, **dict(zip(keys, values)), "name": f"{base_name}_{number:0{width}d}"})
+    return expanded
+
+
+def _parse_sweep(text: str) -> tuple[str, list[str]]:
+    key, sep, values = text.partition("=")
+    if not sep or not key.strip() or not values.strip():
+        raise ValueError(f"Sweep must look like key=value1,value2: {text}")
+    return key.strip(), [value.strip() for value in values.split(",")]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate ICR2 .3D objects from a parameter table.")
+    parser.add_argument("table", type=Path, help="CSV or JSON parameter table")
+    parser.add_argument("target", type=Path, help="Folder for the .3D files")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="KEY=V1,V2",
+        help="Generate every row once per value; repeat for a grid",
+    )
+    parser.add_argument("--merge-vertices", action="store_true", help="Collapse coincident vertices")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 = serial)")
+    args = parser.parse_args(argv)
+
+    if not args.table.is_file():
+        parser.error(f"Parameter table not found: {args.table}")
+    try:
+        rows = load_parameter_table(args.table)
+        rows = expand_sweep(rows, dict(_parse_sweep(text) for text in args.sweep))
+        result = generate_batch(rows, merge_vertices=args.merge_vertices, max_workers=args.workers)
+    except (ValueError, json.JSONDecodeError) as exc:
+        parser.error(str(exc))
+
+    written = result.write(args.target)
+    for name, error in result.failed.items():
+        print(f"{name}: {error}", file=sys.stderr)
+    print(
+        f"{len(written)} objects written to {args.target} "
+        f"({result.generated} meshes generated, {len(result.meshes)} unique)"
+    )
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
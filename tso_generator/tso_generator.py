@@ -622,7 +622,7 @@ def generate_building(
 # .3D writer
 # ------------------------------------------------------------
 
-def write_3d(path, verts, faces, parameters):
+def format_3d(verts, faces, parameters):
     roof_bright = int(parameters.get("roof_color_bright", 0))
     roof_dark = int(parameters.get("roof_color_dark", roof_bright))
     side_bright = int(parameters.get("side_color_bright", 0))
@@ -795,8 +795,12 @@ def write_3d(path, verts, faces, parameters):
     v1, v2, v3 = faces[-1][1][:3]
     lines.append(f"root: BSPF ({v1}, {v2}, {v3}), nil, {faces[-1][0]}, {prev};")
 
+    return "\n".join(lines)
+
+
+def write_3d(path, verts, faces, parameters):
     with open(path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        f.write(format_3d(verts, faces, parameters))
 
 
 # ------------------------------------------------------------